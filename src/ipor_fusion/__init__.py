@@ -21,26 +21,36 @@ from ipor_fusion.core.access import (
 from ipor_fusion.core.context import Web3Context
 from ipor_fusion.core.contract import Call
 from ipor_fusion.core.erc20 import ERC20
+from ipor_fusion.core.facts import ImmutableFacts
+from ipor_fusion.core.failover import FailoverProvider
 from ipor_fusion.core.fee_manager import (
     FeeAccount,
     FeeManager,
     HighWaterMarkPerformanceFee,
     RecipientFee,
 )
+from ipor_fusion.core.multicall import Multicall3
 from ipor_fusion.core.oracle import AssetPriceSource, PriceOracleMiddleware
+from ipor_fusion.core.planner import QueryPlan
 from ipor_fusion.core.plasma_vault import (
     BalanceFuse,
     ManagementFeeData,
     PerformanceFeeData,
     PlasmaVault,
 )
+from ipor_fusion.core.profiling import Profiler, ProfilingMiddleware
+from ipor_fusion.core.provider_pool import ProviderPool
+from ipor_fusion.core.ratecontrol import AdaptiveRateMiddleware, AimdLimiter
 from ipor_fusion.core.rewards_manager import RewardsManager, VestingData
+from ipor_fusion.core.scheduler import RpcScheduler, TaskGroup
 from ipor_fusion.core.simulation import (
     SimulatedCallResult,
     SimulationResult,
     VaultSimulator,
     is_simulate_v1_supported,
 )
+from ipor_fusion.core.vault_state import VaultStateCache
+from ipor_fusion.core.websocket import Subscription, SyncWebSocketProvider
 from ipor_fusion.core.withdraw_manager import (
     PendingRequestsInfo,
     WithdrawManager,
@@ -50,6 +60,7 @@ from ipor_fusion.errors import (
     ContractNotFoundError,
     IporFusionError,
     NotPlasmaVaultError,
+    SubscriptionError,
     TransactionError,
     UnsupportedChainError,
 )
@@ -102,26 +113,51 @@ from ipor_fusion.fuses import (
 )
 from ipor_fusion.market_ids import IporFusionMarkets
 from ipor_fusion.readers import (
+    AaveV3AccountPositions,
+    AaveV3Oracle,
     AaveV3Reader,
+    AaveV3ReservePosition,
     AaveV3UserAccountData,
+    AdaptiveCurveIrm,
     CompoundV3Reader,
+    LendingHealthAlert,
+    LendingHealthMonitor,
+    LendingHealthSample,
     LendingMarketHealth,
+    LendingPositionInputs,
     MorphoMarket,
     MorphoMarketParams,
     MorphoMarketRates,
     MorphoPosition,
+    MorphoPositionSnapshot,
+    MorphoRateModel,
     MorphoReader,
     OracleAsset,
     OracleMapping,
     OracleNode,
     OraclePrice,
+    PoolState,
+    PositionValue,
     RamsesV2Position,
     RamsesV2Reader,
+    StressPosition,
+    StressResult,
+    StressScenario,
     UniswapV3Position,
     UniswapV3Reader,
+    VaultHistoryRow,
     VaultLendingHealth,
+    block_at_timestamp,
+    block_grid,
     build_oracle_mapping,
+    fetch_stress_positions,
+    fetch_vault_history,
     fetch_vault_lending_health,
+    liquidation_price,
+    max_additional_borrow,
+    max_collateral_withdraw,
+    stress_test,
+    timestamp_grid,
 )
 from ipor_fusion.substrates import (
     SubstrateInfo,
@@ -159,6 +195,20 @@ __all__ = [
     "repository_url",
     "Web3Context",
     "Call",
+    "Multicall3",
+    "QueryPlan",
+    "Profiler",
+    "RpcScheduler",
+    "TaskGroup",
+    "ProfilingMiddleware",
+    "AdaptiveRateMiddleware",
+    "AimdLimiter",
+    "FailoverProvider",
+    "ProviderPool",
+    "ImmutableFacts",
+    "SyncWebSocketProvider",
+    "Subscription",
+    "VaultStateCache",
     "VaultSimulator",
     "SimulationResult",
     "SimulatedCallResult",
@@ -238,6 +288,7 @@ __all__ = [
     "ContractNotFoundError",
     "IporFusionError",
     "NotPlasmaVaultError",
+    "SubscriptionError",
     "TransactionError",
     "UnsupportedChainError",
     "CHAIN_NAMES",
@@ -265,20 +316,45 @@ __all__ = [
     "MorphoMarket",
     "MorphoMarketRates",
     "MorphoPosition",
+    "MorphoPositionSnapshot",
+    "MorphoRateModel",
+    "AdaptiveCurveIrm",
     "MorphoMarketParams",
     "AaveV3Reader",
     "AaveV3UserAccountData",
+    "AaveV3AccountPositions",
+    "AaveV3ReservePosition",
+    "AaveV3Oracle",
     "CompoundV3Reader",
     "LendingMarketHealth",
+    "LendingPositionInputs",
     "VaultLendingHealth",
     "fetch_vault_lending_health",
+    "liquidation_price",
+    "max_additional_borrow",
+    "max_collateral_withdraw",
+    "LendingHealthMonitor",
+    "LendingHealthAlert",
+    "LendingHealthSample",
+    "StressPosition",
+    "StressResult",
+    "StressScenario",
+    "fetch_stress_positions",
+    "stress_test",
     "OracleAsset",
     "OracleMapping",
     "OracleNode",
     "OraclePrice",
     "build_oracle_mapping",
+    "PositionValue",
+    "PoolState",
     "UniswapV3Reader",
     "UniswapV3Position",
     "RamsesV2Reader",
     "RamsesV2Position",
+    "VaultHistoryRow",
+    "block_at_timestamp",
+    "block_grid",
+    "fetch_vault_history",
+    "timestamp_grid",
 ]
@@ -15,24 +15,36 @@ def config() -> None:
 
 
 @config.command("set-provider")
-@click.argument("url")
+@click.argument("urls", metavar="URL...", nargs=-1, required=True)
 @click.option(
     "--chain-id",
     type=int,
     default=None,
     help="Chain ID (auto-detected from URL if omitted).",
 )
-def set_provider(url: str, chain_id: int | None) -> None:
-    """Set RPC provider URL for a chain (chain ID auto-detected via eth_chainId)."""
-    from web3 import Web3
+def set_provider(urls: tuple[str, ...], chain_id: int | None) -> None:
+    """Set RPC provider URL for a chain (chain ID auto-detected via eth_chainId).
+
+    Pass several URLs for the same chain to hedge reads across them and fail
+    over when one is slow, erroring or behind. Each is probed, and URLs that
+    answer for different chains are rejected. A ws:// or wss:// URL keeps
+    one persistent connection and lets `vault info --watch` follow new
+    blocks as they arrive.
+    """
+    from ipor_fusion.core.websocket import detect_chain_id
 
     if chain_id is None:
-        web3 = Web3(Web3.HTTPProvider(url))
-        chain_id = web3.eth.chain_id
+        detected = {url: detect_chain_id(url) for url in urls}
+        chain_id = detected[urls[0]]
+        for url, other in detected.items():
+            if other != chain_id:
+                raise click.UsageError(
+                    f"{url} is on chain {other}, not {chain_id} like {urls[0]}."
+                )
         click.echo(f"Detected chain ID: {chain_id}")
 
     cfg = load_config()
-    cfg.providers[str(chain_id)] = url
+    cfg.providers[str(chain_id)] = urls[0] if len(urls) == 1 else list(urls)
     save_config(cfg)
     click.echo(f"Provider for chain {chain_id} set.")
 
@@ -57,8 +69,9 @@ def show() -> None:
 def _print_config(cfg: FusionConfig) -> None:
     click.echo("Providers:")
     if cfg.providers:
-        for chain_id, url in cfg.providers.items():
-            click.echo(f"  Chain {chain_id}: {url}")
+        for chain_id, urls in cfg.providers.items():
+            shown = urls if isinstance(urls, str) else ", ".join(urls)
+            click.echo(f"  Chain {chain_id}: {shown}")
     else:
         click.echo("  (none)")
 
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import json
 import os
-import threading
 from pathlib import Path
 
 import click
@@ -20,6 +19,8 @@ def _xdg_cache_home() -> Path:
 CONFIG_DIR = _xdg_config_home() / "ipor-fusion"
 CONFIG_FILE = CONFIG_DIR / "config.json"
 CACHE_DIR = _xdg_cache_home() / "ipor-fusion"
+# Legacy JSON caches, imported once into the metadata store (see
+# ipor_fusion.cli.metadata_store).
 CACHE_FILE = CACHE_DIR / "contract_cache.json"
 DEPLOYMENT_CACHE_FILE = CACHE_DIR / "deployment_cache.json"
 
@@ -33,7 +34,8 @@ class VaultEntry(BaseModel):
 
 
 class FusionConfig(BaseModel):
-    providers: dict[str, str] = Field(default_factory=dict)
+    # One URL, or several for hedged reads with failover (see FailoverProvider).
+    providers: dict[str, str | list[str]] = Field(default_factory=dict)
     etherscan_api_key: str | None = None
     vaults: list[VaultEntry] = Field(default_factory=list)
     version: int = CONFIG_VERSION
@@ -68,51 +70,3 @@ def load_config() -> FusionConfig:
 def save_config(config: FusionConfig) -> None:
     CONFIG_DIR.mkdir(parents=True, exist_ok=True)
     CONFIG_FILE.write_text(config.model_dump_json(indent=2), encoding="utf-8")
-
-
-_cache_lock = threading.Lock()
-
-
-def load_contract_cache() -> dict[str, str]:
-    with _cache_lock:
-        if not CACHE_FILE.exists():
-            return {}
-        return json.loads(CACHE_FILE.read_text(encoding="utf-8"))  # type: ignore[no-any-return]
-
-
-def save_contract_cache(cache: dict[str, str]) -> None:
-    with _cache_lock:
-        CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        CACHE_FILE.write_text(json.dumps(cache, indent=2), encoding="utf-8")
-
-
-def update_contract_cache(key: str, value: str) -> None:
-    with _cache_lock:
-        CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        existing: dict[str, str] = {}
-        if CACHE_FILE.exists():
-            existing = json.loads(CACHE_FILE.read_text(encoding="utf-8"))
-        existing[key] = value
-        CACHE_FILE.write_text(json.dumps(existing, indent=2), encoding="utf-8")
-
-
-_deployment_cache_lock = threading.Lock()
-
-
-def load_deployment_cache() -> dict[str, dict[str, int]]:
-    with _deployment_cache_lock:
-        if not DEPLOYMENT_CACHE_FILE.exists():
-            return {}
-        return json.loads(DEPLOYMENT_CACHE_FILE.read_text(encoding="utf-8"))  # type: ignore[no-any-return]
-
-
-def update_deployment_cache(key: str, block: int, timestamp: int) -> None:
-    with _deployment_cache_lock:
-        CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        existing: dict[str, dict[str, int]] = {}
-        if DEPLOYMENT_CACHE_FILE.exists():
-            existing = json.loads(DEPLOYMENT_CACHE_FILE.read_text(encoding="utf-8"))
-        existing[key] = {"block": block, "timestamp": timestamp}
-        DEPLOYMENT_CACHE_FILE.write_text(
-            json.dumps(existing, indent=2), encoding="utf-8"
-        )
@@ -6,7 +6,7 @@ import time
 from urllib.parse import urlencode
 from urllib.request import urlopen
 
-from ipor_fusion.cli.config_store import load_contract_cache, update_contract_cache
+from ipor_fusion.cli.metadata_store import NS_CONTRACT_NAME, get_metadata_store
 
 ETHERSCAN_V2_URL = "https://api.etherscan.io/v2/api"
 
@@ -34,14 +34,14 @@ _etherscan_limiter = _RateLimiter(2.5)
 
 
 def get_contract_name(chain_id: int, address: str, api_key: str | None = None) -> str:
-    cache = load_contract_cache()
-    cache_key = f"{chain_id}:{address}"
+    store = get_metadata_store()
+    cache_key = f"{chain_id}:{address}".lower()
 
-    if cached := cache.get(cache_key):
+    if cached := store.get(NS_CONTRACT_NAME, cache_key):
         return cached
 
     if name := _fetch_contract_name(chain_id, address, api_key):
-        update_contract_cache(cache_key, name)
+        store.put(NS_CONTRACT_NAME, cache_key, name)
         return name
     return ""
 
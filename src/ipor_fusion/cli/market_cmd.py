@@ -14,6 +14,7 @@ import json as json_lib
 import click
 
 from ipor_fusion.cli.config_store import load_config
+from ipor_fusion.cli.metadata_store import persistent_facts
 from ipor_fusion.cli.morpho_api import (
     PUBLIC_ALLOCATOR_ADDRESSES,
     MorphoApiError,
@@ -122,7 +123,7 @@ def morpho_blue(
     """
     cfg = load_config()
     provider_url = _resolve_provider(cfg, chain_id)
-    ctx = Web3Context.from_url(provider_url)
+    ctx = Web3Context.from_url(provider_url, facts=persistent_facts())
     if block is not None:
         ctx.default_block = block
     reader = MorphoReader(ctx, MORPHO_BLUE_ADDRESS)
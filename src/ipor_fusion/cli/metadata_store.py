@@ -0,0 +1,248 @@
+"""Persistent store for immutable on-chain and explorer metadata.
+
+Token symbols and decimals, Etherscan contract names, vault deployment
+blocks and immutable contract reads (fuse ``MARKET_ID``s, Morpho market
+parameters; see `ipor_fusion.core.facts`) never change once known. They
+used to live in ``contract_cache.json`` and ``deployment_cache.json``,
+which were re-parsed on every lookup and rewritten whole on every insert
+under a global lock.
+
+`MetadataStore` keeps them in one SQLite database in WAL mode, so readers
+never block and several CLI processes can share it:
+
+- Reads are per key.
+- Writes are buffered and flushed in one transaction every `FLUSH_EVERY`
+  entries and at exit. Reads see buffered writes immediately.
+- Keys are grouped into namespaces: `NS_SYMBOL`, `NS_DECIMALS`,
+  `NS_CONTRACT_NAME`, `NS_DEPLOYMENT` and `NS_TOPOLOGY` here, and the
+  facts' own (`ipor_fusion.core.facts.NS_IMMUTABLE_CALL` and friends),
+  which hold fuse ``MARKET_ID``s among other immutable reads. Address keys
+  are lowercase.
+
+The first time a database is opened, entries from the legacy JSON caches are
+imported into it. The JSON files themselves are left untouched.
+
+Vault topology snapshots (`ipor_fusion.cli.vault_topology`) live here too.
+They are not immutable, but are checked against the chain before each use.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import re
+import sqlite3
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+from ipor_fusion.cli import config_store
+from ipor_fusion.core.facts import ImmutableFacts
+
+logger = logging.getLogger(__name__)
+
+METADATA_DB_NAME = "metadata.sqlite3"
+
+NS_SYMBOL = "symbol"
+NS_DECIMALS = "decimals"
+NS_CONTRACT_NAME = "contract_name"
+NS_DEPLOYMENT = "deployment"
+NS_TOPOLOGY = "topology"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS store_info (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+_JSON_MIGRATED = "json_migrated"
+
+# Legacy contract_cache.json keys: "symbol:<addr>", "decimals:<addr>" and
+# the explorer's "<chain_id>:<addr>" contract names.
+_LEGACY_PREFIXES = {"symbol": NS_SYMBOL, "decimals": NS_DECIMALS}
+_LEGACY_NAME_KEY = re.compile(r"^\d+:0x", re.IGNORECASE)
+
+
+class MetadataStore:
+    """Namespaced key/value store backed by SQLite (WAL)."""
+
+    FLUSH_EVERY = 32
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._lock = threading.Lock()
+        self._pending: dict[tuple[str, str], str] = {}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def get(self, namespace: str, key: str) -> str | None:
+        with self._lock:
+            if (pending := self._pending.get((namespace, key))) is not None:
+                return pending
+            row = self._conn.execute(
+                "SELECT value FROM metadata WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, namespace: str, key: str, value: str) -> None:
+        self.put_many(namespace, [(key, value)])
+
+    def put_many(self, namespace: str, items: Iterable[tuple[str, str]]) -> None:
+        with self._lock:
+            for key, value in items:
+                self._pending[(namespace, key)] = value
+            if len(self._pending) >= self.FLUSH_EVERY:
+                self._flush_locked()
+
+    def items(self, namespace: str) -> dict[str, str]:
+        """Every entry of ``namespace``, buffered writes included."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM metadata WHERE namespace = ?", (namespace,)
+            ).fetchall()
+            entries = dict(rows)
+            entries.update(
+                (key, value)
+                for (ns, key), value in self._pending.items()
+                if ns == namespace
+            )
+        return entries
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+
+    def migrate_legacy_json(self, contract_cache: Path, deployment_cache: Path) -> None:
+        """Import the old JSON caches once per database."""
+        with self._lock:
+            done = self._conn.execute(
+                "SELECT 1 FROM store_info WHERE name = ?", (_JSON_MIGRATED,)
+            ).fetchone()
+            if done:
+                return
+            rows = [
+                *_legacy_contract_rows(contract_cache),
+                *_legacy_deployment_rows(deployment_cache),
+            ]
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO metadata VALUES (?, ?, ?)", rows
+                )
+                self._conn.execute(
+                    "INSERT INTO store_info VALUES (?, '1')", (_JSON_MIGRATED,)
+                )
+        if rows:
+            logger.info(
+                "Imported %d legacy cache entries into %s", len(rows), self._path
+            )
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        rows = [(ns, key, value) for (ns, key), value in self._pending.items()]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO metadata VALUES (?, ?, ?)", rows
+            )
+        self._pending.clear()
+
+
+def _read_json(path: Path) -> dict[str, object]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _legacy_contract_rows(path: Path) -> list[tuple[str, str, str]]:
+    rows = []
+    for key, value in _read_json(path).items():
+        prefix, _, rest = key.partition(":")
+        if prefix in _LEGACY_PREFIXES:
+            rows.append((_LEGACY_PREFIXES[prefix], rest.lower(), str(value)))
+        elif _LEGACY_NAME_KEY.match(key):
+            rows.append((NS_CONTRACT_NAME, key.lower(), str(value)))
+    return rows
+
+
+def _legacy_deployment_rows(path: Path) -> list[tuple[str, str, str]]:
+    return [
+        (NS_DEPLOYMENT, key.lower(), json.dumps(value))
+        for key, value in _read_json(path).items()
+        if isinstance(value, dict)
+    ]
+
+
+_store: MetadataStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_metadata_store() -> MetadataStore:
+    """The process-wide store in the CLI cache directory.
+
+    Reopened if the cache directory changes (tests point it at a temporary
+    one); the previous store is flushed and closed.
+    """
+    global _store
+    path = config_store.CACHE_DIR / METADATA_DB_NAME
+    with _store_lock:
+        if _store is not None and _store.path == path:
+            return _store
+        if _store is not None:
+            _close_quietly(_store)
+        _store = MetadataStore(path)
+        _store.migrate_legacy_json(
+            config_store.CACHE_FILE, config_store.DEPLOYMENT_CACHE_FILE
+        )
+        return _store
+
+
+class _SharedStoreBackend:
+    """`FactsBackend` over the current `get_metadata_store()`, opened only
+    once a fact is actually looked up."""
+
+    def get(self, namespace: str, key: str) -> str | None:
+        return get_metadata_store().get(namespace, key)
+
+    def put(self, namespace: str, key: str, value: str) -> None:
+        get_metadata_store().put(namespace, key, value)
+
+
+def persistent_facts() -> ImmutableFacts:
+    """`ImmutableFacts` kept in the metadata store across CLI runs."""
+    return ImmutableFacts(_SharedStoreBackend())
+
+
+def _close_quietly(store: MetadataStore) -> None:
+    try:
+        store.close()
+    except sqlite3.Error:
+        logger.debug("Could not flush %s", store.path, exc_info=True)
+
+
+@atexit.register
+def _close_at_exit() -> None:
+    with _store_lock:
+        if _store is not None:
+            _close_quietly(_store)
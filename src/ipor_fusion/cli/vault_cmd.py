@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import json
-from collections.abc import Sequence
-from concurrent.futures import Future, ThreadPoolExecutor
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future
 from datetime import datetime, timezone
 from typing import Any
 
@@ -19,14 +20,17 @@ from ipor_fusion.cli.config_store import (
     save_config,
 )
 from ipor_fusion.cli.explorer import get_contract_name
+from ipor_fusion.cli.metadata_store import persistent_facts
 from ipor_fusion.cli.vault_fetcher import (
     _ZERO_ADDRESS,
+    VaultTarget,
     _fetch_deployment_info,
     _fetch_vault_data,
     _resolve_token_decimals,
     _resolve_token_symbol,
     _safe_call,
     _VaultData,
+    fetch_many_vaults,
 )
 from ipor_fusion.cli.vault_health import (
     _BalanceFuseTotals,
@@ -37,6 +41,12 @@ from ipor_fusion.cli.vault_health import (
     _print_health_check,
     _print_reconciliation,
 )
+from ipor_fusion.cli.vault_history import (
+    DURATION,
+    TIMESTAMP,
+    write_csv,
+    write_parquet,
+)
 from ipor_fusion.cli.vault_rendering import (
     _format_age,
     _format_amount,
@@ -45,6 +55,14 @@ from ipor_fusion.cli.vault_rendering import (
     _print_table,
     _substrate_details,
 )
+from ipor_fusion.cli.vault_watch import (
+    DEFAULT_POLL_INTERVAL_S,
+    VaultWatcher,
+    capture_lines,
+    diff_json,
+    diff_lines,
+    new_blocks,
+)
 from ipor_fusion.config.roles import Roles
 from ipor_fusion.core.access import (
     AccessManager,
@@ -54,7 +72,11 @@ from ipor_fusion.core.access import (
 from ipor_fusion.core.context import Web3Context
 from ipor_fusion.core.fee_manager import HighWaterMarkPerformanceFee, RecipientFee
 from ipor_fusion.core.plasma_vault import PlasmaVault
+from ipor_fusion.core.profiling import Profiler, TracedThreadPoolExecutor, span
+from ipor_fusion.core.scheduler import RpcScheduler
 from ipor_fusion.errors import (
+    RECOVERABLE_ERRORS,
+    TRANSPORT_ERRORS,
     ContractNotFoundError,
     NotPlasmaVaultError,
     UnsupportedChainError,
@@ -70,6 +92,12 @@ from ipor_fusion.readers.oracle_mapping import (
     OraclePrice,
     build_oracle_mapping,
 )
+from ipor_fusion.readers.vault_history import (
+    DEFAULT_HISTORY_CONCURRENCY,
+    block_grid,
+    fetch_vault_history,
+    timestamp_grid,
+)
 from ipor_fusion.substrates import (
     decode_substrate,
     format_market_label,
@@ -161,6 +189,16 @@ UINT256_MAX = 2**256 - 1
 # real ``*BalanceFuse`` is a venue.
 _CAPABILITY_BALANCE_FUSES: frozenset[str] = frozenset({"ZeroBalanceFuse"})
 
+# Block-explorer lookups (contract names) are slow, rate-limited HTTP calls:
+# they get their own few threads rather than slots of the RPC scheduler.
+_EXPLORER_WORKERS = 4
+
+
+def _explorer_pool() -> TracedThreadPoolExecutor:
+    return TracedThreadPoolExecutor(
+        max_workers=_EXPLORER_WORKERS, thread_name_prefix="explorer"
+    )
+
 
 def _unix_to_iso(timestamp: int) -> str:
     """Unix seconds as the ISO-8601 UTC string every `*_utc` key carries.
@@ -204,7 +242,7 @@ def _resolve_chain_id(
     )
 
 
-def _resolve_provider(cfg: FusionConfig, chain_id: int) -> str:
+def _resolve_provider(cfg: FusionConfig, chain_id: int) -> str | list[str]:
     if provider_url := cfg.providers.get(str(chain_id)):
         return provider_url
     raise click.UsageError(
@@ -226,7 +264,7 @@ def _build_ctx(
     # validated chains before even resolving a provider.
     _require_supported_chain(chain_id)
     provider_url = _resolve_provider(cfg, chain_id)
-    ctx = Web3Context.from_url(provider_url)
+    ctx = Web3Context.from_url(provider_url, facts=persistent_facts())
     if block_number is not None:
         ctx.default_block = block_number
     return chain_id, ctx
@@ -357,7 +395,7 @@ vault.add_command(list_vaults, "ls")
 
 
 @vault.command("info")
-@click.argument("vault_address", type=ADDRESS)
+@click.argument("vault_address", type=ADDRESS, required=False)
 @click.option(
     "--chain-id", type=CHAIN, default=None, help="Chain ID or name (e.g. 1, ethereum)."
 )
@@ -370,20 +408,123 @@ vault.add_command(list_vaults, "ls")
 @click.option(
     "--json", "json_output", is_flag=True, default=False, help="Output as JSON."
 )
-def info(
-    vault_address: str,
+@click.option(
+    "--profile",
+    "profile_path",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Write a Chrome trace-event file of fetch phases, pool tasks and RPCs.",
+)
+@click.option(
+    "--all",
+    "all_vaults",
+    is_flag=True,
+    default=False,
+    help="Every saved vault (only those on --chain-id, if given).",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    default=False,
+    help="Keep running; on every new block, show what changed.",
+)
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0.5),
+    default=DEFAULT_POLL_INTERVAL_S,
+    show_default=True,
+    help="Seconds between polls for a new block (with --watch, HTTP providers).",
+)
+def info(  # noqa: PLR0913
+    vault_address: str | None,
     chain_id: int | None,
     block_number: int | None,
     json_output: bool,
+    profile_path: str | None,
+    all_vaults: bool,
+    watch: bool,
+    interval: float,
 ) -> None:
     """Display full on-chain vault state.
 
     The comprehensive vault summary — includes all role accounts on the
     vault's AccessManager.
+
+    With --all, every saved vault is fetched in one run: one connection per
+    chain, all vaults of a chain read at the same block, shared contracts
+    read once. Each vault is printed as soon as it completes; with --json,
+    as one JSON object per line (NDJSON).
+
+    With --watch, the full summary is printed once, then on every new block
+    only the lines that changed among the totals, prices and lending health
+    (with --json: one object per block holding the changed fields). The
+    vault's topology is kept in memory between blocks. Stop with Ctrl-C.
+
+    With --profile, the run is traced and written as a Chrome trace-event
+    file (open in chrome://tracing or ui.perfetto.dev), even when it fails.
     """
+    if all_vaults and vault_address is not None:
+        raise click.UsageError("Pass either VAULT_ADDRESS or --all, not both.")
+    if vault_address is None and not all_vaults:
+        raise click.UsageError("Missing argument 'VAULT_ADDRESS' (or use --all).")
+    if watch and (all_vaults or block_number is not None):
+        raise click.UsageError("--watch follows one vault at the chain head.")
+
+    def run() -> None:
+        if vault_address is None:
+            _info_all(chain_id, block_number, json_output)
+        elif watch:
+            _info_watch(vault_address, chain_id, json_output, interval)
+        else:
+            _info(vault_address, chain_id, block_number, json_output)
+
+    _run_profiled(profile_path, "vault info", vault_address or "all", run)
+
+
+def _run_profiled(
+    profile_path: str | None, name: str, vault: str, run: Callable[[], None]
+) -> None:
+    """Run a command, traced into ``profile_path`` (written even when the
+    command fails) when one is given."""
+    if profile_path is None:
+        run()
+        return
+    profiler = Profiler()
+    try:
+        with profiler, span(name, vault=vault):
+            run()
+    finally:
+        profiler.write(profile_path)
+        click.echo(f"Profile written to {profile_path}", err=True)
+
+
+def _info(
+    vault_address: str,
+    chain_id: int | None,
+    block_number: int | None,
+    json_output: bool,
+) -> None:
     cfg = load_config()
+    chain_id, ctx, plasma_vault = _open_vault(
+        cfg, vault_address, chain_id, block_number
+    )
+    _auto_save_vault(cfg, vault_address, chain_id, plasma_vault)
+
+    data = _fetch_vault_data(ctx, plasma_vault, block_number, chain_id=chain_id)
+    with span("render"):
+        _print_vault_info(
+            ctx, plasma_vault, cfg, data, vault_address, chain_id, json_output
+        )
+
+
+def _open_vault(
+    cfg: FusionConfig,
+    vault_address: str,
+    chain_id: int | None,
+    block_number: int | None,
+) -> tuple[int, Web3Context, PlasmaVault]:
+    """`_build_ctx`, then make sure a Plasma Vault lives at ``vault_address``."""
     chain_id, ctx = _build_ctx(cfg, vault_address, chain_id, block_number)
-    checksum_address = Web3.to_checksum_address(vault_address)
 
     # Cheap single-call probe: friendly errors for "nothing deployed here" and
     # "not a Plasma Vault" (revert and empty-return flavors alike) before the
@@ -393,13 +534,418 @@ def info(
     except (ContractNotFoundError, NotPlasmaVaultError) as exc:
         raise click.UsageError(str(exc)) from exc
 
-    plasma_vault = PlasmaVault(ctx, checksum_address)
+    return chain_id, ctx, PlasmaVault(ctx, Web3.to_checksum_address(vault_address))
+
 
+def _info_watch(
+    vault_address: str, chain_id: int | None, json_output: bool, interval: float
+) -> None:
+    cfg = load_config()
+    chain_id, ctx, plasma_vault = _open_vault(cfg, vault_address, chain_id, None)
     _auto_save_vault(cfg, vault_address, chain_id, plasma_vault)
+    chain_label = CHAIN_NAMES.get(chain_id, str(chain_id))
 
-    data = _fetch_vault_data(ctx, plasma_vault, block_number, chain_id=chain_id)
-    _print_vault_info(
-        ctx, plasma_vault, cfg, data, vault_address, chain_id, json_output
+    def show_first(data: _VaultData) -> None:
+        if not json_output:
+            _print_vault_info(ctx, plasma_vault, cfg, data, vault_address, chain_id)
+            return
+        _attach_deployment_info(ctx, cfg, data, vault_address, chain_id)
+        full = _build_json_output(
+            ctx,
+            plasma_vault,
+            data,
+            vault_address,
+            chain_id,
+            chain_label,
+            cfg.etherscan_api_key,
+        )
+        click.echo(json.dumps(full))
+
+    def summary(data: _VaultData) -> Any:
+        if json_output:
+            return {
+                "asset_price_usd": data.asset_price_usd,
+                **_build_totals_json(data),
+                "lending_health": _build_lending_health_json(data),
+            }
+        return capture_lines(lambda: _print_watch_summary(ctx, data))
+
+    _watch_vault(
+        VaultWatcher(ctx, plasma_vault, chain_id),
+        ctx,
+        interval,
+        show_first,
+        summary,
+        json_output,
+    )
+
+
+def _print_watch_summary(ctx: Web3Context, data: _VaultData) -> None:
+    """The dynamic part of `vault info` that `--watch` diffs block to block."""
+    _print_vault_totals(data)
+    click.echo()
+    _print_lending_health(ctx, data)
+
+
+def _watch_vault(  # noqa: PLR0913
+    watcher: VaultWatcher,
+    ctx: Web3Context,
+    interval: float,
+    show_first: Callable[[_VaultData], None],
+    summary: Callable[[_VaultData], Any],
+    json_output: bool,
+) -> None:
+    """Render the vault in full at the current head, then the changes of
+    ``summary`` at every new block, until interrupted.
+
+    ``summary`` is a list of text lines, or a JSON-able dict with --json.
+    A block whose fetch fails, the connection dropping included, is
+    reported and skipped.
+    """
+    previous: Any = None
+    shown = False
+    try:
+        for block in new_blocks(ctx, interval):
+            try:
+                data = watcher.fetch(block)
+                current = summary(data)
+            except (*RECOVERABLE_ERRORS, *TRANSPORT_ERRORS) as exc:
+                click.echo(
+                    f"Block {block}: fetch failed ({type(exc).__name__}: {exc})",
+                    err=True,
+                )
+                continue
+            if shown:
+                _print_watch_changes(data, previous, current, json_output)
+            else:
+                show_first(data)
+                shown = True
+            previous = current
+    except KeyboardInterrupt:
+        # Ctrl-C is how a watch ends, not an error.
+        return
+
+
+def _print_watch_changes(
+    data: _VaultData, previous: Any, current: Any, json_output: bool
+) -> None:
+    if json_output:
+        changes = {
+            "block": data.block_number,
+            "block_timestamp": data.block_timestamp,
+            "changes": diff_json(previous, current),
+        }
+        click.echo(json.dumps(changes))
+        return
+    click.echo(f"Block {data.block_number} ({_unix_to_iso(data.block_timestamp)}):")
+    lines = diff_lines(previous, current)
+    if not lines:
+        click.echo("  (no changes)")
+    for line in lines:
+        click.secho(f"  {line}", fg="red" if line.startswith("-") else "green")
+
+
+def _info_all(
+    chain_id: int | None, block_number: int | None, json_output: bool
+) -> None:
+    cfg = load_config()
+    targets = [
+        VaultTarget(entry.chain_id, Web3.to_checksum_address(entry.address))
+        for entry in cfg.vaults
+        if chain_id is None or entry.chain_id == chain_id
+    ]
+    if not targets:
+        raise click.UsageError(
+            "No saved vaults"
+            + (f" on chain {chain_id}" if chain_id is not None else "")
+            + ". Use 'fusion vault add <address>'."
+        )
+    contexts: dict[int, Web3Context] = {}
+    for target in targets:
+        if target.chain_id not in contexts:
+            _require_supported_chain(target.chain_id)
+            # Several URLs for a chain: spread the fleet over all of them.
+            contexts[target.chain_id] = Web3Context.from_url(
+                _resolve_provider(cfg, target.chain_id),
+                balanced=True,
+                facts=persistent_facts(),
+            )
+
+    def as_json(ctx: Web3Context, plasma_vault: PlasmaVault, data: _VaultData) -> dict:
+        chain = ctx.chain_id
+        _attach_deployment_info(ctx, cfg, data, plasma_vault.address, chain)
+        return _build_json_output(
+            ctx,
+            plasma_vault,
+            data,
+            plasma_vault.address,
+            chain,
+            CHAIN_NAMES.get(chain, str(chain)),
+            cfg.etherscan_api_key,
+        )
+
+    failed = 0
+    results = fetch_many_vaults(
+        targets, contexts, block_number, finish=as_json if json_output else None
+    )
+    for result in results:
+        target = result.target
+        if result.error is not None:
+            failed += 1
+            message = f"{type(result.error).__name__}: {result.error}"
+            if json_output:
+                error = {"address": target.address, "chain_id": target.chain_id}
+                click.echo(json.dumps({**error, "error": message}))
+            else:
+                click.echo(f"Vault {target.address}: {message}\n", err=True)
+            continue
+        if json_output:
+            click.echo(json.dumps(result.output))
+            continue
+        assert result.data is not None  # noqa: S101  # set whenever error is None
+        ctx = contexts[target.chain_id]
+        _print_vault_info(
+            ctx,
+            PlasmaVault(ctx, target.address),
+            cfg,
+            result.data,
+            target.address,
+            target.chain_id,
+        )
+        click.echo("")
+    if failed:
+        raise click.ClickException(f"{failed} of {len(targets)} vaults failed.")
+
+
+@vault.command("health")
+@click.argument("vault_address", type=ADDRESS)
+@click.option(
+    "--chain-id", type=CHAIN, default=None, help="Chain ID or name (e.g. 1, ethereum)."
+)
+@click.option(
+    "--block-number",
+    type=int,
+    default=None,
+    help="Block number (default: latest).",
+)
+@click.option(
+    "--json", "json_output", is_flag=True, default=False, help="Output as JSON."
+)
+@click.option(
+    "--profile",
+    "profile_path",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Write a Chrome trace-event file of fetch phases, pool tasks and RPCs.",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    default=False,
+    help="Keep running; on every new block, show what changed.",
+)
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0.5),
+    default=DEFAULT_POLL_INTERVAL_S,
+    show_default=True,
+    help="Seconds between polls for a new block (with --watch, HTTP providers).",
+)
+def health(  # noqa: PLR0913
+    vault_address: str,
+    chain_id: int | None,
+    block_number: int | None,
+    json_output: bool,
+    profile_path: str | None,
+    watch: bool,
+    interval: float,
+) -> None:
+    """Show the vault's lending positions: LTV, health factor and status
+    per market, with the collateral / borrow breakdown.
+
+    With --watch, the positions are printed once, then on every new block
+    only the lines that changed (with --json: one object per block holding
+    the changed fields). Stop with Ctrl-C.
+
+    With --profile, the run is traced and written as a Chrome trace-event
+    file (open in chrome://tracing or ui.perfetto.dev), even when it fails.
+    """
+    if watch and block_number is not None:
+        raise click.UsageError("--watch follows the chain head; drop --block-number.")
+    _run_profiled(
+        profile_path,
+        "vault health",
+        vault_address,
+        lambda: _health(
+            vault_address, chain_id, block_number, json_output, watch, interval
+        ),
+    )
+
+
+def _health(  # noqa: PLR0913
+    vault_address: str,
+    chain_id: int | None,
+    block_number: int | None,
+    json_output: bool,
+    watch: bool,
+    interval: float,
+) -> None:
+    cfg = load_config()
+    chain_id, ctx, plasma_vault = _open_vault(
+        cfg, vault_address, chain_id, block_number
+    )
+
+    def as_json(data: _VaultData) -> dict:
+        return {
+            "vault": vault_address,
+            "chain_id": chain_id,
+            "block": data.block_number,
+            "block_timestamp": data.block_timestamp,
+            "lending_health": _build_lending_health_json(data),
+        }
+
+    def show(data: _VaultData) -> None:
+        if json_output:
+            click.echo(json.dumps(as_json(data), indent=None if watch else 2))
+            return
+        click.echo(f"Vault:            {vault_address}")
+        block_suffix = " (latest)" if data.is_latest else ""
+        click.echo(f"Block:            {data.block_number}{block_suffix}")
+        click.echo()
+        _print_lending_health(ctx, data)
+
+    if not watch:
+        show(_fetch_vault_data(ctx, plasma_vault, block_number, chain_id=chain_id))
+        return
+
+    def summary(data: _VaultData) -> Any:
+        if json_output:
+            return _build_lending_health_json(data)
+        return capture_lines(lambda: _print_lending_health(ctx, data))
+
+    _watch_vault(
+        VaultWatcher(ctx, plasma_vault, chain_id),
+        ctx,
+        interval,
+        show,
+        summary,
+        json_output,
+    )
+
+
+@vault.command("history")
+@click.argument("vault_address", type=ADDRESS)
+@click.option(
+    "--chain-id", type=CHAIN, default=None, help="Chain ID or name (e.g. 1, ethereum)."
+)
+@click.option("--from-block", type=click.IntRange(min=0), help="First block.")
+@click.option(
+    "--to-block", type=click.IntRange(min=0), help="Last block (default: latest)."
+)
+@click.option("--step", type=click.IntRange(min=1), help="Blocks between samples.")
+@click.option(
+    "--from-time", type=TIMESTAMP, help="First sample time: unix or ISO-8601."
+)
+@click.option("--to-time", type=TIMESTAMP, help="Last sample time (default: now).")
+@click.option("--every", type=DURATION, help="Time between samples, e.g. 3600, 6h, 1d.")
+@click.option(
+    "--output",
+    "-o",
+    default="-",
+    show_default=True,
+    help="File to write; - is stdout (CSV only).",
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["csv", "parquet"]),
+    default=None,
+    help="Output format (default: from the --output extension, else csv).",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1, max=32),
+    default=DEFAULT_HISTORY_CONCURRENCY,
+    show_default=True,
+    help="Blocks read at once.",
+)
+def history(  # noqa: PLR0913
+    vault_address: str,
+    chain_id: int | None,
+    from_block: int | None,
+    to_block: int | None,
+    step: int | None,
+    from_time: int | None,
+    to_time: int | None,
+    every: int | None,
+    output: str,
+    fmt: str | None,
+    concurrency: int,
+) -> None:
+    """Export vault metrics over a range of blocks as CSV or Parquet.
+
+    Samples every --step blocks from --from-block, or every --every from
+    --from-time (each time maps to the last block mined at or before it).
+    Each row holds the block number and timestamp, total assets, total
+    supply, share price (assets per whole share), unrealized management fee
+    and the assets in each balance-fuse market, all as raw integers. Each
+    block costs one multicall; --concurrency blocks are read at once, and
+    rows are written as they come. Requires an archive node, and for
+    Parquet the 'parquet' extra (pip install 'ipor-fusion[parquet]').
+    """
+    fmt = fmt or ("parquet" if output.endswith(".parquet") else "csv")
+    if fmt == "parquet" and output == "-":
+        raise click.UsageError("Parquet output needs a file: use --output PATH.")
+
+    cfg = load_config()
+    chain_id, ctx = _build_ctx(cfg, vault_address, chain_id, None)
+    vault_address = Web3.to_checksum_address(vault_address)
+    try:
+        resolve_access_manager(ctx, vault_address)
+    except (ContractNotFoundError, NotPlasmaVaultError) as exc:
+        raise click.UsageError(str(exc)) from exc
+
+    try:
+        blocks = _history_blocks(
+            ctx, from_block, to_block, step, from_time, to_time, every
+        )
+    except ValueError as exc:
+        raise click.UsageError(str(exc)) from exc
+    market_ids = sorted(
+        {fuse.market_id for fuse in PlasmaVault(ctx, vault_address).get_balance_fuses()}
+    )
+    rows = fetch_vault_history(ctx, vault_address, blocks, market_ids, concurrency)
+
+    if fmt == "parquet":
+        count = write_parquet(rows, market_ids, output)
+    else:
+        with click.open_file(output, "w") as stream:
+            count = write_csv(rows, market_ids, stream)
+    if output != "-":
+        click.echo(f"Wrote {count} rows to {output}", err=True)
+
+
+def _history_blocks(  # noqa: PLR0913
+    ctx: Web3Context,
+    from_block: int | None,
+    to_block: int | None,
+    step: int | None,
+    from_time: int | None,
+    to_time: int | None,
+    every: int | None,
+) -> list[int]:
+    """The sampled blocks: a block grid or a time grid, never a mix."""
+    by_time = (from_time, to_time, every)
+    by_block = (from_block, to_block, step)
+    if from_block is not None and step is not None and by_time == (None,) * 3:
+        last = to_block if to_block is not None else ctx.web3.eth.block_number
+        return block_grid(from_block, last, step)
+    if from_time is not None and every is not None and by_block == (None,) * 3:
+        end = to_time if to_time is not None else int(time.time())
+        return timestamp_grid(ctx, from_time, end, every)
+    raise click.UsageError(
+        "Sample by block (--from-block, --step, optional --to-block) or by "
+        "time (--from-time, --every, optional --to-time)."
     )
 
 
@@ -747,12 +1293,15 @@ def _print_health_lines(market: Any, indent: str) -> None:
 
 # Failure modes of the heavy RoleGranted scan: JSON-RPC rejections/limits plus
 # transport-level errors — web3's HTTPProvider re-raises raw requests
-# exceptions (read timeouts, 429/5xx via raise_for_status).
+# exceptions (read timeouts, 429/5xx via raise_for_status), the WebSocket
+# provider the builtin TimeoutError / ConnectionError.
 _ROLE_SCAN_ERRORS = (
     ContractLogicError,
     Web3RPCError,
     TimeExhausted,
     requests.RequestException,
+    TimeoutError,
+    ConnectionError,
 )
 
 
@@ -796,6 +1345,21 @@ def _print_role_accounts(role_accounts: list[dict[str, Any]] | None) -> None:
     click.echo()
 
 
+def _attach_deployment_info(
+    ctx: Web3Context,
+    cfg: FusionConfig,
+    data: _VaultData,
+    vault_address: str,
+    chain_id: int,
+) -> None:
+    with span("deployment info"):
+        (
+            data.deployment_block,
+            data.deployment_timestamp,
+            data.deployment_error,
+        ) = _fetch_deployment_info(ctx, chain_id, vault_address, cfg.etherscan_api_key)
+
+
 def _print_vault_info(
     ctx: Web3Context,
     plasma_vault: PlasmaVault,
@@ -808,11 +1372,7 @@ def _print_vault_info(
     api_key = cfg.etherscan_api_key
     chain_label = CHAIN_NAMES.get(chain_id, str(chain_id))
 
-    (
-        data.deployment_block,
-        data.deployment_timestamp,
-        data.deployment_error,
-    ) = _fetch_deployment_info(ctx, chain_id, vault_address, api_key)
+    _attach_deployment_info(ctx, cfg, data, vault_address, chain_id)
 
     if json_output:
         result = _build_json_output(
@@ -822,13 +1382,10 @@ def _print_vault_info(
         return
 
     # Start the heavy RoleGranted scan now; joined when its section prints.
-    # shutdown(wait=False) only stops new submissions — the task completes.
-    role_pool = ThreadPoolExecutor(max_workers=1)
-    role_accounts_fut = role_pool.submit(_fetch_role_accounts_json, ctx, data)
-    role_pool.shutdown(wait=False)
-
-    total_assets_usd = _format_usd(
-        data.total_assets, data.asset_decimals, data.asset_price_usd
+    role_accounts_fut = (
+        RpcScheduler.for_context(ctx)
+        .group()
+        .submit(_fetch_role_accounts_json, ctx, data)
     )
 
     name_suffix = f" ({data.vault_name})" if data.vault_name else ""
@@ -854,38 +1411,7 @@ def _print_vault_info(
     click.echo(f"Asset:            {data.asset} ({data.asset_symbol})")
     click.echo(f"Asset decimals:   {data.asset_decimals}")
     click.echo(f"Share decimals:   {data.share_decimals}")
-    if data.asset_price_usd is not None:
-        click.echo(f"Asset price:      ${data.asset_price_usd:,.2f}")
-    else:
-        click.echo("Asset price:      N/A")
-    click.echo(
-        f"Total Assets:     "
-        f"{_format_amount(data.total_assets, data.asset_decimals)} "
-        f"{data.asset_symbol}{total_assets_usd}"
-    )
-    click.echo(
-        f"Total Supply:     "
-        f"{_format_amount(data.total_supply, data.share_decimals)} shares"
-    )
-    if data.total_supply > 0:
-        share_price = (data.total_assets / 10**data.asset_decimals) / (
-            data.total_supply / 10**data.share_decimals
-        )
-        share_price_usd = (
-            f" (${share_price * data.asset_price_usd:,.6f})"
-            if data.asset_price_usd is not None
-            else ""
-        )
-        click.echo(
-            f"Share Price:      {share_price:,.6f} {data.asset_symbol}{share_price_usd}"
-        )
-    if data.supply_cap == UINT256_MAX:
-        click.echo("Supply Cap:       unlimited")
-    else:
-        click.echo(
-            f"Supply Cap:       "
-            f"{_format_amount(data.supply_cap, data.asset_decimals)} {data.asset_symbol}"
-        )
+    _print_vault_totals(data)
     click.echo(f"Access Manager:   {data.access_manager}")
     click.echo(f"Price Oracle:     {data.price_oracle_addr}")
     click.echo(f"Rewards Manager:  {data.rewards_manager or 'N/A'}")
@@ -929,6 +1455,7 @@ def _print_vault_info(
     click.echo()
 
     bf_totals = _print_balance_fuses_table(
+        ctx,
         plasma_vault,
         data.balance_fuses,
         data.asset_decimals,
@@ -948,7 +1475,8 @@ def _print_vault_info(
     click.echo()
 
     click.echo("ERC20 Balances (vault holdings):")
-    erc20_totals = _print_erc20_balances(ctx, plasma_vault, data)
+    with span("health: erc20 balances"):
+        erc20_totals = _print_erc20_balances(ctx, plasma_vault, data)
     click.echo()
 
     _print_reconciliation(
@@ -962,9 +1490,49 @@ def _print_vault_info(
     _print_lending_health(ctx, data)
     click.echo()
 
-    _print_health_check(
-        data, bf_totals, erc20_totals, all_substrate_addrs, plasma_vault
+    with span("health: checks"):
+        _print_health_check(
+            data, bf_totals, erc20_totals, all_substrate_addrs, plasma_vault
+        )
+
+
+def _print_vault_totals(data: _VaultData) -> None:
+    """Asset price, total assets and supply, share price and supply cap."""
+    total_assets_usd = _format_usd(
+        data.total_assets, data.asset_decimals, data.asset_price_usd
+    )
+    if data.asset_price_usd is not None:
+        click.echo(f"Asset price:      ${data.asset_price_usd:,.2f}")
+    else:
+        click.echo("Asset price:      N/A")
+    click.echo(
+        f"Total Assets:     "
+        f"{_format_amount(data.total_assets, data.asset_decimals)} "
+        f"{data.asset_symbol}{total_assets_usd}"
     )
+    click.echo(
+        f"Total Supply:     "
+        f"{_format_amount(data.total_supply, data.share_decimals)} shares"
+    )
+    if data.total_supply > 0:
+        share_price = (data.total_assets / 10**data.asset_decimals) / (
+            data.total_supply / 10**data.share_decimals
+        )
+        share_price_usd = (
+            f" (${share_price * data.asset_price_usd:,.6f})"
+            if data.asset_price_usd is not None
+            else ""
+        )
+        click.echo(
+            f"Share Price:      {share_price:,.6f} {data.asset_symbol}{share_price_usd}"
+        )
+    if data.supply_cap == UINT256_MAX:
+        click.echo("Supply Cap:       unlimited")
+    else:
+        click.echo(
+            f"Supply Cap:       "
+            f"{_format_amount(data.supply_cap, data.asset_decimals)} {data.asset_symbol}"
+        )
 
 
 def _format_fee_percent(value: float | None) -> str:
@@ -1057,6 +1625,51 @@ def _print_fees(data: _VaultData) -> None:
         click.echo(f"    accrued, uncollected: {accrued} {data.asset_symbol}")
 
 
+def _build_totals_json(data: _VaultData) -> dict:
+    """The `total_assets`, `total_supply` and `share_price` keys."""
+    total_assets_usd: float | None = None
+    if data.asset_price_usd is not None:
+        total_assets_usd = (
+            data.total_assets / 10**data.asset_decimals
+        ) * data.asset_price_usd
+    return {
+        "total_assets": {
+            "raw": data.total_assets,
+            "formatted": _format_amount(data.total_assets, data.asset_decimals),
+            "usd": total_assets_usd,
+        },
+        "total_supply": {
+            "raw": data.total_supply,
+            "formatted": _format_amount(data.total_supply, data.share_decimals),
+        },
+        "share_price": _build_share_price_json(data),
+    }
+
+
+def _build_lending_health_json(data: _VaultData) -> dict | None:
+    if not data.lending_health or not data.lending_health.has_lending_positions:
+        return None
+    return {
+        "markets": [
+            {
+                "protocol": m.protocol,
+                "market_id": m.market_id,
+                "market_name": m.market_name,
+                "current_ltv": m.current_ltv,
+                "max_ltv": m.max_ltv,
+                "health_factor": m.health_factor,
+                "total_collateral_usd": m.total_collateral_usd,
+                "total_debt_usd": m.total_debt_usd,
+                "ltv_usage_percent": m.ltv_usage_percent,
+                "is_warning": m.is_warning,
+                "is_critical": m.is_critical,
+            }
+            for m in data.lending_health.markets
+        ],
+        "worst_ltv_usage_percent": data.lending_health.worst_ltv_usage,
+    }
+
+
 def _build_share_price_json(data: _VaultData) -> dict | None:
     if data.total_supply == 0:
         return None
@@ -1396,27 +2009,21 @@ def _build_json_output(  # noqa: C901, PLR0912, PLR0915
     api_key: str | None,
 ) -> dict:
     """Build a dict with all vault info for JSON serialization."""
-    total_assets_usd: float | None = None
-    if data.asset_price_usd is not None:
-        total_assets_usd = (
-            data.total_assets / 10**data.asset_decimals
-        ) * data.asset_price_usd
-
     # Resolve fuse contract names in parallel
-    with ThreadPoolExecutor() as pool:
+    with RpcScheduler.for_context(ctx).group() as pool, _explorer_pool() as explorer:
         # The heavy RoleGranted scan overlaps the fetches below; the with-block
         # exit waits for it, so .result() in the return dict never blocks.
         role_accounts_fut = pool.submit(_fetch_role_accounts_json, ctx, data)
         fuse_name_futs = {
-            addr: pool.submit(get_contract_name, chain_id, addr, api_key)
+            addr: explorer.submit(get_contract_name, chain_id, addr, api_key)
             for addr in data.fuses
         }
         instant_name_futs = {
-            addr: pool.submit(get_contract_name, chain_id, addr, api_key)
+            addr: explorer.submit(get_contract_name, chain_id, addr, api_key)
             for addr in data.instant_fuses
         }
         bf_contract_futs = [
-            pool.submit(get_contract_name, chain_id, bf.fuse, api_key)
+            explorer.submit(get_contract_name, chain_id, bf.fuse, api_key)
             for bf in data.balance_fuses
         ]
         bf_balance_futs = [
@@ -1548,7 +2155,7 @@ def _build_json_output(  # noqa: C901, PLR0912, PLR0915
             for addr in all_sub_addresses
         }
         contract_futs = {
-            addr: pool.submit(get_contract_name, chain_id, addr, api_key)
+            addr: explorer.submit(get_contract_name, chain_id, addr, api_key)
             for addr in all_sub_addresses
         }
 
@@ -1658,29 +2265,6 @@ def _build_json_output(  # noqa: C901, PLR0912, PLR0915
         "market_storage_divergence": recon.bf_total_raw - recon.implied_market_total,
     }
 
-    # Lending health
-    lending_health_json = None
-    if data.lending_health and data.lending_health.has_lending_positions:
-        lending_health_json = {
-            "markets": [
-                {
-                    "protocol": m.protocol,
-                    "market_id": m.market_id,
-                    "market_name": m.market_name,
-                    "current_ltv": m.current_ltv,
-                    "max_ltv": m.max_ltv,
-                    "health_factor": m.health_factor,
-                    "total_collateral_usd": m.total_collateral_usd,
-                    "total_debt_usd": m.total_debt_usd,
-                    "ltv_usage_percent": m.ltv_usage_percent,
-                    "is_warning": m.is_warning,
-                    "is_critical": m.is_critical,
-                }
-                for m in data.lending_health.markets
-            ],
-            "worst_ltv_usage_percent": data.lending_health.worst_ltv_usage,
-        }
-
     # Health check
     all_sub_lower = {a.lower() for a in all_sub_addresses}
     health = _compute_health_check(
@@ -1717,16 +2301,7 @@ def _build_json_output(  # noqa: C901, PLR0912, PLR0915
             "price_usd": data.asset_price_usd,
         },
         "share_decimals": data.share_decimals,
-        "total_assets": {
-            "raw": data.total_assets,
-            "formatted": _format_amount(data.total_assets, data.asset_decimals),
-            "usd": total_assets_usd,
-        },
-        "total_supply": {
-            "raw": data.total_supply,
-            "formatted": _format_amount(data.total_supply, data.share_decimals),
-        },
-        "share_price": _build_share_price_json(data),
+        **_build_totals_json(data),
         "supply_cap": {
             "raw": data.supply_cap,
             "formatted": (
@@ -1753,7 +2328,7 @@ def _build_json_output(  # noqa: C901, PLR0912, PLR0915
         "dependency_graph": _build_dependency_graph_json(data),
         "erc20_balances": erc20_json,
         "reconciliation": reconciliation_json,
-        "lending_health": lending_health_json,
+        "lending_health": _build_lending_health_json(data),
         "health_check": health_json,
     }
 
@@ -1840,9 +2415,9 @@ def _print_fuse_section(
         click.echo("  (none)")
         return
 
-    with ThreadPoolExecutor() as pool:
+    with _explorer_pool() as explorer:
         name_futs = {
-            addr: pool.submit(get_contract_name, chain_id, addr, api_key)
+            addr: explorer.submit(get_contract_name, chain_id, addr, api_key)
             for addr in counts
         }
         rows: list[tuple[str, ...]] = []
@@ -1865,6 +2440,7 @@ def _print_fuse_section(
 
 
 def _print_balance_fuses_table(
+    ctx: Web3Context,
     plasma_vault: PlasmaVault,
     balance_fuses: list,
     decimals: int,
@@ -1875,14 +2451,14 @@ def _print_balance_fuses_table(
 ) -> _BalanceFuseTotals:
     totals = _BalanceFuseTotals()
     seen_market_ids: set[int] = set()
-    with ThreadPoolExecutor() as pool:
+    with RpcScheduler.for_context(ctx).group() as pool, _explorer_pool() as explorer:
         futures: list[tuple[int, int, str, Future, Future]] = []
         for idx, balance_fuse in enumerate(balance_fuses, 1):
             market_id_str = format_market_label(balance_fuse.market_id)
             f_balance = pool.submit(
                 plasma_vault.total_assets_in_market(balance_fuse.market_id).call
             )
-            f_contract = pool.submit(
+            f_contract = explorer.submit(
                 get_contract_name, chain_id, balance_fuse.fuse, api_key
             )
             futures.append(
@@ -1938,7 +2514,7 @@ def _print_substrates(  # noqa: C901
     api_key: str | None,
 ) -> set[str]:
     # Phase 1: fetch all substrates in parallel
-    with ThreadPoolExecutor() as pool:
+    with RpcScheduler.for_context(ctx).group() as pool:
         substrate_futures: list[tuple[str, int, Future]] = []
         for balance_fuse in balance_fuses:
             market_id_str = format_market_label(balance_fuse.market_id)
@@ -1964,13 +2540,13 @@ def _print_substrates(  # noqa: C901
         return {a.lower() for a in all_addresses}
 
     # Phase 2: resolve all symbols + contract names in parallel
-    with ThreadPoolExecutor() as pool:
+    with RpcScheduler.for_context(ctx).group() as pool, _explorer_pool() as explorer:
         symbol_futs = {
             addr: pool.submit(_resolve_token_symbol, ctx, addr)
             for addr in all_addresses
         }
         contract_futs = {
-            addr: pool.submit(get_contract_name, chain_id, addr, api_key)
+            addr: explorer.submit(get_contract_name, chain_id, addr, api_key)
             for addr in all_addresses
         }
 
@@ -1,27 +1,34 @@
 from __future__ import annotations
 
+import json
 import logging
-from collections.abc import Callable
-from concurrent.futures import Future, ThreadPoolExecutor
-from dataclasses import dataclass
-from typing import Any, TypeVar
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import Executor, as_completed
+from contextlib import ExitStack
+from dataclasses import dataclass, fields
+from typing import Any, Generic, TypeVar
 
-from eth_abi import decode
 from eth_abi.exceptions import DecodingError
 from eth_utils import function_signature_to_4byte_selector
 from web3 import Web3
-from web3.exceptions import ContractLogicError, TimeExhausted, Web3RPCError
 from web3.types import ChecksumAddress, HexStr
 
 from ipor_fusion.chains import ensure_supported_chain
-from ipor_fusion.cli.config_store import (
-    load_contract_cache,
-    load_deployment_cache,
-    update_contract_cache,
-    update_deployment_cache,
-)
 from ipor_fusion.cli.explorer import get_deployment_tx
+from ipor_fusion.cli.metadata_store import (
+    NS_DECIMALS,
+    NS_DEPLOYMENT,
+    NS_SYMBOL,
+    get_metadata_store,
+)
+from ipor_fusion.cli.vault_topology import (
+    VaultTopology,
+    load_topology,
+    load_warm_topology,
+    save_topology,
+)
 from ipor_fusion.core.context import Web3Context
+from ipor_fusion.core.contract import Call
 from ipor_fusion.core.erc20 import ERC20
 from ipor_fusion.core.fee_manager import (
     FeeAccount,
@@ -30,8 +37,21 @@ from ipor_fusion.core.fee_manager import (
     RecipientFee,
 )
 from ipor_fusion.core.oracle import PriceOracleMiddleware
-from ipor_fusion.core.plasma_vault import PlasmaVault
-from ipor_fusion.core.withdraw_manager import AccountRequest, WithdrawManager
+from ipor_fusion.core.planner import Node, QueryPlan
+from ipor_fusion.core.plasma_vault import (
+    BalanceFuse,
+    ManagementFeeData,
+    PerformanceFeeData,
+    PlasmaVault,
+)
+from ipor_fusion.core.profiling import TracedThreadPoolExecutor, span
+from ipor_fusion.core.scheduler import RpcScheduler
+from ipor_fusion.core.withdraw_manager import (
+    AccountRequest,
+    WithdrawManager,
+    WithdrawRequestSource,
+)
+from ipor_fusion.errors import RECOVERABLE_ERRORS
 from ipor_fusion.readers.aave_v3 import AaveV3PositionBreakdown, AaveV3Reader
 from ipor_fusion.readers.lending_health import (
     AAVE_V3_MARKET_IDS,
@@ -159,45 +179,68 @@ class _VaultData:
     # Substrates registered for each balance-fuse market. Allows the fuse
     # tables to report substrate counts per fuse without duplicating reads.
     market_substrates: dict[int, list[bytes]] | None = None
+    # The topology this fetch used (warm snapshot or fresh read), stamped with
+    # `block_number`. None when the chain was not known. Watch mode hands it
+    # back to the next fetch instead of re-reading it.
+    topology: VaultTopology | None = None
 
 
 def _safe_call(func: Callable[[], T]) -> T | None:
     try:
         return func()
-    except (ContractLogicError, Web3RPCError, TimeExhausted) as exc:
+    except RECOVERABLE_ERRORS as exc:
         _logger.debug("_safe_call suppressed %s: %s", type(exc).__name__, exc)
         return None
 
 
 _MARKET_ID_SELECTOR = function_signature_to_4byte_selector("MARKET_ID()")
 
+# Reads that may legitimately come back unusable: besides reverts and RPC
+# errors, an EOA (or any contract without the getter) answers eth_call with
+# empty data, which fails ABI decoding instead of reverting.
+_UNREADABLE = (*RECOVERABLE_ERRORS, DecodingError)
+
+
+def _fuse_market_id_call(ctx: Web3Context, fuse_addr: ChecksumAddress) -> Call[int]:
+    """MARKET_ID() — the immutable market every IPOR Fusion fuse exposes."""
+    return Call(
+        to=fuse_addr,
+        data=_MARKET_ID_SELECTOR,
+        output_types=["uint256"],
+        decoder=int,
+        ctx=ctx,
+        immutable=True,
+    )
+
 
-def _fetch_fuse_market_id(ctx: Web3Context, fuse_addr: ChecksumAddress) -> int | None:
-    """Read the immutable MARKET_ID() exposed by every IPOR Fusion fuse.
+def _plan_fuse_markets(
+    ctx: Web3Context, plan: QueryPlan, fuses: Node[list[ChecksumAddress]]
+) -> Node[dict[str, int]]:
+    """MARKET_ID() per fuse, keyed by fuse address.
 
-    Returns ``None`` when the call reverts or the fuse contract does not
-    expose the getter (e.g. a non-fuse address ever found in getFuses()).
+    Fuses whose read reverts or that do not expose the getter (e.g. a
+    non-fuse address ever found in getFuses()) are left out.
     """
-    raw = _safe_call(lambda: ctx.call(fuse_addr, _MARKET_ID_SELECTOR))
-    if not raw:
-        return None
-    try:
-        (value,) = decode(["uint256"], raw)
-    except Exception:
-        return None
-    return int(value)
+    market_ids = plan.each(
+        lambda addrs: {addr: _fuse_market_id_call(ctx, addr) for addr in addrs},
+        fuses,
+        optional=_UNREADABLE,
+    )
+    return plan.derive(
+        lambda ids: {addr: mid for addr, mid in ids.items() if mid is not None},
+        market_ids,
+    )
 
 
 def _resolve_token_symbol(ctx: Web3Context, address: str) -> str:
-    cache = load_contract_cache()
-    cache_key = f"symbol:{address}"
-    if cached := cache.get(cache_key):
+    store = get_metadata_store()
+    if cached := store.get(NS_SYMBOL, address.lower()):
         return cached
 
     checksum = Web3.to_checksum_address(address)
     code = ctx.web3.eth.get_code(checksum)
     if not code or code == b"":
-        update_contract_cache(cache_key, _NO_CONTRACT)
+        store.put(NS_SYMBOL, address.lower(), _NO_CONTRACT)
         return _NO_CONTRACT
 
     try:
@@ -205,15 +248,14 @@ def _resolve_token_symbol(ctx: Web3Context, address: str) -> str:
     except Exception:
         symbol = ""
     if symbol:
-        update_contract_cache(cache_key, symbol)
+        store.put(NS_SYMBOL, address.lower(), symbol)
     return symbol
 
 
 def _resolve_token_decimals(ctx: Web3Context, address: str) -> int | None:
     """Resolve ERC-20 decimals, cached. Returns None if address is not a contract."""
-    cache = load_contract_cache()
-    cache_key = f"decimals:{address}"
-    if cached := cache.get(cache_key):
+    store = get_metadata_store()
+    if cached := store.get(NS_DECIMALS, address.lower()):
         return int(cached)
 
     checksum = Web3.to_checksum_address(address)
@@ -225,84 +267,69 @@ def _resolve_token_decimals(ctx: Web3Context, address: str) -> int | None:
         decimals = ERC20(ctx, checksum).decimals().call()
     except Exception:
         return None
-    update_contract_cache(cache_key, str(decimals))
+    store.put(NS_DECIMALS, address.lower(), str(decimals))
     return decimals
 
 
-def _fetch_withdraw_manager_data(
+def _plan_withdraw_manager_data(
     ctx: Web3Context,
-    pool: ThreadPoolExecutor,
-    withdraw_mgr_addr: ChecksumAddress | None,
-) -> _WithdrawManagerData | None:
-    if not withdraw_mgr_addr:
-        return None
-    wm_contract = WithdrawManager(ctx, withdraw_mgr_addr)
-    f_window = pool.submit(_safe_call, wm_contract.get_withdraw_window().call)
-    f_req_fee = pool.submit(_safe_call, wm_contract.get_request_fee().call)
-    f_wd_fee = pool.submit(_safe_call, wm_contract.get_withdraw_fee().call)
-    f_shares = pool.submit(_safe_call, wm_contract.get_shares_to_release().call)
-    f_last_ts = pool.submit(
-        _safe_call, wm_contract.get_last_release_funds_timestamp().call
-    )
-    f_requests = pool.submit(_safe_call, wm_contract.get_pending_requests)
-    return _WithdrawManagerData(
-        withdraw_window=f_window.result() or 0,
-        request_fee=f_req_fee.result(),
-        withdraw_fee=f_wd_fee.result(),
-        shares_to_release=f_shares.result() or 0,
-        last_release_funds_timestamp=f_last_ts.result() or 0,
-        pending_requests=f_requests.result() or [],
-    )
-
-
-def _fetch_fee_manager_address(
-    ctx: Web3Context, fee_account: ChecksumAddress
-) -> str | None:
-    """Resolve FeeAccount.FEE_MANAGER(); None when it is not a FeeAccount.
-
-    The fee account reported by a vault is not guaranteed to be a FeeAccount
-    contract — older deployments can name a plain recipient address. An EOA
-    answers eth_call with empty data, which fails ABI decoding instead of
-    reverting, so `_safe_call` alone does not cover it.
-    """
-    try:
-        return _safe_call(FeeAccount(ctx, fee_account).fee_manager().call)
-    except DecodingError:
-        return None
+    plan: QueryPlan,
+    withdraw_mgr_addr: Node[ChecksumAddress | None],
+    withdraw_requests: Callable[[ChecksumAddress], WithdrawRequestSource] | None = None,
+) -> Node[_WithdrawManagerData | None]:
+    def wm_read(build: Callable[[WithdrawManager], Any]) -> Node[Any]:
+        return plan.then(
+            lambda addr: build(WithdrawManager(ctx, addr)) if addr else None,
+            withdraw_mgr_addr,
+            optional=True,
+        )
 
+    window = wm_read(lambda wm: wm.get_withdraw_window())
+    request_fee = wm_read(lambda wm: wm.get_request_fee())
+    withdraw_fee = wm_read(lambda wm: wm.get_withdraw_fee())
+    shares = wm_read(lambda wm: wm.get_shares_to_release())
+    last_release = wm_read(lambda wm: wm.get_last_release_funds_timestamp())
+
+    # Event replay plus per-account reads: not a single Call, so a pool task.
+    def pending_requests(addr: ChecksumAddress | None) -> list[AccountRequest]:
+        if not addr:
+            return []
+        source = withdraw_requests(addr) if withdraw_requests else None
+        return WithdrawManager(ctx, addr).get_pending_requests(source=source)
+
+    requests = plan.task(pending_requests, withdraw_mgr_addr, optional=True)
+
+    def assemble(addr, window, request_fee, withdraw_fee, shares, last, requests):
+        if not addr:
+            return None
+        return _WithdrawManagerData(
+            withdraw_window=window or 0,
+            request_fee=request_fee,
+            withdraw_fee=withdraw_fee,
+            shares_to_release=shares or 0,
+            last_release_funds_timestamp=last or 0,
+            pending_requests=requests or [],
+        )
 
-def _fetch_fee_data(
-    ctx: Web3Context,
-    pool: ThreadPoolExecutor,
-    plasma_vault: PlasmaVault,
-) -> _FeeData:
-    """Fetch the vault's fee configuration, including the FeeManager hop.
-
-    Three dependent phases (reads inside each run in parallel): vault-level
-    fee data, then FeeAccount.FEE_MANAGER() to discover the FeeManager, then
-    the FeeManager getters. Nothing raises — every read degrades to ``None``,
-    so vaults without a fee account and FeeManagers predating the deposit fee
-    or high-water mark still produce a usable snapshot.
-    """
-    f_perf = pool.submit(_safe_call, plasma_vault.get_performance_fee_data().call)
-    f_mgmt = pool.submit(_safe_call, plasma_vault.get_management_fee_data().call)
-    f_unrealized = pool.submit(
-        _safe_call, plasma_vault.get_unrealized_management_fee().call
+    return plan.derive(
+        assemble,
+        withdraw_mgr_addr,
+        window,
+        request_fee,
+        withdraw_fee,
+        shares,
+        last_release,
+        requests,
     )
 
-    perf = f_perf.result()
-    mgmt = f_mgmt.result()
-    result = _FeeData(
-        performance_fee_vault_bps=perf.fee_in_percentage if perf else None,
-        management_fee_vault_bps=mgmt.fee_in_percentage if mgmt else None,
-        management_fee_last_update=mgmt.last_update_timestamp if mgmt else None,
-        unrealized_management_fee=f_unrealized.result(),
-    )
 
+def _configured_fee_account(
+    perf: PerformanceFeeData | None, mgmt: ManagementFeeData | None
+) -> ChecksumAddress | None:
     # A FeeManager deploys two separate escrow accounts (performance and
     # management) but is itself the FEE_MANAGER of both, so either hop
     # resolves to the same address; take whichever is configured.
-    fee_account = next(
+    return next(
         (
             data.fee_account
             for data in (perf, mgmt)
@@ -310,40 +337,88 @@ def _fetch_fee_data(
         ),
         None,
     )
-    if fee_account is None:
-        return result
 
-    fee_manager_addr = _fetch_fee_manager_address(ctx, fee_account)
-    if not fee_manager_addr or fee_manager_addr == _ZERO_ADDRESS:
-        return result
-    result.fee_manager = fee_manager_addr
-
-    fee_manager = FeeManager(ctx, fee_manager_addr)
-    f_deposit = pool.submit(_safe_call, fee_manager.get_deposit_fee().call)
-    f_perf_total = pool.submit(_safe_call, fee_manager.get_total_performance_fee().call)
-    f_mgmt_total = pool.submit(_safe_call, fee_manager.get_total_management_fee().call)
-    f_perf_recipients = pool.submit(
-        _safe_call, fee_manager.get_performance_fee_recipients().call
-    )
-    f_mgmt_recipients = pool.submit(
-        _safe_call, fee_manager.get_management_fee_recipients().call
-    )
-    f_dao = pool.submit(
-        _safe_call, fee_manager.get_ipor_dao_fee_recipient_address().call
+
+def _plan_fee_data(
+    ctx: Web3Context,
+    plan: QueryPlan,
+    plasma_vault: PlasmaVault,
+) -> Node[_FeeData]:
+    """Plan the vault's fee configuration, including the FeeManager hop.
+
+    Three dependent rounds: vault-level fee data, then FeeAccount.FEE_MANAGER()
+    to discover the FeeManager, then the FeeManager getters. Nothing raises —
+    every read degrades to ``None``, so vaults without a fee account and
+    FeeManagers predating the deposit fee or high-water mark still produce a
+    usable snapshot.
+    """
+    perf = plan.read(plasma_vault.get_performance_fee_data(), optional=True)
+    mgmt = plan.read(plasma_vault.get_management_fee_data(), optional=True)
+    unrealized = plan.read(plasma_vault.get_unrealized_management_fee(), optional=True)
+
+    fee_account = plan.derive(_configured_fee_account, perf, mgmt)
+    # The fee account reported by a vault is not guaranteed to be a FeeAccount
+    # contract — older deployments can name a plain recipient address.
+    fee_manager_raw = plan.then(
+        lambda account: FeeAccount(ctx, account).fee_manager() if account else None,
+        fee_account,
+        optional=_UNREADABLE,
     )
-    f_hwm = pool.submit(
-        _safe_call,
-        fee_manager.get_plasma_vault_high_water_mark_performance_fee().call,
+    fee_manager_addr = plan.derive(
+        lambda addr: addr if addr and addr != _ZERO_ADDRESS else None,
+        fee_manager_raw,
     )
 
-    result.deposit_fee_wad = f_deposit.result()
-    result.performance_fee_manager_bps = f_perf_total.result()
-    result.management_fee_manager_bps = f_mgmt_total.result()
-    result.performance_fee_recipients = f_perf_recipients.result()
-    result.management_fee_recipients = f_mgmt_recipients.result()
-    result.ipor_dao_fee_recipient = f_dao.result()
-    result.high_water_mark = f_hwm.result()
-    return result
+    def fm_read(build: Callable[[FeeManager], Any]) -> Node[Any]:
+        return plan.then(
+            lambda addr: build(FeeManager(ctx, addr)) if addr else None,
+            fee_manager_addr,
+            optional=True,
+        )
+
+    deposit = fm_read(lambda fm: fm.get_deposit_fee())
+    perf_total = fm_read(lambda fm: fm.get_total_performance_fee())
+    mgmt_total = fm_read(lambda fm: fm.get_total_management_fee())
+    perf_recipients = fm_read(lambda fm: fm.get_performance_fee_recipients())
+    mgmt_recipients = fm_read(lambda fm: fm.get_management_fee_recipients())
+    dao = fm_read(lambda fm: fm.get_ipor_dao_fee_recipient_address())
+    hwm = fm_read(lambda fm: fm.get_plasma_vault_high_water_mark_performance_fee())
+
+    def assemble(perf, mgmt, unrealized, fee_manager, *manager_values) -> _FeeData:
+        result = _FeeData(
+            performance_fee_vault_bps=perf.fee_in_percentage if perf else None,
+            management_fee_vault_bps=mgmt.fee_in_percentage if mgmt else None,
+            management_fee_last_update=mgmt.last_update_timestamp if mgmt else None,
+            unrealized_management_fee=unrealized,
+        )
+        if fee_manager is None:
+            return result
+        result.fee_manager = fee_manager
+        (
+            result.deposit_fee_wad,
+            result.performance_fee_manager_bps,
+            result.management_fee_manager_bps,
+            result.performance_fee_recipients,
+            result.management_fee_recipients,
+            result.ipor_dao_fee_recipient,
+            result.high_water_mark,
+        ) = manager_values
+        return result
+
+    return plan.derive(
+        assemble,
+        perf,
+        mgmt,
+        unrealized,
+        fee_manager_addr,
+        deposit,
+        perf_total,
+        mgmt_total,
+        perf_recipients,
+        mgmt_recipients,
+        dao,
+        hwm,
+    )
 
 
 def _collect_morpho_substrates(
@@ -364,7 +439,6 @@ def _collect_morpho_substrates(
 
 def _fetch_morpho_positions(
     ctx: Web3Context,
-    pool: ThreadPoolExecutor,
     vault_addr: ChecksumAddress,
     market_substrates: dict[int, list[bytes]],
 ) -> dict[int, list[MorphoPositionBreakdown]] | None:
@@ -374,28 +448,29 @@ def _fetch_morpho_positions(
     market_id substrates; each substrate has an independent position. The
     on-chain balance fuse reports a single netted number per IPOR market —
     this helper exposes the three-way decomposition behind that number.
+    All substrates are read in one `MorphoReader.positions_for` batch.
     """
     per_market_substrates = _collect_morpho_substrates(market_substrates)
     if not per_market_substrates:
         return None
 
     reader = MorphoReader(ctx, MORPHO_BLUE_ADDRESS)
-    futures: dict[int, list[Future]] = {
-        mid: [
-            pool.submit(
-                _safe_call,
-                lambda mid_hex=morpho_mid: reader.position_breakdown(
-                    mid_hex, vault_addr
-                ),
-            )
-            for morpho_mid in morpho_mids
-        ]
-        for mid, morpho_mids in per_market_substrates.items()
-    }
+    snapshots = _safe_call(
+        lambda: reader.positions_for(
+            vault_addr,
+            [mid_hex for mids in per_market_substrates.values() for mid_hex in mids],
+            with_oracle_prices=False,
+        )
+    )
+    by_id = {snapshot.market_id: snapshot for snapshot in snapshots or []}
 
     result: dict[int, list[MorphoPositionBreakdown]] = {}
-    for mid, per_market in futures.items():
-        breakdowns = [bd for fut in per_market if (bd := fut.result()) is not None]
+    for mid, morpho_mids in per_market_substrates.items():
+        breakdowns = [
+            by_id[morpho_mid].breakdown
+            for morpho_mid in morpho_mids
+            if morpho_mid in by_id
+        ]
         if breakdowns:
             result[mid] = breakdowns
     return result or None
@@ -426,7 +501,6 @@ def _collect_aave_substrate_assets(
 
 def _fetch_aave_positions(
     ctx: Web3Context,
-    pool: ThreadPoolExecutor,
     vault_addr: ChecksumAddress,
     chain_id: int,
     market_substrates: dict[int, list[bytes]],
@@ -435,7 +509,8 @@ def _fetch_aave_positions(
 
     The on-chain `getUserAccountData` aggregates all reserves into a single
     base-currency total — this helper exposes the per-asset decomposition.
-    Empty positions (vault allows the asset but holds none of it) are dropped.
+    All assets are read in one `AaveV3Reader.positions_for` batch. Empty
+    positions (vault allows the asset but holds none of it) are dropped.
     """
     aave_pool_addr = AAVE_V3_POOL.get(chain_id)
     if not aave_pool_addr:
@@ -445,24 +520,22 @@ def _fetch_aave_positions(
         return None
 
     reader = AaveV3Reader(ctx, aave_pool_addr)
-    futures: dict[int, list[Future]] = {
-        mid: [
-            pool.submit(
-                _safe_call,
-                lambda a=asset: reader.position_breakdown(a, vault_addr),
-            )
-            for asset in assets
-        ]
-        for mid, assets in per_market_assets.items()
+    account = _safe_call(
+        lambda: reader.positions_for(
+            vault_addr,
+            [asset for assets in per_market_assets.values() for asset in assets],
+            with_prices=False,
+        )
+    )
+    by_asset = {
+        position.asset: position.breakdown
+        for position in (account.reserves if account else [])
+        if not position.is_empty
     }
 
     result: dict[int, list[AaveV3PositionBreakdown]] = {}
-    for mid, per_market in futures.items():
-        breakdowns = [
-            bd
-            for fut in per_market
-            if (bd := fut.result()) is not None and not bd.is_empty
-        ]
+    for mid, assets in per_market_assets.items():
+        breakdowns = [by_asset[asset] for asset in assets if asset in by_asset]
         if breakdowns:
             result[mid] = breakdowns
     return result or None
@@ -488,7 +561,7 @@ def _collect_breakdown_token_addresses(
 
 
 def _fetch_breakdown_token_prices(
-    pool: ThreadPoolExecutor,
+    pool: Executor,
     oracle: PriceOracleMiddleware,
     addresses: set[ChecksumAddress],
 ) -> dict[str, float] | None:
@@ -510,167 +583,394 @@ def _fetch_breakdown_token_prices(
     return prices or None
 
 
+@dataclass
+class _TopologyNodes:
+    """Plan nodes for the values a `VaultTopology` snapshot holds."""
+
+    asset: Node[ChecksumAddress]
+    access_manager: Node[ChecksumAddress]
+    price_oracle_addr: Node[ChecksumAddress]
+    rewards_manager: Node[ChecksumAddress | None]
+    withdraw_manager: Node[ChecksumAddress | None]
+    fuses: Node[list[ChecksumAddress]]
+    balance_fuses: Node[list[BalanceFuse]]
+    instant_fuses: Node[list[ChecksumAddress]]
+    dependency_graph: Node[dict[int, list[int]]]
+    fuse_markets: Node[dict[str, int]]
+    # Read only when the chain is known (it drives lending health).
+    market_substrates: Node[dict[int, list[bytes]]] | None
+
+    def snapshot(self, block: int) -> VaultTopology | None:
+        if self.market_substrates is None:
+            return None
+        return VaultTopology(
+            block_number=block,
+            **{
+                f.name: getattr(self, f.name).result()
+                for f in fields(self)
+                if f.name != "market_substrates"
+            },
+            market_substrates=self.market_substrates.result(),
+        )
+
+
+def _topology_from_snapshot(plan: QueryPlan, topology: VaultTopology) -> _TopologyNodes:
+    """Constant nodes: a warm snapshot costs no round."""
+    return _TopologyNodes(
+        **{
+            f.name: plan.derive(lambda name=f.name: getattr(topology, name))
+            for f in fields(_TopologyNodes)
+        }
+    )
+
+
+def _plan_topology(
+    ctx: Web3Context, plan: QueryPlan, plasma_vault: PlasmaVault, chain_id: int
+) -> _TopologyNodes:
+    fuses = plan.read(plasma_vault.get_fuses())
+    balance_fuses = plan.task(plasma_vault.get_balance_fuses)
+
+    # Dependency balance graph per market, and per-fuse MARKET_ID() —
+    # needed to detect orphan markets (action fuse registered but no
+    # balance fuse for the same market_id).
+    dep_graph_raw = plan.each(
+        lambda bfs: {
+            bf.market_id: plasma_vault.get_dependency_balance_graph(bf.market_id)
+            for bf in bfs
+        },
+        balance_fuses,
+    )
+    dep_graph = plan.derive(
+        lambda graph: {
+            mid: [int(d) for d in deps] for mid, deps in graph.items() if deps
+        },
+        dep_graph_raw,
+    )
+
+    substrates_node: Node[dict[int, list[bytes]]] | None = None
+    if chain_id:
+        substrates_raw = plan.each(
+            lambda bfs: {
+                bf.market_id: plasma_vault.get_market_substrates(bf.market_id)
+                for bf in bfs
+            },
+            balance_fuses,
+        )
+        substrates_node = plan.derive(
+            lambda subs: {mid: s for mid, s in subs.items() if s}, substrates_raw
+        )
+
+    return _TopologyNodes(
+        asset=plan.read(plasma_vault.underlying_asset_address()),
+        access_manager=plan.read(plasma_vault.get_access_manager_address()),
+        price_oracle_addr=plan.read(plasma_vault.get_price_oracle_middleware_address()),
+        rewards_manager=plan.read(
+            plasma_vault.get_rewards_claim_manager_address(), optional=True
+        ),
+        withdraw_manager=plan.task(plasma_vault.withdraw_manager_address),
+        fuses=fuses,
+        balance_fuses=balance_fuses,
+        instant_fuses=plan.read(plasma_vault.get_instant_withdrawal_fuses()),
+        dependency_graph=dep_graph,
+        fuse_markets=_plan_fuse_markets(ctx, plan, fuses),
+        market_substrates=substrates_node,
+    )
+
+
 def _fetch_vault_data(
     ctx: Web3Context,
     plasma_vault: PlasmaVault,
     block_number: int | None,
     chain_id: int = 0,
+    topology: VaultTopology | None = None,
+    withdraw_requests: Callable[[ChecksumAddress], WithdrawRequestSource] | None = None,
+    previous: _VaultData | None = None,
 ) -> _VaultData:
+    """Read everything `vault info` shows about ``plasma_vault``.
+
+    ``topology``, when given, is trusted for the target block as is: the
+    caller has checked it (see `ipor_fusion.cli.vault_watch`). Otherwise a
+    stored snapshot is used if still exact, else the topology is read.
+    ``withdraw_requests`` maps the withdraw manager to the request history
+    to verify, in place of replaying its events from block 0.
+
+    ``previous``, a fetch of the same vault, is used only with ``topology``:
+    its static sections (name, decimals, asset symbol, fee configuration and
+    withdraw manager) are carried over as of its block instead of read
+    again, leaving the dynamic reads (totals, balances, prices, lending
+    health).
+    """
     # Fail fast with a client-mappable typed error instead of letting the
     # fetch die deep in the stack (e.g. eth_getLogs range caps) on chains
     # the tooling is not validated on.
     ensure_supported_chain(chain_id or ctx.chain_id)
-    with ThreadPoolExecutor() as pool:
-        # Phase 1: all independent vault reads in parallel
-        f_block = pool.submit(lambda: ctx.web3.eth.block_number)
-        f_name: Future = pool.submit(_safe_call, plasma_vault.name().call)
-        f_decimals = pool.submit(plasma_vault.decimals().call)
-        f_total_assets = pool.submit(plasma_vault.total_assets().call)
-        f_total_supply = pool.submit(plasma_vault.total_supply().call)
-        f_supply_cap = pool.submit(plasma_vault.get_total_supply_cap().call)
-        f_asset = pool.submit(plasma_vault.underlying_asset_address().call)
-        f_access = pool.submit(plasma_vault.get_access_manager_address().call)
-        f_oracle = pool.submit(plasma_vault.get_price_oracle_middleware_address().call)
-        f_fuses = pool.submit(plasma_vault.get_fuses().call)
-        f_balance_fuses = pool.submit(plasma_vault.get_balance_fuses)
-        f_rewards: Future = pool.submit(
-            _safe_call, plasma_vault.get_rewards_claim_manager_address().call
+    with (
+        span("fetch vault data", vault=plasma_vault.address),
+        RpcScheduler.for_context(ctx).group() as pool,
+    ):
+        # One dependency-aware plan instead of hand-sequenced phases: every
+        # read whose inputs are known shares a round, and each round's calls
+        # go out as a single multicall.
+        plan = QueryPlan(ctx, pool)
+        vault_addr = Web3.to_checksum_address(plasma_vault.address)
+
+        # A stored topology snapshot, if no config event has touched the vault
+        # since, replaces every topology read below (checking it needs the
+        # target block up front).
+        warm = topology
+        if (
+            warm is None
+            and chain_id
+            and load_topology(chain_id, vault_addr) is not None
+        ):
+            target = (
+                block_number if block_number is not None else ctx.web3.eth.block_number
+            )
+            with span("topology check"):
+                warm = load_warm_topology(ctx, vault_addr, chain_id, target)
+            resolved_block = plan.derive(lambda: target)
+        elif block_number is None:
+            resolved_block = plan.task(lambda: ctx.web3.eth.block_number)
+        else:
+            resolved_block = plan.derive(lambda: block_number)
+
+        # Round 1: independent vault reads (plus the event replays)
+        block_timestamp = plan.task(
+            lambda block: ctx.web3.eth.get_block(block)["timestamp"], resolved_block
         )
-        f_withdraw = pool.submit(plasma_vault.withdraw_manager_address)
-        f_instant = pool.submit(plasma_vault.get_instant_withdrawal_fuses().call)
-
-        # Phase 2: asset-dependent (wait for asset + oracle addresses)
-        asset = f_asset.result()
-        price_oracle_addr = f_oracle.result()
-        asset_erc20 = ERC20(ctx, asset)
-        oracle = PriceOracleMiddleware(ctx, price_oracle_addr)
-
-        f_symbol: Future = pool.submit(_safe_call, asset_erc20.symbol().call)
-        f_adec = pool.submit(asset_erc20.decimals().call)
-        f_underlying_bal = pool.submit(
-            asset_erc20.balance_of(Web3.to_checksum_address(plasma_vault.address)).call
+        static = previous if topology is not None else None
+        if static is None:
+            name = plan.read(plasma_vault.name(), optional=True)
+            share_decimals = plan.read(plasma_vault.decimals())
+        else:
+            name = plan.derive(lambda: static.vault_name)
+            share_decimals = plan.derive(lambda: static.share_decimals)
+        total_assets = plan.read(plasma_vault.total_assets())
+        total_supply = plan.read(plasma_vault.total_supply())
+        supply_cap = plan.read(plasma_vault.get_total_supply_cap())
+        nodes = (
+            _topology_from_snapshot(plan, warm)
+            if warm is not None
+            else _plan_topology(ctx, plan, plasma_vault, chain_id)
         )
-        f_price: Future = pool.submit(
-            _safe_call, lambda: oracle.get_asset_price(asset).call()
+        asset = nodes.asset
+        price_oracle_addr = nodes.price_oracle_addr
+
+        # Round 2: asset-dependent reads (need asset + oracle addresses)
+        if static is None:
+            asset_symbol = plan.then(
+                lambda a: ERC20(ctx, a).symbol(), asset, optional=True
+            )
+            asset_decimals = plan.then(lambda a: ERC20(ctx, a).decimals(), asset)
+        else:
+            asset_symbol = plan.derive(lambda: static.asset_symbol)
+            asset_decimals = plan.derive(lambda: static.asset_decimals)
+        underlying_balance = plan.then(
+            lambda a: ERC20(ctx, a).balance_of(vault_addr), asset
+        )
+        asset_price = plan.then(
+            lambda o, a: PriceOracleMiddleware(ctx, o).get_asset_price(a),
+            price_oracle_addr,
+            asset,
+            optional=True,
         )
 
-        # Collect all results
-        latest_block = f_block.result()
-        is_latest = block_number is None
-        resolved_block = latest_block if block_number is None else block_number
-        block_timestamp: int = ctx.web3.eth.get_block(resolved_block)["timestamp"]
-        asset_price = f_price.result()
-        withdraw_mgr_addr = f_withdraw.result()
-
-        # Phase 3: withdraw manager details (needs address from phase 1) and
-        # fee configuration (own internal FeeAccount -> FeeManager hop)
-        wm_data = _fetch_withdraw_manager_data(ctx, pool, withdraw_mgr_addr)
-        fee_data = _fetch_fee_data(ctx, pool, plasma_vault)
-
-        # Phase 4: dependency balance graph per market
-        balance_fuses = f_balance_fuses.result()
-        dep_futs = {
-            bf.market_id: pool.submit(
-                plasma_vault.get_dependency_balance_graph(bf.market_id).call
+        # Withdraw manager details (needs its address) and fee configuration
+        # (own FeeAccount -> FeeManager hop, rounds 1-3)
+        if static is None:
+            wm_data = _plan_withdraw_manager_data(
+                ctx, plan, nodes.withdraw_manager, withdraw_requests
             )
-            for bf in balance_fuses
-        }
-        dep_graph: dict[int, list[int]] = {}
-        for market_id, fut in dep_futs.items():
-            deps = fut.result()
-            if deps:
-                dep_graph[market_id] = [int(d) for d in deps]
-
-        # Per-fuse MARKET_ID() — needed to detect orphan markets (action fuse
-        # registered but no balance fuse for the same market_id).
-        fuses_list = f_fuses.result()
-        fuse_market_futs = {
-            addr: pool.submit(_fetch_fuse_market_id, ctx, addr) for addr in fuses_list
-        }
-        fuse_markets: dict[str, int] = {}
-        for addr, fm_fut in fuse_market_futs.items():
-            fuse_mid = fm_fut.result()
-            if fuse_mid is not None:
-                fuse_markets[addr] = fuse_mid
+            fee_data = _plan_fee_data(ctx, plan, plasma_vault)
+        else:
+            wm_data = plan.derive(lambda: static.withdraw_manager_data)
+            fee_data = plan.derive(lambda: static.fee_data)
+
+        # Substrates feed lending health (round 3, alongside the FeeManager)
+        lending_health_node: Node[VaultLendingHealth | None] | None = None
+        substrates_node = nodes.market_substrates
+        if substrates_node is not None:
+            # Opens its own task group on the same scheduler; waiting workers
+            # help run queued tasks, so the nested fan-out cannot deadlock.
+            def read_lending_health(
+                bfs: list[BalanceFuse], subs: dict[int, list[bytes]]
+            ) -> VaultLendingHealth | None:
+                with span("lending health"):
+                    return fetch_vault_lending_health(
+                        ctx, vault_addr, chain_id, [bf.market_id for bf in bfs], subs
+                    )
+
+            lending_health_node = plan.task(
+                read_lending_health,
+                nodes.balance_fuses,
+                substrates_node,
+                optional=True,
+            )
+
+        with span("query plan", rounds=plan.rounds):
+            plan.execute()
 
-        instant_fuses_list = f_instant.result()
+        snapshot = nodes.snapshot(resolved_block.result())
+        if warm is None and snapshot is not None:
+            save_topology(chain_id, vault_addr, snapshot)
 
-        # Phase 5: lending health (Morpho, Aave V3)
+        # Position breakdowns (Morpho, Aave V3) and their token prices
         lending_health: VaultLendingHealth | None = None
-        if chain_id:
-            sub_futs: dict[int, Any] = {
-                bf.market_id: pool.submit(
-                    plasma_vault.get_market_substrates(bf.market_id).call
+        market_substrates: dict[int, list[bytes]] = {}
+        morpho_positions = None
+        aave_positions = None
+        token_prices_usd = None
+        if substrates_node is not None and lending_health_node is not None:
+            with span("positions + breakdown prices"):
+                market_substrates = substrates_node.result()
+                lending_health = lending_health_node.result()
+                morpho_positions = _fetch_morpho_positions(
+                    ctx, vault_addr, market_substrates
                 )
-                for bf in balance_fuses
-            }
-            market_substrates: dict[int, list[bytes]] = {}
-            for mid, fut in sub_futs.items():
-                subs = fut.result()
-                if subs:
-                    market_substrates[mid] = subs
-
-            vault_addr = Web3.to_checksum_address(plasma_vault.address)
-            lending_health = _safe_call(
-                lambda: fetch_vault_lending_health(
-                    ctx,
-                    vault_addr,
-                    chain_id,
-                    [bf.market_id for bf in balance_fuses],
-                    market_substrates,
+                aave_positions = _fetch_aave_positions(
+                    ctx, vault_addr, chain_id, market_substrates
+                )
+                token_prices_usd = _fetch_breakdown_token_prices(
+                    pool,
+                    PriceOracleMiddleware(ctx, price_oracle_addr.result()),
+                    _collect_breakdown_token_addresses(
+                        morpho_positions, aave_positions
+                    ),
                 )
-            )
-
-            morpho_positions = _fetch_morpho_positions(
-                ctx, pool, vault_addr, market_substrates
-            )
-            aave_positions = _fetch_aave_positions(
-                ctx, pool, vault_addr, chain_id, market_substrates
-            )
-            token_prices_usd = _fetch_breakdown_token_prices(
-                pool,
-                oracle,
-                _collect_breakdown_token_addresses(morpho_positions, aave_positions),
-            )
-        else:
-            morpho_positions = None
-            aave_positions = None
-            token_prices_usd = None
-            market_substrates = {}
 
+        price = asset_price.result()
         return _VaultData(
-            block_number=resolved_block,
-            is_latest=is_latest,
-            block_timestamp=block_timestamp,
-            share_decimals=f_decimals.result(),
-            asset_decimals=f_adec.result(),
-            underlying_balance_on_vault=f_underlying_bal.result(),
-            total_assets=f_total_assets.result(),
-            total_supply=f_total_supply.result(),
-            supply_cap=f_supply_cap.result(),
-            asset=asset,
-            vault_name=f_name.result() or "",
-            asset_symbol=f_symbol.result() or "?",
-            access_manager=f_access.result(),
-            price_oracle_addr=price_oracle_addr,
-            rewards_manager=f_rewards.result(),
-            withdraw_manager=withdraw_mgr_addr,
-            asset_price_usd=asset_price.readable() if asset_price else None,
-            fuses=fuses_list,
-            balance_fuses=balance_fuses,
-            instant_fuses=instant_fuses_list,
-            withdraw_manager_data=wm_data,
-            fee_data=fee_data,
-            dependency_graph=dep_graph or None,
+            block_number=resolved_block.result(),
+            is_latest=block_number is None,
+            block_timestamp=block_timestamp.result(),
+            share_decimals=share_decimals.result(),
+            asset_decimals=asset_decimals.result(),
+            underlying_balance_on_vault=underlying_balance.result(),
+            total_assets=total_assets.result(),
+            total_supply=total_supply.result(),
+            supply_cap=supply_cap.result(),
+            asset=asset.result(),
+            vault_name=name.result() or "",
+            asset_symbol=asset_symbol.result() or "?",
+            access_manager=nodes.access_manager.result(),
+            price_oracle_addr=price_oracle_addr.result(),
+            rewards_manager=nodes.rewards_manager.result(),
+            withdraw_manager=nodes.withdraw_manager.result(),
+            asset_price_usd=price.readable() if price else None,
+            fuses=nodes.fuses.result(),
+            balance_fuses=nodes.balance_fuses.result(),
+            instant_fuses=nodes.instant_fuses.result(),
+            withdraw_manager_data=wm_data.result(),
+            fee_data=fee_data.result(),
+            dependency_graph=nodes.dependency_graph.result() or None,
             lending_health=lending_health,
             morpho_positions=morpho_positions,
             aave_positions=aave_positions,
             token_prices_usd=token_prices_usd,
-            fuse_markets=fuse_markets or None,
+            fuse_markets=nodes.fuse_markets.result() or None,
             market_substrates=market_substrates or None,
+            topology=snapshot,
         )
 
 
+@dataclass(frozen=True)
+class VaultTarget:
+    """A vault to fetch in `fetch_many_vaults`."""
+
+    chain_id: int
+    address: ChecksumAddress
+
+
+@dataclass
+class VaultFetchResult(Generic[T]):
+    """One vault's outcome in `fetch_many_vaults`: its data (plus the
+    ``finish`` output), or the error that stopped it."""
+
+    target: VaultTarget
+    data: _VaultData | None = None
+    output: T | None = None
+    error: Exception | None = None
+
+
+DEFAULT_VAULT_CONCURRENCY = 4
+
+
+def fetch_many_vaults(
+    targets: Iterable[VaultTarget],
+    contexts: Mapping[int, Web3Context],
+    block_number: int | None = None,
+    finish: Callable[[Web3Context, PlasmaVault, _VaultData], T] | None = None,
+    max_concurrent: int = DEFAULT_VAULT_CONCURRENCY,
+) -> Iterator[VaultFetchResult[T]]:
+    """Fetch many vaults in one run, yielding each one as soon as it is done.
+
+    ``contexts`` holds one context per chain. Every vault on a chain shares
+    it, and with it the RPC scheduler, the immutable-facts cache and
+    in-flight read coalescing. For the length of the run each context is
+    pinned (``default_block``) to one block, the latest unless
+    ``block_number`` is given, and read under `Web3Context.shared_reads`;
+    its own block is restored when the run ends. The vaults of a run
+    therefore form one consistent snapshot, and an oracle, token or market
+    they share is read once for all of them.
+
+    ``finish`` runs in the vault's worker after a successful fetch (e.g. to
+    render it); its value lands in `VaultFetchResult.output`. A vault that
+    fails yields its error and does not stop the others.
+    """
+    targets = list(targets)
+    blocks = {
+        chain_id: (
+            block_number
+            if block_number is not None
+            else contexts[chain_id].web3.eth.block_number
+        )
+        for chain_id in dict.fromkeys(target.chain_id for target in targets)
+    }
+    with ExitStack() as stack:
+        for chain_id, block in blocks.items():
+            ctx = contexts[chain_id]
+            # The caller's context: back to its own block once the run ends
+            stack.callback(setattr, ctx, "default_block", ctx.default_block)
+            ctx.default_block = block
+            stack.enter_context(ctx.shared_reads())
+        pool = stack.enter_context(TracedThreadPoolExecutor(max_concurrent))
+        futures = [
+            pool.submit(
+                _fetch_one,
+                contexts[target.chain_id],
+                target,
+                blocks[target.chain_id],
+                block_number is None,
+                finish,
+            )
+            for target in targets
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def _fetch_one(
+    ctx: Web3Context,
+    target: VaultTarget,
+    block: int,
+    latest: bool,
+    finish: Callable[[Web3Context, PlasmaVault, _VaultData], T] | None,
+) -> VaultFetchResult[T]:
+    result: VaultFetchResult[T] = VaultFetchResult(target)
+    try:
+        plasma_vault = PlasmaVault(ctx, target.address)
+        with span("fetch vault", vault=target.address):
+            data = _fetch_vault_data(ctx, plasma_vault, block, chain_id=target.chain_id)
+        # Read at a pinned block, but that block was the chain head.
+        data.is_latest = latest
+        result.data = data
+        if finish is not None:
+            result.output = finish(ctx, plasma_vault, data)
+    except Exception as exc:  # one broken vault must not sink the whole run
+        result.error = exc
+    return result
+
+
 def _fetch_deployment_info(
     ctx: Web3Context,
     chain_id: int,
@@ -684,9 +984,10 @@ def _fetch_deployment_info(
     Base/Optimism on the free Etherscan tier). ``None`` means either success or
     a benign empty response.
     """
-    cache_key = f"{chain_id}:{vault_address}"
-    cache = load_deployment_cache()
-    if entry := cache.get(cache_key):
+    store = get_metadata_store()
+    cache_key = f"{chain_id}:{vault_address}".lower()
+    if cached := store.get(NS_DEPLOYMENT, cache_key):
+        entry = json.loads(cached)
         return entry["block"], entry["timestamp"], None
 
     tx_hash, error = get_deployment_tx(chain_id, vault_address, api_key)
@@ -698,7 +999,11 @@ def _fetch_deployment_info(
         block_number: int = tx["blockNumber"]
         block_info = ctx.web3.eth.get_block(block_number)
         timestamp: int = block_info["timestamp"]
-        update_deployment_cache(cache_key, block_number, timestamp)
+        store.put(
+            NS_DEPLOYMENT,
+            cache_key,
+            json.dumps({"block": block_number, "timestamp": timestamp}),
+        )
         return block_number, timestamp, None
     except Exception:
         return None, None, "rpc-fetch-failed"
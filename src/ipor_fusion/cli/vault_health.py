@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import Future
 from dataclasses import dataclass, field
 
 import click
@@ -21,6 +21,7 @@ from ipor_fusion.core.context import Web3Context
 from ipor_fusion.core.erc20 import ERC20
 from ipor_fusion.core.oracle import PriceOracleMiddleware
 from ipor_fusion.core.plasma_vault import PlasmaVault
+from ipor_fusion.core.scheduler import RpcScheduler
 from ipor_fusion.market_ids import IporFusionMarkets
 from ipor_fusion.substrates import (
     decode_substrate,
@@ -106,7 +107,7 @@ def _compute_erc20_balances(  # noqa: C901
     if not token_addrs:
         return totals
 
-    with ThreadPoolExecutor() as pool:
+    with RpcScheduler.for_context(ctx).group() as pool:
         token_futures: dict[str, dict[str, Future]] = {}
         for addr in token_addrs:
             checksum = Web3.to_checksum_address(addr)
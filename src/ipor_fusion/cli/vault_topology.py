@@ -0,0 +1,178 @@
+"""Warm-start snapshots of a vault's topology.
+
+Which fuses, balance fuses and instant-withdrawal fuses a vault has, its
+market substrates and dependency graph, and its oracle, access, withdraw and
+rewards managers only change through governance calls. Each of those calls
+emits one of `CONFIG_EVENTS`. Reading them all costs several dependent
+rounds plus three event replays per `vault info`.
+
+`VaultTopology` is a snapshot of those values stamped with the block it was
+read at. Before reusing it, `load_warm_topology` asks the node for config
+events between that block and the target block, in one ``eth_getLogs`` with
+every config topic. No events means the snapshot is exact for the target
+block. Any event, or a failed lookup (e.g. a provider range cap), means a
+full read, whose result replaces the snapshot.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.types import ChecksumAddress
+
+from ipor_fusion.cli.metadata_store import NS_TOPOLOGY, get_metadata_store
+from ipor_fusion.core.context import Web3Context
+from ipor_fusion.core.plasma_vault import BalanceFuse
+from ipor_fusion.errors import RECOVERABLE_ERRORS
+from ipor_fusion.types import MarketId
+
+_logger = logging.getLogger(__name__)
+
+# Governance events of PlasmaVault (FusesLib, PlasmaVaultLib,
+# PlasmaVaultConfigLib) and of OpenZeppelin's AccessManaged.
+CONFIG_EVENTS = (
+    "FuseAdded(address)",
+    "FuseRemoved(address)",
+    "BalanceFuseAdded(uint256,address)",
+    "BalanceFuseRemoved(uint256,address)",
+    "MarketSubstratesGranted(uint256,bytes32[])",
+    "DependencyBalanceGraphChanged(uint256,uint256[])",
+    "InstantWithdrawalFusesConfigured((address,bytes32[])[])",
+    "PriceOracleMiddlewareChanged(address)",
+    "RewardsClaimManagerAddressChanged(address)",
+    "WithdrawManagerChanged(address)",
+    "AuthorityUpdated(address)",
+)
+CONFIG_TOPICS = [HexBytes(Web3.keccak(text=sig)).to_0x_hex() for sig in CONFIG_EVENTS]
+
+
+@dataclass
+class VaultTopology:
+    """The slow-changing part of `_VaultData`, as read at ``block_number``."""
+
+    block_number: int
+    asset: ChecksumAddress
+    access_manager: ChecksumAddress
+    price_oracle_addr: ChecksumAddress
+    rewards_manager: ChecksumAddress | None
+    withdraw_manager: ChecksumAddress | None
+    fuses: list[ChecksumAddress]
+    balance_fuses: list[BalanceFuse]
+    instant_fuses: list[ChecksumAddress]
+    dependency_graph: dict[int, list[int]]
+    fuse_markets: dict[str, int]
+    market_substrates: dict[int, list[bytes]]
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "block_number": self.block_number,
+                "asset": self.asset,
+                "access_manager": self.access_manager,
+                "price_oracle_addr": self.price_oracle_addr,
+                "rewards_manager": self.rewards_manager,
+                "withdraw_manager": self.withdraw_manager,
+                "fuses": self.fuses,
+                "balance_fuses": [[bf.market_id, bf.fuse] for bf in self.balance_fuses],
+                "instant_fuses": self.instant_fuses,
+                "dependency_graph": self.dependency_graph,
+                "fuse_markets": self.fuse_markets,
+                "market_substrates": {
+                    mid: [sub.hex() for sub in subs]
+                    for mid, subs in self.market_substrates.items()
+                },
+            }
+        )
+
+    @classmethod
+    def from_json(cls, raw: str) -> VaultTopology | None:
+        """Parse a stored snapshot; ``None`` if it is unreadable or from an
+        incompatible version."""
+        try:
+            data: dict[str, Any] = json.loads(raw)
+            return cls(
+                block_number=int(data["block_number"]),
+                asset=data["asset"],
+                access_manager=data["access_manager"],
+                price_oracle_addr=data["price_oracle_addr"],
+                rewards_manager=data["rewards_manager"],
+                withdraw_manager=data["withdraw_manager"],
+                fuses=list(data["fuses"]),
+                balance_fuses=[
+                    BalanceFuse(market_id=MarketId(mid), fuse=fuse)
+                    for mid, fuse in data["balance_fuses"]
+                ],
+                instant_fuses=list(data["instant_fuses"]),
+                dependency_graph={
+                    int(mid): [int(dep) for dep in deps]
+                    for mid, deps in data["dependency_graph"].items()
+                },
+                fuse_markets={
+                    addr: int(mid) for addr, mid in data["fuse_markets"].items()
+                },
+                market_substrates={
+                    int(mid): [bytes.fromhex(sub) for sub in subs]
+                    for mid, subs in data["market_substrates"].items()
+                },
+            )
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+
+def _key(chain_id: int, vault: str) -> str:
+    return f"{chain_id}:{vault}".lower()
+
+
+def load_topology(chain_id: int, vault: str) -> VaultTopology | None:
+    raw = get_metadata_store().get(NS_TOPOLOGY, _key(chain_id, vault))
+    return VaultTopology.from_json(raw) if raw else None
+
+
+def save_topology(chain_id: int, vault: str, topology: VaultTopology) -> None:
+    get_metadata_store().put(NS_TOPOLOGY, _key(chain_id, vault), topology.to_json())
+
+
+def config_changed(
+    ctx: Web3Context, vault: ChecksumAddress, since_block: int, until_block: int
+) -> bool:
+    """Whether any config event was emitted in ``(since_block, until_block]``
+    (either order). One ``eth_getLogs`` over every config topic."""
+    low, high = sorted((since_block, until_block))
+    if low == high:
+        return False
+    logs = ctx.get_logs(
+        contract_address=vault,
+        topics=[CONFIG_TOPICS],
+        from_block=low + 1,
+        to_block=high,
+    )
+    return bool(logs)
+
+
+def load_warm_topology(
+    ctx: Web3Context, vault: ChecksumAddress, chain_id: int, block: int
+) -> VaultTopology | None:
+    """The stored snapshot if it is still exact at ``block``, else ``None``.
+
+    A snapshot confirmed at a later block is re-stamped with it, so the next
+    check scans only the blocks since.
+    """
+    topology = load_topology(chain_id, vault)
+    if topology is None:
+        return None
+    try:
+        changed = config_changed(ctx, vault, topology.block_number, block)
+    except RECOVERABLE_ERRORS as exc:
+        _logger.debug("Topology check for %s failed: %s", vault, exc)
+        return None
+    if changed:
+        return None
+    if block > topology.block_number:
+        topology.block_number = block
+        save_topology(chain_id, vault, topology)
+    return topology
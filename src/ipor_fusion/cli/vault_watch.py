@@ -0,0 +1,222 @@
+"""Watch mode: re-fetch a vault on every new block and show what changed.
+
+`new_blocks` yields each new chain head: from a ``newHeads`` subscription
+when the context has a WebSocket endpoint, else by polling
+``eth_blockNumber`` (`poll_new_blocks`). When several heads land while a
+block is being processed, only the newest is yielded. `VaultWatcher`
+re-fetches the vault at that head. The topology of the previous fetch stays
+in memory, and with it the static sections of that fetch (name, decimals,
+fee configuration, withdraw manager), so each new block costs only the
+dynamic reads (total assets, balances, prices, lending positions) plus one
+``eth_getLogs`` for config events since the previous block. A config event
+drops the topology and the next fetch reads everything again. Withdraw
+requests are kept the same way: their events are replayed once, then only
+the blocks since the previous full fetch are read.
+
+`diff_lines` and `diff_json` turn two renders into the changes between
+them, so each block prints only what moved.
+"""
+
+from __future__ import annotations
+
+import difflib
+import io
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import redirect_stdout
+from functools import partial
+from typing import Any
+
+from eth_abi import decode
+from eth_typing import ChecksumAddress
+from web3 import Web3
+
+from ipor_fusion.cli.vault_fetcher import _fetch_vault_data, _VaultData
+from ipor_fusion.cli.vault_topology import VaultTopology, config_changed
+from ipor_fusion.core.context import Web3Context
+from ipor_fusion.core.plasma_vault import PlasmaVault
+from ipor_fusion.core.vault_state import WITHDRAW_REQUEST_UPDATED
+from ipor_fusion.errors import RECOVERABLE_ERRORS, SubscriptionError
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL_S = 4.0
+
+
+def poll_new_blocks(
+    ctx: Web3Context,
+    interval: float = DEFAULT_POLL_INTERVAL_S,
+    after: int | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Iterator[int]:
+    """Yield each new head above ``after``, polling every ``interval`` seconds.
+
+    A failed poll is logged and retried on the next tick: a watch outlives
+    the odd RPC hiccup.
+    """
+    last = after
+    while True:
+        try:
+            head = ctx.web3.eth.block_number
+        except RECOVERABLE_ERRORS as exc:
+            _logger.debug("eth_blockNumber failed: %s", exc)
+        else:
+            if last is None or head > last:
+                last = head
+                yield head
+                continue
+        sleep(interval)
+
+
+def new_blocks(
+    ctx: Web3Context,
+    interval: float = DEFAULT_POLL_INTERVAL_S,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Iterator[int]:
+    """The current head, then each new one; see the module docstring."""
+    if not (isinstance(ctx, Web3Context) and ctx.supports_subscriptions):
+        yield from poll_new_blocks(ctx, interval, sleep=sleep)
+        return
+    last = ctx.web3.eth.block_number
+    yield last
+    while True:
+        try:
+            with ctx.subscribe_new_heads() as heads:
+                for head in heads:
+                    newest = heads.drain()
+                    number = (newest[-1] if newest else head)["number"]
+                    if number > last:
+                        last = number
+                        yield number
+        except (SubscriptionError, OSError) as exc:
+            # Resubscribe; the next head covers whatever was missed.
+            _logger.debug("newHeads subscription ended: %s", exc)
+            sleep(interval)
+
+
+class _WithdrawRequestLog:
+    """The latest request per account of one WithdrawManager, as of
+    `block`, folded from its ``WithdrawRequestUpdated`` events."""
+
+    def __init__(self, manager: ChecksumAddress):
+        self.manager = manager
+        self.block: int | None = None
+        # account -> (shares, end of withdraw window)
+        self._requests: dict[ChecksumAddress, tuple[int, int]] = {}
+
+    def advance(self, ctx: Web3Context, block: int) -> None:
+        """Fold in the events of ``(self.block, block]``: the whole history
+        on first use."""
+        if self.block is not None and block <= self.block:
+            return
+        logs = ctx.get_logs(
+            contract_address=self.manager,
+            topics=[WITHDRAW_REQUEST_UPDATED],
+            from_block=0 if self.block is None else self.block + 1,
+            to_block=block,
+        )
+        for log in sorted(logs, key=lambda log: (log["blockNumber"], log["logIndex"])):
+            (account, amount, end) = decode(
+                ["address", "uint256", "uint32"], log["data"]
+            )
+            self._requests[Web3.to_checksum_address(account)] = (amount, end)
+        self.block = block
+
+    def withdraw_request_accounts(self, timestamp: int) -> list[ChecksumAddress]:
+        """Accounts whose latest request is non-zero and open after
+        ``timestamp``."""
+        return [
+            account
+            for account, (amount, end) in self._requests.items()
+            if amount != 0 and end > timestamp
+        ]
+
+
+class VaultWatcher:
+    """Fetches one vault block after block, keeping its topology and
+    withdraw requests in memory."""
+
+    def __init__(self, ctx: Web3Context, plasma_vault: PlasmaVault, chain_id: int):
+        self._ctx = ctx
+        self._plasma_vault = plasma_vault
+        self._chain_id = chain_id
+        self._topology: VaultTopology | None = None
+        self._data: _VaultData | None = None
+        self._withdraw_requests: _WithdrawRequestLog | None = None
+
+    @property
+    def topology(self) -> VaultTopology | None:
+        return self._topology
+
+    def fetch(self, block: int) -> _VaultData:
+        """The vault's data at ``block``."""
+        topology = self._topology
+        if topology is not None and self._changed(topology.block_number, block):
+            topology = None
+        # Every read of this fetch, the fallbacks in the renderers included,
+        # targets the same block.
+        self._ctx.default_block = block
+        data = _fetch_vault_data(
+            self._ctx,
+            self._plasma_vault,
+            block,
+            chain_id=self._chain_id,
+            topology=topology,
+            withdraw_requests=partial(self._requests_at, block),
+            previous=self._data,
+        )
+        data.is_latest = True
+        self._topology = data.topology
+        self._data = data
+        return data
+
+    def _requests_at(self, block: int, manager: ChecksumAddress) -> _WithdrawRequestLog:
+        log = self._withdraw_requests
+        if log is None or log.manager != manager or (log.block or 0) > block:
+            # New manager, or a head behind the log: start over.
+            log = self._withdraw_requests = _WithdrawRequestLog(manager)
+        log.advance(self._ctx, block)
+        return log
+
+    def _changed(self, since: int, until: int) -> bool:
+        vault = Web3.to_checksum_address(self._plasma_vault.address)
+        try:
+            return config_changed(self._ctx, vault, since, until)
+        except RECOVERABLE_ERRORS as exc:
+            _logger.debug("Config event check for %s failed: %s", vault, exc)
+            return True
+
+
+def capture_lines(render: Callable[[], None]) -> list[str]:
+    """The lines ``render`` prints to stdout (with ``click.echo``), uncolored."""
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        render()
+    return buffer.getvalue().splitlines()
+
+
+def diff_lines(previous: list[str], current: list[str]) -> list[str]:
+    """Changed lines only: ``- old`` / ``+ new``, in render order."""
+    return [
+        line
+        for line in difflib.unified_diff(previous, current, n=0, lineterm="")
+        if not line.startswith(("---", "+++", "@@"))
+    ]
+
+
+def diff_json(previous: Any, current: Any, path: str = "") -> dict[str, Any]:
+    """Leaves of ``current`` that differ from ``previous``, keyed by dotted
+    path. A key missing from ``current`` maps to ``None``."""
+    if isinstance(previous, dict) and isinstance(current, dict):
+        changes: dict[str, Any] = {}
+        for key in dict.fromkeys([*previous, *current]):
+            changes.update(
+                diff_json(
+                    previous.get(key),
+                    current.get(key),
+                    f"{path}.{key}" if path else str(key),
+                )
+            )
+        return changes
+    return {} if previous == current else {path: current}
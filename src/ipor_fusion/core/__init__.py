@@ -1,6 +1,8 @@
 from ipor_fusion.core.access import AccessManager, RoleAccount, RoleStatus
 from ipor_fusion.core.context import Web3Context
 from ipor_fusion.core.erc20 import ERC20
+from ipor_fusion.core.facts import ImmutableFacts
+from ipor_fusion.core.failover import FailoverProvider
 from ipor_fusion.core.fee_manager import (
     FeeAccount,
     FeeManager,
@@ -8,14 +10,22 @@ from ipor_fusion.core.fee_manager import (
     RecipientFee,
 )
 from ipor_fusion.core.fusion_factory import CloneArgs, FusionFactory, FusionInstance
+from ipor_fusion.core.multicall import Multicall3
 from ipor_fusion.core.oracle import AssetPriceSource, PriceOracleMiddleware
+from ipor_fusion.core.planner import QueryPlan
 from ipor_fusion.core.plasma_vault import (
     BalanceFuse,
     ManagementFeeData,
     PerformanceFeeData,
     PlasmaVault,
 )
+from ipor_fusion.core.profiling import Profiler, ProfilingMiddleware
+from ipor_fusion.core.provider_pool import ProviderPool
+from ipor_fusion.core.ratecontrol import AdaptiveRateMiddleware, AimdLimiter
 from ipor_fusion.core.rewards_manager import RewardsManager, VestingData
+from ipor_fusion.core.scheduler import RpcScheduler, TaskGroup
+from ipor_fusion.core.vault_state import VaultStateCache
+from ipor_fusion.core.websocket import Subscription, SyncWebSocketProvider
 from ipor_fusion.core.withdraw_manager import (
     PendingRequestsInfo,
     WithdrawManager,
@@ -25,6 +35,20 @@ from ipor_fusion.core.withdraw_manager import (
 __all__ = [
     "Web3Context",
     "PlasmaVault",
+    "Multicall3",
+    "QueryPlan",
+    "Profiler",
+    "RpcScheduler",
+    "TaskGroup",
+    "ProfilingMiddleware",
+    "AdaptiveRateMiddleware",
+    "AimdLimiter",
+    "FailoverProvider",
+    "ProviderPool",
+    "ImmutableFacts",
+    "SyncWebSocketProvider",
+    "Subscription",
+    "VaultStateCache",
     "AccessManager",
     "RoleAccount",
     "RoleStatus",
@@ -110,12 +110,16 @@ class AccessManager(ContractWrapper):
         ]
 
     def get_accounts_with_role(self, role_id: int) -> list[RoleAccount]:
+        if cache := self._vault_state():
+            return cache.role_accounts(role_id)
         return self._resolve_role_accounts(
             self._get_grant_role_events(),
             predicate=lambda rid, _: rid == role_id,
         )
 
     def get_all_role_accounts(self) -> list[RoleAccount]:
+        if cache := self._vault_state():
+            return cache.role_accounts()
         return self._resolve_role_accounts(
             self._get_grant_role_events(),
             predicate=lambda _rid, _acc: True,
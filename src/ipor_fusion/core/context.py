@@ -1,12 +1,37 @@
 from __future__ import annotations
 
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from typing import Any
+
 from eth_account import Account
 from eth_typing import ChecksumAddress
 from hexbytes import HexBytes
 from web3 import Web3
-from web3.types import BlockIdentifier, FilterParams, LogReceipt, TxReceipt
+from web3.providers import BaseProvider
+from web3.types import (
+    BlockData,
+    BlockIdentifier,
+    FilterParams,
+    LogReceipt,
+    TxReceipt,
+)
 
-from ipor_fusion.errors import TransactionError, get_revert_reason
+from ipor_fusion.core.facts import ImmutableFacts
+from ipor_fusion.core.failover import FailoverProvider
+from ipor_fusion.core.profiling import ProfilingMiddleware
+from ipor_fusion.core.provider_pool import ProviderPool
+from ipor_fusion.core.ratecontrol import AdaptiveRateMiddleware
+from ipor_fusion.core.scheduler import RpcScheduler
+from ipor_fusion.core.singleflight import SingleFlight
+from ipor_fusion.core.websocket import (
+    Subscription,
+    SyncWebSocketProvider,
+    format_head,
+    format_log,
+    is_websocket_url,
+)
+from ipor_fusion.errors import SubscriptionError, TransactionError, get_revert_reason
 from ipor_fusion.types import ChainId
 
 
@@ -18,7 +43,8 @@ class Web3Context:
     # web3's own HTTP default, made explicit so callers can tighten it: against
     # a degraded RPC every request otherwise blocks for the full 30s, and a
     # multi-call read (vault fetch, health check) fans that out into minutes of
-    # wall clock. Long-running services should pass something tighter.
+    # wall clock. Long-running services should pass something tighter, or
+    # several URLs so slow reads are hedged to another endpoint.
     DEFAULT_RPC_TIMEOUT_S = 30.0
 
     def __init__(
@@ -28,12 +54,18 @@ class Web3Context:
         signer: ChecksumAddress | None = None,
         private_key: str | None = None,
         gas_multiplier: float = 1.25,
+        scheduler: RpcScheduler | None = None,
+        facts: ImmutableFacts | None = None,
     ):
         self._web3 = web3
+        self._scheduler = scheduler
+        self._facts = facts if facts is not None else ImmutableFacts()
         self._chain_id = chain_id
         self._private_key = private_key
         self._gas_multiplier = gas_multiplier
         self._default_block: BlockIdentifier = "latest"
+        self._inflight: SingleFlight[HexBytes] = SingleFlight()
+        self._pinned_reads: dict[tuple[Any, ...], HexBytes] | None = None
         self._signer: ChecksumAddress | None = None
 
         if signer:
@@ -58,20 +90,111 @@ class Web3Context:
     def default_block(self, value: BlockIdentifier) -> None:
         self._default_block = value
 
+    def pinned(self, block: BlockIdentifier) -> Web3Context:
+        """A read-only context at ``block`` sharing this one's provider,
+        scheduler and facts, for reading several blocks concurrently."""
+        ctx = Web3Context(
+            self._web3, self._chain_id, scheduler=self._scheduler, facts=self._facts
+        )
+        ctx.default_block = block
+        return ctx
+
     @property
     def signer(self) -> ChecksumAddress | None:
         return self._signer
 
+    @property
+    def scheduler(self) -> RpcScheduler:
+        """Where this context's parallel reads run.
+
+        Unless one was injected, the process-wide scheduler for the provider
+        endpoint, so every context on the same RPC shares one concurrency
+        budget.
+        """
+        if self._scheduler is None:
+            provider = self._web3.provider
+            endpoint = getattr(provider, "endpoint_uri", None)
+            # A ProviderPool admits more concurrent requests than one endpoint.
+            capacity = getattr(provider, "max_in_flight", None)
+            self._scheduler = RpcScheduler.shared(
+                endpoint if isinstance(endpoint, str) else RpcScheduler.DEFAULT_KEY,
+                max_workers=capacity if isinstance(capacity, int) else None,
+            )
+        return self._scheduler
+
+    @property
+    def facts(self) -> ImmutableFacts:
+        """Cache of immutable reads (see `ipor_fusion.core.facts`). In memory
+        unless a persistent one was injected."""
+        return self._facts
+
     @classmethod
     def from_url(
         cls,
-        url: str,
+        url: str | Sequence[str],
         private_key: str | None = None,
         gas_multiplier: float = 1.25,
         request_timeout_s: float = DEFAULT_RPC_TIMEOUT_S,
+        scheduler: RpcScheduler | None = None,
+        balanced: bool = False,
+        facts: ImmutableFacts | None = None,
+    ) -> Web3Context:
+        """Connect to ``url``, or to several endpoints of one chain.
+
+        With more than one URL, reads are hedged and failed over across them
+        (see `FailoverProvider`). With ``balanced``, they are instead spread
+        over all endpoints for throughput (see `ProviderPool`); use that for
+        fleet-wide scans.
+
+        ``ws://`` and ``wss://`` URLs get one persistent connection each (see
+        `SyncWebSocketProvider`), which also carries `subscribe_new_heads`
+        and `subscribe_logs`.
+        """
+        urls = [url] if isinstance(url, str) else list(url)
+        if not urls:
+            raise ValueError("At least one provider URL is required")
+        providers: list[BaseProvider] = [
+            SyncWebSocketProvider(endpoint, request_timeout_s=request_timeout_s)
+            if is_websocket_url(endpoint)
+            else Web3.HTTPProvider(
+                endpoint,
+                request_kwargs={"timeout": request_timeout_s},
+                # Retries belong to AdaptiveRateMiddleware, which backs off with
+                # jitter and shares one concurrency limit per endpoint.
+                exception_retry_configuration=None,
+            )
+            for endpoint in urls
+        ]
+        provider: BaseProvider = providers[0]
+        if balanced:
+            provider = ProviderPool(providers)
+        elif len(providers) > 1:
+            provider = FailoverProvider(providers)
+        return cls.from_provider(
+            provider,
+            private_key=private_key,
+            gas_multiplier=gas_multiplier,
+            scheduler=scheduler,
+            facts=facts,
+        )
+
+    @classmethod
+    def from_provider(
+        cls,
+        provider: BaseProvider,
+        private_key: str | None = None,
+        gas_multiplier: float = 1.25,
+        scheduler: RpcScheduler | None = None,
+        facts: ImmutableFacts | None = None,
     ) -> Web3Context:
-        web3 = Web3(
-            Web3.HTTPProvider(url, request_kwargs={"timeout": request_timeout_s})
+        """Context over any web3 provider, with the SDK's middleware installed
+        and the chain ID read from the node."""
+        web3 = Web3(provider)
+        # Dormant unless a `Profiler` is active; then every RPC becomes a span.
+        web3.middleware_onion.add(ProfilingMiddleware, name="ipor_fusion_profiling")
+        # Added last, so outermost: each retry attempt gets its own rpc span.
+        web3.middleware_onion.add(
+            AdaptiveRateMiddleware, name="ipor_fusion_rate_control"
         )
         chain_id = ChainId(web3.eth.chain_id)
 
@@ -80,6 +203,8 @@ class Web3Context:
             chain_id=chain_id,
             private_key=private_key,
             gas_multiplier=gas_multiplier,
+            scheduler=scheduler,
+            facts=facts,
         )
 
     def call(
@@ -89,9 +214,66 @@ class Web3Context:
         block: BlockIdentifier | None = None,
     ) -> HexBytes:
         effective_block = block if block is not None else self._default_block
-        return self.web3.eth.call(
-            {"to": to, "data": data}, block_identifier=effective_block
+        if (cached := self.cached_read(to, data, block)) is not None:
+            return cached
+        # Concurrent identical reads (same token's decimals from two fetch
+        # phases, a shared oracle feed) share one request and one result.
+        result = self._inflight.do(
+            (str(to).lower(), bytes(data), effective_block),
+            lambda: self.web3.eth.call(
+                {"to": to, "data": data}, block_identifier=effective_block
+            ),
         )
+        self.remember_read(to, data, result, block)
+        return result
+
+    @contextmanager
+    def shared_reads(self) -> Iterator[None]:
+        """Reuse results of reads at a pinned block number while active.
+
+        State at a given block never changes, so an ``eth_call`` at a numeric
+        block (see `default_block`) is made once and its result reused by
+        every identical read after it, multicall sub-calls included. Meant
+        for runs that fetch many vaults sharing oracles, tokens and markets.
+        Reads at ``"latest"`` are unaffected. Nested use is a no-op.
+        """
+        if self._pinned_reads is not None:
+            yield
+            return
+        self._pinned_reads = {}
+        try:
+            yield
+        finally:
+            self._pinned_reads = None
+
+    def cached_read(
+        self, to: ChecksumAddress, data: bytes, block: BlockIdentifier | None = None
+    ) -> HexBytes | None:
+        """A result recorded under `shared_reads`, if any."""
+        key = self._pinned_key(to, data, block)
+        if key is None or self._pinned_reads is None:
+            return None
+        return self._pinned_reads.get(key)
+
+    def remember_read(
+        self,
+        to: ChecksumAddress,
+        data: bytes,
+        result: bytes,
+        block: BlockIdentifier | None = None,
+    ) -> None:
+        """Record a successful read for `shared_reads`; no-op when inactive."""
+        key = self._pinned_key(to, data, block)
+        if key is not None and self._pinned_reads is not None:
+            self._pinned_reads[key] = HexBytes(result)
+
+    def _pinned_key(
+        self, to: ChecksumAddress, data: bytes, block: BlockIdentifier | None
+    ) -> tuple[Any, ...] | None:
+        effective_block = block if block is not None else self._default_block
+        if self._pinned_reads is None or not isinstance(effective_block, int):
+            return None
+        return (str(to).lower(), bytes(data), effective_block)
 
     def _build_transaction(self, to: ChecksumAddress, data: bytes) -> dict:
         assert self.signer is not None  # noqa: S101  # signer ensured by callers
@@ -135,22 +317,71 @@ class Web3Context:
 
     def get_logs(
         self,
-        contract_address: ChecksumAddress,
-        topics: list[str],
+        contract_address: ChecksumAddress | Sequence[ChecksumAddress],
+        topics: Sequence[str | Sequence[str]],
         from_block: BlockIdentifier = 0,
         to_block: BlockIdentifier = "latest",
     ) -> list[LogReceipt]:
         filter_params: FilterParams = {
             "fromBlock": from_block,
             "toBlock": to_block,
-            "address": contract_address,
-            "topics": topics,  # type: ignore[typeddict-item]
+            "address": (
+                contract_address
+                if isinstance(contract_address, str)
+                else list(contract_address)
+            ),
+            "topics": list(topics),  # type: ignore[typeddict-item]
         }
         return self.web3.eth.get_logs(filter_params)
 
     def get_block(self, block: BlockIdentifier = "latest"):
         return self.web3.eth.get_block(block)
 
+    @property
+    def supports_subscriptions(self) -> bool:
+        """Whether one of the context's endpoints is a WebSocket."""
+        return self._subscriber() is not None
+
+    def subscribe_new_heads(self) -> Subscription[BlockData]:
+        """Iterator of new chain heads, as the node announces them."""
+        return self._require_subscriber().subscribe(["newHeads"], format_head)
+
+    def subscribe_logs(
+        self,
+        contract_address: ChecksumAddress | Sequence[ChecksumAddress],
+        topics: Sequence[str | Sequence[str]] = (),
+    ) -> Subscription[LogReceipt]:
+        """Iterator of new logs matching the same filter `get_logs` takes.
+
+        Replaces re-polling ``eth_getLogs``: events arrive as their blocks do.
+        A reorg re-delivers dropped logs with ``removed`` set.
+        """
+        address = (
+            contract_address
+            if isinstance(contract_address, str)
+            else list(contract_address)
+        )
+        criteria = {"address": address, "topics": list(topics)}
+        return self._require_subscriber().subscribe(["logs", criteria], format_log)
+
+    def _subscriber(self) -> SyncWebSocketProvider | None:
+        provider = self._web3.provider
+        candidates = (
+            [endpoint.provider for endpoint in provider.endpoints]
+            if isinstance(provider, FailoverProvider)
+            else [provider]
+        )
+        return next(
+            (p for p in candidates if isinstance(p, SyncWebSocketProvider)), None
+        )
+
+    def _require_subscriber(self) -> SyncWebSocketProvider:
+        if (subscriber := self._subscriber()) is None:
+            raise SubscriptionError(
+                "Subscriptions need a WebSocket endpoint (a ws:// or wss:// URL)"
+            )
+        return subscriber
+
     def _estimate_gas(self, to: ChecksumAddress, data: str, from_address: str) -> int:
         estimated = self.web3.eth.estimate_gas(
             {"to": to, "from": from_address, "data": data}  # type: ignore[typeddict-item]
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
-from typing import Any, Generic, TypeVar, cast
+from typing import TYPE_CHECKING, Any, Generic, TypeVar, cast
 
 from eth_abi import decode, encode
 from eth_typing import ChecksumAddress
@@ -11,6 +11,10 @@ from web3 import Web3
 from web3.types import TxReceipt
 
 from ipor_fusion.core.context import Web3Context
+from ipor_fusion.core.facts import ImmutableFacts
+
+if TYPE_CHECKING:
+    from ipor_fusion.core.vault_state import VaultStateCache
 
 T = TypeVar("T")
 
@@ -41,6 +45,12 @@ class Call(Generic[T]):
     output_types: list[str] | None = None
     decoder: Callable[..., T] | None = None
     ctx: Web3Context | None = None
+    # The answer can never change for this contract (see
+    # `ipor_fusion.core.facts`); reads may be served from the context's cache.
+    immutable: bool = False
+    # With `immutable`: a revert without data means the contract lacks the
+    # getter, and is cached for a while too.
+    cache_revert: bool = False
 
     @property
     def calldata(self) -> bytes:
@@ -57,7 +67,26 @@ class Call(Generic[T]):
                 "Call.call() on a write-only Call — use .send() instead "
                 "(no output_types declared)."
             )
-        raw = actual.call(self.to, self.data)
+        if self.immutable and (facts := ImmutableFacts.for_context(actual)):
+            return self.decode(
+                facts.read(
+                    actual,
+                    self.to,
+                    self.data,
+                    lambda: actual.call(self.to, self.data),
+                    cache_revert=self.cache_revert,
+                )
+            )
+        return self.decode(actual.call(self.to, self.data))
+
+    def decode(self, raw: bytes) -> T:
+        """Decode raw `eth_call` return data per `output_types`/`decoder`.
+
+        Split out of `call()` so batched execution (`ipor_fusion.core.multicall`)
+        can decode each sub-result exactly as a standalone read would.
+        """
+        if not self.output_types:
+            raise RuntimeError("Call.decode() on a write-only Call")
         values = tuple(decode(self.output_types, bytes(raw)))
         single: Any = values[0] if len(values) == 1 else values
         if self.decoder is not None:
@@ -127,6 +156,8 @@ class ContractWrapper:
         *args: Any,
         output_types: list[str],
         decoder: Callable[..., T] | None = None,
+        immutable: bool = False,
+        cache_revert: bool = False,
     ) -> Call[T]:
         return Call(
             to=self._address,
@@ -134,6 +165,8 @@ class ContractWrapper:
             output_types=output_types,
             decoder=decoder,
             ctx=self._ctx,
+            immutable=immutable,
+            cache_revert=cache_revert,
         )
 
     def _write(self, signature: str, *args: Any) -> Call[None]:
@@ -143,6 +176,14 @@ class ContractWrapper:
             ctx=self._ctx,
         )
 
+    def _vault_state(self) -> VaultStateCache | None:
+        """The shared `VaultStateCache` that can answer the compound methods
+        of this contract, if one is in sync."""
+        # Local import: vault_state builds on the wrappers.
+        from ipor_fusion.core.vault_state import VaultStateCache
+
+        return VaultStateCache.tracking(self._ctx, self._address)
+
 
 def _encode_calldata(signature: str, *args: Any) -> bytes:
     selector = function_signature_to_4byte_selector(signature)
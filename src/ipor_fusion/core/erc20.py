@@ -23,7 +23,9 @@ class ERC20(ContractWrapper):
         )
 
     def decimals(self) -> Call[Decimals]:
-        return self._view("decimals()", output_types=["uint256"], decoder=Decimals)
+        return self._view(
+            "decimals()", output_types=["uint256"], decoder=Decimals, immutable=True
+        )
 
     def symbol(self) -> Call[str]:
         return self._view("symbol()", output_types=["string"])
@@ -0,0 +1,283 @@
+"""Cache of reads whose answer never changes once a contract is deployed.
+
+A fuse's ``MARKET_ID()``, a Morpho market's parameters, an Aave reserve's
+token addresses and an ERC-20's ``decimals()`` are fixed for the life of the
+contract, yet every vault fetch used to read them again. `Call`s built for
+such getters are flagged ``immutable``. `Call.call()` and
+`ipor_fusion.core.multicall.call_all` serve them from the context's
+`ImmutableFacts` and go to the node only on a miss.
+
+Entries are keyed by chain, contract address and calldata (selector plus
+arguments), and hold the raw return data. Each entry is stamped with the
+contract's code hash. It stays valid until that hash changes. The hash is
+re-read with ``eth_getCode`` at most once per `REVALIDATE_S` (and once per
+process without a backend), so warm reads cost no RPC at all.
+
+The code hash is the contract's own, so behind an upgradeable proxy it is
+the proxy's: swapping the implementation leaves it unchanged and the check
+never fires. An entry for a proxy therefore holds for good. ``immutable`` is
+only for getters no upgrade is expected to change, such as an upgradeable
+token's ``decimals()``, which would break every holder's balances. A getter
+a proxy forwards to a replaceable target, like a Chainlink feed's
+``decimals()``, is read live instead.
+
+A getter the contract does not have is a fact about its code too, which
+the oracle mapping's feed probes rely on. Calls flagged ``cache_revert`` as
+well have a revert with no data recorded and answered with the same revert.
+A bare ``require``, running out of gas or a node stripping the revert data
+look the same, so such a record is kept apart from the results, is trusted
+for `REVERT_TTL_S` only and answers only calls that opt in. Reverts carrying
+a reason depend on state and are never recorded.
+
+Without a backend the facts live in memory for the life of the context. Give
+it a `FactsBackend` (the CLI uses its SQLite metadata store) to keep them
+across runs.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from typing import Any, Protocol
+
+from eth_typing import ChecksumAddress
+from web3 import Web3
+from web3.exceptions import ContractLogicError
+
+from ipor_fusion.core.scheduler import RpcScheduler
+from ipor_fusion.errors import RECOVERABLE_ERRORS
+
+logger = logging.getLogger(__name__)
+
+NS_IMMUTABLE_CALL = "immutable_call"
+NS_KNOWN_REVERT = "known_revert"
+NS_CODE_HASH = "code_hash"
+
+
+class FactsBackend(Protocol):
+    """Durable string key/value storage, grouped by namespace."""
+
+    def get(self, namespace: str, key: str) -> str | None: ...
+
+    def put(self, namespace: str, key: str, value: str) -> None: ...
+
+
+class ImmutableFacts:
+    """Return data of immutable reads, validated by the contract's code hash."""
+
+    REVALIDATE_S = 24 * 3600
+    REVERT_TTL_S = 3600
+
+    def __init__(
+        self,
+        backend: FactsBackend | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._backend = backend
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._results: dict[str, tuple[str, bytes]] = {}
+        # Reads known to revert with no data: (code hash, when it was seen)
+        self._reverts: dict[str, tuple[str, float]] = {}
+        # Code hashes confirmed against the node (or a fresh backend record),
+        # keyed like `_address_key`.
+        self._code_hashes: dict[str, str] = {}
+
+    @staticmethod
+    def for_context(ctx: Any) -> ImmutableFacts | None:
+        """The facts a context carries, or ``None`` for test doubles and
+        adapters that do not have any."""
+        facts = getattr(ctx, "facts", None)
+        return facts if isinstance(facts, ImmutableFacts) else None
+
+    def read(
+        self,
+        ctx: Any,
+        to: ChecksumAddress,
+        data: bytes,
+        fetch: Callable[[], bytes],
+        cache_revert: bool = False,
+    ) -> bytes:
+        """Cached return data for ``to``/``data``, or ``fetch()`` remembered.
+
+        With ``cache_revert``, a revert without data is remembered too, and
+        ``ContractLogicError`` raised for a read known to revert, as
+        ``fetch()`` did when it was recorded.
+        """
+        if (raw := self.lookup(ctx, to, data, reverts=cache_revert)) is not None:
+            if not raw:
+                raise ContractLogicError("execution reverted", data="0x")
+            return raw
+        try:
+            raw = bytes(fetch())
+        except ContractLogicError as exc:
+            if cache_revert and (not exc.data or exc.data == "0x"):
+                self.remember_revert(ctx, to, data)
+            raise
+        self.remember(ctx, to, data, raw)
+        return raw
+
+    def lookup(
+        self, ctx: Any, to: ChecksumAddress, data: bytes, reverts: bool = False
+    ) -> bytes | None:
+        """Recorded return data for ``to``/``data``, or ``None`` when nothing
+        valid is recorded. With ``reverts``, empty for a read known (within
+        `REVERT_TTL_S`) to revert."""
+        code_hash = self.code_hash(ctx, to)
+        if code_hash is None:
+            return None
+        key = _call_key(ctx.chain_id, to, data)
+        with self._lock:
+            entry = self._results.get(key)
+        if entry is None and self._backend is not None:
+            entry = _decode_entry(self._backend.get(NS_IMMUTABLE_CALL, key))
+            if entry is not None:
+                with self._lock:
+                    self._results[key] = entry
+        if entry is not None and entry[1] and entry[0] == code_hash:
+            return entry[1]
+        if reverts and self._known_revert(key, code_hash):
+            return b""
+        return None
+
+    def remember(self, ctx: Any, to: ChecksumAddress, data: bytes, raw: bytes) -> None:
+        """Record ``raw`` as the answer to ``to``/``data``.
+
+        Empty return data (an EOA, a contract without the getter) is not
+        recorded: it says nothing about the contract.
+        """
+        if not raw or (code_hash := self.code_hash(ctx, to)) is None:
+            return
+        key = _call_key(ctx.chain_id, to, data)
+        with self._lock:
+            self._results[key] = (code_hash, bytes(raw))
+        if self._backend is not None:
+            self._backend.put(
+                NS_IMMUTABLE_CALL,
+                key,
+                json.dumps({"code_hash": code_hash, "result": bytes(raw).hex()}),
+            )
+
+    def remember_revert(self, ctx: Any, to: ChecksumAddress, data: bytes) -> None:
+        """Record that ``to``/``data`` reverts with no data, most likely
+        because the contract has no such getter. Only ever call it for
+        reverts without a reason, of calls flagged ``cache_revert``."""
+        if (code_hash := self.code_hash(ctx, to)) is None:
+            return
+        key = _call_key(ctx.chain_id, to, data)
+        seen_at = self._clock()
+        with self._lock:
+            self._reverts[key] = (code_hash, seen_at)
+        if self._backend is not None:
+            self._backend.put(
+                NS_KNOWN_REVERT,
+                key,
+                json.dumps({"code_hash": code_hash, "reverted_at": seen_at}),
+            )
+
+    def _known_revert(self, key: str, code_hash: str) -> bool:
+        with self._lock:
+            entry = self._reverts.get(key)
+        if entry is None and self._backend is not None:
+            record = _decode_json(self._backend.get(NS_KNOWN_REVERT, key))
+            seen_at = record.get("reverted_at")
+            if isinstance(record.get("code_hash"), str) and isinstance(
+                seen_at, int | float
+            ):
+                entry = (record["code_hash"], seen_at)
+                with self._lock:
+                    self._reverts[key] = entry
+        return (
+            entry is not None
+            and entry[0] == code_hash
+            and self._clock() - entry[1] < self.REVERT_TTL_S
+        )
+
+    def code_hash(self, ctx: Any, address: ChecksumAddress) -> str | None:
+        """Hash of the code at ``address``; ``None`` if it has none or could
+        not be read."""
+        key = _address_key(ctx.chain_id, address)
+        with self._lock:
+            if (known := self._code_hashes.get(key)) is not None:
+                return known
+        if self._backend is not None:
+            record = _decode_json(self._backend.get(NS_CODE_HASH, key))
+            checked_at = record.get("checked_at")
+            if (
+                isinstance(record.get("hash"), str)
+                and isinstance(checked_at, int | float)
+                and self._clock() - checked_at < self.REVALIDATE_S
+            ):
+                with self._lock:
+                    self._code_hashes[key] = record["hash"]
+                return record["hash"]
+        return self._fetch_code_hash(ctx, address, key)
+
+    def validate(self, ctx: Any, addresses: Iterable[ChecksumAddress]) -> None:
+        """Resolve the code hashes of ``addresses`` in parallel, so that a
+        batch of lookups does not read them one by one."""
+        unique = list(dict.fromkeys(addresses))
+        with self._lock:
+            stale = [
+                address
+                for address in unique
+                if _address_key(ctx.chain_id, address) not in self._code_hashes
+            ]
+        if len(stale) < 2:
+            return
+        with RpcScheduler.for_context(ctx).group() as pool:
+            for address in stale:
+                pool.submit(self.code_hash, ctx, address)
+
+    def _fetch_code_hash(
+        self, ctx: Any, address: ChecksumAddress, key: str
+    ) -> str | None:
+        try:
+            code = ctx.web3.eth.get_code(address)
+        except RECOVERABLE_ERRORS as exc:
+            logger.debug("eth_getCode(%s) failed: %s", address, exc)
+            return None
+        if not isinstance(code, bytes) or not code:
+            return None
+        code_hash = Web3.keccak(code).hex()
+        with self._lock:
+            self._code_hashes[key] = code_hash
+        if self._backend is not None:
+            self._backend.put(
+                NS_CODE_HASH,
+                key,
+                json.dumps({"hash": code_hash, "checked_at": self._clock()}),
+            )
+        return code_hash
+
+
+def _address_key(chain_id: int, address: str) -> str:
+    return f"{chain_id}:{address.lower()}"
+
+
+def _call_key(chain_id: int, address: str, data: bytes) -> str:
+    return f"{_address_key(chain_id, address)}:{bytes(data).hex()}"
+
+
+def _decode_json(value: str | None) -> dict[str, Any]:
+    if value is None:
+        return {}
+    try:
+        data = json.loads(value)
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _decode_entry(value: str | None) -> tuple[str, bytes] | None:
+    entry = _decode_json(value)
+    code_hash, result = entry.get("code_hash"), entry.get("result")
+    if not isinstance(code_hash, str) or not isinstance(result, str):
+        return None
+    try:
+        return code_hash, bytes.fromhex(result)
+    except ValueError:
+        return None
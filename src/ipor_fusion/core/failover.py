@@ -0,0 +1,274 @@
+"""Multi-endpoint JSON-RPC provider with hedged reads and failover.
+
+With one endpoint, every slow or failing request costs its full timeout, and
+a fan-out of reads turns that tail latency into minutes of wall clock.
+`FailoverProvider` spreads the risk over several endpoints for the same
+chain:
+
+- Reads go to the fastest healthy endpoint, ranked by an EWMA of latency.
+- Hedging: when a read outlives a latency budget derived from that
+  endpoint's recent p95, a duplicate goes to the next endpoint. The first
+  response wins. Each endpoint runs its requests on threads of its own, so
+  reads stuck on a slow endpoint never hold back the hedges meant to get
+  around it.
+- Failover: an endpoint that errors or rate-limits is ejected for a while
+  and the read moves on to the next one.
+- A background probe compares ``eth_blockNumber`` across endpoints
+  periodically. It ejects endpoints lagging behind the highest head and
+  readmits recovered ones.
+
+Only idempotent reads (`IDEMPOTENT_METHODS`) are hedged or failed over.
+Anything else, such as ``eth_sendRawTransaction``, goes once to the
+best-ranked endpoint.
+
+`Web3Context.from_url` builds one when given several URLs:
+
+    ctx = Web3Context.from_url(["https://rpc-a.example", "https://rpc-b.example"])
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+from web3.providers import BaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from ipor_fusion.core.ratecontrol import (
+    IDEMPOTENT_METHODS,
+    THROTTLED,
+    classify_response,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Endpoint:
+    """Latency and health bookkeeping for one upstream provider."""
+
+    SAMPLES = 64
+    EWMA_WEIGHT = 0.2
+
+    def __init__(
+        self,
+        provider: BaseProvider,
+        weight: float = 1.0,
+        max_in_flight: int | None = None,
+    ):
+        self.provider = provider
+        self.uri = str(getattr(provider, "endpoint_uri", None) or provider)
+        self.weight = weight
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.latency: float | None = None
+        self.head: int | None = None
+        self.ejected_until = 0.0
+        self._samples: deque[float] = deque(maxlen=self.SAMPLES)
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+    def record_latency(self, latency_s: float) -> None:
+        self._samples.append(latency_s)
+        if self.latency is None:
+            self.latency = latency_s
+        else:
+            self.latency += (latency_s - self.latency) * self.EWMA_WEIGHT
+
+    def p95(self) -> float | None:
+        """95th percentile of recent latencies; ``None`` until enough samples."""
+        if len(self._samples) < 8:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def __repr__(self) -> str:
+        return f"Endpoint({self.uri!r})"
+
+
+class FailoverProvider(BaseProvider):
+    """Routes requests over several providers for the same chain."""
+
+    # Hedge budget used until an endpoint has enough samples for a p95.
+    DEFAULT_HEDGE_S = 1.0
+    MIN_HEDGE_S = 0.05
+    EJECT_S = 30.0
+    PROBE_INTERVAL_S = 15.0
+    DEFAULT_MAX_BLOCK_LAG = 5
+    # Threads per endpoint; reads beyond that queue for that endpoint only.
+    WORKERS_PER_ENDPOINT = 4
+
+    def __init__(
+        self,
+        providers: Sequence[BaseProvider],
+        hedge: bool = True,
+        max_block_lag: int = DEFAULT_MAX_BLOCK_LAG,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not providers:
+            raise ValueError("FailoverProvider needs at least one provider")
+        super().__init__()
+        self.endpoints = [Endpoint(p) for p in providers]
+        self._hedge = hedge
+        self._max_block_lag = max_block_lag
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._next_probe = 0.0
+        # One pool per endpoint (by index), plus one under None for probes
+        self._pools: dict[int | None, ThreadPoolExecutor] = {}
+
+    @property
+    def endpoint_uri(self) -> str:
+        """All endpoint URIs, comma-joined: the key shared schedulers and
+        limiters use for this provider."""
+        return ",".join(endpoint.uri for endpoint in self.endpoints)
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        return any(
+            endpoint.provider.is_connected(show_traceback)
+            for endpoint in self.endpoints
+        )
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        self._maybe_probe()
+        ranked = self.ranked()
+        if method not in IDEMPOTENT_METHODS:
+            return ranked[0].provider.make_request(method, params)
+        return self._read(ranked, method, params)
+
+    def ranked(self) -> list[Endpoint]:
+        """Healthy endpoints fastest first (unmeasured ones first of all, so
+        they get measured), then ejected ones as a last resort."""
+        now = self._clock()
+        healthy = [e for e in self.endpoints if e.healthy(now)]
+        ejected = [e for e in self.endpoints if not e.healthy(now)]
+        healthy.sort(key=lambda e: e.latency or 0.0)
+        ejected.sort(key=lambda e: e.ejected_until)
+        return healthy + ejected
+
+    def eject(self, endpoint: Endpoint, reason: object) -> None:
+        endpoint.ejected_until = self._clock() + self.EJECT_S
+        logger.debug("Ejecting RPC endpoint %s: %s", endpoint.uri, reason)
+
+    def _read(
+        self, ranked: list[Endpoint], method: RPCEndpoint, params: Any
+    ) -> RPCResponse:
+        candidates = iter(ranked)
+        pending: dict[Future[Any], Endpoint] = {}
+        failure: BaseException | _Throttled | None = None
+        hedged = not self._hedge or len(ranked) < 2
+
+        def launch() -> None:
+            if (endpoint := next(candidates, None)) is not None:
+                future = self._executor(endpoint).submit(
+                    self._timed, endpoint, method, params
+                )
+                pending[future] = endpoint
+
+        launch()
+        while pending:
+            budget = None if hedged else self._hedge_budget(pending)
+            done, _ = wait(pending, timeout=budget, return_when=FIRST_COMPLETED)
+            if not done:
+                launch()
+                hedged = True
+                continue
+            for future in done:
+                endpoint = pending.pop(future)
+                outcome = _outcome(future)
+                if not isinstance(outcome, BaseException | _Throttled):
+                    return outcome
+                self.eject(endpoint, outcome)
+                failure = outcome
+            if not pending:
+                launch()
+        return self._give_up(failure)
+
+    @staticmethod
+    def _give_up(failure: BaseException | _Throttled | None) -> RPCResponse:
+        """Surface the last failure once every candidate endpoint failed."""
+        if isinstance(failure, _Throttled):
+            return failure.response
+        assert failure is not None  # noqa: S101  # at least one attempt ran
+        raise failure
+
+    def _timed(
+        self, endpoint: Endpoint, method: RPCEndpoint, params: Any
+    ) -> RPCResponse | _Throttled:
+        started = self._clock()
+        response = endpoint.provider.make_request(method, params)
+        if classify_response(response) == THROTTLED:
+            return _Throttled(response)
+        endpoint.record_latency(self._clock() - started)
+        return response
+
+    def _hedge_budget(self, pending: dict[Future[Any], Endpoint]) -> float:
+        (endpoint,) = pending.values()
+        p95 = endpoint.p95()
+        return max(self.MIN_HEDGE_S, self.DEFAULT_HEDGE_S if p95 is None else p95)
+
+    def _maybe_probe(self) -> None:
+        if len(self.endpoints) < 2:
+            return
+        with self._lock:
+            now = self._clock()
+            if now < self._next_probe:
+                return
+            self._next_probe = now + self.PROBE_INTERVAL_S
+        self._executor().submit(self.probe)
+
+    def probe(self) -> None:
+        """Compare chain heads; eject laggards and readmit recovered endpoints."""
+        for endpoint in self.endpoints:
+            try:
+                response = endpoint.provider.make_request(
+                    RPCEndpoint("eth_blockNumber"), []
+                )
+                endpoint.head = int(response["result"], 16)
+            except Exception as exc:
+                endpoint.head = None
+                self.eject(endpoint, exc)
+        heads = [e.head for e in self.endpoints if e.head is not None]
+        if not heads:
+            return
+        tip = max(heads)
+        for endpoint in self.endpoints:
+            if endpoint.head is None:
+                continue
+            if tip - endpoint.head > self._max_block_lag:
+                self.eject(endpoint, f"{tip - endpoint.head} blocks behind")
+            else:
+                endpoint.ejected_until = 0.0
+
+    def _executor(self, endpoint: Endpoint | None = None) -> ThreadPoolExecutor:
+        """The threads ``endpoint``'s requests run on; the probe's if None."""
+        key = None if endpoint is None else self.endpoints.index(endpoint)
+        with self._lock:
+            if (pool := self._pools.get(key)) is None:
+                pool = self._pools[key] = ThreadPoolExecutor(
+                    max_workers=1 if key is None else self.WORKERS_PER_ENDPOINT,
+                    thread_name_prefix=f"ipor-failover-{'probe' if key is None else key}",
+                )
+            return pool
+
+
+class _Throttled:
+    """A rate-limit error response: a failure for routing purposes."""
+
+    __slots__ = ("response",)
+
+    def __init__(self, response: RPCResponse):
+        self.response = response
+
+    def __str__(self) -> str:
+        return f"rate limited: {self.response.get('error')}"
+
+
+def _outcome(future: Future[Any]) -> Any:
+    error = future.exception()
+    return error if error is not None else future.result()
@@ -0,0 +1,149 @@
+"""Multicall3 batching: many views, one `eth_call`.
+
+Multicall3 is deployed at the same address on every EVM chain the SDK
+supports. `call_all` packs a list of read-only `Call`s into one
+``aggregate3`` with ``allowFailure`` set on every entry, then decodes each
+sub-result exactly as `Call.call()` would — so a revert in one read is
+reported for that read alone instead of failing the whole batch.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, cast
+
+from eth_typing import ChecksumAddress
+from web3.exceptions import ContractLogicError
+
+from ipor_fusion.core.context import Web3Context
+from ipor_fusion.core.contract import Call, ContractWrapper
+from ipor_fusion.core.facts import ImmutableFacts
+from ipor_fusion.errors import _decode_revert_reason
+
+MULTICALL3_ADDRESS: ChecksumAddress = cast(
+    ChecksumAddress, "0xcA11bde05977b3631167028862bE2a173976CA11"
+)
+
+
+@dataclass(slots=True)
+class CallResult:
+    """One `aggregate3` entry: whether the sub-call succeeded, and its raw return
+    data (revert data on failure)."""
+
+    success: bool
+    return_data: bytes
+
+
+def _results_decoder(value: list[tuple[bool, bytes]]) -> list[CallResult]:
+    return [CallResult(success=bool(ok), return_data=bytes(data)) for ok, data in value]
+
+
+class Multicall3(ContractWrapper):
+    """Multicall3 aggregator, at `MULTICALL3_ADDRESS` unless told otherwise."""
+
+    def __init__(self, ctx: Web3Context, address: ChecksumAddress = MULTICALL3_ADDRESS):
+        super().__init__(ctx, address)
+
+    def aggregate3(
+        self, calls: Sequence[Call[Any]], allow_failure: bool = True
+    ) -> Call[list[CallResult]]:
+        return self._view(
+            "aggregate3((address,bool,bytes)[])",
+            [(call.to, allow_failure, call.data) for call in calls],
+            output_types=["(bool,bytes)[]"],
+            decoder=_results_decoder,
+        )
+
+    def get_block_number(self) -> Call[int]:
+        """The number of the block the call runs at, batchable with the reads
+        it dates."""
+        return self._view("getBlockNumber()", output_types=["uint256"])
+
+    def get_current_block_timestamp(self) -> Call[int]:
+        """The timestamp of the block the call runs at, batchable with the
+        reads it dates."""
+        return self._view("getCurrentBlockTimestamp()", output_types=["uint256"])
+
+
+def call_all(ctx: Web3Context, calls: Sequence[Call[Any]]) -> list[Any]:
+    """Execute `calls` as one ``aggregate3`` and decode each result.
+
+    Returns one entry per call, in order: the decoded value, or the exception
+    that reading it standalone would have raised (``ContractLogicError`` for a
+    revert, the ABI decoding error for empty or malformed return data) — the
+    ``asyncio.gather(..., return_exceptions=True)`` convention.
+
+    Immutable calls already in the context's `ImmutableFacts` (for
+    ``cache_revert`` calls, recent reverts of getters the contract lacks
+    included), and calls already made under
+    `Web3Context.shared_reads`, are answered from there and left out of the
+    batch; the others are remembered once read.
+
+    Raises only when the aggregate call itself fails (RPC error, Multicall3 not
+    deployed at the pinned block), in which case nothing was read.
+    """
+    facts = ImmutableFacts.for_context(ctx)
+    if facts is not None:
+        facts.validate(ctx, [call.to for call in calls if call.immutable])
+    cached: dict[int, CallResult] = {
+        i: known
+        for i, call in enumerate(calls)
+        if (known := _known_result(ctx, facts, call)) is not None
+    }
+    pending = [call for i, call in enumerate(calls) if i not in cached]
+    results = Multicall3(ctx).aggregate3(pending).call() if pending else []
+    if len(results) != len(pending):
+        raise ValueError(
+            f"aggregate3 returned {len(results)} results for {len(pending)} calls"
+        )
+    fetched = iter(results)
+    outcomes: list[Any] = []
+    for i, call in enumerate(calls):
+        result = cached[i] if i in cached else next(fetched)
+        if not result.success:
+            data = result.return_data
+            if (
+                not data
+                and i not in cached
+                and facts is not None
+                and call.immutable
+                and call.cache_revert
+            ):
+                facts.remember_revert(ctx, call.to, call.data)
+            outcomes.append(
+                ContractLogicError(
+                    f"execution reverted: {_decode_revert_reason(data)}",
+                    data="0x" + data.hex(),
+                )
+            )
+            continue
+        try:
+            outcomes.append(call.decode(result.return_data))
+        except Exception as exc:  # reported per call, as Call.call() would raise it
+            outcomes.append(exc)
+            continue
+        if i in cached:
+            continue
+        if facts is not None and call.immutable:
+            facts.remember(ctx, call.to, call.data, result.return_data)
+        if isinstance(ctx, Web3Context):
+            ctx.remember_read(call.to, call.data, result.return_data)
+    return outcomes
+
+
+def _known_result(
+    ctx: Web3Context, facts: ImmutableFacts | None, call: Call[Any]
+) -> CallResult | None:
+    if facts is not None and call.immutable:
+        raw = facts.lookup(ctx, call.to, call.data, reverts=call.cache_revert)
+        if raw is not None:
+            # Empty: a getter the contract is known not to have
+            return CallResult(success=bool(raw), return_data=raw)
+    # Only a real context keeps shared reads; test doubles read through.
+    if (
+        isinstance(ctx, Web3Context)
+        and (raw := ctx.cached_read(call.to, call.data)) is not None
+    ):
+        return CallResult(success=True, return_data=raw)
+    return None
@@ -53,6 +53,8 @@ class PriceOracleMiddleware(ContractWrapper):
     # ── Compound method: event replay ──────────────────────────────────────
 
     def get_assets_price_sources(self) -> list[AssetPriceSource]:
+        if cache := self._vault_state():
+            return cache.price_sources()
         events = self._get_asset_price_source_updated_events()
         sources = []
         for event in events:
@@ -0,0 +1,374 @@
+"""Dependency-aware execution of contract reads.
+
+Most fetches are chains of dependent reads: vault → oracle address → prices,
+fee account → ``FEE_MANAGER()`` → recipients, balance fuses → substrates.
+`QueryPlan` lets the caller declare those reads as a DAG up front and then
+runs it in the fewest possible rounds. Every read whose inputs are known
+joins the same round, and a round's `Call`s travel as one Multicall3
+``aggregate3`` (see `ipor_fusion.core.multicall`). A fetch that used to be a
+dozen waves of single-read requests becomes one request per dependency level.
+
+Example:
+
+    plan = QueryPlan(ctx)
+    asset = plan.read(vault.underlying_asset_address())
+    oracle = plan.read(vault.get_price_oracle_middleware_address())
+    symbol = plan.then(lambda a: ERC20(ctx, a).symbol(), asset, optional=True)
+    price = plan.then(
+        lambda o, a: PriceOracleMiddleware(ctx, o).get_asset_price(a),
+        oracle,
+        asset,
+        optional=True,
+    )
+    plan.execute()  # two rounds, one aggregate3 each
+    symbol.result(), price.result()
+
+Node kinds:
+
+- `read` / `then` — one `Call` (a builder may return ``None`` to skip it).
+- `each` — fan-out to a list or dict of `Call`s; the value has the same shape.
+- `task` — arbitrary I/O run in the pool (event replays, block lookups).
+- `derive` — local computation over its inputs. It runs as soon as they land
+  and costs no round.
+
+A builder result that cannot be batched — a `Call` bound to a different
+context, or any other object with a ``call()`` method — is still executed in
+the same round, individually, in the pool.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from concurrent.futures import Executor, Future
+from typing import Any, Generic, TypeVar
+
+from ipor_fusion.core.context import Web3Context
+from ipor_fusion.core.contract import Call
+from ipor_fusion.core.multicall import call_all
+from ipor_fusion.core.profiling import span
+from ipor_fusion.core.scheduler import RpcScheduler
+from ipor_fusion.errors import RECOVERABLE_ERRORS
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+_Optional = bool | tuple[type[Exception], ...]
+
+_READ = "read"
+_EACH = "each"
+_TASK = "task"
+_DERIVE = "derive"
+
+
+class Node(Generic[T]):
+    """Handle to one planned value. Read it with `result()` after execution."""
+
+    __slots__ = (
+        "_kind",
+        "_fn",
+        "_deps",
+        "_level",
+        "_suppress",
+        "_done",
+        "_value",
+        "_error",
+    )
+
+    def __init__(
+        self,
+        kind: str,
+        fn: Callable[..., Any],
+        deps: tuple[Node[Any], ...],
+        level: int,
+        optional: _Optional,
+    ):
+        self._kind = kind
+        self._fn = fn
+        self._deps = deps
+        self._level = level
+        self._suppress: tuple[type[Exception], ...] = (
+            # `optional=True` swallows the errors the CLI has always degraded on.
+            RECOVERABLE_ERRORS if optional is True else optional or ()
+        )
+        self._done = False
+        self._value: Any = None
+        self._error: BaseException | None = None
+
+    def result(self) -> T:
+        """The value, or the node's failure re-raised. ``None`` for a
+        suppressed failure of an optional node."""
+        if not self._done:
+            raise RuntimeError("QueryPlan has not executed this node yet")
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+    def _suppresses(self, error: BaseException) -> bool:
+        return isinstance(error, self._suppress)
+
+    def _settle(self, value: Any = None, error: BaseException | None = None) -> None:
+        if error is not None and self._suppresses(error):
+            logger.debug("QueryPlan suppressed %s: %s", type(error).__name__, error)
+            value, error = None, None
+        self._value, self._error, self._done = value, error, True
+
+
+class QueryPlan:
+    """A DAG of reads executed level by level, one batched round per level.
+
+    Execution fails fast: when a non-optional node fails, `execute()` raises
+    that error at the end of its round (first failing node in declaration
+    order) and later rounds never start. Optional nodes settle to ``None``
+    instead, and ``each`` nodes do so per entry.
+
+    ``pool`` is borrowed when given (it also runs ``task`` nodes); otherwise
+    the plan runs in a task group on the context's `RpcScheduler`.
+    """
+
+    DEFAULT_BATCH_SIZE = 200
+
+    def __init__(
+        self,
+        ctx: Web3Context,
+        pool: Executor | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        self._ctx = ctx
+        self._pool = pool
+        self._batch_size = batch_size
+        self._nodes: list[Node[Any]] = []
+        self._executed = False
+        # Cleared after the first failed aggregate3 (e.g. Multicall3 not yet
+        # deployed at a pinned historical block) so later rounds go direct.
+        self._multicall = True
+
+    def read(self, call: Call[T] | Any, *, optional: _Optional = False) -> Node[T]:
+        """A read with no dependencies."""
+        return self._add(_READ, lambda: call, (), optional)
+
+    def then(
+        self,
+        build: Callable[..., Call[T] | Any | None],
+        *deps: Node[Any],
+        optional: _Optional = False,
+    ) -> Node[T]:
+        """A read built from the values of ``deps``; ``None`` skips it."""
+        return self._add(_READ, build, deps, optional)
+
+    def each(
+        self,
+        build: Callable[..., Iterable[Any] | Mapping[Any, Any]],
+        *deps: Node[Any],
+        optional: _Optional = False,
+    ) -> Node[Any]:
+        """Fan out to many reads built from ``deps``.
+
+        ``build`` returns a list (value: list of results) or a mapping (value:
+        dict with the same keys). With ``optional``, a suppressed failure
+        turns only that entry into ``None``.
+        """
+        return self._add(_EACH, build, deps, optional)
+
+    def task(
+        self,
+        fn: Callable[..., T],
+        *deps: Node[Any],
+        optional: _Optional = False,
+    ) -> Node[T]:
+        """Run ``fn(*dep_values)`` in the pool during the round after ``deps``."""
+        return self._add(_TASK, fn, deps, optional)
+
+    def derive(
+        self,
+        fn: Callable[..., T],
+        *deps: Node[Any],
+        optional: _Optional = False,
+    ) -> Node[T]:
+        """Compute ``fn(*dep_values)`` locally as soon as ``deps`` settle."""
+        return self._add(_DERIVE, fn, deps, optional)
+
+    def execute(self) -> None:
+        if self._executed:
+            raise RuntimeError("QueryPlan already executed")
+        self._executed = True
+        if self._pool is not None:
+            self._run(self._pool)
+            return
+        with RpcScheduler.for_context(self._ctx).group() as pool:
+            self._run(pool)
+
+    @property
+    def rounds(self) -> int:
+        """Number of rounds (dependency levels that perform I/O)."""
+        return len({n._level for n in self._nodes if n._kind != _DERIVE})
+
+    def _add(
+        self,
+        kind: str,
+        fn: Callable[..., Any],
+        deps: tuple[Node[Any], ...],
+        optional: _Optional,
+    ) -> Node[Any]:
+        if self._executed:
+            raise RuntimeError("QueryPlan already executed")
+        base = max((dep._level for dep in deps), default=-1)
+        # Derived values piggyback on the round that produced their inputs;
+        # everything else needs one more round trip. Dependency-free derives
+        # (constants) land on level -1, ahead of the first round.
+        node: Node[Any] = Node(
+            kind, fn, deps, base if kind == _DERIVE else base + 1, optional
+        )
+        self._nodes.append(node)
+        return node
+
+    def _run(self, pool: Executor) -> None:
+        for level in sorted({node._level for node in self._nodes}):
+            nodes = [node for node in self._nodes if node._level == level]
+            io = [node for node in nodes if node._kind != _DERIVE]
+            if io:
+                with span(f"plan round {level}", "phase", nodes=len(io)):
+                    self._run_round(io, pool)
+                self._raise_first_failure(io)
+            for node in nodes:
+                if node._kind == _DERIVE and (args := self._inputs(node)) is not None:
+                    try:
+                        node._settle(node._fn(*args))
+                    except Exception as exc:
+                        node._settle(error=exc)
+            self._raise_first_failure(nodes)
+
+    def _run_round(self, nodes: list[Node[Any]], pool: Executor) -> None:
+        jobs: list[Any] = []
+        slots: list[tuple[Node[Any], list[Any] | None, list[int]]] = []
+        tasks: list[tuple[Node[Any], Future[Any]]] = []
+        for node in nodes:
+            if (args := self._inputs(node)) is None:
+                continue
+            if node._kind == _TASK:
+                tasks.append((node, pool.submit(node._fn, *args)))
+                continue
+            try:
+                built = node._fn(*args)
+            except Exception as exc:
+                node._settle(error=exc)
+                continue
+            if node._kind == _READ:
+                if built is None:
+                    node._settle(None)
+                    continue
+                slots.append((node, None, [len(jobs)]))
+                jobs.append(built)
+                continue
+            if isinstance(built, Mapping):
+                keys: list[Any] | None = list(built.keys())
+                calls = list(built.values())
+            else:
+                keys, calls = None, list(built)
+            slots.append((node, keys, list(range(len(jobs), len(jobs) + len(calls)))))
+            jobs.extend(calls)
+
+        outcomes = self._execute_calls(jobs, pool)
+        for node, keys, indices in slots:
+            self._settle_reads(node, keys, [outcomes[i] for i in indices])
+        for node, future in tasks:
+            error = future.exception()
+            node._settle(None if error else future.result(), error)
+
+    def _execute_calls(self, calls: list[Any], pool: Executor) -> list[Any]:
+        """Run one round's reads; returns a value or exception per call."""
+        outcomes: list[Any] = [None] * len(calls)
+        batchable = [i for i, call in enumerate(calls) if self._batchable(call)]
+        if not self._multicall or len(batchable) < 2:
+            batchable = []
+        batched = set(batchable)
+        chunks = [
+            batchable[start : start + self._batch_size]
+            for start in range(0, len(batchable), self._batch_size)
+        ]
+        aggregates = [
+            (chunk, pool.submit(self._aggregate, [calls[i] for i in chunk]))
+            for chunk in chunks
+        ]
+        singles = {
+            i: pool.submit(self._call_one, calls[i])
+            for i in range(len(calls))
+            if i not in batched
+        }
+        for chunk, future in aggregates:
+            if isinstance(results := future.result(), BaseException):
+                logger.debug("aggregate3 failed, reading individually: %s", results)
+                self._multicall = False
+                singles.update(
+                    (i, pool.submit(self._call_one, calls[i])) for i in chunk
+                )
+                continue
+            for i, outcome in zip(chunk, results, strict=True):
+                outcomes[i] = outcome
+        for i, single in singles.items():
+            outcomes[i] = single.result()
+        return outcomes
+
+    def _batchable(self, call: Any) -> bool:
+        return (
+            isinstance(call, Call)
+            and bool(call.output_types)
+            and (call.ctx is None or call.ctx is self._ctx)
+        )
+
+    def _aggregate(self, calls: list[Call[Any]]) -> list[Any] | BaseException:
+        # Returned, not raised: a failed aggregate only means "read these
+        # individually", and must not count as a fatal error for the pool.
+        try:
+            return call_all(self._ctx, calls)
+        except Exception as exc:
+            return exc
+
+    def _call_one(self, call: Any) -> Any:
+        try:
+            if isinstance(call, Call) and call.ctx is None:
+                return call.call(self._ctx)
+            return call.call()
+        except Exception as exc:  # handed back as an outcome, like call_all()
+            return exc
+
+    @staticmethod
+    def _settle_reads(
+        node: Node[Any], keys: list[Any] | None, outcomes: Sequence[Any]
+    ) -> None:
+        if node._kind == _READ:
+            (outcome,) = outcomes
+            if isinstance(outcome, BaseException):
+                node._settle(error=outcome)
+            else:
+                node._settle(outcome)
+            return
+        values: list[Any] = []
+        for outcome in outcomes:
+            if not isinstance(outcome, BaseException):
+                values.append(outcome)
+            elif node._suppresses(outcome):
+                values.append(None)
+            else:
+                node._settle(error=outcome)
+                return
+        node._settle(
+            dict(zip(keys, values, strict=True)) if keys is not None else values
+        )
+
+    @staticmethod
+    def _inputs(node: Node[Any]) -> list[Any] | None:
+        """Dependency values, or ``None`` after failing `node` with the first
+        dependency error."""
+        for dep in node._deps:
+            if dep._error is not None:
+                node._settle(error=dep._error)
+                return None
+        return [dep._value for dep in node._deps]
+
+    @staticmethod
+    def _raise_first_failure(nodes: list[Node[Any]]) -> None:
+        for node in nodes:
+            if node._error is not None:
+                raise node._error
@@ -313,6 +313,8 @@ class PlasmaVault(ContractWrapper):
     # ── Compound methods: event replay, no `Call` shape ─────────────────────
 
     def get_balance_fuses(self) -> list[BalanceFuse]:
+        if cache := self._vault_state():
+            return cache.balance_fuses()
         # Replay Added/Removed events chronologically to mirror on-chain storage.
         # Sorting by (blockNumber, logIndex) handles provider-side ordering quirks
         # and re-add-after-remove cases that a set-subtraction approach misses.
@@ -335,6 +337,8 @@ class PlasmaVault(ContractWrapper):
         return list(state.values())
 
     def withdraw_manager_address(self) -> ChecksumAddress | None:
+        if cache := self._vault_state():
+            return cache.withdraw_manager()
         events = self._get_withdraw_manager_changed_events()
         sorted_events = sorted(
             events, key=lambda event: event["blockNumber"], reverse=True
@@ -0,0 +1,234 @@
+"""Chrome trace-event profiling for on-chain reads.
+
+A `Profiler` records spans — named, timed intervals pinned to the thread that
+ran them — and writes them as a Chrome trace-event file. Load the file in
+``chrome://tracing`` or https://ui.perfetto.dev to see every fetch phase,
+thread-pool task and RPC on per-thread tracks, which makes the critical path
+through a dependent read chain visible.
+
+Profiling is process-wide and opt-in: spans are recorded only while a
+profiler is active, so the instrumentation left in the fetch code costs a
+global lookup when nothing is listening.
+
+Example:
+
+    from ipor_fusion import Profiler
+
+    with Profiler() as profiler:
+        data = fetch_something(ctx)
+    profiler.write("out.json")
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from functools import partial
+from pathlib import Path
+from typing import Any, TypeVar
+
+from web3.middleware import Web3Middleware
+from web3.types import MakeRequestFn, RPCEndpoint, RPCResponse
+
+T = TypeVar("T")
+
+_active: Profiler | None = None
+_active_lock = threading.Lock()
+
+
+class Profiler:
+    """Collects spans and serializes them in the Chrome trace-event format.
+
+    Thread-safe: spans may be recorded from any thread. Only one profiler is
+    active per process; activating a second one while the first is running
+    raises ``RuntimeError`` rather than silently splitting the trace.
+    """
+
+    def __init__(self) -> None:
+        self._origin_ns = time.perf_counter_ns()
+        self._events: list[dict[str, Any]] = []
+        self._threads: dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> Profiler:
+        self.activate()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.deactivate()
+
+    def activate(self) -> None:
+        global _active
+        with _active_lock:
+            if _active is not None and _active is not self:
+                raise RuntimeError("another Profiler is already active")
+            _active = self
+
+    def deactivate(self) -> None:
+        global _active
+        with _active_lock:
+            if _active is self:
+                _active = None
+
+    @contextmanager
+    def span(self, name: str, category: str = "phase", **args: Any) -> Iterator[None]:
+        """Record the enclosed block as one complete ("X") event."""
+        start_ns = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, category, start_ns, time.perf_counter_ns(), args)
+
+    def record(
+        self,
+        name: str,
+        category: str,
+        start_ns: int,
+        end_ns: int,
+        args: dict[str, Any] | None = None,
+    ) -> None:
+        thread = threading.current_thread()
+        event: dict[str, Any] = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start_ns - self._origin_ns) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": os.getpid(),
+            "tid": thread.ident,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self._events.append(event)
+            self._threads.setdefault(thread.ident or 0, thread.name)
+
+    @property
+    def events(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return list(self._events)
+
+    def to_dict(self) -> dict[str, Any]:
+        """The trace as a JSON-ready dict: spans plus per-thread track names."""
+        pid = os.getpid()
+        with self._lock:
+            spans = sorted(self._events, key=lambda e: e["ts"])
+            thread_names = [
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"name": name},
+                }
+                for tid, name in self._threads.items()
+            ]
+        return {"traceEvents": thread_names + spans, "displayTimeUnit": "ms"}
+
+    def write(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.to_dict()), encoding="utf-8")
+
+
+def active_profiler() -> Profiler | None:
+    return _active
+
+
+def span(
+    name: str, category: str = "phase", **args: Any
+) -> AbstractContextManager[None]:
+    """Span on the active profiler; a no-op context when none is active."""
+    profiler = _active
+    if profiler is None:
+        return nullcontext()
+    return profiler.span(name, category, **args)
+
+
+def traced(fn: Callable[..., T], name: str | None = None) -> Callable[..., T]:
+    """Wrap `fn` so each invocation is recorded as a "task" span.
+
+    The profiler is looked up when the wrapper runs, not when it is built, so
+    wrapped callables can be created unconditionally.
+    """
+
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        profiler = _active
+        if profiler is None:
+            return fn(*args, **kwargs)
+        with profiler.span(name or _task_name(fn, args), "task"):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def _task_name(fn: Callable[..., Any], args: tuple[Any, ...]) -> str:
+    """Readable label for a pool task.
+
+    Pool tasks are mostly wrappers — ``_safe_call(call.call)``, partials,
+    bound ``Call.call`` methods — so unwrap to the innermost callable and,
+    for a contract read, name it by target address and selector.
+    """
+    while True:
+        if isinstance(fn, partial):
+            args = fn.args + args
+            fn = fn.func
+        elif args and callable(args[0]) and getattr(fn, "__name__", "") == "_safe_call":
+            fn, args = args[0], args[1:]
+        else:
+            break
+    owner = getattr(fn, "__self__", None)
+    to = getattr(owner, "to", None)
+    data = getattr(owner, "data", None)
+    if isinstance(to, str) and isinstance(data, bytes | bytearray):
+        return f"{getattr(fn, '__name__', 'call')} {to} 0x{bytes(data[:4]).hex()}"
+    return getattr(fn, "__qualname__", None) or repr(fn)
+
+
+class TracedThreadPoolExecutor(ThreadPoolExecutor):
+    """`ThreadPoolExecutor` whose tasks show up as spans on the worker tracks."""
+
+    def submit(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> Future[T]:
+        return super().submit(traced(fn), *args, **kwargs)
+
+
+class ProfilingMiddleware(Web3Middleware):
+    """web3 middleware recording every JSON-RPC request as an "rpc" span.
+
+    Installed by `Web3Context.from_url`; add it to a hand-built `Web3`
+    instance with ``web3.middleware_onion.add(ProfilingMiddleware)``.
+    """
+
+    def wrap_make_request(self, make_request: MakeRequestFn) -> MakeRequestFn:
+        def middleware(method: RPCEndpoint, params: Any) -> RPCResponse:
+            profiler = _active
+            if profiler is None:
+                return make_request(method, params)
+            with profiler.span(str(method), "rpc", **_rpc_args(method, params)):
+                return make_request(method, params)
+
+        return middleware
+
+
+def _rpc_args(method: str, params: Any) -> dict[str, Any]:
+    """Compact, trace-friendly summary of the request parameters."""
+    if not isinstance(params, list | tuple) or not params:
+        return {}
+    first = params[0]
+    if method == "eth_call" and isinstance(first, dict):
+        data = first.get("data") or first.get("input") or ""
+        data_hex = data if isinstance(data, str) else "0x" + bytes(data).hex()
+        args = {"to": first.get("to"), "selector": data_hex[:10]}
+        if len(params) > 1:
+            args["block"] = str(params[1])
+        return args
+    if method == "eth_getLogs" and isinstance(first, dict):
+        return {
+            "address": first.get("address"),
+            "from": str(first.get("fromBlock")),
+            "to": str(first.get("toBlock")),
+        }
+    return {"params": [str(p)[:66] for p in params]}
@@ -0,0 +1,145 @@
+"""Weighted load balancing of RPC reads across several endpoints.
+
+`FailoverProvider` sends each read to the single best endpoint and only uses
+the others when that one fails. That helps latency but not throughput: a
+fleet scan of hundreds of vaults is still capped by one provider's rate
+limit. `ProviderPool` spreads independent requests over every healthy
+endpoint instead. Each endpoint has:
+
+- a ``weight``: its share of traffic when all endpoints are equally fast,
+  for example plan quotas;
+- a ``max_in_flight`` cap on concurrent requests, which is never exceeded.
+
+A request goes to the endpoint with the least expected wait, that is
+``(in_flight + 1) × latency / weight`` using the observed EWMA latency.
+Faster endpoints therefore take more traffic than their weight alone gives
+them. When every endpoint is at its cap, the request waits for a free slot.
+Failover, ejection and block-lag probing work as in `FailoverProvider`.
+
+The pool is an ordinary web3 provider, so every wrapper (`PlasmaVault`,
+`MorphoReader`, ...) works on it unchanged:
+
+    pool = ProviderPool(
+        [Web3.HTTPProvider(a), Web3.HTTPProvider(b)],
+        weights=[3, 1],
+        max_in_flight=[24, 8],
+    )
+    ctx = Web3Context.from_provider(pool)
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from web3.providers import BaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from ipor_fusion.core.failover import Endpoint, FailoverProvider, _Throttled
+from ipor_fusion.core.ratecontrol import IDEMPOTENT_METHODS
+
+
+class ProviderPool(FailoverProvider):
+    """Shards requests over endpoints by weight and observed throughput."""
+
+    DEFAULT_MAX_IN_FLIGHT = 8
+
+    def __init__(
+        self,
+        providers: Sequence[BaseProvider],
+        weights: Sequence[float] | None = None,
+        max_in_flight: int | Sequence[int] = DEFAULT_MAX_IN_FLIGHT,
+        max_block_lag: int = FailoverProvider.DEFAULT_MAX_BLOCK_LAG,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(
+            providers, hedge=False, max_block_lag=max_block_lag, clock=clock
+        )
+        weights = list(weights) if weights is not None else [1.0] * len(providers)
+        caps = (
+            [max_in_flight] * len(providers)
+            if isinstance(max_in_flight, int)
+            else list(max_in_flight)
+        )
+        if len(weights) != len(providers) or len(caps) != len(providers):
+            raise ValueError("weights and max_in_flight need one entry per provider")
+        if any(w <= 0 for w in weights) or any(c < 1 for c in caps):
+            raise ValueError("weights must be positive and caps at least 1")
+        for endpoint, weight, cap in zip(self.endpoints, weights, caps, strict=True):
+            endpoint.weight = weight
+            endpoint.max_in_flight = cap
+        self._slots = threading.Condition()
+
+    @property
+    def max_in_flight(self) -> int:
+        """Total concurrent requests the pool admits; sizes the scheduler and
+        rate limiter `Web3Context` pairs with it."""
+        return sum(e.max_in_flight or 0 for e in self.endpoints)
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        self._maybe_probe()
+        tried: list[Endpoint] = []
+        failure: BaseException | _Throttled | None = None
+        while (endpoint := self._checkout(tried)) is not None:
+            tried.append(endpoint)
+            try:
+                outcome: Any = self._timed(endpoint, method, params)
+            except Exception as exc:
+                outcome = exc
+            finally:
+                self._checkin(endpoint)
+            if not isinstance(outcome, BaseException | _Throttled):
+                return outcome
+            self.eject(endpoint, outcome)
+            failure = outcome
+            if method not in IDEMPOTENT_METHODS:
+                break
+        return self._give_up(failure)
+
+    def ranked(self) -> list[Endpoint]:
+        """Endpoints by expected wait, healthy first."""
+        now = self._clock()
+        typical = self._typical_latency()
+        return sorted(
+            self.endpoints,
+            key=lambda e: (not e.healthy(now), self._expected_wait(e, typical)),
+        )
+
+    def _checkout(self, tried: list[Endpoint]) -> Endpoint | None:
+        """Reserve a slot on the best untried endpoint, waiting while all of
+        them are full. ``None`` once every endpoint has been tried.
+
+        Ejected endpoints are used only after every healthy one was tried.
+        """
+        with self._slots:
+            while True:
+                now = self._clock()
+                left = [e for e in self.endpoints if e not in tried]
+                if not left:
+                    return None
+                usable = [e for e in left if e.healthy(now)] or left
+                free = [e for e in usable if e.in_flight < (e.max_in_flight or 1)]
+                if free:
+                    typical = self._typical_latency()
+                    best = min(free, key=lambda e: self._expected_wait(e, typical))
+                    best.in_flight += 1
+                    return best
+                self._slots.wait()
+
+    def _checkin(self, endpoint: Endpoint) -> None:
+        with self._slots:
+            endpoint.in_flight -= 1
+            self._slots.notify_all()
+
+    def _typical_latency(self) -> float:
+        """Stand-in latency for endpoints not measured yet: the mean of the
+        measured ones, so a cold pool splits traffic by weight alone."""
+        measured = [e.latency for e in self.endpoints if e.latency is not None]
+        return sum(measured) / len(measured) if measured else 1.0
+
+    @staticmethod
+    def _expected_wait(endpoint: Endpoint, typical: float) -> float:
+        latency = endpoint.latency if endpoint.latency is not None else typical
+        return (endpoint.in_flight + 1) * latency / endpoint.weight
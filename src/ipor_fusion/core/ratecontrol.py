@@ -0,0 +1,286 @@
+"""Adaptive concurrency and retry control for JSON-RPC traffic.
+
+Public RPC endpoints throttle hard and without warning. Without client-side
+control, a burst of parallel reads earns a wall of HTTP 429s that the CLI then
+swallows into ``None``s. `AimdLimiter` bounds in-flight requests per endpoint
+and adapts the bound the way TCP adapts its congestion window:
+
+- Additive increase: every request that completes at about the endpoint's
+  baseline latency grows the limit by ``1/limit``, so roughly +1 per window.
+- Multiplicative decrease: a rate-limit response or a timeout halves it, at
+  most once per cooldown, so a burst of 429s from one window counts once.
+
+`AdaptiveRateMiddleware` applies the limiter to every request of a `Web3`
+instance. It retries idempotent reads after rate limits and transient
+transport failures, using full-jitter exponential backoff and honouring
+``Retry-After``. Writes (``eth_sendRawTransaction``) are never retried.
+`Web3Context.from_url` installs it and turns off the provider's own blind
+retry, so exactly one policy applies.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import re
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+import requests
+from web3.middleware import Web3Middleware
+from web3.types import MakeRequestFn, RPCEndpoint, RPCResponse
+
+logger = logging.getLogger(__name__)
+
+# Reads that return the same answer however often they are sent.
+IDEMPOTENT_METHODS = frozenset(
+    {
+        "eth_blockNumber",
+        "eth_call",
+        "eth_chainId",
+        "eth_estimateGas",
+        "eth_feeHistory",
+        "eth_gasPrice",
+        "eth_getBalance",
+        "eth_getBlockByHash",
+        "eth_getBlockByNumber",
+        "eth_getCode",
+        "eth_getLogs",
+        "eth_getStorageAt",
+        "eth_getTransactionByHash",
+        "eth_getTransactionCount",
+        "eth_getTransactionReceipt",
+        "eth_maxPriorityFeePerGas",
+        "net_version",
+        "web3_clientVersion",
+    }
+)
+
+_RATE_LIMIT_CODES = frozenset({429, -32029})
+# Provider wording varies: "rate limit exceeded", "Too Many Requests",
+# "exceeded its compute units per second capacity", "request limit reached".
+_RATE_LIMIT_MESSAGE = re.compile(
+    r"rate.?limit|too many requests|exceeded .*capacity|request limit",
+    re.IGNORECASE,
+)
+_TRANSIENT_HTTP_STATUSES = frozenset({502, 503, 504})
+
+# Outcomes a request reports back to the limiter.
+OK = "ok"
+THROTTLED = "throttled"  # back off and shrink the limit
+TRANSIENT = "transient"  # back off, limit unchanged
+FAILED = "failed"  # not worth retrying
+
+
+class AimdLimiter:
+    """Concurrency limit for one endpoint, adapted from request outcomes.
+
+    ``acquire`` blocks while ``limit`` requests are in flight; ``release``
+    reports how the request went. ``limit`` is a float; its integer part
+    is the number of slots.
+    """
+
+    DEFAULT_INITIAL = 8.0
+    DEFAULT_MIN = 1.0
+    DEFAULT_MAX = 32.0
+    # A request counts as "fast" while its latency stays within this factor
+    # of the endpoint's baseline for the same method.
+    LATENCY_TOLERANCE = 2.0
+    DECREASE_COOLDOWN_S = 1.0
+
+    _registry: dict[str, AimdLimiter] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(
+        self,
+        initial: float = DEFAULT_INITIAL,
+        minimum: float = DEFAULT_MIN,
+        maximum: float = DEFAULT_MAX,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("expected 1 <= minimum <= initial <= maximum")
+        self._limit = initial
+        self._min = minimum
+        self._max = maximum
+        self._clock = clock
+        self._in_flight = 0
+        self._baselines: dict[str, float] = {}
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+
+    @classmethod
+    def shared(cls, key: str, capacity: int | None = None) -> AimdLimiter:
+        """The process-wide limiter for ``key`` (a provider endpoint).
+
+        ``capacity`` (a `ProviderPool`'s total slots) raises the starting and
+        maximum limit; it only applies when this call creates the limiter.
+        """
+        with cls._registry_lock:
+            limiter = cls._registry.get(key)
+            if limiter is None:
+                limiter = cls._registry[key] = (
+                    cls()
+                    if capacity is None
+                    else cls(
+                        initial=max(cls.DEFAULT_INITIAL, capacity),
+                        maximum=max(cls.DEFAULT_MAX, capacity),
+                    )
+                )
+            return limiter
+
+    @property
+    def limit(self) -> float:
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self, method: str, latency_s: float, outcome: str) -> None:
+        with self._cond:
+            # Grow only when the window was full; otherwise the limit was
+            # not what held the caller back.
+            saturated = self._in_flight >= int(self._limit)
+            self._in_flight -= 1
+            if outcome == THROTTLED:
+                self._decrease()
+            elif outcome == OK and self._is_fast(method, latency_s) and saturated:
+                self._limit = min(self._max, self._limit + 1 / self._limit)
+            self._cond.notify_all()
+
+    def _is_fast(self, method: str, latency_s: float) -> bool:
+        baseline = self._baselines.get(method)
+        if baseline is None or latency_s < baseline:
+            self._baselines[method] = latency_s
+            return True
+        # Drift up slowly so a permanently slower link stops looking congested.
+        self._baselines[method] = baseline + (latency_s - baseline) * 0.01
+        return latency_s <= baseline * self.LATENCY_TOLERANCE
+
+    def _decrease(self) -> None:
+        now = self._clock()
+        if now - self._last_decrease < self.DECREASE_COOLDOWN_S:
+            return
+        self._last_decrease = now
+        self._limit = max(self._min, self._limit / 2)
+        logger.debug("RPC rate limited; concurrency limit now %.1f", self._limit)
+
+
+class AdaptiveRateMiddleware(Web3Middleware):
+    """web3 middleware: per-endpoint AIMD concurrency plus read retries.
+
+    Installed by `Web3Context.from_url`; add it to a hand-built `Web3`
+    instance with ``web3.middleware_onion.add(AdaptiveRateMiddleware)``.
+    """
+
+    MAX_ATTEMPTS = 4
+    BACKOFF_BASE_S = 0.25
+    BACKOFF_CAP_S = 8.0
+
+    limiter: AimdLimiter | None = None
+    sleep: Callable[[float], None] = staticmethod(time.sleep)
+
+    def wrap_make_request(self, make_request: MakeRequestFn) -> MakeRequestFn:
+        def middleware(method: RPCEndpoint, params: Any) -> RPCResponse:
+            limiter = self._limiter()
+            retry = method in IDEMPOTENT_METHODS
+            attempt = 1
+            while True:
+                limiter.acquire()
+                started = time.monotonic()
+                try:
+                    response = make_request(method, params)
+                except Exception as exc:
+                    outcome = classify_error(exc)
+                    limiter.release(method, time.monotonic() - started, outcome)
+                    if not (
+                        retry and outcome != FAILED and attempt < self.MAX_ATTEMPTS
+                    ):
+                        raise
+                    self._backoff(method, attempt, exc, _retry_after(exc))
+                else:
+                    outcome = classify_response(response)
+                    limiter.release(method, time.monotonic() - started, outcome)
+                    if not (
+                        retry and outcome == THROTTLED and attempt < self.MAX_ATTEMPTS
+                    ):
+                        return response
+                    self._backoff(method, attempt, response["error"], None)
+                attempt += 1
+
+        return middleware
+
+    def _limiter(self) -> AimdLimiter:
+        if self.limiter is None:
+            provider = self._w3.provider
+            endpoint = getattr(provider, "endpoint_uri", None)
+            capacity = getattr(provider, "max_in_flight", None)
+            self.limiter = AimdLimiter.shared(
+                endpoint if isinstance(endpoint, str) else "default",
+                capacity=capacity if isinstance(capacity, int) else None,
+            )
+        return self.limiter
+
+    def _backoff(
+        self, method: str, attempt: int, cause: Any, retry_after: float | None
+    ) -> None:
+        ceiling = min(self.BACKOFF_CAP_S, self.BACKOFF_BASE_S * 2 ** (attempt - 1))
+        # Full jitter spreads retries from parallel workers apart.
+        delay = random.uniform(0, ceiling)  # noqa: S311  # jitter, not crypto
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.BACKOFF_CAP_S))
+        logger.debug(
+            "Retrying %s in %.2fs (attempt %d): %s", method, delay, attempt, cause
+        )
+        self.sleep(delay)
+
+
+def classify_response(response: RPCResponse) -> str:
+    """``THROTTLED`` for a rate-limit error response, else ``OK``."""
+    error = response.get("error") if isinstance(response, dict) else None
+    if not isinstance(error, dict):
+        return OK
+    if error.get("code") in _RATE_LIMIT_CODES or _RATE_LIMIT_MESSAGE.search(
+        str(error.get("message", ""))
+    ):
+        return THROTTLED
+    # A JSON-RPC error (revert, bad params) is still a healthy round trip.
+    return OK
+
+
+def classify_error(exc: Exception) -> str:
+    """``THROTTLED`` or ``TRANSIENT`` for retryable failures, else ``FAILED``."""
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        status = exc.response.status_code
+        if status == 429:
+            return THROTTLED
+        return TRANSIENT if status in _TRANSIENT_HTTP_STATUSES else FAILED
+    if isinstance(exc, requests.Timeout):
+        # An overloaded endpoint often stalls instead of answering 429.
+        return THROTTLED
+    if isinstance(exc, requests.ConnectionError):
+        return TRANSIENT
+    # The same failures from `SyncWebSocketProvider`.
+    if isinstance(exc, TimeoutError):
+        return THROTTLED
+    if isinstance(exc, ConnectionError):
+        return TRANSIENT
+    return FAILED
+
+
+def _retry_after(exc: Exception) -> float | None:
+    response = getattr(exc, "response", None)
+    header = getattr(response, "headers", {}).get("Retry-After")
+    try:
+        return max(0.0, float(header)) if header is not None else None
+    except ValueError:  # an HTTP date; fall back to our own backoff
+        return None
@@ -0,0 +1,297 @@
+"""Process-wide, per-provider bounded scheduler for RPC work.
+
+Every fetch used to spin up its own default-sized ``ThreadPoolExecutor`` —
+often from inside a task of another pool — so one vault could hold dozens of
+threads hammering a single endpoint, and many vaults in one process
+multiplied that. `RpcScheduler` replaces those pools. There is one instance
+per provider endpoint (`RpcScheduler.shared`) with a fixed number of workers
+and a priority queue. Callers submit through a `TaskGroup`, an ``Executor``
+that is a drop-in for the old pools:
+
+    with RpcScheduler.for_context(ctx).group() as pool:
+        f_name = pool.submit(vault.name().call)
+        f_supply = pool.submit(vault.total_supply().call)
+
+Groups add two things a plain pool lacks:
+
+- Priority. Lower numbers run first, so a background scan
+  (`PRIORITY_LOW`) never delays the reads a user is waiting on.
+- Fail-fast. The first fatal error in a group — anything outside
+  `RECOVERABLE_ERRORS`, such as a dropped connection or an HTTP 429 — fails
+  every task still queued in that group with the same error instead of
+  sending them to a provider that is already failing.
+
+Nested fan-out is safe. When a worker blocks on a future from the same
+scheduler, it runs queued tasks while it waits. A task that opens its own
+group therefore cannot deadlock the bounded pool.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+from collections.abc import Callable
+from concurrent.futures import CancelledError, Executor, Future
+from concurrent.futures import wait as wait_futures
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from ipor_fusion.core.profiling import traced
+from ipor_fusion.errors import RECOVERABLE_ERRORS
+
+T = TypeVar("T")
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+
+# How long a helping worker blocks on a running future before it checks the
+# queue again for tasks it could run meanwhile.
+_HELP_POLL_S = 0.05
+
+
+def _is_fatal(error: BaseException) -> bool:
+    return not isinstance(error, RECOVERABLE_ERRORS)
+
+
+@dataclass(order=True, slots=True)
+class _Job:
+    priority: int
+    seq: int
+    future: Future[Any] = field(compare=False)
+    group: TaskGroup | None = field(compare=False)
+    fn: Callable[..., Any] = field(compare=False)
+    args: tuple[Any, ...] = field(compare=False)
+    kwargs: dict[str, Any] = field(compare=False)
+
+
+class _SchedulerFuture(Future):
+    """Future whose blocking getters keep a waiting worker busy.
+
+    A worker that blocks on work queued behind it would hold one of the
+    scheduler's few slots while doing nothing. When it waits, it pops queued
+    tasks and runs them until its own future completes.
+    """
+
+    def __init__(self, scheduler: RpcScheduler):
+        super().__init__()
+        self._scheduler = scheduler
+
+    def result(self, timeout: float | None = None) -> Any:
+        self._scheduler._help_until(self, timeout)
+        return super().result(timeout)
+
+    def exception(self, timeout: float | None = None) -> BaseException | None:
+        self._scheduler._help_until(self, timeout)
+        return super().exception(timeout)
+
+
+class RpcScheduler:
+    """Bounded worker pool with a priority queue, shared per provider.
+
+    Workers are daemon threads, started lazily up to ``max_workers`` and kept
+    for the life of the process. Tasks are profiled like the pools they
+    replace (see `ipor_fusion.core.profiling`).
+    """
+
+    DEFAULT_MAX_WORKERS = 8
+    DEFAULT_KEY = "default"
+
+    _registry: dict[str, RpcScheduler] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, name: str = "rpc"):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self._max_workers = max_workers
+        self._name = name
+        self._queue: list[_Job] = []
+        self._cond = threading.Condition()
+        self._workers = 0
+        self._idle = 0
+        self._seq = itertools.count()
+        self._local = threading.local()
+
+    @classmethod
+    def shared(
+        cls, key: str = DEFAULT_KEY, max_workers: int | None = None
+    ) -> RpcScheduler:
+        """The process-wide scheduler for ``key`` (a provider endpoint).
+
+        ``max_workers`` only applies when this call creates the scheduler.
+        """
+        with cls._registry_lock:
+            scheduler = cls._registry.get(key)
+            if scheduler is None:
+                scheduler = cls(
+                    max_workers=max_workers or cls.DEFAULT_MAX_WORKERS,
+                    name=f"rpc-{len(cls._registry)}",
+                )
+                cls._registry[key] = scheduler
+            return scheduler
+
+    @classmethod
+    def for_context(cls, ctx: Any) -> RpcScheduler:
+        """The scheduler a context carries, or the default one.
+
+        Tolerates contexts that are not `Web3Context`s (test doubles, adapters)
+        by falling back to the shared default.
+        """
+        scheduler = getattr(ctx, "scheduler", None)
+        if isinstance(scheduler, RpcScheduler):
+            return scheduler
+        return cls.shared()
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def group(
+        self,
+        priority: int = PRIORITY_NORMAL,
+        fatal: Callable[[BaseException], bool] = _is_fatal,
+    ) -> TaskGroup:
+        """A new task group. ``fatal`` decides which errors fail the group."""
+        return TaskGroup(self, priority, fatal)
+
+    def _submit(
+        self,
+        priority: int,
+        group: TaskGroup | None,
+        fn: Callable[..., Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> Future[Any]:
+        future = _SchedulerFuture(self)
+        job = _Job(priority, next(self._seq), future, group, fn, args, kwargs)
+        with self._cond:
+            heapq.heappush(self._queue, job)
+            if self._idle:
+                # The waker, not the woken worker, takes the worker off the
+                # idle count, so back-to-back submits wake distinct workers.
+                self._idle -= 1
+                self._cond.notify()
+            elif self._workers < self._max_workers:
+                self._workers += 1
+                threading.Thread(
+                    target=self._work,
+                    name=f"ipor-{self._name}-{self._workers}",
+                    daemon=True,
+                ).start()
+        return future
+
+    def _work(self) -> None:
+        self._local.is_worker = True
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._idle += 1
+                    self._cond.wait()
+                job = heapq.heappop(self._queue)
+            self._run(job)
+
+    def _pop(self) -> _Job | None:
+        with self._cond:
+            return heapq.heappop(self._queue) if self._queue else None
+
+    def _run(self, job: _Job) -> None:
+        if not job.future.set_running_or_notify_cancel():
+            return
+        try:
+            result = traced(job.fn)(*job.args, **job.kwargs)
+        except BaseException as exc:
+            job.future.set_exception(exc)
+            if job.group is not None:
+                job.group._task_failed(exc)
+        else:
+            job.future.set_result(result)
+
+    def _help_until(self, future: Future[Any], timeout: float | None) -> None:
+        if timeout is not None or not getattr(self._local, "is_worker", False):
+            return
+        while not future.done():
+            if (job := self._pop()) is not None:
+                self._run(job)
+            else:
+                wait_futures([future], timeout=_HELP_POLL_S)
+
+    def _fail_queued(self, group: TaskGroup, error: BaseException) -> None:
+        """Fail every still-queued task of ``group`` without running it."""
+        with self._cond:
+            dropped = [job for job in self._queue if job.group is group]
+            if not dropped:
+                return
+            self._queue = [job for job in self._queue if job.group is not group]
+            heapq.heapify(self._queue)
+        for job in dropped:
+            if isinstance(error, CancelledError):
+                job.future.cancel()
+            else:
+                job.future.set_exception(error)
+
+
+class TaskGroup(Executor):
+    """Tasks submitted together at one priority, failing together.
+
+    An ``Executor``: use it wherever a ``ThreadPoolExecutor`` was used. Leaving
+    the ``with`` block waits for every task. If the block raises, queued tasks
+    are cancelled instead.
+    """
+
+    def __init__(
+        self,
+        scheduler: RpcScheduler,
+        priority: int,
+        fatal: Callable[[BaseException], bool],
+    ):
+        self._scheduler = scheduler
+        self._priority = priority
+        self._fatal = fatal
+        self._futures: list[Future[Any]] = []
+        self._lock = threading.Lock()
+        self._error: BaseException | None = None
+
+    @property
+    def error(self) -> BaseException | None:
+        """The fatal error that failed this group, if any."""
+        return self._error
+
+    def submit(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> Future[T]:
+        if self._error is not None:
+            failed: Future[T] = Future()
+            failed.set_exception(self._error)
+            return failed
+        future = self._scheduler._submit(self._priority, self, fn, args, kwargs)
+        with self._lock:
+            self._futures.append(future)
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        if cancel_futures:
+            self._scheduler._fail_queued(self, CancelledError())
+        if not wait:
+            return
+        waited = 0
+        # Tasks may submit follow-up tasks to their own group; keep draining.
+        while True:
+            with self._lock:
+                pending = self._futures[waited:]
+            if not pending:
+                return
+            for future in pending:
+                if not future.cancelled():
+                    future.exception()
+            waited += len(pending)
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.shutdown(wait=True, cancel_futures=exc_type is not None)
+
+    def _task_failed(self, error: BaseException) -> None:
+        if not self._fatal(error):
+            return
+        with self._lock:
+            if self._error is not None:
+                return
+            self._error = error
+        self._scheduler._fail_queued(self, error)
@@ -0,0 +1,55 @@
+"""Coalescing of concurrent identical work ("single-flight").
+
+Parallel fetch phases often ask for the same thing at the same moment, for
+example a token's ``decimals()`` from the balance table and from the price
+breakdown. `SingleFlight` lets the first caller for a key do the work while
+later callers with the same key wait for it. All of them get the same result
+or the same exception. Nothing is cached: once a flight lands, the next call
+for that key starts a new one.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any, Generic, TypeVar
+
+V = TypeVar("V")
+
+
+@dataclass(slots=True)
+class _Flight:
+    done: threading.Event = field(default_factory=threading.Event)
+    value: Any = None
+    error: BaseException | None = None
+
+
+class SingleFlight(Generic[V]):
+    """Runs at most one ``fn`` per key at a time; concurrent callers share it."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: dict[Hashable, _Flight] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], V]) -> V:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value  # type: ignore[no-any-return]
+        try:
+            flight.value = fn()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.value  # type: ignore[no-any-return]
@@ -0,0 +1,410 @@
+"""In-memory vault state, kept current by applying new events as deltas.
+
+The compound methods (`PlasmaVault.get_balance_fuses`,
+`AccessManager.get_all_role_accounts`, `WithdrawManager.get_pending_requests`
+and friends) rebuild their answer on every call: a full-history
+``eth_getLogs`` and, for roles, one ``hasRole`` read per account. A
+long-running service such as the MCP server paid that on every request.
+
+`VaultStateCache` replays those events once, decodes them into the state they
+describe, and from then on only folds in new ones. `sync` fetches the logs
+since its last block in one ``eth_getLogs`` over the vault and its managers;
+`apply` takes single logs, e.g. from `subscribe` on a WebSocket context. The
+compound methods look the state up (`VaultStateCache.tracking`) instead of
+replaying, so a warm answer costs no RPC at all.
+
+Only caches registered with `VaultStateCache.shared` are consulted, and only
+for reads at the head (``ctx.default_block == "latest"``): a read pinned to a
+block goes to the node as before, as does any read while the last `sync`
+failed or more than `VaultStateCache.MAX_AGE_S` after the last successful
+one. A service keeps the cache in use by syncing at least that often, as
+the MCP server does on every request. A reorg (a log delivered with ``removed`` set) or a new access
+manager, price oracle or withdraw manager marks the cache stale, and the
+next `sync` replays everything again.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+
+from eth_abi import decode
+from eth_typing import ChecksumAddress
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.types import LogReceipt
+
+from ipor_fusion.core.access import RoleAccount
+from ipor_fusion.core.context import Web3Context
+from ipor_fusion.core.oracle import AssetPriceSource
+from ipor_fusion.core.plasma_vault import BalanceFuse, PlasmaVault
+from ipor_fusion.core.websocket import Subscription
+from ipor_fusion.types import Period, RoleId
+
+logger = logging.getLogger(__name__)
+
+
+def _topic(signature: str) -> str:
+    return HexBytes(Web3.keccak(text=signature)).to_0x_hex()
+
+
+BALANCE_FUSE_ADDED = _topic("BalanceFuseAdded(uint256,address)")
+BALANCE_FUSE_REMOVED = _topic("BalanceFuseRemoved(uint256,address)")
+WITHDRAW_MANAGER_CHANGED = _topic("WithdrawManagerChanged(address)")
+PRICE_ORACLE_CHANGED = _topic("PriceOracleMiddlewareChanged(address)")
+AUTHORITY_UPDATED = _topic("AuthorityUpdated(address)")
+ROLE_GRANTED = _topic("RoleGranted(uint64,address,uint32,uint48,bool)")
+ROLE_REVOKED = _topic("RoleRevoked(uint64,address)")
+PRICE_SOURCE_UPDATED = _topic("AssetPriceSourceUpdated(address,address)")
+WITHDRAW_REQUEST_UPDATED = _topic("WithdrawRequestUpdated(address,uint256,uint32)")
+
+VAULT_TOPICS = [
+    BALANCE_FUSE_ADDED,
+    BALANCE_FUSE_REMOVED,
+    WITHDRAW_MANAGER_CHANGED,
+    PRICE_ORACLE_CHANGED,
+    AUTHORITY_UPDATED,
+]
+MANAGER_TOPICS = [
+    ROLE_GRANTED,
+    ROLE_REVOKED,
+    PRICE_SOURCE_UPDATED,
+    WITHDRAW_REQUEST_UPDATED,
+]
+# Vault events that move the state to other contracts: their history is not
+# in the cache, so it is replayed from scratch.
+_MANAGER_CHANGES = frozenset(
+    {WITHDRAW_MANAGER_CHANGED, PRICE_ORACLE_CHANGED, AUTHORITY_UPDATED}
+)
+
+# Log index above any real one: `(block, _END_OF_BLOCK)` marks a block as
+# fully applied.
+_END_OF_BLOCK = 2**63
+
+
+@dataclass(slots=True)
+class _Grant:
+    """A role membership as AccessManager stores it."""
+
+    since: int
+    delay: Period
+    # Re-granting a member schedules its new execution delay for `effect`.
+    next_delay: Period
+    effect: int
+
+    def delay_at(self, timestamp: int) -> Period:
+        return self.next_delay if self.effect <= timestamp else self.delay
+
+
+@dataclass
+class _State:
+    """Decoded state as of `block`; `last` is the newest log applied."""
+
+    block: int
+    timestamp: int
+    access_manager: ChecksumAddress
+    price_oracle: ChecksumAddress
+    withdraw_manager: ChecksumAddress | None = None
+    last: tuple[int, int] = (-1, -1)
+    stale: bool = False
+    balance_fuses: dict[int, ChecksumAddress] = field(default_factory=dict)
+    grants: dict[tuple[RoleId, ChecksumAddress], _Grant] = field(default_factory=dict)
+    price_sources: list[AssetPriceSource] = field(default_factory=list)
+    # account -> (shares, end of withdraw window)
+    withdraw_requests: dict[ChecksumAddress, tuple[int, int]] = field(
+        default_factory=dict
+    )
+
+    def addresses(self) -> list[ChecksumAddress]:
+        managers = [self.access_manager, self.price_oracle, self.withdraw_manager]
+        return [address for address in managers if address is not None]
+
+    def apply(self, log: LogReceipt, live: bool) -> None:
+        position = (log["blockNumber"], log["logIndex"])
+        if live and position <= self.last:
+            return  # already in; `sync` and a subscription overlap
+        self.last = max(self.last, position)
+        topic = HexBytes(log["topics"][0]).to_0x_hex()
+        if topic in _MANAGER_CHANGES:
+            if live:
+                self.stale = True
+            elif topic == WITHDRAW_MANAGER_CHANGED:
+                (address,) = decode(["address"], log["data"])
+                self.withdraw_manager = Web3.to_checksum_address(address)
+        elif topic in (BALANCE_FUSE_ADDED, BALANCE_FUSE_REMOVED):
+            self._apply_balance_fuse(log, added=topic == BALANCE_FUSE_ADDED)
+        elif topic in (ROLE_GRANTED, ROLE_REVOKED):
+            self._apply_role(log, granted=topic == ROLE_GRANTED)
+        elif topic == PRICE_SOURCE_UPDATED:
+            (asset, source) = decode(["address", "address"], log["data"])
+            self.price_sources.append(
+                AssetPriceSource(
+                    asset=Web3.to_checksum_address(asset),
+                    source=Web3.to_checksum_address(source),
+                )
+            )
+        elif topic == WITHDRAW_REQUEST_UPDATED:
+            (account, amount, end) = decode(
+                ["address", "uint256", "uint32"], log["data"]
+            )
+            self.withdraw_requests[Web3.to_checksum_address(account)] = (amount, end)
+
+    def _apply_balance_fuse(self, log: LogReceipt, added: bool) -> None:
+        (market_id, fuse) = decode(["uint256", "address"], log["data"])
+        checksum = Web3.to_checksum_address(fuse)
+        if added:
+            self.balance_fuses[market_id] = checksum
+        elif self.balance_fuses.get(market_id) == checksum:
+            del self.balance_fuses[market_id]
+
+    def _apply_role(self, log: LogReceipt, granted: bool) -> None:
+        (role_id,) = decode(["uint64"], log["topics"][1])
+        (account,) = decode(["address"], log["topics"][2])
+        key = (RoleId(role_id), Web3.to_checksum_address(account))
+        if not granted:
+            self.grants.pop(key, None)
+            return
+        (delay, since, new_member) = decode(["uint32", "uint48", "bool"], log["data"])
+        current = self.grants.get(key)
+        if new_member or current is None:
+            self.grants[key] = _Grant(since, Period(delay), Period(delay), since)
+        else:
+            # For a member, `since` is when the new delay takes effect.
+            current.delay = current.delay_at(since)
+            current.next_delay = Period(delay)
+            current.effect = since
+
+
+class VaultStateCache:
+    """Decoded balance fuses, roles, price sources and withdraw requests of
+    one vault, updated from its events."""
+
+    # How long after a successful sync the state answers for the head.
+    MAX_AGE_S = 60
+
+    _registry: dict[str, VaultStateCache] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(
+        self,
+        chain_id: int,
+        vault: ChecksumAddress,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.chain_id = chain_id
+        self.vault = Web3.to_checksum_address(vault)
+        self._clock = clock
+        self._state: _State | None = None
+        self._in_sync = False
+        self._synced_at = 0.0
+        self._lock = threading.Lock()
+        # One sync at a time; readers only wait for `_lock`.
+        self._sync_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, chain_id: int, vault: ChecksumAddress) -> VaultStateCache:
+        """The process-wide cache for ``vault``, which the compound methods
+        consult. Created empty: `sync` it before relying on it."""
+        key = f"{chain_id}:{vault}".lower()
+        with cls._registry_lock:
+            cache = cls._registry.get(key)
+            if cache is None:
+                cache = cls._registry[key] = cls(chain_id, vault)
+            return cache
+
+    @classmethod
+    def tracking(cls, ctx: object, address: str) -> VaultStateCache | None:
+        """A registered cache that can answer for contract ``address`` at
+        the head of ``ctx``'s chain, or ``None``."""
+        if not isinstance(ctx, Web3Context) or ctx.default_block != "latest":
+            return None
+        with cls._registry_lock:
+            caches = list(cls._registry.values())
+        for cache in caches:
+            if cache.chain_id == ctx.chain_id and cache.covers(address):
+                return cache
+        return None
+
+    @classmethod
+    def clear_shared(cls) -> None:
+        with cls._registry_lock:
+            cls._registry.clear()
+
+    @property
+    def block_number(self) -> int | None:
+        """The block the state is exact at, or ``None`` before the first load."""
+        state = self._state
+        return None if state is None else state.block
+
+    def covers(self, address: str) -> bool:
+        """Whether the state is usable, synced within `MAX_AGE_S`, and
+        includes contract ``address``."""
+        with self._lock:
+            state = self._state
+            if state is None or state.stale or not self._in_sync:
+                return False
+            if self._clock() - self._synced_at > self.MAX_AGE_S:
+                return False
+            return address.lower() in {
+                a.lower() for a in [self.vault, *state.addresses()]
+            }
+
+    # ── Updating ────────────────────────────────────────────────────────────
+
+    def sync(self, ctx: Web3Context) -> None:
+        """Bring the state up to the chain head.
+
+        One ``eth_getLogs`` for the blocks since the last sync, or a full
+        replay on first use and after the cache went stale. If it fails the
+        cache is bypassed until a later sync succeeds.
+        """
+        with self._sync_lock:
+            try:
+                self._sync(ctx)
+            except BaseException:
+                with self._lock:
+                    self._in_sync = False
+                raise
+            with self._lock:
+                self._in_sync = True
+                self._synced_at = self._clock()
+
+    def _sync(self, ctx: Web3Context) -> None:
+        state = self._state
+        if state is None or state.stale:
+            self._load(ctx)
+            return
+        head = ctx.get_block("latest")
+        if head["number"] <= state.block:
+            return
+        logs = ctx.get_logs(
+            contract_address=[self.vault, *state.addresses()],
+            topics=[[*VAULT_TOPICS, *MANAGER_TOPICS]],
+            from_block=state.block + 1,
+            to_block=head["number"],
+        )
+        with self._lock:
+            for log in _chronological(logs):
+                state.apply(log, live=True)
+            state.block = head["number"]
+            state.timestamp = head["timestamp"]
+            state.last = max(state.last, (state.block, _END_OF_BLOCK))
+        if state.stale:
+            self._load(ctx)
+
+    def _load(self, ctx: Web3Context) -> None:
+        head = ctx.get_block("latest")
+        block = head["number"]
+        vault = PlasmaVault(ctx, self.vault)
+        state = _State(
+            block=block,
+            timestamp=head["timestamp"],
+            access_manager=vault.get_access_manager_address().call(),
+            price_oracle=vault.get_price_oracle_middleware_address().call(),
+        )
+        # The withdraw manager comes from the vault's own events, so the
+        # managers' history is read second.
+        vault_logs = ctx.get_logs(
+            contract_address=self.vault, topics=[VAULT_TOPICS], to_block=block
+        )
+        for log in _chronological(vault_logs):
+            state.apply(log, live=False)
+        manager_logs = ctx.get_logs(
+            contract_address=state.addresses(),
+            topics=[MANAGER_TOPICS],
+            to_block=block,
+        )
+        for log in _chronological(manager_logs):
+            state.apply(log, live=False)
+        state.last = (block, _END_OF_BLOCK)
+        logger.debug(
+            "Loaded state of vault %s at block %d (%d events)",
+            self.vault,
+            block,
+            len(vault_logs) + len(manager_logs),
+        )
+        with self._lock:
+            self._state = state
+
+    def apply(self, log: LogReceipt) -> None:
+        """Fold in one log, e.g. from `subscribe`. Logs already applied are
+        ignored; a removed log (reorg) or a manager change marks the cache
+        stale until the next `sync`."""
+        with self._lock:
+            state = self._state
+            if state is None or state.stale:
+                return
+            if log.get("removed"):
+                state.stale = True
+                return
+            state.apply(log, live=True)
+
+    def subscribe(self, ctx: Web3Context) -> Subscription[LogReceipt]:
+        """The logs `apply` expects, as they arrive (WebSocket contexts only).
+
+        Covers the contracts known now: after the cache goes stale, `sync`
+        and subscribe again.
+        """
+        state = self._state
+        if state is None:
+            raise RuntimeError("VaultStateCache.subscribe() before the first sync")
+        return ctx.subscribe_logs(
+            [self.vault, *state.addresses()],
+            topics=[[*VAULT_TOPICS, *MANAGER_TOPICS]],
+        )
+
+    # ── Lookups ─────────────────────────────────────────────────────────────
+
+    def _current(self) -> _State:
+        state = self._state
+        if state is None:
+            raise RuntimeError("VaultStateCache read before the first sync")
+        return state
+
+    def balance_fuses(self) -> list[BalanceFuse]:
+        with self._lock:
+            fuses = self._current().balance_fuses.items()
+            return [BalanceFuse(market_id=m, fuse=f) for m, f in fuses]
+
+    def withdraw_manager(self) -> ChecksumAddress | None:
+        return self._current().withdraw_manager
+
+    def role_accounts(self, role_id: int | None = None) -> list[RoleAccount]:
+        """Members (grants in effect at the synced block), as ``hasRole``
+        reports them, optionally of one role only."""
+        with self._lock:
+            state = self._current()
+            return [
+                RoleAccount(
+                    account=account,
+                    role_id=rid,
+                    is_member=True,
+                    execution_delay=grant.delay_at(state.timestamp),
+                )
+                for (rid, account), grant in state.grants.items()
+                if (role_id is None or rid == role_id)
+                and grant.since <= state.timestamp
+            ]
+
+    def price_sources(self) -> list[AssetPriceSource]:
+        with self._lock:
+            return list(self._current().price_sources)
+
+    def withdraw_request_accounts(self, timestamp: int) -> list[ChecksumAddress]:
+        """Accounts whose latest request is non-zero and open after
+        ``timestamp``."""
+        with self._lock:
+            requests = self._current().withdraw_requests.items()
+            return [
+                account
+                for account, (amount, end) in requests
+                if amount != 0 and end > timestamp
+            ]
+
+
+def _chronological(logs: Iterable[LogReceipt]) -> list[LogReceipt]:
+    # Providers do not all return logs in order.
+    return sorted(logs, key=lambda log: (log["blockNumber"], log["logIndex"]))
@@ -0,0 +1,341 @@
+"""JSON-RPC over one persistent WebSocket, with ``eth_subscribe``.
+
+`SyncWebSocketProvider` is a synchronous web3 provider for ``ws://`` and
+``wss://`` endpoints. All requests share one connection, and any number of
+threads may use it at once: a reader thread matches each response to its
+request by id. Notifications of ``eth_subscribe`` subscriptions arrive on the
+same connection and are routed to their `Subscription`, an iterator of
+events.
+
+The connection is opened on first use and reopened by the first request
+after it drops. Subscriptions do not survive a drop: iterating one then
+raises `SubscriptionError`, and the caller subscribes again (backfilling the
+gap with ``eth_getLogs`` if it must not miss events).
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import queue
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Generic, TypeVar, cast
+
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.providers import JSONBaseProvider
+from web3.types import BlockData, LogReceipt, RPCEndpoint, RPCResponse
+
+from ipor_fusion.errors import SubscriptionError
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# Stands in for a notification when the subscription ends.
+_CLOSED = object()
+
+# Integer fields of a ``newHeads`` notification; other 0x-strings are bytes.
+_HEAD_QUANTITIES = frozenset(
+    {
+        "number",
+        "timestamp",
+        "gasLimit",
+        "gasUsed",
+        "baseFeePerGas",
+        "difficulty",
+        "blobGasUsed",
+        "excessBlobGas",
+    }
+)
+
+
+def is_websocket_url(url: str) -> bool:
+    return url.startswith(("ws://", "wss://"))
+
+
+class Subscription(Generic[T]):
+    """Events of one ``eth_subscribe`` subscription, in arrival order.
+
+    Iterating blocks until the next event. It stops after `close` (callable
+    from any thread), and raises `SubscriptionError` if the connection drops.
+    """
+
+    def __init__(
+        self,
+        provider: SyncWebSocketProvider,
+        subscription_id: str,
+        events: queue.Queue[Any],
+        formatter: Callable[[dict[str, Any]], T],
+    ):
+        self.id = subscription_id
+        self._provider = provider
+        self._events = events
+        self._formatter = formatter
+        self._closed = False
+
+    def __iter__(self) -> Iterator[T]:
+        while True:
+            event = self._events.get()
+            if event is _CLOSED:
+                if self._closed:
+                    return
+                raise SubscriptionError(
+                    f"Subscription {self.id} ended: connection to "
+                    f"{self._provider.endpoint_uri} lost"
+                )
+            yield self._formatter(event)
+
+    def drain(self) -> list[T]:
+        """Events already received but not yet iterated, without blocking."""
+        drained: list[T] = []
+        while True:
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                return drained
+            if event is _CLOSED:
+                # Leave the end marker for the iterator to act on.
+                self._events.put(event)
+                return drained
+            drained.append(self._formatter(event))
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._provider.unsubscribe(self.id)
+        self._events.put(_CLOSED)
+
+    def __enter__(self) -> Subscription[T]:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class SyncWebSocketProvider(JSONBaseProvider):
+    """Thread-safe web3 provider over one persistent WebSocket connection."""
+
+    def __init__(
+        self,
+        endpoint_uri: str,
+        request_timeout_s: float = 30.0,
+        connect: Callable[[str], Any] | None = None,
+    ):
+        super().__init__()
+        self.endpoint_uri = endpoint_uri
+        self._timeout = request_timeout_s
+        self._connect = connect
+        self._lock = threading.Lock()
+        self._conn: Any = None
+        self._ids = itertools.count(1)
+        # request id -> (future, whether it is an eth_subscribe)
+        self._pending: dict[int, tuple[Future[RPCResponse], bool]] = {}
+        self._subscriptions: dict[str, queue.Queue[Any]] = {}
+
+    def __str__(self) -> str:
+        return f"WebSocket connection {self.endpoint_uri}"
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        try:
+            self._connection()
+        except OSError:
+            if show_traceback:
+                raise
+            return False
+        return True
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        return self._request(method, params)
+
+    def subscribe(
+        self, params: list[Any], formatter: Callable[[dict[str, Any]], T]
+    ) -> Subscription[T]:
+        """``eth_subscribe`` with ``params``; events pass through ``formatter``."""
+        response = self._request(RPCEndpoint("eth_subscribe"), params, subscribe=True)
+        if "error" in response:
+            raise SubscriptionError(
+                f"eth_subscribe{params!r} refused: {response['error']}"
+            )
+        subscription_id = str(response["result"])
+        with self._lock:
+            events = self._subscriptions[subscription_id]
+        return Subscription(self, subscription_id, events, formatter)
+
+    def unsubscribe(self, subscription_id: str) -> None:
+        with self._lock:
+            events = self._subscriptions.pop(subscription_id, None)
+            connected = self._conn is not None
+        if events is None or not connected:
+            return
+        try:
+            self._request(RPCEndpoint("eth_unsubscribe"), [subscription_id])
+        except OSError as exc:
+            # The node drops the subscription with the connection anyway.
+            logger.debug("eth_unsubscribe(%s) failed: %s", subscription_id, exc)
+
+    def close(self) -> None:
+        with self._lock:
+            conn = self._conn
+        if conn is not None:
+            conn.close()
+
+    def _request(
+        self, method: RPCEndpoint, params: Any, subscribe: bool = False
+    ) -> RPCResponse:
+        conn = self._connection()
+        request_id = next(self._ids)
+        future: Future[RPCResponse] = Future()
+        with self._lock:
+            self._pending[request_id] = (future, subscribe)
+        payload = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        payload["params"] = params if params is not None else []
+        message = json.dumps(payload)
+        try:
+            try:
+                conn.send(message)
+            except OSError:
+                self._drop(conn)
+                raise
+            except Exception as exc:  # websockets' ConnectionClosed and kin
+                self._drop(conn)
+                raise ConnectionError(
+                    f"Connection to {self.endpoint_uri} lost: {exc}"
+                ) from exc
+            return future.result(timeout=self._timeout)
+        except FutureTimeout as exc:
+            raise TimeoutError(
+                f"{method} timed out after {self._timeout}s on {self.endpoint_uri}"
+            ) from exc
+        finally:
+            with self._lock:
+                self._pending.pop(request_id, None)
+
+    def _connection(self) -> Any:
+        with self._lock:
+            if self._conn is not None:
+                return self._conn
+            connect = self._connect or _default_connect
+            try:
+                conn = connect(self.endpoint_uri)
+            except OSError:
+                raise
+            except Exception as exc:  # handshake rejected (HTTP 4xx, bad URI)
+                raise ConnectionError(
+                    f"Cannot open {self.endpoint_uri}: {exc}"
+                ) from exc
+            self._conn = conn
+        threading.Thread(
+            target=self._read_loop,
+            args=(conn,),
+            name=f"ws-reader {self.endpoint_uri}",
+            daemon=True,
+        ).start()
+        return conn
+
+    def _read_loop(self, conn: Any) -> None:
+        try:
+            for raw in conn:
+                self._dispatch(json.loads(raw))
+        except Exception as exc:  # any failure leaves the connection unusable
+            logger.debug("WebSocket %s closed: %s", self.endpoint_uri, exc)
+        finally:
+            self._drop(conn)
+
+    def _dispatch(self, message: Any) -> None:
+        if not isinstance(message, dict):
+            return
+        if message.get("method") == "eth_subscription":
+            params = message.get("params") or {}
+            with self._lock:
+                events = self._subscriptions.get(params.get("subscription"))
+            if events is not None:
+                events.put(params.get("result"))
+            return
+        with self._lock:
+            entry = self._pending.get(message.get("id"))  # type: ignore[arg-type]
+            if entry is None:
+                return
+            future, subscribe = entry
+            # Registered before the caller wakes up, and on the reader thread,
+            # so no notification can arrive ahead of its queue.
+            if subscribe and "result" in message:
+                self._subscriptions[str(message["result"])] = queue.Queue()
+        future.set_result(cast(RPCResponse, message))
+
+    def _drop(self, conn: Any) -> None:
+        with self._lock:
+            if self._conn is conn:
+                self._conn = None
+            pending = list(self._pending.values())
+            subscriptions = list(self._subscriptions.values())
+            self._subscriptions.clear()
+        for future, _ in pending:
+            if not future.done():
+                future.set_exception(
+                    ConnectionError(f"Connection to {self.endpoint_uri} lost")
+                )
+        for events in subscriptions:
+            events.put(_CLOSED)
+
+
+def detect_chain_id(url: str) -> int:
+    """The chain id ``url`` answers ``eth_chainId`` with: over a connection
+    opened and closed again for a ws:// or wss:// URL, else over HTTP."""
+    if not is_websocket_url(url):
+        return Web3(Web3.HTTPProvider(url)).eth.chain_id
+    provider = SyncWebSocketProvider(url)
+    try:
+        return Web3(provider).eth.chain_id
+    finally:
+        provider.close()
+
+
+def _default_connect(uri: str) -> Any:
+    # websockets' sync client (11+); imported here so HTTP-only users do not
+    # depend on its version.
+    from websockets.sync.client import connect
+
+    return connect(uri, max_size=None)
+
+
+def format_head(raw: dict[str, Any]) -> BlockData:
+    """A ``newHeads`` notification in `web3.types.BlockData` shape."""
+    head: dict[str, Any] = {}
+    for key, value in raw.items():
+        if key in _HEAD_QUANTITIES and isinstance(value, str):
+            head[key] = int(value, 16)
+        elif key == "miner" and isinstance(value, str):
+            head[key] = Web3.to_checksum_address(value)
+        elif isinstance(value, str) and value.startswith("0x"):
+            head[key] = HexBytes(value)
+        else:
+            head[key] = value
+    return cast(BlockData, head)
+
+
+def format_log(raw: dict[str, Any]) -> LogReceipt:
+    """A ``logs`` notification in the shape ``eth_getLogs`` results have.
+
+    ``removed`` is true when a reorg dropped a log delivered earlier.
+    """
+    return cast(
+        LogReceipt,
+        {
+            **raw,
+            "address": Web3.to_checksum_address(raw["address"]),
+            "blockHash": HexBytes(raw["blockHash"]),
+            "blockNumber": int(raw["blockNumber"], 16),
+            "data": HexBytes(raw["data"]),
+            "logIndex": int(raw["logIndex"], 16),
+            "topics": [HexBytes(topic) for topic in raw["topics"]],
+            "transactionHash": HexBytes(raw["transactionHash"]),
+            "transactionIndex": int(raw["transactionIndex"], 16),
+            "removed": bool(raw.get("removed", False)),
+        },
+    )
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
+from typing import Protocol
 
 from eth_abi import decode
 from eth_typing import BlockNumber, ChecksumAddress
@@ -56,6 +57,13 @@ def _withdraw_request_info_decoder(value: tuple) -> WithdrawRequestInfo:
     )
 
 
+class WithdrawRequestSource(Protocol):
+    """Already-decoded ``WithdrawRequestUpdated`` history, e.g. a
+    `VaultStateCache`, that spares `get_pending_requests` the replay."""
+
+    def withdraw_request_accounts(self, timestamp: int) -> list[ChecksumAddress]: ...
+
+
 class WithdrawManager(ContractWrapper):
     """Handles time-windowed withdrawal requests and fund releases."""
 
@@ -114,22 +122,15 @@ class WithdrawManager(ContractWrapper):
     def get_pending_requests(
         self,
         from_block: BlockNumber = BlockNumber(0),  # noqa: B008  # NewType, immutable
+        source: WithdrawRequestSource | None = None,
     ) -> list[AccountRequest]:
-        """Return per-account validated withdrawal requests (active only)."""
-        current_timestamp = self._ctx.get_block()["timestamp"]
-        events = self._get_withdraw_request_updated_events(from_block=from_block)
+        """Return per-account validated withdrawal requests (active only).
 
-        accounts: list[str] = []
-        for event in events:
-            (account, amount, end_withdraw_window) = decode(
-                ["address", "uint256", "uint32"], event["data"]
-            )
-            if (
-                end_withdraw_window > current_timestamp
-                and amount != 0
-                and account not in accounts
-            ):
-                accounts.append(account)
+        ``source``, when given, names the accounts to verify instead of the
+        event replay (only for the full history, ``from_block=0``).
+        """
+        current_timestamp = self._ctx.get_block()["timestamp"]
+        accounts = self._requesting_accounts(current_timestamp, from_block, source)
 
         results: list[AccountRequest] = []
         for account in accounts:
@@ -149,6 +150,28 @@ class WithdrawManager(ContractWrapper):
 
         return results
 
+    def _requesting_accounts(
+        self,
+        current_timestamp: int,
+        from_block: BlockNumber,
+        source: WithdrawRequestSource | None = None,
+    ) -> list[str]:
+        """Accounts whose request events leave an open request to verify."""
+        if from_block == 0 and (cache := source or self._vault_state()):
+            return list(cache.withdraw_request_accounts(current_timestamp))
+        accounts: list[str] = []
+        for event in self._get_withdraw_request_updated_events(from_block=from_block):
+            (account, amount, end_withdraw_window) = decode(
+                ["address", "uint256", "uint32"], event["data"]
+            )
+            if (
+                end_withdraw_window > current_timestamp
+                and amount != 0
+                and account not in accounts
+            ):
+                accounts.append(account)
+        return accounts
+
     def get_pending_requests_info(
         self,
         from_block: BlockNumber = BlockNumber(0),  # noqa: B008  # NewType, immutable
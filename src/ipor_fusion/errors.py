@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import logging
 
+import requests
 from eth_abi import decode as abi_decode
 from web3 import Web3
+from web3.exceptions import ContractLogicError, TimeExhausted, Web3RPCError
 from web3.types import TxReceipt
 
 log = logging.getLogger(__name__)
@@ -21,6 +23,25 @@ PANIC_CODES: dict[int, str] = {
     0x51: "zero-initialized function pointer",
 }
 
+# Errors meaning "this one read is unavailable" — a revert, an RPC-level error
+# response, a timeout — as opposed to a broken transport or a bug. Reads that
+# are allowed to degrade swallow exactly these.
+RECOVERABLE_ERRORS: tuple[type[Exception], ...] = (
+    ContractLogicError,
+    Web3RPCError,
+    TimeExhausted,
+)
+
+# Errors of a broken transport — a reset connection, an HTTP timeout or 5xx
+# that outlasted the retry middleware. HTTPProvider raises the requests
+# exceptions, the WebSocket providers the builtin OSErrors. A long-running
+# loop that reads a block at a time outlives these as well and moves on to
+# the next block.
+TRANSPORT_ERRORS: tuple[type[Exception], ...] = (
+    requests.RequestException,
+    OSError,
+)
+
 ERROR_SELECTOR = bytes.fromhex("08c379a0")
 PANIC_SELECTOR = bytes.fromhex("4e487b71")
 
@@ -113,6 +134,11 @@ class UnsupportedChainError(IporFusionError, ValueError):
     """
 
 
+class SubscriptionError(IporFusionError):
+    """The node refused an ``eth_subscribe``, or the connection carrying the
+    subscription dropped."""
+
+
 class TransactionError(IporFusionError):
     def __init__(
         self,
@@ -366,8 +366,11 @@ class VaultListEntry(_Base):
 
 
 class ConfigShowResponse(_Base):
-    providers: dict[str, str] = Field(
-        description="Map of chain_id (string) to RPC provider URL."
+    providers: dict[str, str | list[str]] = Field(
+        description=(
+            "Map of chain_id (string) to RPC provider URL, or to a list of "
+            "URLs used with hedged reads and failover."
+        )
     )
     vaults: list[VaultListEntry]
     etherscan_api_key: str | None = Field(
@@ -4,6 +4,8 @@ Calls the ipor_fusion SDK directly — no CLI subprocess.
 Configuration is loaded from the shared CLI config (~/.config/ipor-fusion/).
 """
 
+import logging
+import threading
 from typing import Annotated, Literal
 
 from mcp.server.fastmcp import FastMCP
@@ -20,6 +22,7 @@ from ipor_fusion.cli.config_store import (
 )
 from ipor_fusion.cli.market_cmd import _build_json as _build_morpho_blue_json
 from ipor_fusion.cli.market_cmd import _meta_morpho_json
+from ipor_fusion.cli.metadata_store import persistent_facts
 from ipor_fusion.cli.morpho_api import (
     PUBLIC_ALLOCATOR_ADDRESSES,
     MorphoApiError,
@@ -37,6 +40,9 @@ from ipor_fusion.config.roles import Roles
 from ipor_fusion.core.access import resolve_access_manager
 from ipor_fusion.core.context import Web3Context
 from ipor_fusion.core.plasma_vault import PlasmaVault
+from ipor_fusion.core.vault_state import VaultStateCache
+from ipor_fusion.core.websocket import SyncWebSocketProvider, detect_chain_id
+from ipor_fusion.errors import RECOVERABLE_ERRORS
 from ipor_fusion.mcp.models import (
     ActionResult,
     ChangelogEntryModel,
@@ -54,6 +60,8 @@ from ipor_fusion.readers.morpho import MorphoReader
 from ipor_fusion.readers.oracle_mapping import build_oracle_mapping
 from ipor_fusion.types import MorphoBlueMarketId
 
+logger = logging.getLogger(__name__)
+
 mcp = FastMCP(
     "ipor-fusion",
     instructions=(
@@ -73,7 +81,7 @@ mcp._mcp_server.version = package_version()
 # ---------------------------------------------------------------------------
 
 
-def _resolve_provider(cfg: FusionConfig, chain_id: int) -> str:
+def _resolve_provider(cfg: FusionConfig, chain_id: int) -> str | list[str]:
     if provider_url := cfg.providers.get(str(chain_id)):
         return provider_url
     raise ValueError(
@@ -97,17 +105,66 @@ def _resolve_chain_id(cfg: FusionConfig, vault_address: str, chain_id: int) -> i
     )
 
 
+# One head context per chain for the server's lifetime, with the provider
+# URL it was built from: a ws:// endpoint holds a connection and a reader
+# thread, which every tool call on that chain shares.
+_contexts: dict[int, tuple[str | list[str], Web3Context]] = {}
+_contexts_lock = threading.Lock()
+
+
+def _chain_ctx(cfg: FusionConfig, chain_id: int) -> Web3Context:
+    """The server's context for ``chain_id``, at the head. Never mutate it:
+    pin a block with `Web3Context.pinned`."""
+    provider_url = _resolve_provider(cfg, chain_id)
+    with _contexts_lock:
+        cached = _contexts.get(chain_id)
+        if cached is not None and cached[0] == provider_url:
+            return cached[1]
+        ctx = Web3Context.from_url(provider_url, facts=persistent_facts())
+        _contexts[chain_id] = (provider_url, ctx)
+    if cached is not None:
+        # The provider was reconfigured; release the old connections.
+        _close_websockets(cached[1])
+    return ctx
+
+
+def _close_websockets(ctx: Web3Context) -> None:
+    provider = ctx.web3.provider
+    for candidate in [
+        *(endpoint.provider for endpoint in getattr(provider, "endpoints", [])),
+        provider,
+    ]:
+        if isinstance(candidate, SyncWebSocketProvider):
+            candidate.close()
+
+
 def _build_ctx(
     cfg: FusionConfig, chain_id: int, block_number: int = 0
 ) -> tuple[Web3Context, int | None]:
-    provider_url = _resolve_provider(cfg, chain_id)
-    ctx = Web3Context.from_url(provider_url)
+    ctx = _chain_ctx(cfg, chain_id)
     effective_block = block_number if block_number else None
     if effective_block is not None:
-        ctx.default_block = effective_block
+        ctx = ctx.pinned(effective_block)
     return ctx, effective_block
 
 
+def _sync_vault_state(ctx: Web3Context, vault: str) -> None:
+    """Bring the server's cached events of ``vault`` up to the head.
+
+    The server outlives its requests, so balance fuses, role holders, price
+    sources and withdraw requests are replayed once per vault and then
+    updated with the events since the previous call (see
+    `ipor_fusion.core.vault_state`). Head reads only: a pinned block number
+    bypasses the cache. On failure the tools fall back to a full replay.
+    """
+    if ctx.default_block != "latest":
+        return
+    try:
+        VaultStateCache.shared(ctx.chain_id, Web3.to_checksum_address(vault)).sync(ctx)
+    except RECOVERABLE_ERRORS as exc:
+        logger.debug("Vault state sync for %s failed: %s", vault, exc)
+
+
 # ---------------------------------------------------------------------------
 # Server tools
 # ---------------------------------------------------------------------------
@@ -178,6 +235,7 @@ def vault_info(
     # once the probe passes, any later failure is a real error on a real
     # vault and must stay loud.
     resolve_access_manager(ctx, checksum)
+    _sync_vault_state(ctx, checksum)
 
     plasma_vault = PlasmaVault(ctx, checksum)
     data = _fetch_vault_data(ctx, plasma_vault, effective_block, chain_id=chain_id)
@@ -254,6 +312,7 @@ def vault_role_accounts(
     checksum = Web3.to_checksum_address(vault_address)
 
     access_manager = resolve_access_manager(ctx, checksum)
+    _sync_vault_state(ctx, checksum)
     accounts = (
         access_manager.get_all_role_accounts()
         if role_id is None
@@ -335,7 +394,7 @@ def vault_oracle_mapping(
     # The event-replay fallback and the output both need a concrete block
     # number, so resolve "latest" up front and pin the context to it.
     effective_block = block_number if block_number else ctx.web3.eth.block_number
-    ctx.default_block = effective_block
+    ctx = ctx.pinned(effective_block)
 
     resolve_access_manager(ctx, checksum)
 
@@ -383,8 +442,7 @@ def vault_add(
             )
 
     if not label:
-        provider_url = _resolve_provider(cfg, chain_id)
-        ctx = Web3Context.from_url(provider_url)
+        ctx = _chain_ctx(cfg, chain_id)
         checksum = Web3.to_checksum_address(address)
         try:
             label = PlasmaVault(ctx, checksum).name().call()
@@ -456,8 +514,7 @@ def config_set_provider(url: str, chain_id: int = 0) -> ActionResult:
         chain_id: Chain ID (auto-detected via eth_chainId if 0).
     """
     if not chain_id:
-        web3 = Web3(Web3.HTTPProvider(url))
-        chain_id = web3.eth.chain_id
+        chain_id = detect_chain_id(url)
 
     cfg = load_config()
     cfg.providers[str(chain_id)] = url
@@ -1,15 +1,40 @@
-from ipor_fusion.readers.aave_v3 import AaveV3Reader, AaveV3UserAccountData
+from ipor_fusion.readers.aave_v3 import (
+    AaveV3AccountPositions,
+    AaveV3Oracle,
+    AaveV3Reader,
+    AaveV3ReservePosition,
+    AaveV3UserAccountData,
+)
 from ipor_fusion.readers.compound_v3 import CompoundV3Reader
 from ipor_fusion.readers.lending_health import (
     LendingMarketHealth,
+    LendingPositionInputs,
     VaultLendingHealth,
     fetch_vault_lending_health,
+    liquidation_price,
+    max_additional_borrow,
+    max_collateral_withdraw,
+)
+from ipor_fusion.readers.lending_monitor import (
+    LendingHealthAlert,
+    LendingHealthMonitor,
+    LendingHealthSample,
+)
+from ipor_fusion.readers.lending_stress import (
+    StressPosition,
+    StressResult,
+    StressScenario,
+    fetch_stress_positions,
+    stress_test,
 )
 from ipor_fusion.readers.morpho import (
+    AdaptiveCurveIrm,
     MorphoMarket,
     MorphoMarketParams,
     MorphoMarketRates,
     MorphoPosition,
+    MorphoPositionSnapshot,
+    MorphoRateModel,
     MorphoReader,
 )
 from ipor_fusion.readers.oracle_mapping import (
@@ -19,30 +44,66 @@ from ipor_fusion.readers.oracle_mapping import (
     OraclePrice,
     build_oracle_mapping,
 )
-from ipor_fusion.readers.position_manager import PositionData
+from ipor_fusion.readers.position_manager import (
+    PoolState,
+    PositionData,
+    PositionValue,
+)
 from ipor_fusion.readers.ramses_v2 import RamsesV2Position, RamsesV2Reader
 from ipor_fusion.readers.uniswap_v3 import UniswapV3Position, UniswapV3Reader
+from ipor_fusion.readers.vault_history import (
+    VaultHistoryRow,
+    block_at_timestamp,
+    block_grid,
+    fetch_vault_history,
+    timestamp_grid,
+)
 
 __all__ = [
     "MorphoReader",
     "MorphoMarket",
     "MorphoMarketRates",
     "MorphoPosition",
+    "MorphoPositionSnapshot",
+    "MorphoRateModel",
+    "AdaptiveCurveIrm",
     "MorphoMarketParams",
     "AaveV3Reader",
     "AaveV3UserAccountData",
+    "AaveV3AccountPositions",
+    "AaveV3ReservePosition",
+    "AaveV3Oracle",
     "CompoundV3Reader",
     "LendingMarketHealth",
+    "LendingPositionInputs",
     "VaultLendingHealth",
     "fetch_vault_lending_health",
+    "liquidation_price",
+    "max_additional_borrow",
+    "max_collateral_withdraw",
+    "LendingHealthMonitor",
+    "LendingHealthAlert",
+    "LendingHealthSample",
+    "StressPosition",
+    "StressResult",
+    "StressScenario",
+    "fetch_stress_positions",
+    "stress_test",
     "OracleAsset",
     "OracleMapping",
     "OracleNode",
     "OraclePrice",
     "build_oracle_mapping",
     "PositionData",
+    "PositionValue",
+    "PoolState",
     "UniswapV3Reader",
     "UniswapV3Position",
     "RamsesV2Reader",
     "RamsesV2Position",
+    "VaultHistoryRow",
+    "block_at_timestamp",
+    "block_grid",
+    "fetch_vault_history",
+    "timestamp_grid",
 ]
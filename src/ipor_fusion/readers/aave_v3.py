@@ -1,3 +1,5 @@
+import logging
+from collections.abc import Sequence
 from dataclasses import dataclass
 
 from eth_typing import ChecksumAddress
@@ -5,10 +7,19 @@ from web3 import Web3
 
 from ipor_fusion.core.contract import Call, ContractWrapper
 from ipor_fusion.core.erc20 import ERC20
+from ipor_fusion.core.multicall import call_all
 from ipor_fusion.types import Amount
 
+_logger = logging.getLogger(__name__)
+
 _ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
 
+# ReserveConfigurationMap bit layout (ReserveConfiguration.sol)
+_LTV_MASK = 0xFFFF
+_LIQUIDATION_THRESHOLD_SHIFT = 16
+_DECIMALS_SHIFT = 48
+_DECIMALS_MASK = 0xFF
+
 # DataTypes.ReserveDataLegacy returned by Pool.getReserveData(address).
 # All fields are static, so the struct is encoded inline as a flat sequence.
 _RESERVE_DATA_TYPES = [
@@ -74,6 +85,99 @@ class AaveV3PositionBreakdown:
         return self.supply == 0 and self.variable_debt == 0 and self.stable_debt == 0
 
 
+@dataclass(slots=True)
+class AaveV3Reserve:
+    """A reserve's listing, decoded from `getReserveData()`.
+
+    `id` is the reserve's index in the user-configuration bitmap; `ltv` and
+    `liquidation_threshold` are in basis points.
+    """
+
+    id: int
+    ltv: int
+    liquidation_threshold: int
+    decimals: int
+    a_token: ChecksumAddress
+    stable_debt_token: ChecksumAddress
+    variable_debt_token: ChecksumAddress
+
+
+@dataclass(slots=True)
+class AaveV3ReservePosition:
+    """A user's position in one Aave V3 reserve, in asset amounts, with its
+    value and its share of the account health factor.
+
+    `price` is the Aave oracle price in the pool's base currency (USD, 1e8),
+    None when prices were not read. `health_contribution` is the reserve's
+    collateral value times its liquidation threshold, over the account's
+    total debt: the shares of all collateral reserves add up to the health
+    factor, unless the account is in an E-Mode category, whose threshold
+    replaces the reserve's own. None without a price or without debt.
+    """
+
+    asset: ChecksumAddress
+    reserve: AaveV3Reserve
+    supply: Amount
+    variable_debt: Amount
+    stable_debt: Amount
+    collateral_enabled: bool
+    price: int | None = None
+    health_contribution: float | None = None
+
+    @property
+    def debt(self) -> Amount:
+        return Amount(self.variable_debt + self.stable_debt)
+
+    @property
+    def supply_base(self) -> int | None:
+        return self._to_base(self.supply)
+
+    @property
+    def debt_base(self) -> int | None:
+        return self._to_base(self.debt)
+
+    @property
+    def supply_usd(self) -> float | None:
+        value = self.supply_base
+        return value / 1e8 if value is not None else None
+
+    @property
+    def debt_usd(self) -> float | None:
+        value = self.debt_base
+        return value / 1e8 if value is not None else None
+
+    @property
+    def is_empty(self) -> bool:
+        return self.supply == 0 and self.debt == 0
+
+    @property
+    def breakdown(self) -> AaveV3PositionBreakdown:
+        return AaveV3PositionBreakdown(
+            asset=self.asset,
+            a_token=self.reserve.a_token,
+            variable_debt_token=self.reserve.variable_debt_token,
+            stable_debt_token=self.reserve.stable_debt_token,
+            supply=self.supply,
+            variable_debt=self.variable_debt,
+            stable_debt=self.stable_debt,
+        )
+
+    def _to_base(self, amount: int) -> int | None:
+        # GenericLogic: amount * price / 10^decimals, rounded down
+        if self.price is None:
+            return None
+        return amount * self.price // 10**self.reserve.decimals
+
+
+@dataclass(slots=True)
+class AaveV3AccountPositions:
+    """A user's Aave V3 account: the pool's aggregate `getUserAccountData()`
+    and the per-reserve positions behind it."""
+
+    account: AaveV3UserAccountData
+    reserves: list[AaveV3ReservePosition]
+
+
 def _user_account_data_decoder(value: tuple) -> AaveV3UserAccountData:
     return AaveV3UserAccountData(*value)
 
@@ -89,6 +193,20 @@ def _reserve_tokens_decoder(value: tuple) -> AaveV3ReserveTokens:
     )
 
 
+def _reserve_decoder(value: tuple) -> AaveV3Reserve:
+    configuration = value[0]
+    return AaveV3Reserve(
+        id=value[7],
+        ltv=configuration & _LTV_MASK,
+        liquidation_threshold=(configuration >> _LIQUIDATION_THRESHOLD_SHIFT)
+        & _LTV_MASK,
+        decimals=(configuration >> _DECIMALS_SHIFT) & _DECIMALS_MASK,
+        a_token=Web3.to_checksum_address(value[8]),
+        stable_debt_token=Web3.to_checksum_address(value[9]),
+        variable_debt_token=Web3.to_checksum_address(value[10]),
+    )
+
+
 class AaveV3Reader(ContractWrapper):
     """Reader for Aave V3 lending pool on-chain state."""
 
@@ -109,8 +227,132 @@ class AaveV3Reader(ContractWrapper):
             asset,
             output_types=_RESERVE_DATA_TYPES,
             decoder=_reserve_tokens_decoder,
+            # The rest of getReserveData() is live state, but this decoder
+            # only keeps the token addresses, fixed when the reserve is listed.
+            immutable=True,
+        )
+
+    def reserve(self, asset: ChecksumAddress) -> Call[AaveV3Reserve]:
+        """Return the reserve's id, risk parameters, decimals and tokens."""
+        return self._view(
+            "getReserveData(address)",
+            asset,
+            output_types=_RESERVE_DATA_TYPES,
+            decoder=_reserve_decoder,
         )
 
+    def user_configuration(self, user: ChecksumAddress) -> Call[int]:
+        """The user's configuration bitmap: for reserve ``id``, bit ``2 * id``
+        is set while borrowing it and bit ``2 * id + 1`` while it is used as
+        collateral."""
+        return self._view(
+            "getUserConfiguration(address)", user, output_types=["uint256"]
+        )
+
+    def addresses_provider(self) -> Call[ChecksumAddress]:
+        return self._view(
+            "ADDRESSES_PROVIDER()",
+            output_types=["address"],
+            decoder=Web3.to_checksum_address,
+            immutable=True,
+        )
+
+    def positions_for(
+        self,
+        user: ChecksumAddress,
+        assets: Sequence[ChecksumAddress],
+        with_prices: bool = True,
+    ) -> AaveV3AccountPositions:
+        """Read the user's account and positions in all ``assets`` in at most
+        three multicall rounds, whatever the number of assets.
+
+        The first round reads `getUserAccountData()`, the user configuration
+        and `getReserveData()` for every asset; the second the aToken and
+        debt-token balances; the third the Aave oracle's prices for the
+        reserves the user holds (skipped when ``with_prices`` is False).
+        Reserves whose reads reverted are left out. Raises if the account
+        itself cannot be read.
+        """
+        assets = list(dict.fromkeys(assets))
+        head = [self.get_user_account_data(user), self.user_configuration(user)]
+        if with_prices:
+            head.append(self.addresses_provider())
+        results = call_all(self._ctx, head + [self.reserve(a) for a in assets])
+        account, configuration = results[0], results[1]
+        for result in (account, configuration):
+            if isinstance(result, Exception):
+                raise result
+        provider = results[2] if with_prices else None
+        reserves = {
+            asset: reserve
+            for asset, reserve in zip(assets, results[len(head) :], strict=True)
+            if not _failed(asset, reserve)
+        }
+
+        positions, oracle = self._read_balances(user, configuration, reserves, provider)
+        if isinstance(oracle, Exception):
+            _logger.debug("Failed to resolve the Aave V3 price oracle: %s", oracle)
+        elif oracle is not None:
+            self._read_prices(oracle, positions)
+        for position in positions:
+            position.health_contribution = _health_contribution(position, account)
+        return AaveV3AccountPositions(account=account, reserves=positions)
+
+    def _read_balances(
+        self,
+        user: ChecksumAddress,
+        configuration: int,
+        reserves: dict[ChecksumAddress, AaveV3Reserve],
+        provider: ChecksumAddress | Exception | None,
+    ) -> tuple[list[AaveV3ReservePosition], ChecksumAddress | Exception | None]:
+        """One round: every reserve's token balances, and the price oracle's
+        address from ``provider`` (passed through if it failed)."""
+        calls: list[Call] = [
+            ERC20(self._ctx, token).balance_of(user)
+            for reserve in reserves.values()
+            for token in _position_tokens(reserve)
+        ]
+        if isinstance(provider, str):
+            calls.append(AaveV3AddressesProvider(self._ctx, provider).price_oracle())
+        results = iter(call_all(self._ctx, calls) if calls else [])
+
+        positions = []
+        for asset, reserve in reserves.items():
+            balances = [next(results) for _ in _position_tokens(reserve)]
+            if _failed(asset, *balances):
+                continue
+            supply, variable_debt, *stable_debt = balances
+            positions.append(
+                AaveV3ReservePosition(
+                    asset=asset,
+                    reserve=reserve,
+                    supply=supply,
+                    variable_debt=variable_debt,
+                    stable_debt=stable_debt[0] if stable_debt else Amount(0),
+                    collateral_enabled=bool(configuration >> (2 * reserve.id + 1) & 1),
+                )
+            )
+        oracle = next(results) if isinstance(provider, str) else provider
+        return positions, oracle
+
+    def _read_prices(
+        self, oracle: ChecksumAddress, positions: list[AaveV3ReservePosition]
+    ) -> None:
+        held = [p for p in positions if not p.is_empty]
+        if not held:
+            return
+        try:
+            prices = (
+                AaveV3Oracle(self._ctx, oracle)
+                .asset_prices([p.asset for p in held])
+                .call()
+            )
+        except Exception as exc:  # positions stay unpriced, as for a failed read
+            _logger.debug("Failed to read Aave V3 oracle %s: %s", oracle, exc)
+            return
+        for position, price in zip(held, prices, strict=True):
+            position.price = price
+
     def position_breakdown(
         self, asset: ChecksumAddress, user: ChecksumAddress
     ) -> AaveV3PositionBreakdown:
@@ -140,3 +382,54 @@ class AaveV3Reader(ContractWrapper):
             variable_debt=variable_debt,
             stable_debt=stable_debt,
         )
+
+
+class AaveV3AddressesProvider(ContractWrapper):
+    """Aave V3 PoolAddressesProvider: the registry of a market's contracts."""
+
+    def price_oracle(self) -> Call[ChecksumAddress]:
+        return self._view(
+            "getPriceOracle()",
+            output_types=["address"],
+            decoder=Web3.to_checksum_address,
+        )
+
+
+class AaveV3Oracle(ContractWrapper):
+    """The AaveOracle of an Aave V3 market, pricing reserves in the pool's
+    base currency."""
+
+    def asset_prices(self, assets: Sequence[ChecksumAddress]) -> Call[list[int]]:
+        return self._view(
+            "getAssetsPrices(address[])",
+            list(assets),
+            output_types=["uint256[]"],
+            decoder=list,
+        )
+
+
+def _position_tokens(reserve: AaveV3Reserve) -> list[ChecksumAddress]:
+    """aToken, variable debt token, and the stable debt token if enabled."""
+    tokens = [reserve.a_token, reserve.variable_debt_token]
+    if reserve.stable_debt_token.lower() != _ZERO_ADDRESS:
+        tokens.append(reserve.stable_debt_token)
+    return tokens
+
+
+def _health_contribution(
+    position: AaveV3ReservePosition, account: AaveV3UserAccountData
+) -> float | None:
+    collateral = position.supply_base
+    if collateral is None or account.total_debt_base == 0:
+        return None
+    if not position.collateral_enabled:
+        return 0.0
+    threshold = position.reserve.liquidation_threshold
+    return collateral * threshold / 10_000 / account.total_debt_base
+
+
+def _failed(asset: ChecksumAddress, *results: object) -> bool:
+    failed = next((r for r in results if isinstance(r, Exception)), None)
+    if failed is not None:
+        _logger.debug("Failed to read Aave V3 reserve %s: %s", asset, failed)
+    return failed is not None
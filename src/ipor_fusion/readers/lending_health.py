@@ -8,18 +8,16 @@ from __future__ import annotations
 
 import logging
 import math
-from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
-from eth_abi import decode
 from eth_typing import ChecksumAddress
-from eth_utils import function_signature_to_4byte_selector
 from web3 import Web3
 
 from ipor_fusion.core.context import Web3Context
+from ipor_fusion.core.scheduler import RpcScheduler
 from ipor_fusion.market_ids import IporFusionMarkets
-from ipor_fusion.readers.aave_v3 import AaveV3Reader
-from ipor_fusion.readers.morpho import MorphoReader
+from ipor_fusion.readers.aave_v3 import AaveV3Reader, AaveV3UserAccountData
+from ipor_fusion.readers.morpho import MorphoPositionSnapshot, MorphoReader
 from ipor_fusion.substrates import market_name
 from ipor_fusion.types import MorphoBlueMarketId
 
@@ -67,6 +65,27 @@ AAVE_V3_MARKET_IDS = frozenset(
 )
 
 
+@dataclass(slots=True)
+class LendingPositionInputs:
+    """The raw reads behind a `LendingMarketHealth`, for the position
+    calculators (`liquidation_price`, `max_additional_borrow`,
+    `max_collateral_withdraw`).
+
+    Morpho: `collateral` in collateral-token units, `debt` in loan-token
+    units, `oracle_price` at 1e36 scale (None if it could not be read).
+    Aave V3: `collateral` and `debt` in the pool's base currency (USD, 1e8),
+    no oracle price. `lltv` is the liquidation LTV (Aave: the weighted
+    liquidation threshold) and `borrow_ltv` the LTV new borrows may reach
+    (Morpho: the LLTV too), both WAD-scaled.
+    """
+
+    collateral: int
+    debt: int
+    lltv: int
+    borrow_ltv: int
+    oracle_price: int | None = None
+
+
 @dataclass(slots=True)
 class LendingMarketHealth:
     """Health status of a single lending market position.
@@ -86,6 +105,7 @@ class LendingMarketHealth:
     total_debt_usd: float | None
     ltv_usage_percent: float | None
     substrate_id: str | None = None
+    inputs: LendingPositionInputs | None = None
 
     @property
     def is_warning(self) -> bool:
@@ -116,12 +136,90 @@ class VaultLendingHealth:
         return max(usages) if usages else None
 
 
-def _call_morpho_oracle_price(ctx: Web3Context, oracle_address: ChecksumAddress) -> int:
-    """Call IOracle(oracle).price() -> uint256."""
-    selector = function_signature_to_4byte_selector("price()")
-    raw = ctx.call(oracle_address, selector)
-    (price,) = decode(["uint256"], raw)
-    return price
+def liquidation_price(position: LendingMarketHealth) -> int | None:
+    """The lowest oracle price (1e36 scale) at which a Morpho position stays
+    healthy; below it, it can be liquidated.
+
+    None without debt (never liquidatable), without collateral (always), or
+    for Aave, whose health is account-wide rather than tied to one price.
+    """
+    inputs = _inputs(position)
+    if position.protocol != "morpho":
+        return None
+    return _morpho_liquidation_price(inputs.debt, inputs.collateral, inputs.lltv)
+
+
+def _morpho_liquidation_price(debt: int, collateral: int, lltv: int) -> int | None:
+    if debt == 0 or collateral == 0 or lltv == 0:
+        return None
+    # Healthy iff collateral * price / 1e36 * lltv / 1e18 >= debt, each step
+    # rounded down as Morpho rounds it.
+    min_value = _div_up(debt * WAD, lltv)
+    return _div_up(min_value * ORACLE_PRICE_SCALE, collateral)
+
+
+def max_additional_borrow(position: LendingMarketHealth) -> int:
+    """How much more the position can borrow right now: loan-token units for
+    Morpho (up to the LLTV), base currency for Aave (up to the LTV)."""
+    inputs = _inputs(position)
+    return max(
+        _borrow_capacity(position.protocol, inputs, inputs.collateral) - inputs.debt, 0
+    )
+
+
+def max_collateral_withdraw(
+    position: LendingMarketHealth, target_hf: float = 1.0
+) -> int:
+    """The most collateral that can be withdrawn while the health factor
+    stays at ``target_hf`` or above: collateral-token units for Morpho, base
+    currency for Aave.
+
+    For Aave this is the account-wide value at the weighted liquidation
+    threshold; a reserve whose threshold is below the average allows less.
+    Raises ValueError for a target below 1, which no protocol lets a
+    withdrawal reach.
+    """
+    if target_hf < 1:
+        raise ValueError(f"Target health factor {target_hf} is below 1")
+    inputs = _inputs(position)
+    if inputs.debt == 0:
+        return inputs.collateral
+    # Liquidation capacity must cover target_hf * debt.
+    required = _div_up(inputs.debt * round(target_hf * WAD), WAD)
+    if position.protocol == "morpho":
+        if not inputs.oracle_price or not inputs.lltv:
+            return 0
+        min_value = _div_up(required * WAD, inputs.lltv)
+        min_collateral = _div_up(min_value * ORACLE_PRICE_SCALE, inputs.oracle_price)
+    else:
+        if not inputs.lltv:
+            return 0
+        min_collateral = _div_up(required * WAD, inputs.lltv)
+    return max(inputs.collateral - min_collateral, 0)
+
+
+def _inputs(position: LendingMarketHealth) -> LendingPositionInputs:
+    if position.inputs is None:
+        raise ValueError(
+            f"{position.market_name} health has no position inputs to compute from"
+        )
+    return position.inputs
+
+
+def _borrow_capacity(
+    protocol: str, inputs: LendingPositionInputs, collateral: int
+) -> int:
+    if protocol == "morpho":
+        if not inputs.oracle_price:
+            return 0
+        value = collateral * inputs.oracle_price // ORACLE_PRICE_SCALE
+        return value * inputs.borrow_ltv // WAD
+    # Aave's percentMul rounds half up; the LTV is whole basis points.
+    return (collateral * inputs.borrow_ltv + WAD // 2) // WAD
+
+
+def _div_up(numerator: int, denominator: int) -> int:
+    return -(-numerator // denominator)
 
 
 def _shares_to_assets_up(shares: int, total_assets: int, total_shares: int) -> int:
@@ -131,24 +229,25 @@ def _shares_to_assets_up(shares: int, total_assets: int, total_shares: int) -> i
     return math.ceil(shares * (total_assets + 1) / (total_shares + 1))
 
 
-def _compute_morpho_market_health(
-    ctx: Web3Context,
-    reader: MorphoReader,
-    morpho_market_id: MorphoBlueMarketId,
-    vault_address: ChecksumAddress,
-    ipor_market_id: int,
-    market_name: str,
+def _morpho_market_health(
+    snapshot: MorphoPositionSnapshot, ipor_market_id: int, market_name: str
 ) -> LendingMarketHealth | None:
     """Compute LTV health for a single Morpho Blue market position."""
-    try:
-        position = reader.position(morpho_market_id, vault_address).call()
-    except Exception:
-        _logger.debug("Failed to read Morpho position for %s", morpho_market_id)
-        return None
+    position, market, params = snapshot.position, snapshot.market, snapshot.params
+    morpho_market_id = snapshot.market_id
+    borrowed = _shares_to_assets_up(
+        position.borrow_shares, market.total_borrow_assets, market.total_borrow_shares
+    )
+    inputs = LendingPositionInputs(
+        collateral=position.collateral,
+        debt=borrowed,
+        lltv=params.lltv,
+        borrow_ltv=params.lltv,
+        oracle_price=snapshot.oracle_price,
+    )
 
     # No borrow = no liquidation risk
     if position.borrow_shares == 0:
-        params = reader.market_params(morpho_market_id).call()
         return LendingMarketHealth(
             protocol="morpho",
             market_id=ipor_market_id,
@@ -160,20 +259,14 @@ def _compute_morpho_market_health(
             total_debt_usd=None,
             ltv_usage_percent=0.0,
             substrate_id=morpho_market_id,
+            inputs=inputs,
         )
 
-    try:
-        market = reader.market(morpho_market_id).call()
-        params = reader.market_params(morpho_market_id).call()
-        oracle_price = _call_morpho_oracle_price(ctx, params.oracle)
-    except Exception:
-        _logger.debug("Failed to read Morpho market data for %s", morpho_market_id)
+    oracle_price = snapshot.oracle_price
+    if oracle_price is None:
+        _logger.debug("No Morpho oracle price for %s", morpho_market_id)
         return None
 
-    borrowed = _shares_to_assets_up(
-        position.borrow_shares, market.total_borrow_assets, market.total_borrow_shares
-    )
-
     if position.collateral == 0 or oracle_price == 0:
         return LendingMarketHealth(
             protocol="morpho",
@@ -186,6 +279,7 @@ def _compute_morpho_market_health(
             total_debt_usd=None,
             ltv_usage_percent=None,
             substrate_id=morpho_market_id,
+            inputs=inputs,
         )
 
     # collateral_value_in_loan = collateral * oracle_price / ORACLE_PRICE_SCALE
@@ -217,9 +311,33 @@ def _compute_morpho_market_health(
         total_debt_usd=None,
         ltv_usage_percent=round(ltv_usage, 2) if ltv_usage is not None else None,
         substrate_id=morpho_market_id,
+        inputs=inputs,
     )
 
 
+def _compute_morpho_health(
+    reader: MorphoReader,
+    vault_address: ChecksumAddress,
+    morpho_markets: list[tuple[int, str, MorphoBlueMarketId]],
+) -> list[LendingMarketHealth]:
+    """Compute LTV health for every Morpho Blue substrate from one
+    `MorphoReader.positions_for` batch."""
+    try:
+        snapshots = reader.positions_for(
+            vault_address, [morpho_mid for _, _, morpho_mid in morpho_markets]
+        )
+    except Exception:
+        _logger.debug("Failed to read Morpho positions for %s", vault_address)
+        return []
+    by_id = {snapshot.market_id: snapshot for snapshot in snapshots}
+    return [
+        health
+        for ipor_mid, name, morpho_mid in morpho_markets
+        if (snapshot := by_id.get(morpho_mid)) is not None
+        and (health := _morpho_market_health(snapshot, ipor_mid, name)) is not None
+    ]
+
+
 def _compute_aave_market_health(
     reader: AaveV3Reader,
     vault_address: ChecksumAddress,
@@ -232,6 +350,20 @@ def _compute_aave_market_health(
     except Exception:
         _logger.debug("Failed to read Aave V3 account data for %s", vault_address)
         return None
+    return _aave_market_health(data, ipor_market_id, market_name)
+
+
+def _aave_market_health(
+    data: AaveV3UserAccountData, ipor_market_id: int, market_name: str
+) -> LendingMarketHealth:
+    """LTV health of an Aave V3 account, from its `getUserAccountData()`."""
+    # Basis points to WAD
+    inputs = LendingPositionInputs(
+        collateral=data.total_collateral_base,
+        debt=data.total_debt_base,
+        lltv=data.current_liquidation_threshold * 10**14,
+        borrow_ltv=data.ltv * 10**14,
+    )
 
     # No debt = no risk
     if data.total_debt_base == 0:
@@ -246,6 +378,7 @@ def _compute_aave_market_health(
             total_collateral_usd=round(data.total_collateral_base / 1e8, 2),
             total_debt_usd=0.0,
             ltv_usage_percent=0.0,
+            inputs=inputs,
         )
 
     # Aave returns ltv and liquidation_threshold in basis points (1 = 0.01%)
@@ -270,10 +403,32 @@ def _compute_aave_market_health(
         total_collateral_usd=round(data.total_collateral_base / 1e8, 2),
         total_debt_usd=round(data.total_debt_base / 1e8, 2),
         ltv_usage_percent=round(ltv_usage, 2) if ltv_usage is not None else None,
+        inputs=inputs,
     )
 
 
-def fetch_vault_lending_health(  # noqa: C901
+def _lending_markets(
+    balance_fuse_market_ids: list[int], market_substrates: dict[int, list[bytes]]
+) -> tuple[list[tuple[int, str, MorphoBlueMarketId]], list[tuple[int, str]]]:
+    """Split a vault's markets into Morpho substrates ``(ipor market id, name,
+    morpho market id)`` and Aave V3 markets ``(ipor market id, name)``."""
+    morpho_markets: list[tuple[int, str, MorphoBlueMarketId]] = []
+    aave_market_ids: list[tuple[int, str]] = []
+
+    for mid in balance_fuse_market_ids:
+        name = market_name(mid)
+        if mid in MORPHO_MARKET_IDS:
+            substrates = market_substrates.get(mid, [])
+            for sub in substrates:
+                hex_str = sub.hex()
+                if len(hex_str) == 64:
+                    morpho_markets.append((mid, name, MorphoBlueMarketId(hex_str)))
+        elif mid in AAVE_V3_MARKET_IDS:
+            aave_market_ids.append((mid, name))
+    return morpho_markets, aave_market_ids
+
+
+def fetch_vault_lending_health(
     ctx: Web3Context,
     vault_address: ChecksumAddress,
     chain_id: int,
@@ -289,39 +444,24 @@ def fetch_vault_lending_health(  # noqa: C901
         balance_fuse_market_ids: List of market IDs from balance fuses.
         market_substrates: Map of market_id -> list of raw substrate bytes.
     """
-    morpho_markets: list[tuple[int, str, MorphoBlueMarketId]] = []
-    aave_market_ids: list[tuple[int, str]] = []
-
-    for mid in balance_fuse_market_ids:
-        name = market_name(mid)
-        if mid in MORPHO_MARKET_IDS:
-            substrates = market_substrates.get(mid, [])
-            for sub in substrates:
-                hex_str = sub.hex()
-                if len(hex_str) == 64:
-                    morpho_markets.append((mid, name, MorphoBlueMarketId(hex_str)))
-        elif mid in AAVE_V3_MARKET_IDS:
-            aave_market_ids.append((mid, name))
-
+    morpho_markets, aave_market_ids = _lending_markets(
+        balance_fuse_market_ids, market_substrates
+    )
     results: list[LendingMarketHealth] = []
 
-    with ThreadPoolExecutor() as pool:
+    with RpcScheduler.for_context(ctx).group() as pool:
         futures = []
 
         if morpho_markets:
-            morpho_reader = MorphoReader(ctx, MORPHO_BLUE_ADDRESS)
-            for ipor_mid, name, morpho_mid in morpho_markets:
-                futures.append(
-                    pool.submit(
-                        _compute_morpho_market_health,
-                        ctx,
-                        morpho_reader,
-                        morpho_mid,
-                        vault_address,
-                        ipor_mid,
-                        name,
-                    )
-                )
+            # All substrates in one batch: two multicall rounds in total.
+            morpho_future = pool.submit(
+                _compute_morpho_health,
+                MorphoReader(ctx, MORPHO_BLUE_ADDRESS),
+                vault_address,
+                morpho_markets,
+            )
+        else:
+            morpho_future = None
 
         if aave_market_ids:
             aave_pool = AAVE_V3_POOL.get(chain_id)
@@ -344,6 +484,8 @@ def fetch_vault_lending_health(  # noqa: C901
                     "No Aave V3 pool address for chain %d, skipping", chain_id
                 )
 
+        if morpho_future is not None:
+            results.extend(morpho_future.result())
         for fut in futures:
             result = fut.result()
             if result is not None:
@@ -0,0 +1,361 @@
+"""Continuous lending health: many vaults, refreshed block by block.
+
+`fetch_vault_lending_health` reads one vault from scratch, with a thread
+pool per call. Polling many vaults that way repeats every read on every
+block, the immutable Morpho market params included.
+
+`LendingHealthMonitor` tracks many vaults on one chain. Morpho market params
+are read once per market. Each `refresh` then reads everything that can move
+in a single multicall: every vault's Morpho `position()`, each market's
+`market()` state and each oracle's `price()` once however many vaults share
+them, and every vault's Aave V3 `getUserAccountData()`. A market's health is
+recomputed only when those inputs changed since the previous refresh.
+
+The monitor keeps the last ``history_size`` refreshes of each vault and
+calls its alert callbacks when a market's `is_warning` or `is_critical`
+flips. A market first seen in a warning or critical state counts as a flip.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any
+
+from eth_typing import ChecksumAddress
+
+from ipor_fusion.core.context import Web3Context
+from ipor_fusion.core.contract import Call
+from ipor_fusion.core.multicall import Multicall3, call_all
+from ipor_fusion.errors import RECOVERABLE_ERRORS, TRANSPORT_ERRORS
+from ipor_fusion.readers.aave_v3 import AaveV3Reader
+from ipor_fusion.readers.lending_health import (
+    AAVE_V3_POOL,
+    MORPHO_BLUE_ADDRESS,
+    LendingMarketHealth,
+    VaultLendingHealth,
+    _aave_market_health,
+    _lending_markets,
+    _morpho_market_health,
+)
+from ipor_fusion.readers.morpho import (
+    MorphoMarketParams,
+    MorphoOracle,
+    MorphoPositionSnapshot,
+    MorphoReader,
+)
+from ipor_fusion.types import MorphoBlueMarketId
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_SIZE = 100
+
+# (protocol, IPOR market id, substrate): one market of one vault
+_MarketKey = tuple[str, int, str | None]
+
+
+@dataclass(slots=True)
+class LendingHealthSample:
+    """A vault's lending health at one block. `changed` is False when no
+    market's inputs moved since the previous sample."""
+
+    block_number: int
+    health: VaultLendingHealth
+    changed: bool
+
+
+@dataclass(slots=True)
+class LendingHealthAlert:
+    """A market whose `is_warning` or `is_critical` flipped at `block_number`.
+
+    `previous` is None for a market seen for the first time, `current` for
+    one that is no longer reported.
+    """
+
+    block_number: int
+    vault_address: ChecksumAddress
+    previous: LendingMarketHealth | None
+    current: LendingMarketHealth | None
+
+    @property
+    def is_warning(self) -> bool:
+        return self.current is not None and self.current.is_warning
+
+    @property
+    def is_critical(self) -> bool:
+        return self.current is not None and self.current.is_critical
+
+
+@dataclass(slots=True)
+class _TrackedVault:
+    address: ChecksumAddress
+    morpho_markets: list[tuple[int, str, MorphoBlueMarketId]]
+    aave_market: tuple[int, str] | None
+    history: deque[LendingHealthSample]
+    # Per market: the raw inputs the health was last computed from
+    inputs: dict[_MarketKey, tuple[Any, LendingMarketHealth | None]] = field(
+        default_factory=dict
+    )
+
+
+class LendingHealthMonitor:
+    """Lending health of many vaults on one chain, kept current block by
+    block; see the module docstring."""
+
+    def __init__(
+        self,
+        ctx: Web3Context,
+        chain_id: int,
+        history_size: int = DEFAULT_HISTORY_SIZE,
+    ):
+        self._ctx = ctx
+        self._chain_id = chain_id
+        self._history_size = history_size
+        self._morpho = MorphoReader(ctx, MORPHO_BLUE_ADDRESS)
+        aave_pool = AAVE_V3_POOL.get(chain_id)
+        self._aave = AaveV3Reader(ctx, aave_pool) if aave_pool else None
+        self._params: dict[MorphoBlueMarketId, MorphoMarketParams] = {}
+        self._vaults: dict[ChecksumAddress, _TrackedVault] = {}
+        self._callbacks: list[Callable[[LendingHealthAlert], None]] = []
+        self._lock = threading.Lock()
+
+    def track(
+        self,
+        vault_address: ChecksumAddress,
+        balance_fuse_market_ids: list[int],
+        market_substrates: dict[int, list[bytes]],
+    ) -> None:
+        """Start (or, with new markets, restart) tracking a vault. The
+        arguments are those of `fetch_vault_lending_health`."""
+        morpho_markets, aave_markets = _lending_markets(
+            balance_fuse_market_ids, market_substrates
+        )
+        if aave_markets and self._aave is None:
+            _logger.debug(
+                "No Aave V3 pool address for chain %d, skipping", self._chain_id
+            )
+        with self._lock:
+            self._vaults[vault_address] = _TrackedVault(
+                address=vault_address,
+                morpho_markets=morpho_markets,
+                # Aave V3 account data is per user: one read covers every market
+                aave_market=aave_markets[0] if aave_markets and self._aave else None,
+                history=deque(maxlen=self._history_size),
+            )
+
+    def untrack(self, vault_address: ChecksumAddress) -> None:
+        with self._lock:
+            self._vaults.pop(vault_address, None)
+
+    def on_alert(self, callback: Callable[[LendingHealthAlert], None]) -> None:
+        """Call ``callback`` with every `LendingHealthAlert`. A callback that
+        raises is logged and does not stop the others."""
+        self._callbacks.append(callback)
+
+    @property
+    def vaults(self) -> list[ChecksumAddress]:
+        with self._lock:
+            return list(self._vaults)
+
+    def health(self, vault_address: ChecksumAddress) -> VaultLendingHealth | None:
+        """The vault's health at the last refresh, None before the first."""
+        history = self.history(vault_address)
+        return history[-1].health if history else None
+
+    def history(self, vault_address: ChecksumAddress) -> list[LendingHealthSample]:
+        """The vault's last refreshes, oldest first."""
+        with self._lock:
+            tracked = self._vaults.get(vault_address)
+            return list(tracked.history) if tracked else []
+
+    def refresh(self, block: int | None = None) -> list[LendingHealthAlert]:
+        """Read every tracked vault at ``block`` (the context's default block
+        if None) and return the alerts raised, after calling the callbacks.
+
+        The context itself is left as it was: the reads go through a copy
+        pinned to ``block``. Raises if the multicall itself fails; a single
+        read that reverts leaves its market at its last known health.
+        """
+        ctx = self._ctx if block is None else self._ctx.pinned(block)
+        with self._lock:
+            vaults = list(self._vaults.values())
+        self._read_params(ctx, vaults)
+
+        reads: dict[Hashable, Call[Any]] = {"block": Multicall3(ctx).get_block_number()}
+        for tracked in vaults:
+            self._plan(ctx, tracked, reads)
+        results = dict(zip(reads, call_all(ctx, list(reads.values())), strict=True))
+        block_number = results["block"]
+        if isinstance(block_number, Exception):
+            raise block_number
+
+        alerts: list[LendingHealthAlert] = []
+        for tracked in vaults:
+            alerts += self._update(tracked, results, block_number)
+        for alert in alerts:
+            for callback in self._callbacks:
+                try:
+                    callback(alert)
+                except Exception:
+                    _logger.exception("Lending health alert callback failed")
+        return alerts
+
+    def run(self, blocks: Iterable[int]) -> None:
+        """`refresh` at each block of ``blocks``, e.g. the CLI's
+        ``new_blocks(ctx)``. A failed refresh, whether the RPC rejected it or
+        the connection dropped, is logged and the next block tried: a monitor
+        outlives the odd RPC hiccup."""
+        for block in blocks:
+            try:
+                self.refresh(block)
+            except (*RECOVERABLE_ERRORS, *TRANSPORT_ERRORS) as exc:
+                _logger.debug("Lending health refresh at %d failed: %s", block, exc)
+
+    def _read_params(self, ctx: Web3Context, vaults: list[_TrackedVault]) -> None:
+        missing = list(
+            dict.fromkeys(
+                morpho_mid
+                for tracked in vaults
+                for _, _, morpho_mid in tracked.morpho_markets
+                if morpho_mid not in self._params
+            )
+        )
+        if not missing:
+            return
+        params = call_all(ctx, [self._morpho.market_params(mid) for mid in missing])
+        for morpho_mid, result in zip(missing, params, strict=True):
+            if isinstance(result, Exception):
+                _logger.debug("Failed to read Morpho market %s: %s", morpho_mid, result)
+            else:
+                self._params[morpho_mid] = result
+
+    def _plan(
+        self,
+        ctx: Web3Context,
+        tracked: _TrackedVault,
+        reads: dict[Hashable, Call[Any]],
+    ) -> None:
+        for _, _, morpho_mid in tracked.morpho_markets:
+            params = self._params.get(morpho_mid)
+            if params is None:
+                continue
+            reads[("position", tracked.address, morpho_mid)] = self._morpho.position(
+                morpho_mid, tracked.address
+            )
+            reads.setdefault(("market", morpho_mid), self._morpho.market(morpho_mid))
+            reads.setdefault(
+                ("price", params.oracle), MorphoOracle(ctx, params.oracle).price()
+            )
+        if tracked.aave_market is not None and self._aave is not None:
+            reads[("aave", tracked.address)] = self._aave.get_user_account_data(
+                tracked.address
+            )
+
+    def _update(
+        self,
+        tracked: _TrackedVault,
+        results: dict[Hashable, Any],
+        block_number: int,
+    ) -> list[LendingHealthAlert]:
+        previous = {_key(m): m for m in self._last_markets(tracked)}
+        markets: list[LendingMarketHealth] = []
+        changed = False
+
+        for ipor_mid, name, morpho_mid in tracked.morpho_markets:
+            key: _MarketKey = ("morpho", ipor_mid, morpho_mid)
+            params = self._params.get(morpho_mid)
+            position = results.get(("position", tracked.address, morpho_mid))
+            market = results.get(("market", morpho_mid))
+            if params is None or _failed(position, market):
+                health = tracked.inputs.get(key, (None, None))[1]
+            else:
+                price = results[("price", params.oracle)]
+                snapshot = MorphoPositionSnapshot(
+                    market_id=morpho_mid,
+                    position=position,
+                    market=market,
+                    params=params,
+                    oracle_price=None if _failed(price) else price,
+                )
+                health, recomputed = self._recompute(
+                    tracked,
+                    key,
+                    (position, market, snapshot.oracle_price),
+                    partial(_morpho_market_health, snapshot, ipor_mid, name),
+                )
+                changed |= recomputed
+            if health is not None:
+                markets.append(health)
+
+        if tracked.aave_market is not None:
+            ipor_mid, name = tracked.aave_market
+            key = ("aave_v3", ipor_mid, None)
+            data = results.get(("aave", tracked.address))
+            if _failed(data):
+                health = tracked.inputs.get(key, (None, None))[1]
+            else:
+                health, recomputed = self._recompute(
+                    tracked,
+                    key,
+                    data,
+                    partial(_aave_market_health, data, ipor_mid, name),
+                )
+                changed |= recomputed
+            if health is not None:
+                markets.append(health)
+
+        with self._lock:
+            tracked.history.append(
+                LendingHealthSample(
+                    block_number=block_number,
+                    health=VaultLendingHealth(markets=markets),
+                    changed=changed,
+                )
+            )
+        current = {_key(m): m for m in markets}
+        return [
+            LendingHealthAlert(
+                block_number=block_number,
+                vault_address=tracked.address,
+                previous=previous.get(key),
+                current=current.get(key),
+            )
+            for key in dict.fromkeys([*previous, *current])
+            if _state(previous.get(key)) != _state(current.get(key))
+        ]
+
+    @staticmethod
+    def _recompute(
+        tracked: _TrackedVault,
+        key: _MarketKey,
+        inputs: Any,
+        compute: Callable[[], LendingMarketHealth | None],
+    ) -> tuple[LendingMarketHealth | None, bool]:
+        known = tracked.inputs.get(key)
+        if known is not None and known[0] == inputs:
+            return known[1], False
+        health = compute()
+        tracked.inputs[key] = (inputs, health)
+        return health, True
+
+    def _last_markets(self, tracked: _TrackedVault) -> list[LendingMarketHealth]:
+        with self._lock:
+            return tracked.history[-1].health.markets if tracked.history else []
+
+
+def _key(market: LendingMarketHealth) -> _MarketKey:
+    return market.protocol, market.market_id, market.substrate_id
+
+
+def _state(market: LendingMarketHealth | None) -> tuple[bool, bool]:
+    if market is None:
+        return False, False
+    return market.is_warning, market.is_critical
+
+
+def _failed(*results: object) -> bool:
+    return any(r is None or isinstance(r, Exception) for r in results)
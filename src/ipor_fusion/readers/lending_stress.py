@@ -0,0 +1,289 @@
+"""Lending stress test: vault borrowing positions under a grid of price shocks.
+
+`fetch_stress_positions` reads a vault's Morpho Blue and Aave V3 borrowing
+positions once. Each becomes a `StressPosition`: collateral value, debt and
+liquidation threshold in one unit. `stress_test` then prices every position
+under every scenario of a collateral × loan price-shock grid. That is pure
+compute: NumPy arrays of scenarios × positions, with no RPC. Positions from
+many vaults can be stressed together.
+
+A shock moves every collateral price (or every loan price) by the same
+fraction: ``-0.2`` is a 20% drop. The health factor scales with the
+collateral-to-loan price ratio: ``hf * (1 + collateral_shock) / (1 +
+loan_shock)``.
+
+NumPy is optional for the SDK and is needed only by `stress_test`:
+``pip install 'ipor-fusion[stress]'``.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import Any
+
+from eth_typing import ChecksumAddress
+
+from ipor_fusion.core.context import Web3Context
+from ipor_fusion.core.scheduler import RpcScheduler
+from ipor_fusion.readers.aave_v3 import AaveV3Reader
+from ipor_fusion.readers.lending_health import (
+    AAVE_V3_POOL,
+    MORPHO_BLUE_ADDRESS,
+    ORACLE_PRICE_SCALE,
+    WAD,
+    _lending_markets,
+    _morpho_liquidation_price,
+    _shares_to_assets_up,
+)
+from ipor_fusion.readers.morpho import MorphoReader
+from ipor_fusion.types import MorphoBlueMarketId
+
+_logger = logging.getLogger(__name__)
+
+# 40 collateral drops × 25 loan rises: 1,000 scenarios.
+DEFAULT_COLLATERAL_SHOCKS: tuple[float, ...] = tuple(-i / 80 for i in range(40))
+DEFAULT_LOAN_SHOCKS: tuple[float, ...] = tuple(i / 100 for i in range(25))
+
+
+@dataclass(slots=True)
+class StressPosition:
+    """A borrowing position, reduced to what a price shock acts on.
+
+    `collateral_value` and `debt` share a unit. For Morpho it is the loan
+    token, with collateral valued at the oracle price. For Aave it is the
+    pool's base currency (USD). `liquidation_threshold` is the fraction of
+    collateral value that can be borrowed before liquidation: the LLTV for
+    Morpho, the weighted liquidation threshold for Aave.
+
+    For Morpho, `oracle_price` is the oracle's price (1e36 scale) and
+    `liquidation_price` the oracle price below which the position can be
+    liquidated, exact from the integer reads. Both are None for Aave, whose
+    health is account-wide.
+    """
+
+    vault_address: ChecksumAddress
+    protocol: str
+    market_id: int
+    market_name: str
+    collateral_value: float
+    debt: float
+    liquidation_threshold: float
+    substrate_id: str | None = None
+    oracle_price: int | None = None
+    liquidation_price: int | None = None
+
+    @property
+    def health_factor(self) -> float:
+        if self.debt == 0:
+            return math.inf
+        return self.collateral_value * self.liquidation_threshold / self.debt
+
+    @property
+    def liquidation_shock(self) -> float:
+        """The collateral price move, loan price held, that brings the health
+        factor to 1. ``-0.25`` means liquidation after a 25% drop; zero or
+        more means the position is already liquidatable."""
+        if self.health_factor == 0:
+            return math.inf
+        return 1 / self.health_factor - 1
+
+
+@dataclass(slots=True)
+class StressScenario:
+    """One row of the worst-case table: a scenario and its weakest position."""
+
+    collateral_shock: float
+    loan_shock: float
+    min_health_factor: float
+    worst_position: StressPosition
+    liquidated_positions: int
+
+
+@dataclass(slots=True)
+class StressResult:
+    """Health factors for every scenario (rows) and position (columns).
+
+    The array fields are NumPy arrays: the shocks are indexed by scenario,
+    and `health_factors` has shape ``(scenarios, positions)``.
+    """
+
+    positions: list[StressPosition]
+    collateral_shocks: Any
+    loan_shocks: Any
+    health_factors: Any
+
+    @property
+    def ltv_usage_percent(self) -> Any:
+        """Debt over borrowing capacity, in percent: 100 / health factor."""
+        with _numpy().errstate(divide="ignore"):
+            return 100 / self.health_factors
+
+    @property
+    def liquidation_distance(self) -> Any:
+        """The further collateral drop, at each scenario's prices, before
+        liquidation: 1 - 1 / health factor. Negative once liquidatable."""
+        with _numpy().errstate(divide="ignore"):
+            return 1 - 1 / self.health_factors
+
+    @property
+    def liquidated(self) -> Any:
+        return self.health_factors < 1
+
+    def worst_scenarios(self, limit: int = 10) -> list[StressScenario]:
+        """The ``limit`` scenarios with the lowest health factor across all
+        positions, worst first."""
+        if not self.positions:
+            return []
+        np = _numpy()
+        worst_position = self.health_factors.argmin(axis=1)
+        min_health = self.health_factors[np.arange(len(worst_position)), worst_position]
+        liquidated = self.liquidated.sum(axis=1)
+        order = np.argsort(min_health, kind="stable")[:limit]
+        return [
+            StressScenario(
+                collateral_shock=float(self.collateral_shocks[i]),
+                loan_shock=float(self.loan_shocks[i]),
+                min_health_factor=float(min_health[i]),
+                worst_position=self.positions[int(worst_position[i])],
+                liquidated_positions=int(liquidated[i]),
+            )
+            for i in order
+        ]
+
+
+def stress_test(
+    positions: list[StressPosition],
+    collateral_shocks: tuple[float, ...] | list[float] = DEFAULT_COLLATERAL_SHOCKS,
+    loan_shocks: tuple[float, ...] | list[float] = DEFAULT_LOAN_SHOCKS,
+) -> StressResult:
+    """Health factors of ``positions`` under every combination of
+    ``collateral_shocks`` and ``loan_shocks``; no RPC. Needs NumPy.
+
+    Raises ValueError for a shock of -100% or lower.
+    """
+    np = _numpy()
+    collateral, loan = np.meshgrid(
+        np.asarray(collateral_shocks, dtype=float),
+        np.asarray(loan_shocks, dtype=float),
+        indexing="ij",
+    )
+    collateral, loan = collateral.ravel(), loan.ravel()
+    if (collateral <= -1).any() or (loan <= -1).any():
+        raise ValueError("Price shocks must stay above -100%")
+    base = np.array([p.health_factor for p in positions], dtype=float)
+    return StressResult(
+        positions=list(positions),
+        collateral_shocks=collateral,
+        loan_shocks=loan,
+        health_factors=np.outer((1 + collateral) / (1 + loan), base),
+    )
+
+
+def fetch_stress_positions(
+    ctx: Web3Context,
+    vault_address: ChecksumAddress,
+    chain_id: int,
+    balance_fuse_market_ids: list[int],
+    market_substrates: dict[int, list[bytes]],
+) -> list[StressPosition]:
+    """Read the vault's borrowing positions, the one fetch a stress test
+    needs: every Morpho substrate in one `MorphoReader.positions_for` batch,
+    and the Aave V3 account data in parallel.
+
+    Positions without debt carry no liquidation risk and are left out, as
+    are Morpho markets whose reads reverted. RPC failures are raised.
+    """
+    morpho_markets, aave_markets = _lending_markets(
+        balance_fuse_market_ids, market_substrates
+    )
+    aave_pool = AAVE_V3_POOL.get(chain_id) if aave_markets else None
+    with RpcScheduler.for_context(ctx).group() as pool:
+        morpho = (
+            pool.submit(_morpho_positions, ctx, vault_address, morpho_markets)
+            if morpho_markets
+            else None
+        )
+        aave = (
+            pool.submit(_aave_position, ctx, aave_pool, vault_address, *aave_markets[0])
+            if aave_pool
+            else None
+        )
+        positions = morpho.result() if morpho else []
+        if aave and (position := aave.result()) is not None:
+            positions.append(position)
+    return positions
+
+
+def _morpho_positions(
+    ctx: Web3Context,
+    vault_address: ChecksumAddress,
+    morpho_markets: list[tuple[int, str, MorphoBlueMarketId]],
+) -> list[StressPosition]:
+    snapshots = MorphoReader(ctx, MORPHO_BLUE_ADDRESS).positions_for(
+        vault_address, [morpho_mid for _, _, morpho_mid in morpho_markets]
+    )
+    by_id = {snapshot.market_id: snapshot for snapshot in snapshots}
+    positions = []
+    for ipor_mid, name, morpho_mid in morpho_markets:
+        snapshot = by_id.get(morpho_mid)
+        if snapshot is None or snapshot.position.borrow_shares == 0:
+            continue
+        if snapshot.oracle_price is None:
+            _logger.debug("No Morpho oracle price for %s, skipping", morpho_mid)
+            continue
+        collateral, lltv = snapshot.position.collateral, snapshot.params.lltv
+        debt = _shares_to_assets_up(
+            snapshot.position.borrow_shares,
+            snapshot.market.total_borrow_assets,
+            snapshot.market.total_borrow_shares,
+        )
+        positions.append(
+            StressPosition(
+                vault_address=vault_address,
+                protocol="morpho",
+                market_id=ipor_mid,
+                market_name=name,
+                collateral_value=collateral
+                * snapshot.oracle_price
+                / ORACLE_PRICE_SCALE,
+                debt=float(debt),
+                liquidation_threshold=lltv / WAD,
+                substrate_id=morpho_mid,
+                oracle_price=snapshot.oracle_price,
+                liquidation_price=_morpho_liquidation_price(debt, collateral, lltv),
+            )
+        )
+    return positions
+
+
+def _aave_position(
+    ctx: Web3Context,
+    pool_address: ChecksumAddress,
+    vault_address: ChecksumAddress,
+    ipor_market_id: int,
+    market_name: str,
+) -> StressPosition | None:
+    data = AaveV3Reader(ctx, pool_address).get_user_account_data(vault_address).call()
+    if data.total_debt_base == 0:
+        return None
+    return StressPosition(
+        vault_address=vault_address,
+        protocol="aave_v3",
+        market_id=ipor_market_id,
+        market_name=market_name,
+        collateral_value=data.total_collateral_base / 1e8,
+        debt=data.total_debt_base / 1e8,
+        liquidation_threshold=data.current_liquidation_threshold / 10_000,
+    )
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as exc:
+        raise ImportError(
+            "The lending stress test needs NumPy: pip install 'ipor-fusion[stress]'"
+        ) from exc
+    return numpy
@@ -1,5 +1,7 @@
+import logging
 import math
-from dataclasses import dataclass
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, replace
 
 from eth_abi import decode, encode
 from eth_typing import ChecksumAddress
@@ -9,8 +11,12 @@ from web3.types import Timestamp
 
 from ipor_fusion.core.context import Web3Context
 from ipor_fusion.core.contract import Call, ContractWrapper
+from ipor_fusion.core.multicall import Multicall3, call_all
+from ipor_fusion.readers import morpho_irm
 from ipor_fusion.types import Amount, Fee, MorphoBlueMarketId, Shares
 
+_logger = logging.getLogger(__name__)
+
 WAD = 10**18
 SECONDS_PER_YEAR = 365 * 24 * 60 * 60  # matches Morpho IRM YEAR constant
 
@@ -82,6 +88,180 @@ class MorphoPositionBreakdown:
     supply_assets: Amount
 
 
+@dataclass(slots=True)
+class MorphoPositionSnapshot:
+    """A user's position in a Morpho Blue market with everything it is valued
+    against, as read by `MorphoReader.positions_for`.
+
+    `oracle_price` is the market oracle's `price()` (collateral quoted in the
+    loan token, scaled by 1e36). It is read only for positions with collateral
+    or debt and is ``None`` otherwise, or when the oracle reverted.
+    """
+
+    market_id: MorphoBlueMarketId
+    position: MorphoPosition
+    market: MorphoMarket
+    params: MorphoMarketParams
+    oracle_price: int | None = None
+
+    @property
+    def breakdown(self) -> MorphoPositionBreakdown:
+        return _breakdown(self.market_id, self.position, self.market, self.params)
+
+
+@dataclass(slots=True)
+class MorphoRateModel:
+    """A market's AdaptiveCurveIRM inputs, as read by `MorphoReader.rate_models`.
+
+    Rates follow locally and exactly (see `ipor_fusion.readers.morpho_irm`):
+    now, at a later time, or after a hypothetical supply or borrow, without
+    calling the IRM. `rate_at_target` is the IRM's stored value (0 before the
+    market's first interaction); `timestamp` is the block time the state was
+    read at, the default for every method below.
+    """
+
+    market_id: MorphoBlueMarketId
+    market: MorphoMarket
+    params: MorphoMarketParams
+    rate_at_target: int
+    timestamp: int
+
+    def borrow_rate(self, timestamp: int | None = None) -> int:
+        """What the IRM's ``borrowRateView`` returns at ``timestamp``: the
+        borrow rate per second (1e18 scale)."""
+        rate, _ = self._borrow_rate(timestamp)
+        return rate
+
+    def rates(self, timestamp: int | None = None) -> MorphoMarketRates:
+        return _market_rates(self.borrow_rate(timestamp), self.market)
+
+    def accrued(self, timestamp: int | None = None) -> "MorphoRateModel":
+        """The model as the next interaction at ``timestamp`` leaves it:
+        interest accrued into the totals, rate at target adapted."""
+        at = self.timestamp if timestamp is None else timestamp
+        rate, rate_at_target = self._borrow_rate(at)
+        supply_assets, supply_shares, borrow_assets = morpho_irm.accrue_interest(
+            self.market.total_supply_assets,
+            self.market.total_supply_shares,
+            self.market.total_borrow_assets,
+            self.market.fee,
+            rate,
+            self._elapsed(at),
+        )
+        market = replace(
+            self.market,
+            total_supply_assets=Amount(supply_assets),
+            total_supply_shares=Shares(supply_shares),
+            total_borrow_assets=Amount(borrow_assets),
+            last_update=Timestamp(at),
+        )
+        return replace(self, market=market, rate_at_target=rate_at_target, timestamp=at)
+
+    def rates_after(
+        self,
+        supply_assets: int = 0,
+        borrow_assets: int = 0,
+        timestamp: int | None = None,
+    ) -> MorphoMarketRates:
+        """Rates right after supplying ``supply_assets`` and borrowing
+        ``borrow_assets`` (negative to withdraw or repay) at ``timestamp``.
+
+        Raises ValueError when the action would leave the market with more
+        borrowed than supplied.
+        """
+        state = self.accrued(timestamp)
+        market = replace(
+            state.market,
+            total_supply_assets=Amount(
+                state.market.total_supply_assets + supply_assets
+            ),
+            total_borrow_assets=Amount(
+                state.market.total_borrow_assets + borrow_assets
+            ),
+        )
+        if not 0 <= market.total_borrow_assets <= market.total_supply_assets:
+            raise ValueError(
+                f"Market {self.market_id} cannot have {market.total_borrow_assets} "
+                f"borrowed against {market.total_supply_assets} supplied"
+            )
+        (rate,) = morpho_irm.rate_curve(
+            state.rate_at_target,
+            [
+                morpho_irm.utilization(
+                    market.total_borrow_assets, market.total_supply_assets
+                )
+            ],
+        )
+        return _market_rates(rate, market)
+
+    def rate_curve(
+        self, utilizations: Iterable[int], timestamp: int | None = None
+    ) -> list[int]:
+        """Borrow rate per second at each WAD-scaled utilization, on the
+        curve as it stands at ``timestamp``."""
+        return morpho_irm.rate_curve(
+            self.accrued(timestamp).rate_at_target, utilizations
+        )
+
+    def _elapsed(self, timestamp: int) -> int:
+        return max(timestamp - self.market.last_update, 0)
+
+    def _borrow_rate(self, timestamp: int | None) -> tuple[int, int]:
+        at = self.timestamp if timestamp is None else timestamp
+        return morpho_irm.borrow_rate(
+            morpho_irm.utilization(
+                self.market.total_borrow_assets, self.market.total_supply_assets
+            ),
+            self.rate_at_target,
+            self._elapsed(at),
+        )
+
+
+def _market_rates(rate_wad: int, market: MorphoMarket) -> MorphoMarketRates:
+    borrow_apy = math.expm1(rate_wad / WAD * SECONDS_PER_YEAR)
+    if market.total_supply_assets > 0:
+        utilization = market.total_borrow_assets / market.total_supply_assets
+    else:
+        utilization = 0.0
+    fee_factor = 1.0 - market.fee / WAD
+    return MorphoMarketRates(
+        rate_per_second_wad=rate_wad,
+        utilization=utilization,
+        borrow_apy=borrow_apy,
+        supply_apy=borrow_apy * utilization * fee_factor,
+    )
+
+
+def _breakdown(
+    market_id: MorphoBlueMarketId,
+    pos: MorphoPosition,
+    market: MorphoMarket,
+    params: MorphoMarketParams,
+) -> MorphoPositionBreakdown:
+    if market.total_borrow_shares > 0:
+        borrow_assets = math.ceil(
+            pos.borrow_shares
+            * (market.total_borrow_assets + 1)
+            / (market.total_borrow_shares + 1)
+        )
+    else:
+        borrow_assets = 0
+    if market.total_supply_shares > 0:
+        supply_assets = (
+            pos.supply_shares * market.total_supply_assets // market.total_supply_shares
+        )
+    else:
+        supply_assets = 0
+    return MorphoPositionBreakdown(
+        market_id=market_id,
+        loan_token=params.loan_token,
+        collateral_token=params.collateral_token,
+        collateral=pos.collateral,
+        borrow_assets=Amount(borrow_assets),
+        supply_assets=Amount(supply_assets),
+    )
+
+
 def _market_decoder(value: tuple) -> MorphoMarket:
     return MorphoMarket(*value)
 
@@ -140,30 +320,74 @@ class MorphoReader(ContractWrapper):
         pos = self.position(market_id, user).call()
         market = self.market(market_id).call()
         params = self.market_params(market_id).call()
-        if market.total_borrow_shares > 0:
-            borrow_assets = math.ceil(
-                pos.borrow_shares
-                * (market.total_borrow_assets + 1)
-                / (market.total_borrow_shares + 1)
+        return _breakdown(market_id, pos, market, params)
+
+    def positions_for(
+        self,
+        user: ChecksumAddress,
+        market_ids: Sequence[MorphoBlueMarketId],
+        with_oracle_prices: bool = True,
+    ) -> list[MorphoPositionSnapshot]:
+        """Read the user's positions in all ``market_ids`` in at most two
+        multicall rounds.
+
+        The first round reads `position()`, `market()` and `market_params()`
+        for every market; the second reads `price()` once per distinct oracle
+        behind a position with collateral or debt (skipped when there is
+        none, or when ``with_oracle_prices`` is False). Markets whose reads
+        reverted are left out, in the order given otherwise.
+        """
+        market_ids = list(dict.fromkeys(market_ids))
+        if not market_ids:
+            return []
+        results = call_all(
+            self._ctx,
+            [
+                call
+                for market_id in market_ids
+                for call in (
+                    self.position(market_id, user),
+                    self.market(market_id),
+                    self.market_params(market_id),
+                )
+            ],
+        )
+        snapshots: list[MorphoPositionSnapshot] = []
+        for i, market_id in enumerate(market_ids):
+            position, market, params = results[3 * i : 3 * i + 3]
+            if _failed(market_id, position, market, params):
+                continue
+            snapshots.append(
+                MorphoPositionSnapshot(market_id, position, market, params)
             )
-        else:
-            borrow_assets = 0
-        if market.total_supply_shares > 0:
-            supply_assets = (
-                pos.supply_shares
-                * market.total_supply_assets
-                // market.total_supply_shares
+        if with_oracle_prices:
+            self._read_oracle_prices(snapshots)
+        return snapshots
+
+    def _read_oracle_prices(self, snapshots: list[MorphoPositionSnapshot]) -> None:
+        priced = [
+            s for s in snapshots if s.position.borrow_shares or s.position.collateral
+        ]
+        oracles = list(dict.fromkeys(s.params.oracle for s in priced))
+        if not oracles:
+            return
+        prices = dict(
+            zip(
+                oracles,
+                call_all(
+                    self._ctx, [MorphoOracle(self._ctx, o).price() for o in oracles]
+                ),
+                strict=True,
             )
-        else:
-            supply_assets = 0
-        return MorphoPositionBreakdown(
-            market_id=market_id,
-            loan_token=params.loan_token,
-            collateral_token=params.collateral_token,
-            collateral=pos.collateral,
-            borrow_assets=Amount(borrow_assets),
-            supply_assets=Amount(supply_assets),
         )
+        for snapshot in priced:
+            price = prices[snapshot.params.oracle]
+            if isinstance(price, Exception):
+                _logger.debug(
+                    "Failed to read Morpho oracle %s: %s", snapshot.params.oracle, price
+                )
+            else:
+                snapshot.oracle_price = price
 
     def market_params(self, market_id: MorphoBlueMarketId) -> Call[MorphoMarketParams]:
         return self._view(
@@ -171,6 +395,7 @@ class MorphoReader(ContractWrapper):
             bytes.fromhex(market_id.removeprefix("0x")),
             output_types=["address", "address", "address", "address", "uint256"],
             decoder=_market_params_decoder,
+            immutable=True,
         )
 
     def rates(self, market_id: MorphoBlueMarketId) -> MorphoMarketRates:
@@ -190,23 +415,86 @@ class MorphoReader(ContractWrapper):
         """Compute APYs given pre-fetched market state and params.
 
         Use this when the caller has already read `market()` and `market_params()`
-        to avoid two redundant RPC roundtrips.
+        to avoid two redundant RPC roundtrips. This still calls the IRM; for
+        many markets, or rates at other times and utilizations, see
+        `rate_models`.
+        """
+        return _market_rates(_irm_borrow_rate_view(self._ctx, params, market), market)
+
+    def rate_models(
+        self, market_ids: Sequence[MorphoBlueMarketId]
+    ) -> list[MorphoRateModel]:
+        """Read what AdaptiveCurveIRM needs for every market, in at most two
+        multicall rounds: the block timestamp with each market's state and
+        params, then each IRM's `rateAtTarget`. Markets whose reads reverted,
+        including those on another IRM, are left out.
         """
-        rate_wad = _irm_borrow_rate_view(self._ctx, params, market)
-        rate = rate_wad / WAD
-        borrow_apy = math.expm1(rate * SECONDS_PER_YEAR)
-        if market.total_supply_assets > 0:
-            utilization = market.total_borrow_assets / market.total_supply_assets
-        else:
-            utilization = 0.0
-        fee_factor = 1.0 - market.fee / WAD
-        supply_apy = borrow_apy * utilization * fee_factor
-        return MorphoMarketRates(
-            rate_per_second_wad=rate_wad,
-            utilization=utilization,
-            borrow_apy=borrow_apy,
-            supply_apy=supply_apy,
+        market_ids = list(dict.fromkeys(market_ids))
+        if not market_ids:
+            return []
+        timestamp, *results = call_all(
+            self._ctx,
+            [
+                Multicall3(self._ctx).get_current_block_timestamp(),
+                *(
+                    call
+                    for market_id in market_ids
+                    for call in (self.market(market_id), self.market_params(market_id))
+                ),
+            ],
         )
+        if isinstance(timestamp, Exception):
+            raise timestamp
+        read = [
+            (market_id, market, params)
+            for market_id, market, params in zip(
+                market_ids, results[::2], results[1::2], strict=True
+            )
+            if not _failed(market_id, market, params)
+        ]
+        rates_at_target = call_all(
+            self._ctx,
+            [
+                AdaptiveCurveIrm(self._ctx, params.irm).rate_at_target(market_id)
+                for market_id, _, params in read
+            ],
+        )
+        return [
+            MorphoRateModel(market_id, market, params, rate_at_target, timestamp)
+            for (market_id, market, params), rate_at_target in zip(
+                read, rates_at_target, strict=True
+            )
+            if not _failed(market_id, rate_at_target)
+        ]
+
+
+def _failed(market_id: MorphoBlueMarketId, *results: object) -> bool:
+    failed = next((r for r in results if isinstance(r, Exception)), None)
+    if failed is not None:
+        _logger.debug("Failed to read Morpho market %s: %s", market_id, failed)
+    return failed is not None
+
+
+class AdaptiveCurveIrm(ContractWrapper):
+    """Morpho's AdaptiveCurveIRM, the interest rate model behind most Morpho
+    Blue markets."""
+
+    def rate_at_target(self, market_id: MorphoBlueMarketId) -> Call[int]:
+        """The market's stored rate at target utilization, per second (1e18
+        scale); 0 before its first interaction."""
+        return self._view(
+            "rateAtTarget(bytes32)",
+            bytes.fromhex(market_id.removeprefix("0x")),
+            output_types=["int256"],
+        )
+
+
+class MorphoOracle(ContractWrapper):
+    """A Morpho Blue market oracle (``IOracle``)."""
+
+    def price(self) -> Call[int]:
+        """Price of one collateral unit in loan-token units, scaled by 1e36."""
+        return self._view("price()", output_types=["uint256"])
 
 
 def _irm_borrow_rate_view(
@@ -0,0 +1,169 @@
+"""Morpho Blue interest math, ported from Solidity to exact integer arithmetic.
+
+`borrow_rate` is AdaptiveCurveIRM's ``_borrowRate`` (morpho-blue-irm,
+``AdaptiveCurveIrm.sol``) and `accrue_interest` is Morpho Blue's
+``_accrueInterest``: given the same market state, stored ``rateAtTarget``
+and block timestamp, they return the same integers the contracts compute,
+so rates can be derived locally instead of calling ``borrowRateView`` on the
+IRM for every market.
+
+Solidity's signed division truncates toward zero where Python's ``//``
+floors; `_div_to_zero` stands in for it wherever an operand can be negative.
+Rates are per second, scaled by 1e18 (WAD).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+WAD = 10**18
+SECONDS_PER_YEAR = 365 * 24 * 60 * 60
+
+# ConstantsLib
+CURVE_STEEPNESS = 4 * WAD
+ADJUSTMENT_SPEED = 50 * WAD // SECONDS_PER_YEAR
+TARGET_UTILIZATION = 9 * WAD // 10
+INITIAL_RATE_AT_TARGET = 4 * WAD // 100 // SECONDS_PER_YEAR
+MIN_RATE_AT_TARGET = WAD // 1000 // SECONDS_PER_YEAR
+MAX_RATE_AT_TARGET = 2 * WAD // SECONDS_PER_YEAR
+
+# ExpLib
+LN_2_INT = 693147180559945309
+LN_WEI_INT = -41446531673892822312
+WEXP_UPPER_BOUND = 93859467695000404319
+WEXP_UPPER_VALUE = 57716089161558943949701069502944508345128422502756744429568
+
+# Morpho Blue SharesMathLib
+VIRTUAL_SHARES = 10**6
+VIRTUAL_ASSETS = 1
+
+
+def _div_to_zero(x: int, y: int) -> int:
+    quotient = abs(x) // abs(y)
+    return quotient if (x < 0) == (y < 0) else -quotient
+
+
+def _w_mul_to_zero(x: int, y: int) -> int:
+    return _div_to_zero(x * y, WAD)
+
+
+def _w_div_to_zero(x: int, y: int) -> int:
+    return _div_to_zero(x * WAD, y)
+
+
+def w_exp(x: int) -> int:
+    """``ExpLib.wExp``: e^x for a WAD-scaled ``x``, to about 1e-3 relative.
+
+    Splits ``x = q * ln 2 + r`` with ``|r| <= ln 2 / 2`` and returns
+    ``(1 + r + r^2 / 2) << q``, clamped to 0 and ``WEXP_UPPER_VALUE``.
+    """
+    if x < LN_WEI_INT:
+        return 0
+    if x >= WEXP_UPPER_BOUND:
+        return WEXP_UPPER_VALUE
+    rounding = -(LN_2_INT // 2) if x < 0 else LN_2_INT // 2
+    q = _div_to_zero(x + rounding, LN_2_INT)
+    r = x - q * LN_2_INT
+    exp_r = WAD + r + r * r // WAD // 2
+    return exp_r << q if q >= 0 else exp_r >> -q
+
+
+def utilization(total_borrow_assets: int, total_supply_assets: int) -> int:
+    """Borrowed over supplied, WAD-scaled and rounded down; 0 with no supply."""
+    if total_supply_assets == 0:
+        return 0
+    return total_borrow_assets * WAD // total_supply_assets
+
+
+def _error(utilization_wad: int) -> int:
+    norm = (
+        WAD - TARGET_UTILIZATION
+        if utilization_wad > TARGET_UTILIZATION
+        else TARGET_UTILIZATION
+    )
+    return _w_div_to_zero(utilization_wad - TARGET_UTILIZATION, norm)
+
+
+def _curve(rate_at_target: int, err: int) -> int:
+    if err < 0:
+        coeff = WAD - _w_div_to_zero(WAD, CURVE_STEEPNESS)
+    else:
+        coeff = CURVE_STEEPNESS - WAD
+    return _w_mul_to_zero(_w_mul_to_zero(coeff, err) + WAD, rate_at_target)
+
+
+def _new_rate_at_target(start: int, linear_adaptation: int) -> int:
+    rate = _w_mul_to_zero(start, w_exp(linear_adaptation))
+    return min(max(rate, MIN_RATE_AT_TARGET), MAX_RATE_AT_TARGET)
+
+
+def borrow_rate(
+    utilization_wad: int, rate_at_target: int, elapsed: int
+) -> tuple[int, int]:
+    """``AdaptiveCurveIrm._borrowRate``: the average borrow rate over the
+    ``elapsed`` seconds since the market's last update, and the rate at
+    target at the end of them.
+
+    ``rate_at_target`` is the IRM's stored value for the market (0 before
+    its first interaction). The rate at target drifts exponentially toward
+    more (utilization above target) or less (below) over time; the average
+    integrates that drift with the trapezoidal rule, as the contract does.
+    """
+    err = _error(utilization_wad)
+    if rate_at_target == 0:
+        avg_rate_at_target = end_rate_at_target = INITIAL_RATE_AT_TARGET
+    else:
+        speed = _w_mul_to_zero(ADJUSTMENT_SPEED, err)
+        linear_adaptation = speed * elapsed
+        if linear_adaptation == 0:
+            avg_rate_at_target = end_rate_at_target = rate_at_target
+        else:
+            end_rate_at_target = _new_rate_at_target(rate_at_target, linear_adaptation)
+            mid_rate_at_target = _new_rate_at_target(
+                rate_at_target, _div_to_zero(linear_adaptation, 2)
+            )
+            avg_rate_at_target = (
+                rate_at_target + end_rate_at_target + 2 * mid_rate_at_target
+            ) // 4
+    return _curve(avg_rate_at_target, err), end_rate_at_target
+
+
+def rate_curve(rate_at_target: int, utilizations: Iterable[int]) -> list[int]:
+    """The instantaneous borrow rate at each WAD-scaled utilization, for a
+    fixed rate at target (no time elapsed): the curve to chart, or the rate
+    right after an action moves utilization."""
+    at_target = rate_at_target or INITIAL_RATE_AT_TARGET
+    return [_curve(at_target, _error(u)) for u in utilizations]
+
+
+def w_taylor_compounded(rate: int, elapsed: int) -> int:
+    """``MathLib.wTaylorCompounded``: e^(rate * elapsed) - 1 to three terms,
+    rounded down, as Morpho Blue compounds interest."""
+    first = rate * elapsed
+    second = first * first // (2 * WAD)
+    third = second * first // (3 * WAD)
+    return first + second + third
+
+
+def accrue_interest(
+    total_supply_assets: int,
+    total_supply_shares: int,
+    total_borrow_assets: int,
+    fee: int,
+    rate: int,
+    elapsed: int,
+) -> tuple[int, int, int]:
+    """``Morpho._accrueInterest`` on the market totals: returns
+    ``(total_supply_assets, total_supply_shares, total_borrow_assets)`` after
+    ``elapsed`` seconds at ``rate``, fee shares minted to the fee recipient."""
+    interest = total_borrow_assets * w_taylor_compounded(rate, elapsed) // WAD
+    total_borrow_assets += interest
+    total_supply_assets += interest
+    if fee:
+        fee_amount = interest * fee // WAD
+        total_supply_shares += (
+            fee_amount
+            * (total_supply_shares + VIRTUAL_SHARES)
+            // (total_supply_assets - fee_amount + VIRTUAL_ASSETS)
+        )
+    return total_supply_assets, total_supply_shares, total_borrow_assets
@@ -36,6 +36,14 @@ Design:
   seam). Every read is "safe": a revert/decode failure yields ``None`` so one
   bad asset never aborts the whole map. The pure logic (classification,
   recursion, event collapse) takes a reader and is unit-testable with a fake.
+- Reads are memoized per call (reverts included), so feeds and tokens shared
+  by several assets are probed once. Feed wiring and token metadata getters
+  are ``immutable`` calls, so across runs a context with persistent
+  ``ImmutableFacts`` (the CLI's and MCP server's) re-reads only prices and
+  the aggregator getters, which a proxy forwards to its current aggregator.
+  Before resolving, the builder has the reader ``prefetch`` the tree level
+  by level — every asset's probes at one depth go out as a few multicalls —
+  so the sequential resolver then runs almost entirely from the memo.
 - SDK primitives are reused for the reads that already exist
   (``PriceOracleMiddleware``, ``ERC20``, ``PlasmaVault``); only the feed-probe
   reads and ``getConfiguredAssets`` — which they lack — are added here.
@@ -44,7 +52,8 @@ Adding a feed type:
 
 1. Wrapper class (``ContractWrapper``) exposing its getters.
 2. Revert-safe reader probes on :class:`OracleMappingReader` (``None`` on
-   failure).
+   failure), and their calls in ``_feed_calls`` / ``_derived_calls`` so
+   ``prefetch`` batches them.
 3. ``TYPE_*`` constant + ``_resolve_*`` function; recurse only into
    middleware assets — component *feeds* belong in ``source_detail``.
 4. Dispatch entry in ``_classify_and_resolve``, ordered by specificity,
@@ -61,7 +70,8 @@ Adding a feed type:
 
 from __future__ import annotations
 
-from collections.abc import Iterable
+import logging
+from collections.abc import Hashable, Iterable
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from typing import Any
@@ -73,10 +83,13 @@ from web3 import Web3
 from ipor_fusion.core.context import Web3Context
 from ipor_fusion.core.contract import Call, ContractWrapper
 from ipor_fusion.core.erc20 import ERC20
+from ipor_fusion.core.multicall import call_all
 from ipor_fusion.core.oracle import PriceOracleMiddleware
 from ipor_fusion.core.plasma_vault import PlasmaVault
 from ipor_fusion.types import AssetSource, MappingStatus, NodeStatus, Price
 
+_logger = logging.getLogger(__name__)
+
 ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
 
 # keccak256("AssetPriceSourceUpdated(address,address)") — both args are in the
@@ -207,20 +220,51 @@ class _OracleManager(ContractWrapper):
         )
 
 
+# Feed wiring is fixed at deployment, so its getters are flagged immutable:
+# `ImmutableFacts` keeps them per code hash across runs. They are also
+# `cache_revert`: that a feed lacks a getter is remembered for a while too.
+# The aggregator getters forward through a proxy to an aggregator that
+# moves on every upgrade, so they are read live with the prices.
+
+
 class _Erc4626Feed(ContractWrapper):
     def vault(self) -> Call[ChecksumAddress]:
-        return self._view("vault()", output_types=["address"], decoder=_addr)
+        return self._view(
+            "vault()",
+            output_types=["address"],
+            decoder=_addr,
+            immutable=True,
+            cache_revert=True,
+        )
 
 
 class _MorphoFeed(ContractWrapper):
     def morpho_oracle(self) -> Call[ChecksumAddress]:
-        return self._view("morphoOracle()", output_types=["address"], decoder=_addr)
+        return self._view(
+            "morphoOracle()",
+            output_types=["address"],
+            decoder=_addr,
+            immutable=True,
+            cache_revert=True,
+        )
 
     def collateral_token(self) -> Call[ChecksumAddress]:
-        return self._view("collateralToken()", output_types=["address"], decoder=_addr)
+        return self._view(
+            "collateralToken()",
+            output_types=["address"],
+            decoder=_addr,
+            immutable=True,
+            cache_revert=True,
+        )
 
     def loan_token(self) -> Call[ChecksumAddress]:
-        return self._view("loanToken()", output_types=["address"], decoder=_addr)
+        return self._view(
+            "loanToken()",
+            output_types=["address"],
+            decoder=_addr,
+            immutable=True,
+            cache_revert=True,
+        )
 
 
 class _MorphoOracle(ContractWrapper):
@@ -230,20 +274,37 @@ class _MorphoOracle(ContractWrapper):
 
 class _DualXrefFeed(ContractWrapper):
     def asset_x(self) -> Call[ChecksumAddress]:
-        return self._view("ASSET_X()", output_types=["address"], decoder=_addr)
+        return self._view(
+            "ASSET_X()",
+            output_types=["address"],
+            decoder=_addr,
+            immutable=True,
+            cache_revert=True,
+        )
 
     def asset_x_asset_y_feed(self) -> Call[ChecksumAddress]:
         return self._view(
-            "ASSET_X_ASSET_Y_ORACLE_FEED()", output_types=["address"], decoder=_addr
+            "ASSET_X_ASSET_Y_ORACLE_FEED()",
+            output_types=["address"],
+            decoder=_addr,
+            immutable=True,
+            cache_revert=True,
         )
 
     def asset_y_usd_feed(self) -> Call[ChecksumAddress]:
         return self._view(
-            "ASSET_Y_USD_ORACLE_FEED()", output_types=["address"], decoder=_addr
+            "ASSET_Y_USD_ORACLE_FEED()",
+            output_types=["address"],
+            decoder=_addr,
+            immutable=True,
+            cache_revert=True,
         )
 
 
 class _Aggregator(ContractWrapper):
+    # Read live, not as facts: a Chainlink feed is an EACAggregatorProxy
+    # whose code never changes while these getters forward to the current
+    # aggregator, so a value kept per code hash would outlive an upgrade.
     def decimals(self) -> Call[int]:
         return self._view("decimals()", output_types=["uint8"], decoder=int)
 
@@ -268,10 +329,14 @@ class _Aggregator(ContractWrapper):
 
 class _Erc4626Vault(ContractWrapper):
     def asset(self) -> Call[ChecksumAddress]:
-        return self._view("asset()", output_types=["address"], decoder=_addr)
+        return self._view(
+            "asset()", output_types=["address"], decoder=_addr, immutable=True
+        )
 
     def decimals(self) -> Call[int]:
-        return self._view("decimals()", output_types=["uint8"], decoder=int)
+        return self._view(
+            "decimals()", output_types=["uint8"], decoder=int, immutable=True
+        )
 
     def convert_to_assets(self, shares: int) -> Call[int]:
         return self._view(
@@ -288,20 +353,187 @@ class _Erc4626Vault(ContractWrapper):
 
 
 class OracleMappingReader:
-    """Revert-safe on-chain reads against a fixed ``Web3Context`` (and block)."""
+    """Revert-safe on-chain reads against a fixed ``Web3Context`` (and block).
 
-    def __init__(self, ctx: Web3Context, oracle: ChecksumAddress):
+    Every read is memoized by target and calldata, failures included, in a
+    memo shared with the readers ``delegate`` returns: the context is pinned
+    to one block, so the same read always gets the same answer.
+    """
+
+    def __init__(
+        self,
+        ctx: Web3Context,
+        oracle: ChecksumAddress,
+        _memo: dict[Hashable, Any] | None = None,
+    ):
         self._ctx = ctx
         self._oracle_addr = oracle
         self._oracle = PriceOracleMiddleware(ctx, oracle)
         self._manager = _OracleManager(ctx, oracle)
-
-    @staticmethod
-    def _safe(call: Call[Any]) -> Any:
+        self._memo: dict[Hashable, Any] = {} if _memo is None else _memo
+
+    def _safe(self, call: Call[Any]) -> Any:
+        key = _call_key(call)
+        if key not in self._memo:
+            try:
+                self._memo[key] = call.call()
+            except Exception:
+                self._memo[key] = None
+        return self._memo[key]
+
+    # -- batching ----------------------------------------------------------
+    def _batch(self, calls: Iterable[Call[Any]]) -> bool:
+        """Memoize ``calls`` with one multicall; False if it could not run."""
+        pending = {
+            key: call for call in calls if (key := _call_key(call)) not in self._memo
+        }
+        if not pending:
+            return True
         try:
-            return call.call()
-        except Exception:
-            return None
+            results = call_all(self._ctx, list(pending.values()))
+        except Exception as exc:
+            _logger.debug("Oracle mapping prefetch failed: %s", exc)
+            return False
+        for key, result in zip(pending, results, strict=True):
+            self._memo[key] = None if isinstance(result, Exception) else result
+        return True
+
+    def prefetch(self, assets: Iterable[ChecksumAddress], max_depth: int) -> None:
+        """Memoize the reads resolving ``assets`` will make, level by level.
+
+        Each recursion level takes three multicalls however many assets it
+        holds: every asset's metadata, price and source (with the oracle
+        variant probes); every distinct feed's probes for all the types it
+        might be; then the reads those answers point at (ERC4626 vault,
+        Morpho oracle price, dual cross-reference components). The assets
+        they lead to (a vault's underlying, a Morpho loan token, a
+        zero-source asset on the delegated middleware) form the next level.
+
+        Probes for a type the resolver later rejects cost calldata, not round
+        trips. Nothing is decided here: resolution still runs afterwards,
+        from the memo, and reads anything missed one call at a time — as it
+        does for everything if a multicall fails.
+        """
+        frontier = [(self, asset) for asset in dict.fromkeys(assets)]
+        seen: set[tuple[str, str]] = set()
+        carried: list[Call[Any]] = []
+        for depth in range(max_depth + 2):
+            frontier = [
+                (reader, asset)
+                for reader, asset in frontier
+                if (reader._oracle_addr.lower(), asset.lower()) not in seen
+            ]
+            seen.update((r._oracle_addr.lower(), a.lower()) for r, a in frontier)
+            readers = {id(reader): reader for reader, _ in frontier}.values()
+            calls = [*carried, *(c for r in readers for c in r._variant_calls())]
+            calls += [
+                c for reader, asset in frontier for c in reader._asset_calls(asset)
+            ]
+            carried = []
+            # Past max_depth the resolver reads the asset and stops
+            if not self._batch(calls) or not frontier or depth > max_depth:
+                return
+
+            sources = [
+                (reader, asset, reader.source_of(asset)) for reader, asset in frontier
+            ]
+            feeds = list(
+                dict.fromkeys(
+                    source
+                    for _, _, source in sources
+                    if source is not None and source.lower() != ZERO_ADDRESS
+                )
+            )
+            if not self._batch(c for feed in feeds for c in self._feed_calls(feed)):
+                return
+            if not self._batch(c for feed in feeds for c in self._derived_calls(feed)):
+                return
+
+            frontier, carried = self._next_level(sources)
+
+    def _next_level(
+        self,
+        sources: list[tuple[OracleMappingReader, ChecksumAddress, Any]],
+    ) -> tuple[list[tuple[OracleMappingReader, ChecksumAddress]], list[Call[Any]]]:
+        """The assets one level down from ``sources``, and the ERC4626 rate
+        reads to send with them."""
+        frontier: list[tuple[OracleMappingReader, ChecksumAddress]] = []
+        rates: list[Call[Any]] = []
+        for reader, asset, source in sources:
+            if source is None or source.lower() == ZERO_ADDRESS:
+                middleware = reader.underlying_middleware()
+                if middleware is not None and middleware.lower() != ZERO_ADDRESS:
+                    frontier.append((reader.delegate(middleware), asset))
+                continue
+            if (vault := self.feed_vault(source)) is not None:
+                if (underlying := self.vault_asset(vault)) is not None:
+                    frontier.append((reader, underlying))
+                if (share_decimals := self.vault_decimals(vault)) is not None:
+                    rates.append(
+                        _Erc4626Vault(self._ctx, vault).convert_to_assets(
+                            10**share_decimals
+                        )
+                    )
+            if (loan := self.feed_loan_token(source)) is not None:
+                frontier.append((reader, loan))
+        return frontier, rates
+
+    def _variant_calls(self) -> list[Call[Any]]:
+        return [
+            self._manager.get_price_oracle_middleware(),
+            self._oracle.chainlink_feed_registry(),
+        ]
+
+    def _asset_calls(self, asset: ChecksumAddress) -> list[Call[Any]]:
+        token = ERC20(self._ctx, asset)
+        return [
+            token.symbol(),
+            token.decimals(),
+            self._oracle.get_asset_price(asset),
+            self._oracle.get_source_of_asset_price(asset),
+        ]
+
+    def _feed_calls(self, source: ChecksumAddress) -> list[Call[Any]]:
+        aggregator = _Aggregator(self._ctx, source)
+        dual_xref = _DualXrefFeed(self._ctx, source)
+        morpho = _MorphoFeed(self._ctx, source)
+        return [
+            dual_xref.asset_x(),
+            dual_xref.asset_x_asset_y_feed(),
+            dual_xref.asset_y_usd_feed(),
+            morpho.morpho_oracle(),
+            morpho.collateral_token(),
+            morpho.loan_token(),
+            _Erc4626Feed(self._ctx, source).vault(),
+            *self._aggregator_calls(source),
+            aggregator.version(),
+            aggregator.aggregator(),
+            aggregator.phase_id(),
+        ]
+
+    def _aggregator_calls(self, feed: ChecksumAddress) -> list[Call[Any]]:
+        aggregator = _Aggregator(self._ctx, feed)
+        return [
+            aggregator.latest_round_data(),
+            aggregator.decimals(),
+            aggregator.description(),
+        ]
+
+    def _derived_calls(self, source: ChecksumAddress) -> list[Call[Any]]:
+        """Reads that depend on ``source``'s (memoized) probe answers."""
+        calls: list[Call[Any]] = []
+        if (vault := self.feed_vault(source)) is not None:
+            erc4626 = _Erc4626Vault(self._ctx, vault)
+            calls += [erc4626.asset(), erc4626.decimals()]
+        if (morpho_oracle := self.feed_morpho_oracle(source)) is not None:
+            calls.append(_MorphoOracle(self._ctx, morpho_oracle).price())
+        for component in (
+            self.feed_asset_x_asset_y_feed(source),
+            self.feed_asset_y_usd_feed(source),
+        ):
+            if component is not None:
+                calls += self._aggregator_calls(component)
+        return calls
 
     # -- enumeration -------------------------------------------------------
     def configured_assets(self) -> list[ChecksumAddress] | None:
@@ -339,8 +571,9 @@ class OracleMappingReader:
         return self._safe(self._oracle.chainlink_feed_registry())
 
     def delegate(self, oracle: ChecksumAddress) -> OracleMappingReader:
-        """Sibling reader bound to another oracle on the same context/block."""
-        return OracleMappingReader(self._ctx, oracle)
+        """Sibling reader bound to another oracle on the same context/block,
+        sharing this reader's memo."""
+        return OracleMappingReader(self._ctx, oracle, _memo=self._memo)
 
     # -- token metadata ----------------------------------------------------
     def symbol(self, token: ChecksumAddress) -> str | None:
@@ -414,6 +647,10 @@ class OracleMappingReader:
 # ---------------------------------------------------------------------------
 
 
+def _call_key(call: Call[Any]) -> tuple[str, bytes]:
+    return call.to.lower(), bytes(call.data)
+
+
 def collapse_sources(
     events: Iterable[tuple[int, ChecksumAddress, ChecksumAddress]],
 ) -> dict[ChecksumAddress, ChecksumAddress]:
@@ -999,6 +1236,7 @@ def build_oracle_mapping(
 
     reader = OracleMappingReader(ctx, oracle_addr)
     assets, asset_source = _enumerate_assets(reader, effective_block)
+    reader.prefetch(assets, max_depth)
 
     configured: list[OracleNode] = []
     for asset in assets:
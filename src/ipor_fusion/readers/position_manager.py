@@ -1,13 +1,21 @@
-from collections.abc import Callable
+import logging
+from collections.abc import Callable, Hashable, Iterable, Mapping, Sequence
 from dataclasses import dataclass
-from typing import TypeVar
+from typing import Any, TypeVar
 
 from eth_typing import ChecksumAddress
 from web3 import Web3
 
+from ipor_fusion.core.context import Web3Context
 from ipor_fusion.core.contract import Call, ContractWrapper
+from ipor_fusion.core.multicall import Multicall3, call_all
+from ipor_fusion.readers import uniswap_v3_math
 from ipor_fusion.types import Amount, Fee, Tick, TokenId
 
+_logger = logging.getLogger(__name__)
+
+_ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
 _POSITION_ABI_TYPES = [
     "uint96",
     "address",
@@ -42,6 +50,48 @@ class PositionData:
     tokens_owed1: Amount
 
 
+@dataclass(slots=True)
+class PoolState:
+    """What a position's value depends on in its pool: the current sqrt price
+    (Q64.96) and tick, and the global fee growth of each token (Q128.128)."""
+
+    address: ChecksumAddress
+    sqrt_price_x96: int
+    tick: Tick
+    fee_growth_global0_x128: int
+    fee_growth_global1_x128: int
+
+
+@dataclass(slots=True)
+class TickFeeGrowth:
+    """A tick's fee growth outside (Q128.128), from the pool's `ticks()`."""
+
+    fee_growth_outside0_x128: int
+    fee_growth_outside1_x128: int
+
+
+@dataclass(slots=True)
+class PositionValue:
+    """A position valued at its pool's current price, in token amounts.
+
+    `amount0` / `amount1` are what burning the liquidity would return;
+    `fees0` / `fees1` the fees owed plus those accrued and not yet
+    collected.
+    """
+
+    token_id: TokenId
+    position: PositionData
+    pool: PoolState
+    amount0: Amount
+    amount1: Amount
+    fees0: Amount
+    fees1: Amount
+
+    @property
+    def in_range(self) -> bool:
+        return self.position.tick_lower <= self.pool.tick < self.position.tick_upper
+
+
 _T = TypeVar("_T", bound=PositionData)
 
 
@@ -79,9 +129,267 @@ def _decode_position_fields(value: tuple) -> dict:
     }
 
 
+class UniswapV3Factory(ContractWrapper):
+    """A Uniswap V3 (or Ramses V2) pool factory."""
+
+    def get_pool(
+        self, token0: ChecksumAddress, token1: ChecksumAddress, fee: Fee
+    ) -> Call[ChecksumAddress]:
+        return self._view(
+            "getPool(address,address,uint24)",
+            token0,
+            token1,
+            fee,
+            output_types=["address"],
+            decoder=Web3.to_checksum_address,
+            # Pools are deployed once per key; an existing one never moves.
+            immutable=True,
+        )
+
+
+class UniswapV3Pool(ContractWrapper):
+    """A Uniswap V3 pool: the state positions are valued from. Only the
+    leading fields of `slot0()` and `ticks()` are decoded."""
+
+    # `ticks()` fields up to and including the fee growth outside of each
+    # token, which come last; forks that add fields before them override it.
+    _tick_types = ["uint128", "int128", "uint256", "uint256"]
+
+    def slot0(self) -> Call[tuple[int, Tick]]:
+        return self._view("slot0()", output_types=["uint160", "int24"])
+
+    def fee_growth_global0_x128(self) -> Call[int]:
+        return self._view("feeGrowthGlobal0X128()", output_types=["uint256"])
+
+    def fee_growth_global1_x128(self) -> Call[int]:
+        return self._view("feeGrowthGlobal1X128()", output_types=["uint256"])
+
+    def ticks(self, tick: Tick) -> Call[TickFeeGrowth]:
+        return self._view(
+            "ticks(int24)",
+            tick,
+            output_types=self._tick_types,
+            decoder=lambda v: TickFeeGrowth(v[-2], v[-1]),
+        )
+
+
 class PositionManagerReader(ContractWrapper):
     """Base reader for NonfungiblePositionManager-style contracts."""
 
+    # The dataclass `positions()` decodes into, and the pool wrapper that
+    # knows the fork's `ticks()` layout, set by each fork's reader
+    _position_type: type[PositionData] = PositionData
+    _pool_type: type[UniswapV3Pool] = UniswapV3Pool
+
+    def factory(self) -> Call[ChecksumAddress]:
+        return self._view(
+            "factory()",
+            output_types=["address"],
+            decoder=Web3.to_checksum_address,
+            immutable=True,
+        )
+
+    def balance_of(self, owner: ChecksumAddress) -> Call[int]:
+        """Number of position NFTs ``owner`` holds."""
+        return self._view("balanceOf(address)", owner, output_types=["uint256"])
+
+    def token_of_owner_by_index(
+        self, owner: ChecksumAddress, index: int
+    ) -> Call[TokenId]:
+        return self._view(
+            "tokenOfOwnerByIndex(address,uint256)",
+            owner,
+            index,
+            output_types=["uint256"],
+            decoder=TokenId,
+        )
+
+    def token_ids_of(
+        self, owner: ChecksumAddress, block: int | None = None
+    ) -> list[TokenId]:
+        """Every position NFT ``owner`` holds at ``block`` (the latest by
+        default), in the manager's enumeration order: `balanceOf()` and the
+        block number in one multicall, then one multicall of
+        `tokenOfOwnerByIndex()` for all indices at that same block.
+
+        Unlike scanning `NewPositionFuse` events, this needs no receipts and
+        also sees positions transferred in or burned since.
+        """
+        return self._token_ids_at(owner, block)[1]
+
+    def positions_of(
+        self, owner: ChecksumAddress, block: int | None = None
+    ) -> dict[TokenId, PositionData]:
+        """`positions()` of every NFT ``owner`` holds, keyed by token id, in
+        three calls however many there are (see `token_ids_of`), all at one
+        block. Pass the result to `position_values` with the same ``block``
+        to value them without reading the positions again."""
+        at_block, token_ids = self._token_ids_at(owner, block)
+        if not token_ids:
+            return {}
+        results = call_all(
+            at_block, [self._positions(t, self._position_type) for t in token_ids]
+        )
+        return {
+            token_id: position
+            for token_id, position in zip(token_ids, results, strict=True)
+            if not _failed(token_id, position)
+        }
+
+    def _token_ids_at(
+        self, owner: ChecksumAddress, block: int | None
+    ) -> tuple[Web3Context, list[TokenId]]:
+        """The context pinned to the block the balance was read at, and the
+        token ids at that block."""
+        if block is None:
+            block, balance = call_all(
+                self._ctx,
+                [Multicall3(self._ctx).get_block_number(), self.balance_of(owner)],
+            )
+        else:
+            (balance,) = call_all(self._ctx.pinned(block), [self.balance_of(owner)])
+        for result in (block, balance):
+            if isinstance(result, Exception):
+                raise result
+        # The indices are read at the balance's block: they cannot move
+        # between the two reads, so a failure is a real one.
+        at_block = self._ctx.pinned(block)
+        if balance == 0:
+            return at_block, []
+        results = call_all(
+            at_block,
+            [self.token_of_owner_by_index(owner, i) for i in range(balance)],
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return at_block, results
+
+    def position_values(
+        self,
+        positions: Sequence[TokenId] | Mapping[TokenId, PositionData],
+        block: int | None = None,
+    ) -> list[PositionValue]:
+        """Value every position in ``positions`` at its pool's price at
+        ``block``, in three multicall rounds however many positions there
+        are, all at that one block so a position is never combined with pool
+        state from a later one.
+
+        ``positions`` is either token ids or the `positions()` already read
+        at ``block`` (from `positions_of`), which are then not read again.
+        Without a ``block`` the first round also reads the block number and
+        the other rounds are pinned to it.
+
+        The first round reads `positions()` for every token and the manager's
+        factory; the second each distinct pool's address (immutable, so
+        answered from `ImmutableFacts` once known); the third each pool's
+        `slot0()` and global fee growth, and the `ticks()` bounding every
+        position with liquidity. Amounts and fees are then computed locally
+        with `uniswap_v3_math`. Positions whose reads reverted (a burned
+        token, say) are left out, in the order given otherwise.
+        """
+        if isinstance(positions, Mapping):
+            read: dict[TokenId, PositionData] = dict(positions)
+            token_ids = []
+        else:
+            read = {}
+            token_ids = list(dict.fromkeys(positions))
+        if not read and not token_ids:
+            return []
+        if isinstance(positions, Mapping) and block is None:
+            raise ValueError("pre-read positions need the block they were read at")
+
+        ctx = self._ctx if block is None else self._ctx.pinned(block)
+        calls: list[Call[Any]] = [
+            self._positions(t, self._position_type) for t in token_ids
+        ]
+        calls.append(self.factory())
+        if block is None:
+            calls.append(Multicall3(self._ctx).get_block_number())
+        results = call_all(ctx, calls)
+        if block is None:
+            block = results.pop()
+            if isinstance(block, Exception):
+                raise block
+            ctx = self._ctx.pinned(block)
+        factory = results[-1]
+        if isinstance(factory, Exception):
+            raise factory
+        read.update(
+            (token_id, position)
+            for token_id, position in zip(token_ids, results[:-1], strict=True)
+            if not _failed(token_id, position)
+        )
+        return self._values_at(ctx, factory, read)
+
+    def _values_at(
+        self,
+        ctx: Web3Context,
+        factory: ChecksumAddress,
+        positions: dict[TokenId, PositionData],
+    ) -> list[PositionValue]:
+        """The second and third rounds of `position_values`, through ``ctx``
+        (pinned to the block ``positions`` were read at)."""
+        pool_addresses = self._pool_addresses(ctx, factory, positions.values())
+
+        reads: dict[Hashable, Call[Any]] = {}
+        for address in dict.fromkeys(pool_addresses.values()):
+            pool = self._pool_type(ctx, address)
+            reads[("slot0", address)] = pool.slot0()
+            reads[("growth0", address)] = pool.fee_growth_global0_x128()
+            reads[("growth1", address)] = pool.fee_growth_global1_x128()
+        for position in positions.values():
+            address = pool_addresses.get(_pool_key(position))
+            if address is None or position.liquidity == 0:
+                continue
+            for tick in (position.tick_lower, position.tick_upper):
+                reads.setdefault(
+                    ("tick", address, tick),
+                    self._pool_type(ctx, address).ticks(tick),
+                )
+        state = dict(
+            zip(
+                reads,
+                call_all(ctx, list(reads.values())) if reads else [],
+                strict=True,
+            )
+        )
+
+        values = []
+        for token_id, position in positions.items():
+            address = pool_addresses.get(_pool_key(position))
+            slot0 = state.get(("slot0", address))
+            growth = (state.get(("growth0", address)), state.get(("growth1", address)))
+            ticks = [
+                state.get(("tick", address, tick), TickFeeGrowth(0, 0))
+                for tick in (position.tick_lower, position.tick_upper)
+            ]
+            if address is None or _failed(token_id, slot0, *growth, *ticks):
+                continue
+            pool = PoolState(address, *slot0, *growth)
+            values.append(_value(token_id, position, pool, *ticks))
+        return values
+
+    def _pool_addresses(
+        self,
+        ctx: Web3Context,
+        factory: ChecksumAddress,
+        positions: Iterable[PositionData],
+    ) -> dict[tuple[ChecksumAddress, ChecksumAddress, Fee], ChecksumAddress]:
+        keys = list(dict.fromkeys(_pool_key(p) for p in positions))
+        if not keys:
+            return {}
+        pools = call_all(
+            ctx, [UniswapV3Factory(ctx, factory).get_pool(*key) for key in keys]
+        )
+        addresses = {}
+        for key, pool in zip(keys, pools, strict=True):
+            if isinstance(pool, Exception) or pool == _ZERO_ADDRESS:
+                _logger.debug("No pool for %s: %s", key, pool)
+            else:
+                addresses[key] = pool
+        return addresses
+
     def _positions(self, token_id: TokenId, into: Callable[..., _T]) -> Call[_T]:
         """Build a `positions(uint256)` view that decodes into the subclass's
         dataclass via `into(**fields)`.
@@ -92,3 +400,66 @@ class PositionManagerReader(ContractWrapper):
             output_types=_POSITION_ABI_TYPES,
             decoder=lambda v: into(**_decode_position_fields(v)),
         )
+
+
+def _pool_key(position: PositionData) -> tuple[ChecksumAddress, ChecksumAddress, Fee]:
+    return position.token0, position.token1, position.fee
+
+
+def _value(
+    token_id: TokenId,
+    position: PositionData,
+    pool: PoolState,
+    lower: TickFeeGrowth,
+    upper: TickFeeGrowth,
+) -> PositionValue:
+    amount0, amount1 = uniswap_v3_math.amounts_for_liquidity(
+        pool.sqrt_price_x96,
+        position.tick_lower,
+        position.tick_upper,
+        position.liquidity,
+    )
+    inside0 = uniswap_v3_math.fee_growth_inside(
+        pool.tick,
+        position.tick_lower,
+        position.tick_upper,
+        pool.fee_growth_global0_x128,
+        lower.fee_growth_outside0_x128,
+        upper.fee_growth_outside0_x128,
+    )
+    inside1 = uniswap_v3_math.fee_growth_inside(
+        pool.tick,
+        position.tick_lower,
+        position.tick_upper,
+        pool.fee_growth_global1_x128,
+        lower.fee_growth_outside1_x128,
+        upper.fee_growth_outside1_x128,
+    )
+    fees0 = uniswap_v3_math.uncollected_fees(
+        position.liquidity,
+        inside0,
+        position.fee_growth_inside0_last_x128,
+        position.tokens_owed0,
+    )
+    fees1 = uniswap_v3_math.uncollected_fees(
+        position.liquidity,
+        inside1,
+        position.fee_growth_inside1_last_x128,
+        position.tokens_owed1,
+    )
+    return PositionValue(
+        token_id=token_id,
+        position=position,
+        pool=pool,
+        amount0=Amount(amount0),
+        amount1=Amount(amount1),
+        fees0=Amount(fees0),
+        fees1=Amount(fees1),
+    )
+
+
+def _failed(token_id: TokenId, *results: object) -> bool:
+    errors = [r for r in results if r is None or isinstance(r, Exception)]
+    if errors:
+        _logger.debug("Skipping position %s: %s", token_id, errors[0])
+    return bool(errors)
@@ -1,7 +1,11 @@
 from dataclasses import dataclass
 
 from ipor_fusion.core.contract import Call
-from ipor_fusion.readers.position_manager import PositionData, PositionManagerReader
+from ipor_fusion.readers.position_manager import (
+    PositionData,
+    PositionManagerReader,
+    UniswapV3Pool,
+)
 from ipor_fusion.types import TokenId
 
 
@@ -10,8 +14,18 @@ class RamsesV2Position(PositionData):
     """Liquidity position data from the Ramses V2 NonfungiblePositionManager."""
 
 
+class RamsesV2Pool(UniswapV3Pool):
+    """A Ramses V2 pool, whose `Tick.Info` carries the boosted liquidity
+    (gross, net) between the liquidity and the fee growth outside."""
+
+    _tick_types = ["uint128", "int128", "uint128", "int128", "uint256", "uint256"]
+
+
 class RamsesV2Reader(PositionManagerReader):
     """Reader for Ramses V2 NonfungiblePositionManager on-chain state."""
 
+    _position_type = RamsesV2Position
+    _pool_type = RamsesV2Pool
+
     def positions(self, token_id: TokenId) -> Call[RamsesV2Position]:
         return self._positions(token_id, RamsesV2Position)
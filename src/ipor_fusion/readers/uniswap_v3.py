@@ -1,7 +1,11 @@
 from dataclasses import dataclass
 
 from ipor_fusion.core.contract import Call
-from ipor_fusion.readers.position_manager import PositionData, PositionManagerReader
+from ipor_fusion.readers.position_manager import (
+    PositionData,
+    PositionManagerReader,
+    UniswapV3Pool,
+)
 from ipor_fusion.types import TokenId
 
 
@@ -13,5 +17,8 @@ class UniswapV3Position(PositionData):
 class UniswapV3Reader(PositionManagerReader):
     """Reader for Uniswap V3 NonfungiblePositionManager on-chain state."""
 
+    _position_type = UniswapV3Position
+    _pool_type = UniswapV3Pool
+
     def positions(self, token_id: TokenId) -> Call[UniswapV3Position]:
         return self._positions(token_id, UniswapV3Position)
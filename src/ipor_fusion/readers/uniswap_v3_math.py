@@ -0,0 +1,163 @@
+"""Uniswap V3 position math, ported from Solidity to exact integer arithmetic.
+
+`get_sqrt_ratio_at_tick` is ``TickMath.getSqrtRatioAtTick``, the
+``get_amount*_delta`` functions are ``SqrtPriceMath``'s and
+`amounts_for_liquidity` is the periphery's
+``LiquidityAmounts.getAmountsForLiquidity``. `fee_growth_inside` and
+`uncollected_fees` follow ``Tick.getFeeGrowthInside`` and the periphery's
+``PositionValue.fees``. Given the same pool state they return the integers
+the contracts compute, so positions can be valued locally.
+
+Prices are square roots in Q64.96 fixed point; fee growth is Q128.128 and
+wraps modulo 2**256 as in Solidity, where underflow is intended. Ramses V2
+is a Uniswap V3 fork and uses the same math.
+"""
+
+from __future__ import annotations
+
+MIN_TICK = -887272
+MAX_TICK = 887272
+MIN_SQRT_RATIO = 4295128739
+MAX_SQRT_RATIO = 1461446703485210103287273052203988822378723970342
+
+Q96 = 1 << 96
+Q128 = 1 << 128
+_UINT256 = 1 << 256
+
+# TickMath: 1 / sqrt(1.0001) ** (2 ** i) in Q128.128, for bit i of |tick|
+_TICK_RATIOS = (
+    (0x2, 0xFFF97272373D413259A46990580E213A),
+    (0x4, 0xFFF2E50F5F656932EF12357CF3C7FDCC),
+    (0x8, 0xFFE5CACA7E10E4E61C3624EAA0941CD0),
+    (0x10, 0xFFCB9843D60F6159C9DB58835C926644),
+    (0x20, 0xFF973B41FA98C081472E6896DFB254C0),
+    (0x40, 0xFF2EA16466C96A3843EC78B326B52861),
+    (0x80, 0xFE5DEE046A99A2A811C461F1969C3053),
+    (0x100, 0xFCBE86C7900A88AEDCFFC83B479AA3A4),
+    (0x200, 0xF987A7253AC413176F2B074CF7815E54),
+    (0x400, 0xF3392B0822B70005940C7A398E4B70F3),
+    (0x800, 0xE7159475A2C29B7443B29C7FA6E889D9),
+    (0x1000, 0xD097F3BDFD2022B8845AD8F792AA5825),
+    (0x2000, 0xA9F746462D870FDF8A65DC1F90E061E5),
+    (0x4000, 0x70D869A156D2A1B890BB3DF62BAF32F7),
+    (0x8000, 0x31BE135F97D08FD981231505542FCFA6),
+    (0x10000, 0x9AA508B5B7A84E1C677DE54F3E99BC9),
+    (0x20000, 0x5D6AF8DEDB81196699C329225EE604),
+    (0x40000, 0x2216E584F5FA1EA926041BEDFE98),
+    (0x80000, 0x48A170391F7DC42444E8FA2),
+)
+
+
+def get_sqrt_ratio_at_tick(tick: int) -> int:
+    """``TickMath.getSqrtRatioAtTick``: sqrt(1.0001 ** tick) in Q64.96,
+    rounded up. Raises ValueError outside ``[MIN_TICK, MAX_TICK]``."""
+    abs_tick = abs(tick)
+    if abs_tick > MAX_TICK:
+        raise ValueError(f"Tick {tick} is outside [{MIN_TICK}, {MAX_TICK}]")
+    ratio = 0xFFFCB933BD6FAD37AA2D162D1A594001 if abs_tick & 0x1 else Q128
+    for bit, factor in _TICK_RATIOS:
+        if abs_tick & bit:
+            ratio = (ratio * factor) >> 128
+    if tick > 0:
+        ratio = (_UINT256 - 1) // ratio
+    return (ratio >> 32) + (1 if ratio % (1 << 32) else 0)
+
+
+def get_tick_at_sqrt_ratio(sqrt_price_x96: int) -> int:
+    """``TickMath.getTickAtSqrtRatio``: the greatest tick whose sqrt ratio is
+    at most ``sqrt_price_x96``. Raises ValueError outside
+    ``[MIN_SQRT_RATIO, MAX_SQRT_RATIO)``.
+
+    The contract approximates a log2 and corrects it; a binary search over
+    `get_sqrt_ratio_at_tick` lands on the same tick by definition.
+    """
+    if not MIN_SQRT_RATIO <= sqrt_price_x96 < MAX_SQRT_RATIO:
+        raise ValueError(f"Sqrt price {sqrt_price_x96} is out of range")
+    low, high = MIN_TICK, MAX_TICK
+    while low < high:
+        mid = (low + high + 1) // 2
+        if get_sqrt_ratio_at_tick(mid) <= sqrt_price_x96:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _mul_div_up(a: int, b: int, denominator: int) -> int:
+    return -(-a * b // denominator)
+
+
+def get_amount0_delta(
+    sqrt_ratio_a_x96: int, sqrt_ratio_b_x96: int, liquidity: int, round_up: bool
+) -> int:
+    """``SqrtPriceMath.getAmount0Delta``: token0 between two sqrt prices for
+    ``liquidity``, ``L * (sqrt(b) - sqrt(a)) / (sqrt(a) * sqrt(b))``."""
+    sqrt_a, sqrt_b = sorted((sqrt_ratio_a_x96, sqrt_ratio_b_x96))
+    if sqrt_a == 0:
+        raise ValueError("Sqrt price must be positive")
+    numerator1, numerator2 = liquidity << 96, sqrt_b - sqrt_a
+    if round_up:
+        return -(-_mul_div_up(numerator1, numerator2, sqrt_b) // sqrt_a)
+    return numerator1 * numerator2 // sqrt_b // sqrt_a
+
+
+def get_amount1_delta(
+    sqrt_ratio_a_x96: int, sqrt_ratio_b_x96: int, liquidity: int, round_up: bool
+) -> int:
+    """``SqrtPriceMath.getAmount1Delta``: token1 between two sqrt prices for
+    ``liquidity``, ``L * (sqrt(b) - sqrt(a))``."""
+    sqrt_a, sqrt_b = sorted((sqrt_ratio_a_x96, sqrt_ratio_b_x96))
+    if round_up:
+        return _mul_div_up(liquidity, sqrt_b - sqrt_a, Q96)
+    return liquidity * (sqrt_b - sqrt_a) // Q96
+
+
+def amounts_for_liquidity(
+    sqrt_price_x96: int, tick_lower: int, tick_upper: int, liquidity: int
+) -> tuple[int, int]:
+    """``LiquidityAmounts.getAmountsForLiquidity``: the token0 and token1 a
+    position of ``liquidity`` between two ticks holds at ``sqrt_price_x96``,
+    rounded down (what burning it would return, before fees)."""
+    sqrt_a = get_sqrt_ratio_at_tick(tick_lower)
+    sqrt_b = get_sqrt_ratio_at_tick(tick_upper)
+    if sqrt_price_x96 <= sqrt_a:
+        return get_amount0_delta(sqrt_a, sqrt_b, liquidity, False), 0
+    if sqrt_price_x96 < sqrt_b:
+        return (
+            get_amount0_delta(sqrt_price_x96, sqrt_b, liquidity, False),
+            get_amount1_delta(sqrt_a, sqrt_price_x96, liquidity, False),
+        )
+    return 0, get_amount1_delta(sqrt_a, sqrt_b, liquidity, False)
+
+
+def fee_growth_inside(
+    tick_current: int,
+    tick_lower: int,
+    tick_upper: int,
+    fee_growth_global_x128: int,
+    lower_outside_x128: int,
+    upper_outside_x128: int,
+) -> int:
+    """``Tick.getFeeGrowthInside`` for one token: the fee growth per unit of
+    liquidity accumulated between two ticks, modulo 2**256."""
+    if tick_current >= tick_lower:
+        below = lower_outside_x128
+    else:
+        below = fee_growth_global_x128 - lower_outside_x128
+    if tick_current < tick_upper:
+        above = upper_outside_x128
+    else:
+        above = fee_growth_global_x128 - upper_outside_x128
+    return (fee_growth_global_x128 - below - above) % _UINT256
+
+
+def uncollected_fees(
+    liquidity: int,
+    fee_growth_inside_x128: int,
+    fee_growth_inside_last_x128: int,
+    tokens_owed: int,
+) -> int:
+    """``PositionValue.fees`` for one token: the fees already owed to the
+    position plus those accrued since its last update."""
+    growth = (fee_growth_inside_x128 - fee_growth_inside_last_x128) % _UINT256
+    return tokens_owed + growth * liquidity // Q128
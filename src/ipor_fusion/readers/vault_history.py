@@ -0,0 +1,238 @@
+"""Vault metrics sampled over a range of blocks.
+
+`fetch_vault_history` reads a vault at each block of a grid: total assets,
+total supply, share price, unrealized management fee and the assets in each
+balance-fuse market. A block's reads (and its timestamp) go out as one
+Multicall3 ``aggregate3``, and several blocks are read at once on the
+context's `RpcScheduler`. Rows come back in block order as soon as they are
+ready, so a long range can be written out while it is still being read.
+
+The grid is either every ``step`` blocks (`block_grid`) or every
+``interval`` seconds (`timestamp_grid`), where each timestamp maps to the
+last block mined at or before it (`block_at_timestamp`, a binary search
+over block headers).
+
+Historical blocks require an archive node.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import deque
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any
+
+from eth_typing import ChecksumAddress
+from web3 import Web3
+
+from ipor_fusion.core.context import Web3Context
+from ipor_fusion.core.multicall import Multicall3, call_all
+from ipor_fusion.core.plasma_vault import PlasmaVault
+from ipor_fusion.core.scheduler import RpcScheduler
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_CONCURRENCY = 4
+
+# Fixed calls ahead of the per-market ones in each block's batch.
+_TIMESTAMP, _TOTAL_ASSETS, _TOTAL_SUPPLY, _SHARE_PRICE, _MANAGEMENT_FEE = range(5)
+
+
+@dataclass(slots=True)
+class VaultHistoryRow:
+    """Vault metrics at one block. Raw integer amounts in the vault's asset
+    (shares for ``total_supply``); ``None`` where the read reverted, e.g.
+    before the vault was deployed."""
+
+    block_number: int
+    timestamp: int | None
+    total_assets: int | None
+    total_supply: int | None
+    # Assets one whole share (10**decimals) converts to.
+    share_price: int | None
+    unrealized_management_fee: int | None
+    market_assets: dict[int, int | None] = field(default_factory=dict)
+
+
+def block_grid(from_block: int, to_block: int, step: int) -> list[int]:
+    """Every ``step``-th block from ``from_block``, plus ``to_block``."""
+    if step < 1:
+        raise ValueError("step must be at least 1")
+    if to_block < from_block:
+        raise ValueError(f"to_block {to_block} is before from_block {from_block}")
+    blocks = list(range(from_block, to_block + 1, step))
+    if blocks[-1] != to_block:
+        blocks.append(to_block)
+    return blocks
+
+
+def block_at_timestamp(
+    ctx: Web3Context,
+    timestamp: int,
+    low: int = 0,
+    high: int | None = None,
+    timestamps: dict[int, int] | None = None,
+) -> int:
+    """The last block in ``[low, high]`` mined at or before ``timestamp``.
+
+    A binary search over block headers: about log2(high - low) reads.
+    ``timestamps`` caches the headers read, so searches for nearby
+    timestamps (see `timestamp_grid`) share them. Raises ValueError when
+    block ``low`` is already later than ``timestamp``.
+    """
+    known = timestamps if timestamps is not None else {}
+
+    def timestamp_of(block: int) -> int:
+        if block not in known:
+            known[block] = ctx.get_block(block)["timestamp"]
+        return known[block]
+
+    if high is None:
+        high = ctx.web3.eth.block_number
+    if timestamp_of(low) > timestamp:
+        raise ValueError(f"Block {low} is later than timestamp {timestamp}")
+    if timestamp_of(high) <= timestamp:
+        return high
+    # Invariant: timestamp_of(low) <= timestamp < timestamp_of(high)
+    while high - low > 1:
+        middle = (low + high) // 2
+        if timestamp_of(middle) <= timestamp:
+            low = middle
+        else:
+            high = middle
+    return low
+
+
+def timestamp_grid(ctx: Web3Context, start: int, end: int, interval: int) -> list[int]:
+    """The block at each of ``start``, ``start + interval``, ... up to
+    ``end`` (unix seconds); see `block_at_timestamp`. A block is listed once
+    even if several timestamps map to it.
+
+    Only the first timestamp is searched over the whole chain. Each later
+    one starts from a guess, the previous block plus the previous step, and
+    gallops out from it to bracket the answer: a couple of header reads per
+    sample while block times stay steady.
+    """
+    if interval < 1:
+        raise ValueError("interval must be at least 1 second")
+    if end < start:
+        raise ValueError(f"end {end} is before start {start}")
+    head = ctx.web3.eth.block_number
+    known: dict[int, int] = {}
+
+    def timestamp_of(block: int) -> int:
+        if block not in known:
+            known[block] = ctx.get_block(block)["timestamp"]
+        return known[block]
+
+    blocks: list[int] = []
+    low, high = 0, head
+    for moment in range(start, end + 1, interval):
+        if blocks:
+            step = blocks[-1] - (blocks[-2] if len(blocks) > 1 else blocks[-1])
+            guess = min(low + max(step, 1), head)
+            low, high = _bracket(timestamp_of, moment, low, guess, head)
+        found = block_at_timestamp(ctx, moment, low, high, known)
+        if not blocks or blocks[-1] != found:
+            blocks.append(found)
+        low = found
+    return blocks
+
+
+def _bracket(
+    timestamp_of: Callable[[int], int], moment: int, low: int, guess: int, head: int
+) -> tuple[int, int]:
+    """Blocks ``(lo, hi)`` in ``[low, head]`` with the answer for ``moment``
+    between them, galloping away from ``guess``."""
+    span = 1
+    if timestamp_of(guess) <= moment:
+        lo = guess
+        while lo + span < head and timestamp_of(lo + span) <= moment:
+            lo += span
+            span *= 2
+        return lo, min(lo + span, head)
+    hi = guess
+    while hi - span > low and timestamp_of(hi - span) > moment:
+        hi -= span
+        span *= 2
+    return max(hi - span, low), hi
+
+
+def fetch_vault_history(
+    ctx: Web3Context,
+    vault_address: ChecksumAddress,
+    blocks: Sequence[int],
+    market_ids: Sequence[int] | None = None,
+    max_concurrent: int = DEFAULT_HISTORY_CONCURRENCY,
+) -> Iterator[VaultHistoryRow]:
+    """The vault's metrics at each of ``blocks``, in order; see the module
+    docstring.
+
+    ``market_ids`` defaults to the vault's balance-fuse markets at the last
+    of ``blocks``. At most ``max_concurrent`` blocks are in flight. Raises
+    on the first block whose batch fails as a whole (RPC error, Multicall3
+    not yet deployed).
+    """
+    if not blocks:
+        return
+    vault = Web3.to_checksum_address(vault_address)
+    last = ctx.pinned(max(blocks))
+    if market_ids is None:
+        market_ids = sorted(
+            {fuse.market_id for fuse in PlasmaVault(last, vault).get_balance_fuses()}
+        )
+    share = 10 ** PlasmaVault(last, vault).decimals().call()
+    read = _block_reader(ctx, vault, share, list(market_ids))
+    with RpcScheduler.for_context(ctx).group() as pool:
+        # A bounded window rather than `pool.map`: a consumer that stops
+        # early (or a failed block) leaves at most one window of reads to
+        # finish, not the rest of the range.
+        window: deque[Future[VaultHistoryRow]] = deque()
+        for block in blocks:
+            if len(window) >= max_concurrent:
+                yield window.popleft().result()
+            window.append(pool.submit(read, block))
+        while window:
+            yield window.popleft().result()
+
+
+def _block_reader(
+    ctx: Web3Context, vault: ChecksumAddress, share: int, market_ids: list[int]
+) -> Callable[[int], VaultHistoryRow]:
+    def read(block: int) -> VaultHistoryRow:
+        at_block = ctx.pinned(block)
+        plasma_vault = PlasmaVault(at_block, vault)
+        results = call_all(
+            at_block,
+            [
+                Multicall3(at_block).get_current_block_timestamp(),
+                plasma_vault.total_assets(),
+                plasma_vault.total_supply(),
+                plasma_vault.convert_to_assets(share),
+                plasma_vault.get_unrealized_management_fee(),
+                *(plasma_vault.total_assets_in_market(m) for m in market_ids),
+            ],
+        )
+        values = [_value(block, result) for result in results]
+        return VaultHistoryRow(
+            block_number=block,
+            timestamp=values[_TIMESTAMP],
+            total_assets=values[_TOTAL_ASSETS],
+            total_supply=values[_TOTAL_SUPPLY],
+            share_price=values[_SHARE_PRICE],
+            unrealized_management_fee=values[_MANAGEMENT_FEE],
+            market_assets=dict(
+                zip(market_ids, values[_MANAGEMENT_FEE + 1 :], strict=True)
+            ),
+        )
+
+    return read
+
+
+def _value(block: int, result: Any) -> int | None:
+    if isinstance(result, Exception):
+        _logger.debug("Read at block %d failed: %s", block, result)
+        return None
+    return int(result)
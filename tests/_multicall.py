@@ -0,0 +1,69 @@
+"""Shared Multicall3 fakes for the unit tests that read through `call_all`.
+
+`aggregate3_result` encodes what ``aggregate3`` returns, for tests that
+script a mock context's answers batch by batch. `MulticallChain` stands in
+for `Web3Context.call`: it answers plain reads and unpacks ``aggregate3``
+batches the way the contract does, from whatever `result` says about each
+``(to, data)``.
+"""
+
+from __future__ import annotations
+
+from eth_abi import decode, encode
+from eth_utils import function_signature_to_4byte_selector
+from web3 import Web3
+from web3.exceptions import ContractLogicError
+
+from ipor_fusion.core.multicall import MULTICALL3_ADDRESS
+
+AGGREGATE3 = function_signature_to_4byte_selector("aggregate3((address,bool,bytes)[])")
+_ERROR = function_signature_to_4byte_selector("Error(string)")
+
+
+def aggregate3_result(*results: tuple[bool, bytes]) -> bytes:
+    """The return data of ``aggregate3``: one ``(success, returnData)`` per
+    call, in order."""
+    return encode(["(bool,bytes)[]"], [list(results)])
+
+
+def revert_data(reason: str) -> bytes:
+    """What a ``require(false, reason)`` reverts with."""
+    return _ERROR + encode(["string"], [reason])
+
+
+class MulticallChain:
+    """`Web3Context.call` stand-in; subclasses say how each read answers
+    by overriding `result`. Every request is recorded in `requests`."""
+
+    def __init__(self):
+        self.requests: list[tuple[str, bytes]] = []
+
+    def result(self, to: str, data: bytes) -> tuple[bool, bytes]:
+        """``(success, returnData)`` of a read of ``data`` on ``to``."""
+        raise NotImplementedError
+
+    def call(self, to, data, block=None):
+        self.requests.append((to, bytes(data)))
+        if to == MULTICALL3_ADDRESS and data[:4] == AGGREGATE3:
+            return self.aggregate3(data)
+        ok, raw = self.result(to, bytes(data))
+        if ok:
+            return raw
+        message = "execution reverted"
+        if raw[:4] == _ERROR and len(raw) > 4:
+            (reason,) = decode(["string"], raw[4:])
+            message += f": {reason}"
+        raise ContractLogicError(message, data="0x" + raw.hex())
+
+    def aggregate3(self, data: bytes) -> bytes:
+        (calls,) = decode(["(address,bool,bytes)[]"], data[4:])
+        return aggregate3_result(
+            *(
+                self.result(Web3.to_checksum_address(target), payload)
+                for target, _allow, payload in calls
+            )
+        )
+
+    @property
+    def aggregates(self) -> int:
+        return sum(1 for to, _ in self.requests if to == MULTICALL3_ADDRESS)
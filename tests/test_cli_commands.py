@@ -9,6 +9,7 @@ from click.testing import CliRunner
 from ipor_fusion.cli import config_store
 from ipor_fusion.cli.config_store import FusionConfig, VaultEntry, save_config
 from ipor_fusion.cli.main import cli, main
+from ipor_fusion.cli.vault_fetcher import VaultFetchResult, VaultTarget, _VaultData
 from ipor_fusion.core.fee_manager import HighWaterMarkPerformanceFee, RecipientFee
 from ipor_fusion.core.plasma_vault import ManagementFeeData, PerformanceFeeData
 from ipor_fusion.core.withdraw_manager import AccountRequest
@@ -168,13 +169,45 @@ class TestConfigSetProvider:
         cfg_data = json.loads(tmp_config[1].read_text(encoding="utf-8"))
         assert cfg_data["providers"]["1"] == "https://rpc.example.com"
 
-    @patch("web3.Web3")
-    def test_auto_detect_chain_id(self, mock_web3_cls, tmp_config):
-        mock_instance = MagicMock()
-        mock_instance.eth.chain_id = 42161
-        mock_web3_cls.return_value = mock_instance
-        mock_web3_cls.HTTPProvider.return_value = "mock_provider"
+    def test_several_urls_stored_as_list(self, tmp_config):
+        runner = CliRunner()
+        urls = ["https://rpc-a.example.com", "https://rpc-b.example.com"]
+        result = runner.invoke(
+            cli, ["config", "set-provider", *urls, "--chain-id", "1"]
+        )
+        assert result.exit_code == 0
+
+        cfg_data = json.loads(tmp_config[1].read_text(encoding="utf-8"))
+        assert cfg_data["providers"]["1"] == urls
+
+        shown = runner.invoke(cli, ["config", "show"])
+        assert "Chain 1: https://rpc-a.example.com, https://rpc-b.example.com" in (
+            shown.output
+        )
+
+    @patch("ipor_fusion.core.websocket.detect_chain_id", return_value=8453)
+    def test_every_url_is_probed(self, detect, tmp_config):
+        urls = ["https://rpc-a.example.com", "wss://rpc-b.example.com"]
+
+        result = CliRunner().invoke(cli, ["config", "set-provider", *urls])
+
+        assert result.exit_code == 0, result.output
+        assert [c.args[0] for c in detect.call_args_list] == urls
+        cfg_data = json.loads(tmp_config[1].read_text(encoding="utf-8"))
+        assert cfg_data["providers"]["8453"] == urls
 
+    @patch("ipor_fusion.core.websocket.detect_chain_id", side_effect=[1, 1, 8453])
+    def test_url_on_another_chain_is_rejected(self, _detect, tmp_config):
+        urls = ["https://a.example.com", "https://b.example.com", "https://c.example"]
+
+        result = CliRunner().invoke(cli, ["config", "set-provider", *urls])
+
+        assert result.exit_code != 0
+        assert "https://c.example is on chain 8453, not 1" in result.output
+        assert not tmp_config[1].exists()
+
+    @patch("ipor_fusion.core.websocket.detect_chain_id", return_value=42161)
+    def test_auto_detect_chain_id(self, _detect, tmp_config):
         runner = CliRunner()
         result = runner.invoke(
             cli, ["config", "set-provider", "https://arb-rpc.example.com"]
@@ -410,6 +443,235 @@ class TestVaultInfoGuards:
         assert result.exit_code != 0
         assert "does not appear" not in result.output
 
+    @patch(
+        "ipor_fusion.cli.vault_cmd._fetch_vault_data",
+        side_effect=RuntimeError("sub-call failed"),
+    )
+    @patch("ipor_fusion.cli.vault_cmd.resolve_access_manager")
+    @patch("ipor_fusion.cli.vault_cmd.Web3Context")
+    def test_profile_written_even_when_fetch_fails(
+        self, mock_ctx_cls, _resolve, _fetch, tmp_config, tmp_path
+    ):
+        # A trace of the failing run is the one you most want to look at.
+        self._setup(mock_ctx_cls)
+        out = tmp_path / "trace.json"
+
+        result = CliRunner().invoke(
+            cli,
+            ["vault", "info", ADDR_1, "--chain-id", "1", "--profile", str(out)],
+        )
+
+        assert result.exit_code != 0
+        trace = json.loads(out.read_text(encoding="utf-8"))
+        names = [e["name"] for e in trace["traceEvents"] if e["ph"] == "X"]
+        assert "vault info" in names
+
+    @patch(
+        "ipor_fusion.cli.vault_cmd._fetch_vault_data",
+        side_effect=RuntimeError("sub-call failed"),
+    )
+    @patch("ipor_fusion.cli.vault_cmd.resolve_access_manager")
+    @patch("ipor_fusion.cli.vault_cmd.Web3Context")
+    def test_health_profile_written_even_when_fetch_fails(
+        self, mock_ctx_cls, _resolve, _fetch, tmp_config, tmp_path
+    ):
+        self._setup(mock_ctx_cls)
+        out = tmp_path / "trace.json"
+
+        result = CliRunner().invoke(
+            cli,
+            ["vault", "health", ADDR_1, "--chain-id", "1", "--profile", str(out)],
+        )
+
+        assert result.exit_code != 0
+        trace = json.loads(out.read_text(encoding="utf-8"))
+        names = [e["name"] for e in trace["traceEvents"] if e["ph"] == "X"]
+        assert "vault health" in names
+
+
+class TestVaultInfoAll:
+    @staticmethod
+    def _setup() -> None:
+        save_config(
+            FusionConfig(
+                providers={"1": "https://eth.example.com", "8453": "https://base"},
+                vaults=[
+                    VaultEntry(address=ADDR_1, label="eth", chain_id=1),
+                    VaultEntry(address=ADDR_2, label="base", chain_id=8453),
+                ],
+            )
+        )
+
+    def test_requires_address_or_all(self, tmp_config):
+        result = CliRunner().invoke(cli, ["vault", "info"])
+
+        assert result.exit_code != 0
+        assert "VAULT_ADDRESS" in result.output
+
+    def test_rejects_address_with_all(self, tmp_config):
+        result = CliRunner().invoke(cli, ["vault", "info", ADDR_1, "--all"])
+
+        assert result.exit_code != 0
+        assert "not both" in result.output
+
+    @patch("ipor_fusion.cli.vault_cmd.fetch_many_vaults")
+    @patch("ipor_fusion.cli.vault_cmd.Web3Context")
+    def test_streams_ndjson_one_line_per_vault(
+        self, mock_ctx_cls, mock_fetch, tmp_config
+    ):
+        self._setup()
+        eth, base = (VaultTarget(1, ADDR_1), VaultTarget(8453, ADDR_2))
+        mock_fetch.return_value = iter(
+            [
+                VaultFetchResult(base, output={"address": ADDR_2}),
+                VaultFetchResult(eth, error=RuntimeError("boom")),
+            ]
+        )
+
+        result = CliRunner().invoke(cli, ["vault", "info", "--all", "--json"])
+
+        lines = [json.loads(line) for line in result.stdout.splitlines()]
+        assert lines[0] == {"address": ADDR_2}
+        assert lines[1] == {
+            "address": ADDR_1,
+            "chain_id": 1,
+            "error": "RuntimeError: boom",
+        }
+        assert result.exit_code != 0
+        assert "1 of 2 vaults failed" in result.output
+        # One connection per chain, spread over its endpoints.
+        assert mock_ctx_cls.from_url.call_count == 2
+        assert all(c.kwargs["balanced"] for c in mock_ctx_cls.from_url.call_args_list)
+
+    @patch("ipor_fusion.cli.vault_cmd.fetch_many_vaults", return_value=iter([]))
+    @patch("ipor_fusion.cli.vault_cmd.Web3Context")
+    def test_chain_filter(self, mock_ctx_cls, mock_fetch, tmp_config):
+        self._setup()
+
+        result = CliRunner().invoke(
+            cli, ["vault", "info", "--all", "--chain-id", "base", "--json"]
+        )
+
+        assert result.exit_code == 0
+        targets, contexts, _block = mock_fetch.call_args.args
+        assert targets == [VaultTarget(8453, ADDR_2)]
+        assert list(contexts) == [8453]
+
+
+def _watch_data(block: int, total_assets: int) -> _VaultData:
+    return _VaultData(
+        block_number=block,
+        is_latest=True,
+        block_timestamp=1700000000 + block,
+        share_decimals=18,
+        asset_decimals=6,
+        total_assets=total_assets,
+        total_supply=10**18,
+        supply_cap=2**256 - 1,
+        asset=ADDR_2,
+        asset_symbol="USDC",
+        access_manager=ADDR_ACCESS,
+        price_oracle_addr=ADDR_ORACLE,
+        rewards_manager=None,
+        withdraw_manager=None,
+        asset_price_usd=1.0,
+        fuses=[],
+        balance_fuses=[],
+        instant_fuses=[],
+    )
+
+
+class TestVaultWatch:
+    @pytest.fixture(autouse=True)
+    def _saved_vault(self, tmp_config):
+        save_config(
+            FusionConfig(
+                providers={"1": "https://eth.example.com"},
+                vaults=[VaultEntry(address=ADDR_1, label="eth", chain_id=1)],
+            )
+        )
+        with (
+            patch("ipor_fusion.cli.vault_cmd.resolve_access_manager"),
+            patch("ipor_fusion.cli.vault_cmd.Web3Context"),
+            patch(
+                "ipor_fusion.cli.vault_cmd.new_blocks",
+                return_value=iter([100, 101, 102]),
+            ),
+        ):
+            yield
+
+    def test_rejects_all_and_block_number(self):
+        for extra in (["--all"], [ADDR_1, "--block-number", "5"]):
+            result = CliRunner().invoke(cli, ["vault", "info", "--watch", *extra])
+
+            assert result.exit_code != 0
+            assert "--watch" in result.output
+
+    @patch("ipor_fusion.cli.vault_cmd._print_vault_info")
+    @patch("ipor_fusion.cli.vault_cmd.VaultWatcher")
+    def test_info_prints_full_once_then_changed_lines(
+        self, mock_watcher_cls, mock_print_info
+    ):
+        mock_watcher_cls.return_value.fetch.side_effect = [
+            _watch_data(100, 5 * 10**6),
+            _watch_data(101, 5 * 10**6),
+            _watch_data(102, 6 * 10**6),
+        ]
+        mock_print_info.side_effect = lambda *a, **kw: click.echo("FULL INFO")
+
+        result = CliRunner().invoke(cli, ["vault", "info", ADDR_1, "--watch"])
+
+        assert result.exit_code == 0, result.output
+        out = result.output.splitlines()
+        assert out[0] == "FULL INFO"
+        assert out[1].startswith("Block 101 (")
+        assert out[2] == "  (no changes)"
+        assert out[3].startswith("Block 102 (")
+        assert out[4].startswith("  -Total Assets:     5.0") and "USDC" in out[4]
+        assert out[5].startswith("  +Total Assets:     6.0")
+        assert any(line.startswith("  +Share Price:") for line in out)
+        mock_print_info.assert_called_once()
+
+    @patch("ipor_fusion.cli.vault_cmd._print_vault_info")
+    @patch("ipor_fusion.cli.vault_cmd.VaultWatcher")
+    def test_dropped_connection_skips_the_block(
+        self, mock_watcher_cls, mock_print_info
+    ):
+        mock_watcher_cls.return_value.fetch.side_effect = [
+            _watch_data(100, 5 * 10**6),
+            ConnectionResetError("connection reset"),
+            _watch_data(102, 6 * 10**6),
+        ]
+
+        result = CliRunner().invoke(cli, ["vault", "info", ADDR_1, "--watch"])
+
+        assert result.exit_code == 0, result.output
+        assert "Block 101: fetch failed (ConnectionResetError" in result.stderr
+        assert "Block 102 (" in result.stdout
+
+    @patch("ipor_fusion.cli.vault_cmd.VaultWatcher")
+    def test_health_json_streams_changes(self, mock_watcher_cls):
+        mock_watcher_cls.return_value.fetch.side_effect = [
+            _watch_data(100, 5 * 10**6),
+            _watch_data(101, 5 * 10**6),
+            _watch_data(102, 5 * 10**6),
+        ]
+
+        result = CliRunner().invoke(
+            cli, ["vault", "health", ADDR_1, "--watch", "--json"]
+        )
+
+        assert result.exit_code == 0, result.output
+        lines = [json.loads(line) for line in result.stdout.splitlines()]
+        assert lines[0]["block"] == 100
+        assert lines[0]["lending_health"] is None
+        assert lines[1] == {
+            "block": 101,
+            "block_timestamp": 1700000101,
+            "changes": {},
+        }
+        assert len(lines) == 3
+
 
 @pytest.mark.usefixtures("mock_fee_contracts")
 class TestVaultInfo:
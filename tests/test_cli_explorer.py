@@ -11,6 +11,7 @@ from ipor_fusion.cli.explorer import (
     get_contract_name,
     get_deployment_tx,
 )
+from ipor_fusion.cli.metadata_store import NS_CONTRACT_NAME, get_metadata_store
 
 
 @pytest.fixture(autouse=True)
@@ -21,6 +22,9 @@ def _patch_paths(tmp_path, monkeypatch):
     monkeypatch.setattr(config_store, "CONFIG_FILE", config_dir / "config.json")
     monkeypatch.setattr(config_store, "CACHE_DIR", cache_dir)
     monkeypatch.setattr(config_store, "CACHE_FILE", cache_dir / "contract_cache.json")
+    monkeypatch.setattr(
+        config_store, "DEPLOYMENT_CACHE_FILE", cache_dir / "deployment_cache.json"
+    )
 
 
 def _mock_urlopen(response_data: bytes):
@@ -59,10 +63,7 @@ class TestGetContractName:
         assert result == "PlasmaVault"
         mock_urlopen_fn.assert_called_once()
 
-        cache_file = tmp_path / ".cache" / "contract_cache.json"
-        assert cache_file.exists()
-        cached = json.loads(cache_file.read_text(encoding="utf-8"))
-        assert cached["1:0xDEF"] == "PlasmaVault"
+        assert get_metadata_store().get(NS_CONTRACT_NAME, "1:0xdef") == "PlasmaVault"
 
     def test_returns_empty_for_unsupported_chain(self):
         result = get_contract_name(99999, "0xABC", api_key="key123")
@@ -10,7 +10,8 @@ from web3 import Web3
 from web3.exceptions import ContractLogicError
 
 from ipor_fusion.cli import config_store
-from ipor_fusion.cli.config_store import FusionConfig, VaultEntry, save_contract_cache
+from ipor_fusion.cli.config_store import FusionConfig, VaultEntry
+from ipor_fusion.cli.metadata_store import NS_SYMBOL, get_metadata_store
 from ipor_fusion.cli.vault_cmd import (
     ADDRESS,
     CHAIN,
@@ -31,19 +32,21 @@ from ipor_fusion.cli.vault_cmd import (
     _resolve_provider,
 )
 from ipor_fusion.cli.vault_fetcher import (
+    VaultTarget,
     _collect_aave_substrate_assets,
     _collect_breakdown_token_addresses,
     _collect_morpho_substrates,
     _FeeData,
     _fetch_aave_positions,
     _fetch_breakdown_token_prices,
-    _fetch_fee_data,
-    _fetch_fuse_market_id,
     _fetch_morpho_positions,
+    _plan_fee_data,
+    _plan_fuse_markets,
     _resolve_token_symbol,
     _safe_call,
     _VaultData,
     _WithdrawManagerData,
+    fetch_many_vaults,
 )
 from ipor_fusion.cli.vault_health import (
     _BalanceFuseTotals,
@@ -64,6 +67,7 @@ from ipor_fusion.cli.vault_rendering import (
 )
 from ipor_fusion.config.roles import Roles
 from ipor_fusion.core.fee_manager import HighWaterMarkPerformanceFee, RecipientFee
+from ipor_fusion.core.planner import QueryPlan
 from ipor_fusion.market_ids import IporFusionMarkets
 from ipor_fusion.readers.aave_v3 import AaveV3PositionBreakdown
 from ipor_fusion.readers.lending_health import (
@@ -74,6 +78,17 @@ from ipor_fusion.readers.morpho import MorphoPositionBreakdown
 from ipor_fusion.substrates import decode_substrate, market_name
 from ipor_fusion.types import Amount, MorphoBlueMarketId
 
+
+@pytest.fixture(autouse=True)
+def _tmp_cache(tmp_path, monkeypatch):
+    cache_dir = tmp_path / ".cache"
+    monkeypatch.setattr(config_store, "CACHE_DIR", cache_dir)
+    monkeypatch.setattr(config_store, "CACHE_FILE", cache_dir / "contract_cache.json")
+    monkeypatch.setattr(
+        config_store, "DEPLOYMENT_CACHE_FILE", cache_dir / "deployment_cache.json"
+    )
+
+
 VALID_ADDR_LOWER = "0x" + "ab" * 20
 VALID_ADDR_UPPER = "0x" + "AB" * 20
 VALID_CHECKSUM = Web3.to_checksum_address("0x" + "ab" * 20)
@@ -659,7 +674,7 @@ class TestResolveTokenSymbol:
         )
 
     def test_returns_cached_symbol(self):
-        save_contract_cache({"symbol:0xabc": "USDC"})
+        get_metadata_store().put(NS_SYMBOL, "0xabc", "USDC")
         ctx = MagicMock()
         assert _resolve_token_symbol(ctx, "0xabc") == "USDC"
 
@@ -1071,7 +1086,7 @@ class TestPrintBalanceFusesTable:
             FakeBalanceFuse(market_id=12, fuse=ADDR_2),
         ]
 
-        _print_balance_fuses_table(pv, fuses, 6, "USDC", 1.0, 1, None)
+        _print_balance_fuses_table(MagicMock(), pv, fuses, 6, "USDC", 1.0, 1, None)
         out = capsys.readouterr().out
         assert "Balance Fuses (1):" in out
         assert "Zero-Balance Fuses (1):" in out
@@ -1084,7 +1099,14 @@ class TestPrintBalanceFusesTable:
         pv = MagicMock()
         pv.total_assets_in_market.return_value.call.return_value = 0
         _print_balance_fuses_table(
-            pv, [FakeBalanceFuse(market_id=14, fuse=ADDR_1)], 6, "USDC", 1.0, 1, None
+            MagicMock(),
+            pv,
+            [FakeBalanceFuse(market_id=14, fuse=ADDR_1)],
+            6,
+            "USDC",
+            1.0,
+            1,
+            None,
         )
         out = capsys.readouterr().out
         assert "Balance Fuses (1):" in out
@@ -1701,66 +1723,86 @@ class TestFetcherCollectors:
 
 
 class TestFetchAavePositions:
+    @staticmethod
+    def _position(breakdown):
+        return MagicMock(
+            asset=breakdown.asset, breakdown=breakdown, is_empty=breakdown.is_empty
+        )
+
     @patch("ipor_fusion.cli.vault_fetcher.AaveV3Reader")
     def test_returns_none_when_chain_unsupported(self, _mock_reader_cls):
-        with ThreadPoolExecutor() as pool:
-            result = _fetch_aave_positions(MagicMock(), pool, _VAULT_ADDR, 999, {})
+        result = _fetch_aave_positions(MagicMock(), _VAULT_ADDR, 999, {})
         assert result is None
 
     @patch("ipor_fusion.cli.vault_fetcher.AaveV3Reader")
     def test_returns_none_when_no_aave_substrates(self, _mock_reader_cls):
-        with ThreadPoolExecutor() as pool:
-            result = _fetch_aave_positions(MagicMock(), pool, _VAULT_ADDR, 1, {})
+        result = _fetch_aave_positions(MagicMock(), _VAULT_ADDR, 1, {})
         assert result is None
 
     @patch("ipor_fusion.cli.vault_fetcher.AaveV3Reader")
     def test_drops_empty_breakdowns(self, mock_reader_cls):
+        asset = Web3.to_checksum_address("0x" + "22" * 20)
         mock_reader = MagicMock()
-        mock_reader.position_breakdown.return_value = _aave_breakdown(
-            supply=0, variable_debt=0, stable_debt=0
-        )
+        mock_reader.positions_for.return_value.reserves = [
+            self._position(_aave_breakdown(asset=asset))
+        ]
         mock_reader_cls.return_value = mock_reader
 
         addr_bytes = bytes(12) + bytes.fromhex("22" * 20)
-        with ThreadPoolExecutor() as pool:
-            result = _fetch_aave_positions(
-                MagicMock(), pool, _VAULT_ADDR, 1, {1: [addr_bytes]}
-            )
+        result = _fetch_aave_positions(MagicMock(), _VAULT_ADDR, 1, {1: [addr_bytes]})
         assert result is None
 
     @patch("ipor_fusion.cli.vault_fetcher.AaveV3Reader")
     def test_returns_breakdowns_for_active_positions(self, mock_reader_cls):
+        asset = Web3.to_checksum_address("0x" + "22" * 20)
         mock_reader = MagicMock()
-        mock_reader.position_breakdown.return_value = _aave_breakdown(supply=42)
+        mock_reader.positions_for.return_value.reserves = [
+            self._position(_aave_breakdown(asset=asset, supply=42))
+        ]
         mock_reader_cls.return_value = mock_reader
 
         addr_bytes = bytes(12) + bytes.fromhex("22" * 20)
-        with ThreadPoolExecutor() as pool:
-            result = _fetch_aave_positions(
-                MagicMock(), pool, _VAULT_ADDR, 1, {1: [addr_bytes]}
-            )
-        assert result == {1: [_aave_breakdown(supply=42)]}
+        result = _fetch_aave_positions(MagicMock(), _VAULT_ADDR, 1, {1: [addr_bytes]})
+
+        mock_reader.positions_for.assert_called_once_with(
+            _VAULT_ADDR, [asset], with_prices=False
+        )
+        assert result == {1: [_aave_breakdown(asset=asset, supply=42)]}
+
+    @patch("ipor_fusion.cli.vault_fetcher.AaveV3Reader")
+    def test_failed_batch_returns_none(self, mock_reader_cls):
+        mock_reader_cls.return_value.positions_for.side_effect = ContractLogicError(
+            "boom"
+        )
+
+        addr_bytes = bytes(12) + bytes.fromhex("22" * 20)
+        result = _fetch_aave_positions(MagicMock(), _VAULT_ADDR, 1, {1: [addr_bytes]})
+        assert result is None
 
 
 class TestFetchMorphoPositions:
     @patch("ipor_fusion.cli.vault_fetcher.MorphoReader")
     def test_returns_none_when_no_morpho_substrates(self, _mock_reader_cls):
-        with ThreadPoolExecutor() as pool:
-            result = _fetch_morpho_positions(MagicMock(), pool, _VAULT_ADDR, {})
+        result = _fetch_morpho_positions(MagicMock(), _VAULT_ADDR, {})
         assert result is None
 
     @patch("ipor_fusion.cli.vault_fetcher.MorphoReader")
     def test_returns_breakdowns_for_morpho_substrates(self, mock_reader_cls):
+        snapshot = MagicMock(market_id="ab" * 32, breakdown=_morpho_breakdown())
         mock_reader = MagicMock()
-        mock_reader.position_breakdown.return_value = _morpho_breakdown()
+        mock_reader.positions_for.return_value = [snapshot]
         mock_reader_cls.return_value = mock_reader
 
-        morpho_sub = bytes.fromhex("ab" * 32)
-        with ThreadPoolExecutor() as pool:
-            result = _fetch_morpho_positions(
-                MagicMock(), pool, _VAULT_ADDR, {14: [morpho_sub]}
-            )
+        result = _fetch_morpho_positions(
+            MagicMock(),
+            _VAULT_ADDR,
+            {14: [bytes.fromhex("ab" * 32), bytes.fromhex("cd" * 32)]},
+        )
+
         assert result == {14: [_morpho_breakdown()]}
+        mock_reader.positions_for.assert_called_once_with(
+            _VAULT_ADDR, ["ab" * 32, "cd" * 32], with_oracle_prices=False
+        )
 
 
 class TestBreakdownTokenPrices:
@@ -1965,33 +2007,39 @@ class TestPrintFuseSection:
         assert "(none)" in captured.out
 
 
-class TestFetchFuseMarketId:
+class TestPlanFuseMarkets:
     """Reads the immutable MARKET_ID() exposed by every IPOR Fusion fuse so
     the CLI can detect orphan markets (action fuses without a matching
     balance fuse)."""
 
+    @staticmethod
+    def _fuse_markets(ctx) -> dict[str, int]:
+        plan = QueryPlan(ctx)
+        node = _plan_fuse_markets(ctx, plan, plan.derive(lambda: [ADDR_1]))
+        plan.execute()
+        return node.result()
+
     def test_returns_decoded_uint256(self):
         ctx = MagicMock()
         # uint256(14) ABI-encoded
         ctx.call.return_value = (14).to_bytes(32, "big")
-        result = _fetch_fuse_market_id(ctx, ADDR_1)
-        assert result == 14
+        assert self._fuse_markets(ctx) == {ADDR_1: 14}
         ctx.call.assert_called_once()
 
-    def test_returns_none_on_revert(self):
+    def test_skips_fuse_on_revert(self):
         ctx = MagicMock()
         ctx.call.side_effect = ContractLogicError("execution reverted")
-        assert _fetch_fuse_market_id(ctx, ADDR_1) is None
+        assert self._fuse_markets(ctx) == {}
 
-    def test_returns_none_on_empty_response(self):
+    def test_skips_fuse_on_empty_response(self):
         ctx = MagicMock()
         ctx.call.return_value = b""
-        assert _fetch_fuse_market_id(ctx, ADDR_1) is None
+        assert self._fuse_markets(ctx) == {}
 
-    def test_returns_none_on_undecodable_response(self):
+    def test_skips_fuse_on_undecodable_response(self):
         ctx = MagicMock()
         ctx.call.return_value = b"\x00\x01"  # too short for uint256
-        assert _fetch_fuse_market_id(ctx, ADDR_1) is None
+        assert self._fuse_markets(ctx) == {}
 
 
 class TestPartitionBalanceFuses:
@@ -2230,14 +2278,20 @@ class TestPrintFees:
         assert "MISMATCH" not in capsys.readouterr().out
 
 
-class TestFetchFeeData:
+def _fee_data(vault) -> _FeeData:
+    plan = QueryPlan(MagicMock())
+    node = _plan_fee_data(MagicMock(), plan, vault)
+    plan.execute()
+    return node.result()
+
+
+class TestPlanFeeData:
     def test_no_fee_account_skips_the_fee_manager_hop(self):
         vault = MagicMock()
         vault.get_performance_fee_data.return_value.call.return_value = None
         vault.get_management_fee_data.return_value.call.return_value = None
         vault.get_unrealized_management_fee.return_value.call.return_value = 7
-        with ThreadPoolExecutor() as pool:
-            result = _fetch_fee_data(MagicMock(), pool, vault)
+        result = _fee_data(vault)
         assert result.fee_manager is None
         assert result.deposit_fee_wad is None
         assert result.unrealized_management_fee == 7
@@ -2256,12 +2310,9 @@ class TestFetchFeeData:
         def empty_return():
             raise DecodingError("Tried to read 32 bytes, only got 0 bytes.")
 
-        with (
-            patch("ipor_fusion.cli.vault_fetcher.FeeAccount") as account_cls,
-            ThreadPoolExecutor() as pool,
-        ):
+        with patch("ipor_fusion.cli.vault_fetcher.FeeAccount") as account_cls:
             account_cls.return_value.fee_manager.return_value.call = empty_return
-            result = _fetch_fee_data(MagicMock(), pool, vault)
+            result = _fee_data(vault)
 
         assert result.fee_manager is None
         assert result.performance_fee_vault_bps == 1000
@@ -2279,7 +2330,6 @@ class TestFetchFeeData:
         with (
             patch("ipor_fusion.cli.vault_fetcher.FeeAccount") as account_cls,
             patch("ipor_fusion.cli.vault_fetcher.FeeManager") as manager_cls,
-            ThreadPoolExecutor() as pool,
         ):
             account_cls.return_value.fee_manager.return_value.call.return_value = ADDR_2
             manager = manager_cls.return_value
@@ -2292,9 +2342,75 @@ class TestFetchFeeData:
             manager.get_management_fee_recipients.return_value.call.return_value = []
             dao_getter = manager.get_ipor_dao_fee_recipient_address
             dao_getter.return_value.call.return_value = ADDR_1
-            result = _fetch_fee_data(MagicMock(), pool, vault)
+            result = _fee_data(vault)
 
         assert result.fee_manager == ADDR_2
         assert result.deposit_fee_wad is None
         assert result.high_water_mark is None
         assert result.performance_fee_manager_bps == 1000
+
+
+class TestFetchManyVaults:
+    @staticmethod
+    def _ctx(head: int) -> MagicMock:
+        ctx = MagicMock()
+        ctx.web3.eth.block_number = head
+        return ctx
+
+    @patch("ipor_fusion.cli.vault_fetcher._fetch_vault_data")
+    def test_pins_each_chain_and_shares_reads(self, mock_fetch):
+        pinned: set[tuple[int, object]] = set()
+
+        def fetch(ctx, pv, block, chain_id):
+            pinned.add((chain_id, ctx.default_block))
+            return MagicMock(block_number=block)
+
+        mock_fetch.side_effect = fetch
+        contexts = {1: self._ctx(100), 8453: self._ctx(200)}
+        for ctx in contexts.values():
+            ctx.default_block = "latest"
+        targets = [
+            VaultTarget(1, VALID_CHECKSUM),
+            VaultTarget(8453, VALID_CHECKSUM),
+            VaultTarget(1, Web3.to_checksum_address("0x" + "cd" * 20)),
+        ]
+
+        results = list(fetch_many_vaults(targets, contexts))
+
+        assert {r.target for r in results} == set(targets)
+        assert all(r.error is None and r.data.is_latest for r in results)
+        assert pinned == {(1, 100), (8453, 200)}
+        # The caller's contexts are handed back at their own block
+        assert contexts[1].default_block == "latest"
+        assert contexts[8453].default_block == "latest"
+        contexts[1].shared_reads.assert_called_once_with()
+        blocks = {
+            (call.kwargs["chain_id"], call.args[2])
+            for call in mock_fetch.call_args_list
+        }
+        assert blocks == {(1, 100), (8453, 200)}
+
+    @patch("ipor_fusion.cli.vault_fetcher._fetch_vault_data")
+    def test_failure_is_reported_per_vault(self, mock_fetch):
+        bad = Web3.to_checksum_address("0x" + "cd" * 20)
+
+        def fetch(ctx, pv, block, chain_id):
+            if pv.address == bad:
+                raise ContractLogicError("execution reverted")
+            return MagicMock()
+
+        mock_fetch.side_effect = fetch
+
+        results = {
+            r.target.address: r
+            for r in fetch_many_vaults(
+                [VaultTarget(1, VALID_CHECKSUM), VaultTarget(1, bad)],
+                {1: self._ctx(100)},
+                block_number=50,
+                finish=lambda ctx, pv, data: pv.address,
+            )
+        }
+
+        assert isinstance(results[bad].error, ContractLogicError)
+        assert results[VALID_CHECKSUM].output == VALID_CHECKSUM
+        assert results[VALID_CHECKSUM].data.is_latest is False
@@ -3,6 +3,7 @@
 
 from unittest.mock import MagicMock, patch
 
+import pytest
 from eth_abi import encode
 from web3 import Web3
 
@@ -10,17 +11,25 @@ from ipor_fusion.market_ids import IporFusionMarkets
 from ipor_fusion.readers.aave_v3 import AaveV3Reader
 from ipor_fusion.readers.lending_health import (
     AAVE_V3_MARKET_IDS,
-    MORPHO_BLUE_ADDRESS,
     MORPHO_MARKET_IDS,
     ORACLE_PRICE_SCALE,
     LendingMarketHealth,
     VaultLendingHealth,
     _compute_aave_market_health,
-    _compute_morpho_market_health,
+    _compute_morpho_health,
+    _morpho_market_health,
     _shares_to_assets_up,
     fetch_vault_lending_health,
+    liquidation_price,
+    max_additional_borrow,
+    max_collateral_withdraw,
+)
+from ipor_fusion.readers.morpho import (
+    MorphoMarket,
+    MorphoMarketParams,
+    MorphoPosition,
+    MorphoPositionSnapshot,
 )
-from ipor_fusion.readers.morpho import MorphoReader
 from ipor_fusion.types import MorphoBlueMarketId
 
 VAULT_ADDR = Web3.to_checksum_address("0x1111111111111111111111111111111111111111")
@@ -31,11 +40,6 @@ IRM_ADDR = Web3.to_checksum_address("0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
 MORPHO_MARKET_ID = MorphoBlueMarketId("a" * 64)
 
 
-def _make_morpho_reader():
-    ctx = MagicMock()
-    return MorphoReader(ctx, MORPHO_BLUE_ADDRESS), ctx
-
-
 def _make_aave_reader():
     ctx = MagicMock()
     pool = Web3.to_checksum_address("0x2222222222222222222222222222222222222222")
@@ -195,23 +199,23 @@ class TestVaultLendingHealthProperties:
 # ── Morpho health computation ────────────────────────────────────────
 
 
-class TestComputeMorphoMarketHealth:
-    def test_no_borrow_returns_zero_ltv(self):
-        reader, ctx = _make_morpho_reader()
+def _snapshot(borrow_shares, collateral, oracle_price=ORACLE_PRICE_SCALE):
+    # total_borrow_assets == total_borrow_shares: borrowed ≈ borrow_shares
+    return MorphoPositionSnapshot(
+        market_id=MORPHO_MARKET_ID,
+        position=MorphoPosition(0, borrow_shares, collateral),
+        market=MorphoMarket(2000, 2000, 1000, 1000, 1700000000, 0),
+        params=MorphoMarketParams(
+            TOKEN_A, TOKEN_B, ORACLE_ADDR, IRM_ADDR, 860000000000000000
+        ),
+        oracle_price=oracle_price,
+    )
 
-        # position: no borrow
-        ctx.call.side_effect = [
-            # position(market_id, user) → supply_shares=1000, borrow_shares=0, collateral=500
-            encode(["uint256", "uint128", "uint128"], [1000, 0, 500]),
-            # market_params(market_id) → lltv=0.86e18
-            encode(
-                ["address", "address", "address", "address", "uint256"],
-                [TOKEN_A, TOKEN_B, ORACLE_ADDR, IRM_ADDR, 860000000000000000],
-            ),
-        ]
 
-        result = _compute_morpho_market_health(
-            ctx, reader, MORPHO_MARKET_ID, VAULT_ADDR, 14, "MORPHO"
+class TestMorphoMarketHealth:
+    def test_no_borrow_returns_zero_ltv(self):
+        result = _morpho_market_health(
+            _snapshot(0, 500, oracle_price=None), 14, "MORPHO"
         )
 
         assert result is not None
@@ -222,36 +226,11 @@ class TestComputeMorphoMarketHealth:
         assert not result.is_warning
 
     def test_active_borrow_computes_ltv(self):
-        reader, ctx = _make_morpho_reader()
-
         # 50% LTV scenario:
-        # borrow_shares=500, total_borrow_assets=1000, total_borrow_shares=1000
-        # → borrowed ≈ 500
-        # collateral=1000, oracle_price=1e36 (1:1 price)
-        # → collateral_value = 1000
+        # borrowed ≈ 500, collateral=1000, oracle_price=1e36 (1:1 price)
         # → current_ltv = 500/1000 = 0.5
         # lltv = 0.86 → usage = 0.5/0.86 ≈ 58.14%
-
-        ctx.call.side_effect = [
-            # position
-            encode(["uint256", "uint128", "uint128"], [0, 500, 1000]),
-            # market
-            encode(
-                ["uint128", "uint128", "uint128", "uint128", "uint128", "uint128"],
-                [2000, 2000, 1000, 1000, 1700000000, 0],
-            ),
-            # market_params
-            encode(
-                ["address", "address", "address", "address", "uint256"],
-                [TOKEN_A, TOKEN_B, ORACLE_ADDR, IRM_ADDR, 860000000000000000],
-            ),
-            # oracle price() → 1e36 (1:1)
-            encode(["uint256"], [ORACLE_PRICE_SCALE]),
-        ]
-
-        result = _compute_morpho_market_health(
-            ctx, reader, MORPHO_MARKET_ID, VAULT_ADDR, 14, "MORPHO"
-        )
+        result = _morpho_market_health(_snapshot(500, 1000), 14, "MORPHO")
 
         assert result is not None
         assert result.protocol == "morpho"
@@ -260,81 +239,59 @@ class TestComputeMorphoMarketHealth:
         assert result.health_factor is not None
         assert result.health_factor > 1.0
         assert 55.0 < result.ltv_usage_percent < 62.0
+        assert result.substrate_id == MORPHO_MARKET_ID
         assert not result.is_warning
 
     def test_high_ltv_triggers_warning(self):
-        reader, ctx = _make_morpho_reader()
-
         # ~83% LTV → 83/86 ≈ 96.5% usage → critical
-        # borrowed ≈ 830, collateral=1000, oracle_price=1e36
-        ctx.call.side_effect = [
-            encode(["uint256", "uint128", "uint128"], [0, 830, 1000]),
-            encode(
-                ["uint128", "uint128", "uint128", "uint128", "uint128", "uint128"],
-                [2000, 2000, 1000, 1000, 1700000000, 0],
-            ),
-            encode(
-                ["address", "address", "address", "address", "uint256"],
-                [TOKEN_A, TOKEN_B, ORACLE_ADDR, IRM_ADDR, 860000000000000000],
-            ),
-            encode(["uint256"], [ORACLE_PRICE_SCALE]),
-        ]
-
-        result = _compute_morpho_market_health(
-            ctx, reader, MORPHO_MARKET_ID, VAULT_ADDR, 14, "MORPHO"
-        )
+        result = _morpho_market_health(_snapshot(830, 1000), 14, "MORPHO")
 
         assert result is not None
         assert result.is_critical
         assert result.is_warning
 
     def test_zero_collateral_returns_none_ltv(self):
-        reader, ctx = _make_morpho_reader()
-
-        ctx.call.side_effect = [
-            encode(["uint256", "uint128", "uint128"], [0, 100, 0]),
-            encode(
-                ["uint128", "uint128", "uint128", "uint128", "uint128", "uint128"],
-                [2000, 2000, 1000, 1000, 1700000000, 0],
-            ),
-            encode(
-                ["address", "address", "address", "address", "uint256"],
-                [TOKEN_A, TOKEN_B, ORACLE_ADDR, IRM_ADDR, 860000000000000000],
-            ),
-            encode(["uint256"], [ORACLE_PRICE_SCALE]),
-        ]
-
-        result = _compute_morpho_market_health(
-            ctx, reader, MORPHO_MARKET_ID, VAULT_ADDR, 14, "MORPHO"
-        )
+        result = _morpho_market_health(_snapshot(100, 0), 14, "MORPHO")
 
         assert result is not None
         assert result.current_ltv is None
         assert result.ltv_usage_percent is None
 
-    def test_position_read_failure_returns_none(self):
-        reader, ctx = _make_morpho_reader()
-        ctx.call.side_effect = Exception("RPC error")
-
-        result = _compute_morpho_market_health(
-            ctx, reader, MORPHO_MARKET_ID, VAULT_ADDR, 14, "MORPHO"
+    def test_missing_oracle_price_returns_none(self):
+        result = _morpho_market_health(
+            _snapshot(100, 1000, oracle_price=None), 14, "MORPHO"
         )
 
         assert result is None
 
-    def test_market_data_failure_returns_none(self):
-        reader, ctx = _make_morpho_reader()
-        # First call succeeds (position), second fails (market)
-        ctx.call.side_effect = [
-            encode(["uint256", "uint128", "uint128"], [0, 100, 1000]),
-            Exception("market read failed"),
-        ]
 
-        result = _compute_morpho_market_health(
-            ctx, reader, MORPHO_MARKET_ID, VAULT_ADDR, 14, "MORPHO"
+class TestComputeMorphoHealth:
+    def test_one_batch_for_all_substrates(self):
+        reader = MagicMock()
+        other = MorphoBlueMarketId("b" * 64)
+        reader.positions_for.return_value = [_snapshot(500, 1000)]
+
+        results = _compute_morpho_health(
+            reader,
+            VAULT_ADDR,
+            [(14, "MORPHO", MORPHO_MARKET_ID), (14, "MORPHO", other)],
         )
 
-        assert result is None
+        reader.positions_for.assert_called_once_with(
+            VAULT_ADDR, [MORPHO_MARKET_ID, other]
+        )
+        assert [r.substrate_id for r in results] == [MORPHO_MARKET_ID]
+
+    def test_batch_failure_returns_empty(self):
+        reader = MagicMock()
+        reader.positions_for.side_effect = Exception("RPC error")
+
+        assert (
+            _compute_morpho_health(
+                reader, VAULT_ADDR, [(14, "MORPHO", MORPHO_MARKET_ID)]
+            )
+            == []
+        )
 
 
 # ── Aave V3 health computation ───────────────────────────────────────
@@ -443,6 +400,86 @@ class TestComputeAaveMarketHealth:
         assert result is None
 
 
+# ── Position calculators ─────────────────────────────────────────────
+
+
+def _aave_health(collateral=10_000 * 10**8, debt=5_000 * 10**8):
+    reader, ctx = _make_aave_reader()
+    # liq_threshold=8000 (80%), ltv=7500 (75%)
+    ctx.call.return_value = encode(
+        ["uint256", "uint256", "uint256", "uint256", "uint256", "uint256"],
+        [collateral, debt, 0, 8000, 7500, 1_600_000_000_000_000_000],
+    )
+    return _compute_aave_market_health(reader, VAULT_ADDR, 1, "AAVE_V3")
+
+
+class TestPositionCalculators:
+    def test_liquidation_price_is_exact(self):
+        # 500 borrowed against 1000 collateral at LLTV 0.86
+        health = _morpho_market_health(_snapshot(500, 1000), 14, "MORPHO")
+
+        price = liquidation_price(health)
+
+        assert price == 582 * ORACLE_PRICE_SCALE // 1000
+        # Morpho's check: collateral * price / 1e36 * lltv / 1e18 >= borrowed
+        lltv = 860000000000000000
+        assert 1000 * price // ORACLE_PRICE_SCALE * lltv // 10**18 >= 500
+        assert 1000 * (price - 1) // ORACLE_PRICE_SCALE * lltv // 10**18 < 500
+
+    def test_liquidation_price_needs_a_morpho_loan(self):
+        no_debt = _morpho_market_health(_snapshot(0, 1000), 14, "MORPHO")
+
+        assert liquidation_price(no_debt) is None
+        assert liquidation_price(_aave_health()) is None
+
+    def test_morpho_borrow_and_withdraw(self):
+        health = _morpho_market_health(_snapshot(500, 1000), 14, "MORPHO")
+
+        # capacity floor(1000 * 0.86) = 860
+        assert max_additional_borrow(health) == 360
+        # 500 / 0.86 → 582 collateral must stay
+        assert max_collateral_withdraw(health) == 418
+        # 600 / 0.86 → 698 collateral must stay
+        assert max_collateral_withdraw(health, target_hf=1.2) == 302
+
+    def test_without_debt_all_collateral_is_free(self):
+        health = _morpho_market_health(_snapshot(0, 1000), 14, "MORPHO")
+
+        assert max_collateral_withdraw(health, target_hf=2.0) == 1000
+        assert max_additional_borrow(health) == 860
+
+    def test_aave_borrow_and_withdraw(self):
+        health = _aave_health()
+
+        # $10,000 at 75% LTV less $5,000 debt
+        assert max_additional_borrow(health) == 2_500 * 10**8
+        # $5,000 / 80% threshold → $6,250 must stay
+        assert max_collateral_withdraw(health) == 3_750 * 10**8
+        assert max_collateral_withdraw(health, target_hf=2.0) == 0
+
+    def test_rejects_target_below_one(self):
+        health = _aave_health()
+
+        with pytest.raises(ValueError, match="below 1"):
+            max_collateral_withdraw(health, target_hf=0.9)
+
+    def test_requires_position_inputs(self):
+        health = LendingMarketHealth(
+            protocol="morpho",
+            market_id=14,
+            market_name="MORPHO",
+            current_ltv=None,
+            max_ltv=0.86,
+            health_factor=None,
+            total_collateral_usd=None,
+            total_debt_usd=None,
+            ltv_usage_percent=None,
+        )
+
+        with pytest.raises(ValueError, match="no position inputs"):
+            max_additional_borrow(health)
+
+
 # ── fetch_vault_lending_health integration ───────────────────────────
 
 
@@ -474,18 +511,20 @@ class TestFetchVaultLendingHealth:
 
     @patch("ipor_fusion.readers.lending_health.market_name", return_value="Morpho")
     @patch(
-        "ipor_fusion.readers.lending_health._compute_morpho_market_health",
-        return_value=LendingMarketHealth(
-            protocol="morpho",
-            market_id=14,
-            market_name="Morpho",
-            current_ltv=0.5,
-            max_ltv=0.86,
-            health_factor=1.72,
-            total_collateral_usd=None,
-            total_debt_usd=None,
-            ltv_usage_percent=58.14,
-        ),
+        "ipor_fusion.readers.lending_health._compute_morpho_health",
+        return_value=[
+            LendingMarketHealth(
+                protocol="morpho",
+                market_id=14,
+                market_name="Morpho",
+                current_ltv=0.5,
+                max_ltv=0.86,
+                health_factor=1.72,
+                total_collateral_usd=None,
+                total_debt_usd=None,
+                ltv_usage_percent=58.14,
+            )
+        ],
     )
     def test_morpho_returns_result_via_threadpool(self, mock_compute, mock_name):
         ctx = MagicMock()
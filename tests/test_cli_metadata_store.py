@@ -0,0 +1,120 @@
+import json
+import threading
+
+import pytest
+
+from ipor_fusion.cli import config_store, metadata_store
+from ipor_fusion.cli.metadata_store import (
+    NS_CONTRACT_NAME,
+    NS_DECIMALS,
+    NS_DEPLOYMENT,
+    NS_SYMBOL,
+    MetadataStore,
+    get_metadata_store,
+)
+
+
+@pytest.fixture(autouse=True)
+def _patch_paths(tmp_path, monkeypatch):
+    cache_dir = tmp_path / ".cache"
+    monkeypatch.setattr(config_store, "CACHE_DIR", cache_dir)
+    monkeypatch.setattr(config_store, "CACHE_FILE", cache_dir / "contract_cache.json")
+    monkeypatch.setattr(
+        config_store, "DEPLOYMENT_CACHE_FILE", cache_dir / "deployment_cache.json"
+    )
+
+
+class TestMetadataStore:
+    def test_roundtrip_per_namespace(self, tmp_path):
+        store = MetadataStore(tmp_path / "m.sqlite3")
+        store.put(NS_SYMBOL, "0xabc", "USDC")
+        store.put(NS_DECIMALS, "0xabc", "6")
+
+        assert store.get(NS_SYMBOL, "0xabc") == "USDC"
+        assert store.get(NS_DECIMALS, "0xabc") == "6"
+        assert store.get(NS_SYMBOL, "0xdef") is None
+
+    def test_buffered_writes_persist_after_flush(self, tmp_path):
+        path = tmp_path / "m.sqlite3"
+        store = MetadataStore(path)
+        store.put_many(NS_SYMBOL, [("0x1", "A"), ("0x2", "B")])
+        assert store.items(NS_SYMBOL) == {"0x1": "A", "0x2": "B"}
+        store.close()
+
+        reopened = MetadataStore(path)
+        assert reopened.items(NS_SYMBOL) == {"0x1": "A", "0x2": "B"}
+
+    def test_flushes_once_buffer_is_full(self, tmp_path):
+        path = tmp_path / "m.sqlite3"
+        store = MetadataStore(path)
+        store.put_many(
+            NS_SYMBOL,
+            [(f"0x{i}", str(i)) for i in range(MetadataStore.FLUSH_EVERY)],
+        )
+
+        other = MetadataStore(path)
+        assert len(other.items(NS_SYMBOL)) == MetadataStore.FLUSH_EVERY
+
+    def test_uses_wal_journal(self, tmp_path):
+        store = MetadataStore(tmp_path / "m.sqlite3")
+        (mode,) = store._conn.execute("PRAGMA journal_mode").fetchone()
+        assert mode == "wal"
+
+    def test_concurrent_writers(self, tmp_path):
+        store = MetadataStore(tmp_path / "m.sqlite3")
+
+        def write(n):
+            for i in range(50):
+                store.put(NS_SYMBOL, f"0x{n}-{i}", "T")
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        store.flush()
+
+        assert len(store.items(NS_SYMBOL)) == 200
+
+
+class TestLegacyJsonMigration:
+    def test_imports_legacy_caches_once(self, tmp_path):
+        cache_dir = tmp_path / ".cache"
+        cache_dir.mkdir()
+        (cache_dir / "contract_cache.json").write_text(
+            json.dumps(
+                {
+                    "symbol:0xABC": "USDC",
+                    "decimals:0xABC": "6",
+                    "1:0xDEF": "PlasmaVault",
+                }
+            ),
+            encoding="utf-8",
+        )
+        (cache_dir / "deployment_cache.json").write_text(
+            json.dumps({"1:0xDEF": {"block": 10, "timestamp": 20}}),
+            encoding="utf-8",
+        )
+
+        store = get_metadata_store()
+
+        assert store.get(NS_SYMBOL, "0xabc") == "USDC"
+        assert store.get(NS_DECIMALS, "0xabc") == "6"
+        assert store.get(NS_CONTRACT_NAME, "1:0xdef") == "PlasmaVault"
+        assert json.loads(store.get(NS_DEPLOYMENT, "1:0xdef")) == {
+            "block": 10,
+            "timestamp": 20,
+        }
+
+        store.put(NS_SYMBOL, "0xabc", "USDC.e")
+        store.close()
+        metadata_store._store = None
+        # Already migrated: the JSON file does not overwrite newer entries.
+        assert get_metadata_store().get(NS_SYMBOL, "0xabc") == "USDC.e"
+
+    def test_corrupt_legacy_file_is_ignored(self, tmp_path):
+        cache_dir = tmp_path / ".cache"
+        cache_dir.mkdir()
+        (cache_dir / "contract_cache.json").write_text("{oops", encoding="utf-8")
+
+        assert get_metadata_store().items(NS_SYMBOL) == {}
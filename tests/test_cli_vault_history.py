@@ -0,0 +1,153 @@
+"""Tests for the `vault history` CLI command and its row writers."""
+
+import io
+from unittest.mock import MagicMock, patch
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from ipor_fusion.cli import config_store
+from ipor_fusion.cli.config_store import FusionConfig, save_config
+from ipor_fusion.cli.main import cli
+from ipor_fusion.cli.vault_history import DURATION, TIMESTAMP, write_csv
+from ipor_fusion.readers.vault_history import VaultHistoryRow
+
+VAULT = "0x2222222222222222222222222222222222222222"
+
+
+@pytest.fixture
+def tmp_config(tmp_path, monkeypatch):
+    config_dir = tmp_path / ".fusion"
+    monkeypatch.setattr(config_store, "CONFIG_DIR", config_dir)
+    monkeypatch.setattr(config_store, "CONFIG_FILE", config_dir / "config.json")
+    save_config(FusionConfig(providers={"1": "https://rpc.example.com"}))
+
+
+def _row(block: int, total_assets: int | None = 100) -> VaultHistoryRow:
+    return VaultHistoryRow(
+        block_number=block,
+        timestamp=1_700_000_000 + block,
+        total_assets=total_assets,
+        total_supply=90,
+        share_price=1_111_111,
+        unrealized_management_fee=0,
+        market_assets={3: 60, 7: None},
+    )
+
+
+class TestParamTypes:
+    def test_timestamp_accepts_unix_and_iso(self):
+        assert TIMESTAMP.convert("1700000000", None, None) == 1_700_000_000
+        assert TIMESTAMP.convert("2024-01-01", None, None) == 1_704_067_200
+        assert TIMESTAMP.convert("2024-01-01T01:00:00Z", None, None) == 1_704_070_800
+
+    def test_duration_units(self):
+        assert DURATION.convert("90", None, None) == 90
+        assert DURATION.convert("6h", None, None) == 6 * 3600
+        assert DURATION.convert("1d", None, None) == 86_400
+
+    @pytest.mark.parametrize("value", ["0", "1y", "h"])
+    def test_bad_duration(self, value):
+        with pytest.raises(click.BadParameter):
+            DURATION.convert(value, None, None)
+
+
+class TestWriteCsv:
+    def test_header_and_rows(self):
+        stream = io.StringIO()
+
+        count = write_csv([_row(10), _row(20, total_assets=None)], [3, 7], stream)
+
+        assert count == 2
+        assert stream.getvalue().splitlines() == [
+            "block_number,timestamp,total_assets,total_supply,share_price,"
+            "unrealized_management_fee,market_3_assets,market_7_assets",
+            "10,1700000010,100,90,1111111,0,60,",
+            "20,1700000020,,90,1111111,0,60,",
+        ]
+
+
+@patch("ipor_fusion.cli.vault_cmd.fetch_vault_history")
+@patch("ipor_fusion.cli.vault_cmd.PlasmaVault")
+@patch("ipor_fusion.cli.vault_cmd.resolve_access_manager")
+@patch("ipor_fusion.cli.vault_cmd.Web3Context")
+class TestHistoryCommand:
+    def test_block_range_to_csv(
+        self, mock_ctx_cls, _resolve, mock_vault, mock_fetch, tmp_config
+    ):
+        ctx = MagicMock()
+        ctx.web3.eth.block_number = 130
+        mock_ctx_cls.from_url.return_value = ctx
+        mock_vault.return_value.get_balance_fuses.return_value = [
+            MagicMock(market_id=7),
+            MagicMock(market_id=3),
+        ]
+        mock_fetch.return_value = iter([_row(100), _row(130)])
+
+        result = CliRunner().invoke(
+            cli,
+            ["vault", "history", VAULT, "--chain-id", "1"]
+            + ["--from-block", "100", "--step", "20"],
+        )
+
+        assert result.exit_code == 0, result.output
+        _ctx, _vault, blocks, market_ids, concurrency = mock_fetch.call_args.args
+        assert blocks == [100, 120, 130]
+        assert market_ids == [3, 7]
+        assert concurrency == 4
+        assert result.output.splitlines()[1] == "100,1700000100,100,90,1111111,0,60,"
+
+    @patch("ipor_fusion.cli.vault_cmd.timestamp_grid", return_value=[5, 9])
+    def test_time_range(
+        self, mock_grid, mock_ctx_cls, _resolve, mock_vault, mock_fetch, tmp_config
+    ):
+        mock_ctx_cls.from_url.return_value = MagicMock()
+        mock_vault.return_value.get_balance_fuses.return_value = []
+        mock_fetch.return_value = iter([])
+
+        result = CliRunner().invoke(
+            cli,
+            ["vault", "history", VAULT, "--chain-id", "1"]
+            + ["--from-time", "2024-01-01", "--to-time", "2024-01-02"]
+            + ["--every", "6h"],
+        )
+
+        assert result.exit_code == 0, result.output
+        _ctx, start, end, interval = mock_grid.call_args.args
+        assert (start, end, interval) == (1_704_067_200, 1_704_153_600, 21_600)
+        assert mock_fetch.call_args.args[2] == [5, 9]
+
+    @pytest.mark.parametrize(
+        "args",
+        [
+            ["--from-block", "1"],
+            ["--from-block", "1", "--step", "2", "--every", "1h"],
+            ["--from-time", "1700000000", "--every", "1h", "--to-block", "9"],
+            [],
+        ],
+    )
+    def test_rejects_mixed_or_incomplete_grids(
+        self, mock_ctx_cls, _resolve, _vault, mock_fetch, tmp_config, args
+    ):
+        mock_ctx_cls.from_url.return_value = MagicMock()
+
+        result = CliRunner().invoke(
+            cli, ["vault", "history", VAULT, "--chain-id", "1", *args]
+        )
+
+        assert result.exit_code == 2
+        assert "Sample by block" in result.output
+        mock_fetch.assert_not_called()
+
+    def test_parquet_needs_a_file(
+        self, _ctx_cls, _resolve, _vault, mock_fetch, tmp_config
+    ):
+        result = CliRunner().invoke(
+            cli,
+            ["vault", "history", VAULT, "--chain-id", "1"]
+            + ["--from-block", "1", "--step", "1", "--format", "parquet"],
+        )
+
+        assert result.exit_code == 2
+        assert "needs a file" in result.output
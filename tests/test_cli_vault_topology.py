@@ -0,0 +1,134 @@
+from unittest.mock import MagicMock
+
+import pytest
+from web3 import Web3
+from web3.exceptions import Web3RPCError
+
+from ipor_fusion.cli import config_store
+from ipor_fusion.cli.vault_fetcher import _topology_from_snapshot
+from ipor_fusion.cli.vault_topology import (
+    CONFIG_TOPICS,
+    VaultTopology,
+    config_changed,
+    load_topology,
+    load_warm_topology,
+    save_topology,
+)
+from ipor_fusion.core.planner import QueryPlan
+from ipor_fusion.core.plasma_vault import BalanceFuse
+from ipor_fusion.types import MarketId
+
+VAULT = Web3.to_checksum_address("0x" + "11" * 20)
+FUSE = Web3.to_checksum_address("0x" + "22" * 20)
+
+
+@pytest.fixture(autouse=True)
+def _patch_paths(tmp_path, monkeypatch):
+    cache_dir = tmp_path / ".cache"
+    monkeypatch.setattr(config_store, "CACHE_DIR", cache_dir)
+    monkeypatch.setattr(config_store, "CACHE_FILE", cache_dir / "contract_cache.json")
+    monkeypatch.setattr(
+        config_store, "DEPLOYMENT_CACHE_FILE", cache_dir / "deployment_cache.json"
+    )
+
+
+def _topology(block: int = 100) -> VaultTopology:
+    return VaultTopology(
+        block_number=block,
+        asset=Web3.to_checksum_address("0x" + "aa" * 20),
+        access_manager=Web3.to_checksum_address("0x" + "bb" * 20),
+        price_oracle_addr=Web3.to_checksum_address("0x" + "cc" * 20),
+        rewards_manager=None,
+        withdraw_manager=Web3.to_checksum_address("0x" + "dd" * 20),
+        fuses=[FUSE],
+        balance_fuses=[BalanceFuse(market_id=MarketId(14), fuse=FUSE)],
+        instant_fuses=[FUSE],
+        dependency_graph={14: [1]},
+        fuse_markets={FUSE: 14},
+        market_substrates={14: [b"\x01" * 32]},
+    )
+
+
+def _ctx(logs=None, error=None) -> MagicMock:
+    ctx = MagicMock()
+    ctx.get_logs.return_value = logs or []
+    if error is not None:
+        ctx.get_logs.side_effect = error
+    return ctx
+
+
+class TestVaultTopology:
+    def test_json_roundtrip(self):
+        topology = _topology()
+        assert VaultTopology.from_json(topology.to_json()) == topology
+
+    def test_unreadable_snapshot_is_ignored(self):
+        assert VaultTopology.from_json('{"block_number": 1}') is None
+        assert VaultTopology.from_json("not json") is None
+
+    def test_store_roundtrip(self):
+        save_topology(8453, VAULT, _topology())
+        assert load_topology(8453, VAULT) == _topology()
+        assert load_topology(1, VAULT) is None
+
+
+class TestConfigChanged:
+    def test_queries_every_config_topic_in_one_call(self):
+        ctx = _ctx()
+
+        assert config_changed(ctx, VAULT, 100, 150) is False
+        ctx.get_logs.assert_called_once_with(
+            contract_address=VAULT,
+            topics=[CONFIG_TOPICS],
+            from_block=101,
+            to_block=150,
+        )
+
+    def test_older_target_block_scans_backwards_range(self):
+        ctx = _ctx(logs=[{"blockNumber": 90}])
+
+        assert config_changed(ctx, VAULT, 100, 80) is True
+        assert ctx.get_logs.call_args.kwargs["from_block"] == 81
+        assert ctx.get_logs.call_args.kwargs["to_block"] == 100
+
+    def test_same_block_needs_no_request(self):
+        ctx = _ctx()
+        assert config_changed(ctx, VAULT, 100, 100) is False
+        ctx.get_logs.assert_not_called()
+
+
+class TestLoadWarmTopology:
+    def test_no_snapshot(self):
+        assert load_warm_topology(_ctx(), VAULT, 8453, 200) is None
+
+    def test_unchanged_snapshot_is_restamped(self):
+        save_topology(8453, VAULT, _topology(100))
+
+        warm = load_warm_topology(_ctx(), VAULT, 8453, 200)
+
+        assert warm is not None
+        assert warm.block_number == 200
+        assert load_topology(8453, VAULT).block_number == 200
+
+    def test_config_event_invalidates(self):
+        save_topology(8453, VAULT, _topology(100))
+        ctx = _ctx(logs=[{"blockNumber": 150}])
+
+        assert load_warm_topology(ctx, VAULT, 8453, 200) is None
+
+    def test_failed_log_query_falls_back_to_full_read(self):
+        save_topology(8453, VAULT, _topology(100))
+        ctx = _ctx(error=Web3RPCError("block range too large"))
+
+        assert load_warm_topology(ctx, VAULT, 8453, 200) is None
+
+
+class TestTopologyNodes:
+    def test_snapshot_nodes_cost_no_round(self):
+        plan = QueryPlan(MagicMock())
+        nodes = _topology_from_snapshot(plan, _topology())
+
+        plan.execute()
+
+        assert plan.rounds == 0
+        assert nodes.snapshot(100) == _topology(100)
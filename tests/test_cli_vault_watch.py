@@ -0,0 +1,176 @@
+from unittest.mock import MagicMock, PropertyMock, patch
+
+import click
+from eth_abi import encode
+from web3 import Web3
+from web3.exceptions import Web3RPCError
+
+from ipor_fusion.cli.vault_topology import VaultTopology
+from ipor_fusion.cli.vault_watch import (
+    VaultWatcher,
+    capture_lines,
+    diff_json,
+    diff_lines,
+    poll_new_blocks,
+)
+
+VAULT = Web3.to_checksum_address("0x" + "11" * 20)
+MANAGER = Web3.to_checksum_address("0x" + "22" * 20)
+ALICE = Web3.to_checksum_address("0x" + "aa" * 20)
+BOB = Web3.to_checksum_address("0x" + "bb" * 20)
+
+
+def _request_log(block: int, account: str, shares: int, end: int) -> dict:
+    return {
+        "blockNumber": block,
+        "logIndex": 0,
+        "data": encode(["address", "uint256", "uint32"], [account, shares, end]),
+    }
+
+
+def _topology(block: int) -> VaultTopology:
+    return VaultTopology(
+        block_number=block,
+        asset=VAULT,
+        access_manager=VAULT,
+        price_oracle_addr=VAULT,
+        rewards_manager=None,
+        withdraw_manager=None,
+        fuses=[],
+        balance_fuses=[],
+        instant_fuses=[],
+        dependency_graph={},
+        fuse_markets={},
+        market_substrates={},
+    )
+
+
+class TestPollNewBlocks:
+    def test_yields_each_new_head_once(self):
+        ctx = MagicMock()
+        type(ctx.web3.eth).block_number = PropertyMock(side_effect=[100, 100, 103, 104])
+        sleeps: list[float] = []
+
+        blocks = poll_new_blocks(ctx, interval=2.0, sleep=sleeps.append)
+
+        assert [next(blocks), next(blocks), next(blocks)] == [100, 103, 104]
+        assert sleeps == [2.0]
+
+    def test_failed_poll_is_retried(self):
+        ctx = MagicMock()
+        type(ctx.web3.eth).block_number = PropertyMock(
+            side_effect=[Web3RPCError("rate limited"), 7]
+        )
+        sleeps: list[float] = []
+
+        assert next(poll_new_blocks(ctx, after=5, sleep=sleeps.append)) == 7
+        assert len(sleeps) == 1
+
+
+class TestVaultWatcher:
+    @staticmethod
+    def _fetched(block: int) -> MagicMock:
+        data = MagicMock()
+        data.topology = _topology(block)
+        return data
+
+    @patch("ipor_fusion.cli.vault_watch.config_changed", return_value=False)
+    @patch("ipor_fusion.cli.vault_watch._fetch_vault_data")
+    def test_topology_is_reused_until_config_changes(self, mock_fetch, mock_changed):
+        mock_fetch.side_effect = lambda *a, **kw: self._fetched(a[2])
+        ctx = MagicMock()
+        watcher = VaultWatcher(ctx, MagicMock(address=VAULT), 1)
+
+        watcher.fetch(100)
+        watcher.fetch(101)
+        mock_changed.return_value = True
+        watcher.fetch(102)
+
+        topologies = [c.kwargs["topology"] for c in mock_fetch.call_args_list]
+        assert topologies[0] is None
+        assert topologies[1].block_number == 100
+        assert topologies[2] is None
+        mock_changed.assert_called_with(ctx, VAULT, 101, 102)
+        assert ctx.default_block == 102
+
+    @patch("ipor_fusion.cli.vault_watch.config_changed", return_value=False)
+    @patch("ipor_fusion.cli.vault_watch._fetch_vault_data")
+    def test_previous_fetch_is_handed_on(self, mock_fetch, _changed):
+        fetched = [self._fetched(100), self._fetched(101)]
+        mock_fetch.side_effect = fetched
+        watcher = VaultWatcher(MagicMock(), MagicMock(address=VAULT), 1)
+
+        watcher.fetch(100)
+        watcher.fetch(101)
+
+        # Its static sections stand in for a re-read while the topology holds
+        assert [c.kwargs["previous"] for c in mock_fetch.call_args_list] == [
+            None,
+            fetched[0],
+        ]
+
+    @patch(
+        "ipor_fusion.cli.vault_watch.config_changed",
+        side_effect=Web3RPCError("range too large"),
+    )
+    @patch("ipor_fusion.cli.vault_watch._fetch_vault_data")
+    def test_unverifiable_topology_is_reread(self, mock_fetch, _mock_changed):
+        mock_fetch.side_effect = lambda *a, **kw: self._fetched(a[2])
+        watcher = VaultWatcher(MagicMock(), MagicMock(address=VAULT), 1)
+
+        watcher.fetch(100)
+        watcher.fetch(101)
+
+        assert mock_fetch.call_args.kwargs["topology"] is None
+
+    @patch("ipor_fusion.cli.vault_watch.config_changed", return_value=False)
+    @patch("ipor_fusion.cli.vault_watch._fetch_vault_data")
+    def test_withdraw_requests_are_read_incrementally(self, mock_fetch, _changed):
+        accounts: list[list[str]] = []
+
+        def fetch(ctx, vault, block, **kw):
+            source = kw["withdraw_requests"](MANAGER)
+            accounts.append(source.withdraw_request_accounts(1_000))
+            return self._fetched(block)
+
+        mock_fetch.side_effect = fetch
+        ctx = MagicMock()
+        ctx.get_logs.side_effect = [
+            [_request_log(50, ALICE, 5, 2_000), _request_log(60, BOB, 7, 900)],
+            [_request_log(101, ALICE, 0, 2_000), _request_log(101, BOB, 3, 3_000)],
+        ]
+        watcher = VaultWatcher(ctx, MagicMock(address=VAULT), 1)
+
+        watcher.fetch(100)
+        watcher.fetch(101)
+
+        ranges = [
+            (c.kwargs["from_block"], c.kwargs["to_block"])
+            for c in ctx.get_logs.call_args_list
+        ]
+        assert ranges == [(0, 100), (101, 101)]
+        # Bob's first request had expired; Alice cancelled hers.
+        assert accounts == [[ALICE], [BOB]]
+
+
+class TestDiffs:
+    def test_diff_lines_keeps_only_changes(self):
+        before = ["Total Assets: 1", "Share Price: 1.0", "Status: OK"]
+        after = ["Total Assets: 2", "Share Price: 1.0", "Status: OK"]
+
+        assert diff_lines(before, after) == ["-Total Assets: 1", "+Total Assets: 2"]
+        assert diff_lines(before, before) == []
+
+    def test_diff_json_reports_changed_leaves_by_path(self):
+        before = {"total_assets": {"raw": 1, "formatted": "1"}, "share_price": None}
+        after = {"total_assets": {"raw": 2, "formatted": "1"}, "share_price": None}
+
+        assert diff_json(before, after) == {"total_assets.raw": 2}
+        assert diff_json({"lh": {"a": 1}}, {"lh": None}) == {"lh": None}
+
+    def test_capture_lines(self):
+        def render():
+            click.echo("one")
+            click.secho("two", fg="red")
+
+        assert capture_lines(render) == ["one", "two"]
@@ -0,0 +1,264 @@
+"""Unit tests for the immutable-facts cache — no network."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from _multicall import MulticallChain
+from eth_abi import decode, encode
+from eth_utils import function_signature_to_4byte_selector
+from web3 import Web3
+from web3.exceptions import ContractLogicError
+
+from ipor_fusion.core.contract import Call
+from ipor_fusion.core.facts import ImmutableFacts
+from ipor_fusion.core.multicall import call_all
+
+TOKEN = Web3.to_checksum_address("0x1111111111111111111111111111111111111111")
+FUSE = Web3.to_checksum_address("0x2222222222222222222222222222222222222222")
+
+_DECIMALS = function_signature_to_4byte_selector("decimals()")
+_MARKET_ID = function_signature_to_4byte_selector("MARKET_ID()")
+_TOTAL_SUPPLY = function_signature_to_4byte_selector("totalSupply()")
+_VAULT = function_signature_to_4byte_selector("vault()")
+
+
+class DictBackend:
+    def __init__(self):
+        self.data: dict[tuple[str, str], str] = {}
+
+    def get(self, namespace, key):
+        return self.data.get((namespace, key))
+
+    def put(self, namespace, key, value):
+        self.data[(namespace, key)] = value
+
+
+class FakeChain(MulticallChain):
+    """Context stand-in: answers reads from a table, unpacks ``aggregate3``
+    and serves ``eth_getCode``."""
+
+    chain_id = 1
+
+    def __init__(self, facts: ImmutableFacts):
+        super().__init__()
+        self.facts = facts
+        self.table = {
+            (TOKEN, _DECIMALS): encode(["uint8"], [6]),
+            (TOKEN, _TOTAL_SUPPLY): encode(["uint256"], [1000]),
+            (FUSE, _MARKET_ID): encode(["uint256"], [14]),
+        }
+        self.code = {TOKEN: b"\x60\x80", FUSE: b"\x60\x81"}
+        # (to, data) -> revert data
+        self.reverts: dict[tuple[str, bytes], bytes] = {}
+        self.web3 = MagicMock()
+        self.web3.eth.get_code.side_effect = lambda address: self.code.get(address, b"")
+
+    def result(self, to, data):
+        if (to, data) in self.reverts:
+            return False, self.reverts[(to, data)]
+        return True, self.table.get((to, data), b"")
+
+
+def _call(chain, to, selector, output, immutable=True, cache_revert=False) -> Call:
+    return Call(
+        to=to,
+        data=selector,
+        output_types=[output],
+        ctx=chain,
+        immutable=immutable,
+        cache_revert=cache_revert,
+    )
+
+
+def _probe(chain, to, selector, output) -> Call:
+    return _call(chain, to, selector, output, cache_revert=True)
+
+
+class TestCallCaching:
+    def test_immutable_read_is_served_from_cache(self):
+        chain = FakeChain(ImmutableFacts())
+
+        assert _call(chain, TOKEN, _DECIMALS, "uint8").call() == 6
+        assert _call(chain, TOKEN, _DECIMALS, "uint8").call() == 6
+
+        assert chain.requests == [(TOKEN, _DECIMALS)]
+
+    def test_mutable_read_always_hits_the_node(self):
+        chain = FakeChain(ImmutableFacts())
+        call = _call(chain, TOKEN, _TOTAL_SUPPLY, "uint256", immutable=False)
+
+        call.call()
+        call.call()
+
+        assert len(chain.requests) == 2
+        chain.web3.eth.get_code.assert_not_called()
+
+    def test_contract_without_code_is_not_cached(self):
+        chain = FakeChain(ImmutableFacts())
+        del chain.code[TOKEN]
+
+        _call(chain, TOKEN, _DECIMALS, "uint8").call()
+        _call(chain, TOKEN, _DECIMALS, "uint8").call()
+
+        assert len(chain.requests) == 2
+
+    def test_context_without_facts_reads_directly(self):
+        ctx = MagicMock()
+        ctx.call.return_value = encode(["uint8"], [18])
+
+        assert _call(ctx, TOKEN, _DECIMALS, "uint8").call() == 18
+        assert ImmutableFacts.for_context(ctx) is None
+
+
+class TestPersistence:
+    def test_backend_survives_new_process_without_rpc(self):
+        backend = DictBackend()
+        _call(FakeChain(ImmutableFacts(backend)), TOKEN, _DECIMALS, "uint8").call()
+
+        chain = FakeChain(ImmutableFacts(backend))
+        assert _call(chain, TOKEN, _DECIMALS, "uint8").call() == 6
+
+        assert chain.requests == []
+        chain.web3.eth.get_code.assert_not_called()
+
+    def test_code_hash_change_invalidates_after_revalidation(self):
+        backend = DictBackend()
+        now = [1000.0]
+        _call(
+            FakeChain(ImmutableFacts(backend, clock=lambda: now[0])),
+            TOKEN,
+            _DECIMALS,
+            "uint8",
+        ).call()
+
+        now[0] += ImmutableFacts.REVALIDATE_S
+        chain = FakeChain(ImmutableFacts(backend, clock=lambda: now[0]))
+        chain.code[TOKEN] = b"\x60\x80\x00"
+        chain.table[(TOKEN, _DECIMALS)] = encode(["uint8"], [18])
+
+        assert _call(chain, TOKEN, _DECIMALS, "uint8").call() == 18
+        assert chain.requests == [(TOKEN, _DECIMALS)]
+
+    def test_unchanged_code_keeps_entry_after_revalidation(self):
+        backend = DictBackend()
+        now = [1000.0]
+        _call(
+            FakeChain(ImmutableFacts(backend, clock=lambda: now[0])),
+            TOKEN,
+            _DECIMALS,
+            "uint8",
+        ).call()
+
+        now[0] += ImmutableFacts.REVALIDATE_S
+        chain = FakeChain(ImmutableFacts(backend, clock=lambda: now[0]))
+
+        assert _call(chain, TOKEN, _DECIMALS, "uint8").call() == 6
+        assert chain.requests == []
+        chain.web3.eth.get_code.assert_called_once_with(TOKEN)
+
+
+class TestCallAll:
+    def test_cached_calls_are_left_out_of_the_batch(self):
+        chain = FakeChain(ImmutableFacts())
+        calls = [
+            _call(chain, TOKEN, _DECIMALS, "uint8"),
+            _call(chain, FUSE, _MARKET_ID, "uint256"),
+            _call(chain, TOKEN, _TOTAL_SUPPLY, "uint256", immutable=False),
+        ]
+        assert call_all(chain, calls) == [6, 14, 1000]
+
+        chain.requests.clear()
+        chain.table[(TOKEN, _TOTAL_SUPPLY)] = encode(["uint256"], [2000])
+        assert call_all(chain, calls) == [6, 14, 2000]
+
+        ((to, data),) = chain.requests
+        (batched,) = decode(["(address,bool,bytes)[]"], data[4:])
+        assert [payload for _, _, payload in batched] == [_TOTAL_SUPPLY]
+
+    def test_fully_cached_batch_sends_nothing(self):
+        chain = FakeChain(ImmutableFacts())
+        calls = [
+            _call(chain, TOKEN, _DECIMALS, "uint8"),
+            _call(chain, FUSE, _MARKET_ID, "uint256"),
+        ]
+        call_all(chain, calls)
+        chain.requests.clear()
+
+        assert call_all(chain, calls) == [6, 14]
+        assert chain.requests == []
+
+
+class TestRevertCaching:
+    def test_missing_getter_revert_is_served_from_cache(self):
+        chain = FakeChain(ImmutableFacts())
+        chain.reverts[(TOKEN, _VAULT)] = b""
+
+        for _ in range(2):
+            with pytest.raises(ContractLogicError):
+                _probe(chain, TOKEN, _VAULT, "address").call()
+
+        assert chain.requests == [(TOKEN, _VAULT)]
+
+    def test_revert_is_not_cached_without_opt_in(self):
+        chain = FakeChain(ImmutableFacts())
+        chain.reverts[(TOKEN, _DECIMALS)] = b""
+
+        for _ in range(2):
+            with pytest.raises(ContractLogicError):
+                _call(chain, TOKEN, _DECIMALS, "uint8").call()
+        call_all(chain, [_call(chain, TOKEN, _DECIMALS, "uint8")])
+
+        assert len(chain.requests) == 3
+
+    def test_cached_revert_answers_only_calls_that_opt_in(self):
+        chain = FakeChain(ImmutableFacts())
+        chain.reverts[(TOKEN, _VAULT)] = b""
+        with pytest.raises(ContractLogicError):
+            _probe(chain, TOKEN, _VAULT, "address").call()
+        del chain.reverts[(TOKEN, _VAULT)]
+        chain.table[(TOKEN, _VAULT)] = encode(["address"], [FUSE])
+
+        assert _call(chain, TOKEN, _VAULT, "address").call() == FUSE.lower()
+
+    def test_revert_with_reason_is_not_cached(self):
+        chain = FakeChain(ImmutableFacts())
+        chain.reverts[(TOKEN, _VAULT)] = b"\x08\xc3\x79\xa0"
+
+        for _ in range(2):
+            with pytest.raises(ContractLogicError):
+                _probe(chain, TOKEN, _VAULT, "address").call()
+
+        assert len(chain.requests) == 2
+
+    def test_cached_revert_expires(self):
+        now = [1_000.0]
+        backend = DictBackend()
+        chain = FakeChain(ImmutableFacts(backend, clock=lambda: now[0]))
+        chain.reverts[(TOKEN, _VAULT)] = b""
+        with pytest.raises(ContractLogicError):
+            _probe(chain, TOKEN, _VAULT, "address").call()
+
+        now[0] += ImmutableFacts.REVERT_TTL_S
+        chain = FakeChain(ImmutableFacts(backend, clock=lambda: now[0]))
+        chain.reverts[(TOKEN, _VAULT)] = b""
+        with pytest.raises(ContractLogicError):
+            _probe(chain, TOKEN, _VAULT, "address").call()
+
+        assert chain.requests == [(TOKEN, _VAULT)]
+
+    def test_call_all_remembers_and_replays_reverts(self):
+        backend = DictBackend()
+        chain = FakeChain(ImmutableFacts(backend))
+        chain.reverts[(TOKEN, _VAULT)] = b""
+        calls = [
+            _probe(chain, TOKEN, _VAULT, "address"),
+            _call(chain, TOKEN, _DECIMALS, "uint8"),
+        ]
+        call_all(chain, calls)
+
+        chain = FakeChain(ImmutableFacts(backend))
+        reverted, decimals = call_all(chain, calls)
+
+        assert isinstance(reverted, ContractLogicError)
+        assert decimals == 6
+        assert chain.requests == []
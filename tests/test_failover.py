@@ -0,0 +1,160 @@
+"""Unit tests for the hedging / failover provider — no network required."""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from web3.providers import BaseProvider
+
+from ipor_fusion.core.context import Web3Context
+from ipor_fusion.core.failover import FailoverProvider
+
+TIMEOUT_S = 5
+
+
+class FakeProvider(BaseProvider):
+    """Answers every request with ``answer``; optionally blocks or raises."""
+
+    def __init__(self, uri, answer=None, error=None, head=100):
+        super().__init__()
+        self.endpoint_uri = uri
+        self.answer = answer if answer is not None else {"result": uri}
+        self.error = error
+        self.head = head
+        self.gate: threading.Event | None = None
+        self.methods: list[str] = []
+
+    def make_request(self, method, params):
+        self.methods.append(method)
+        if method == "eth_blockNumber":
+            return {"result": hex(self.head)}
+        if self.gate is not None:
+            self.gate.wait(TIMEOUT_S)
+        if self.error is not None:
+            raise self.error
+        return self.answer
+
+    def is_connected(self, show_traceback=False):
+        return True
+
+
+def _provider(*fakes, **kwargs) -> FailoverProvider:
+    provider = FailoverProvider(fakes, **kwargs)
+    provider._next_probe = float("inf")  # probes only where a test asks
+    return provider
+
+
+class TestFailoverProvider:
+    def test_reads_go_to_the_fastest_endpoint(self):
+        slow, fast = FakeProvider("slow"), FakeProvider("fast")
+        provider = _provider(slow, fast)
+        provider.endpoints[0].record_latency(0.5)
+        provider.endpoints[1].record_latency(0.1)
+
+        assert provider.make_request("eth_call", []) == {"result": "fast"}
+        assert slow.methods == []
+
+    def test_failing_endpoint_is_ejected_and_read_fails_over(self):
+        broken = FakeProvider("broken", error=requests.ConnectionError("down"))
+        backup = FakeProvider("backup")
+        provider = _provider(broken, backup)
+
+        assert provider.make_request("eth_call", []) == {"result": "backup"}
+        assert [e.uri for e in provider.ranked()] == ["backup", "broken"]
+
+    def test_rate_limited_response_fails_over(self):
+        limited = FakeProvider(
+            "limited", answer={"error": {"code": 429, "message": "Too Many Requests"}}
+        )
+        provider = _provider(limited, FakeProvider("backup"))
+
+        assert provider.make_request("eth_getLogs", []) == {"result": "backup"}
+
+    def test_slow_read_is_hedged_to_the_next_endpoint(self):
+        stuck, quick = FakeProvider("stuck"), FakeProvider("quick")
+        stuck.gate = threading.Event()
+        provider = _provider(stuck, quick)
+        provider.DEFAULT_HEDGE_S = 0.01
+
+        try:
+            assert provider.make_request("eth_call", []) == {"result": "quick"}
+        finally:
+            stuck.gate.set()
+        assert stuck.methods == ["eth_call"]
+
+    def test_hedges_fire_while_slow_endpoint_saturates_its_threads(self):
+        stuck, quick = FakeProvider("stuck"), FakeProvider("quick")
+        stuck.gate = threading.Event()
+        provider = _provider(stuck, quick)
+        provider.DEFAULT_HEDGE_S = 0.01
+        answers: list[dict] = []
+
+        def read():
+            answers.append(provider.make_request("eth_call", []))
+
+        # Far more stuck primaries than the slow endpoint has threads
+        readers = [threading.Thread(target=read) for _ in range(24)]
+        try:
+            for thread in readers:
+                thread.start()
+            for thread in readers:
+                thread.join(TIMEOUT_S / 2)
+            assert answers == [{"result": "quick"}] * len(readers)
+        finally:
+            stuck.gate.set()
+
+    def test_all_endpoints_failing_raises_the_last_error(self):
+        provider = _provider(
+            FakeProvider("a", error=requests.ConnectionError("a down")),
+            FakeProvider("b", error=requests.ConnectionError("b down")),
+        )
+        with pytest.raises(requests.ConnectionError, match="b down"):
+            provider.make_request("eth_call", [])
+
+    def test_writes_are_sent_once(self):
+        broken = FakeProvider("broken", error=requests.ConnectionError("down"))
+        backup = FakeProvider("backup")
+        provider = _provider(broken, backup)
+
+        with pytest.raises(requests.ConnectionError):
+            provider.make_request("eth_sendRawTransaction", ["0x00"])
+        assert backup.methods == []
+
+    def test_probe_ejects_lagging_endpoint_and_readmits_it(self):
+        tip, behind = FakeProvider("tip", head=1000), FakeProvider("behind", head=900)
+        provider = _provider(tip, behind)
+
+        provider.probe()
+        assert [e.uri for e in provider.ranked()] == ["tip", "behind"]
+        assert not provider.endpoints[1].healthy(0.0)
+
+        behind.head = 1000
+        provider.probe()
+        assert provider.endpoints[1].healthy(0.0)
+
+    def test_endpoint_uri_joins_all_endpoints(self):
+        provider = _provider(FakeProvider("a"), FakeProvider("b"))
+        assert provider.endpoint_uri == "a,b"
+
+    def test_requires_a_provider(self):
+        with pytest.raises(ValueError):
+            FailoverProvider([])
+
+
+class TestFromUrlMultipleEndpoints:
+    @patch("ipor_fusion.core.context.Web3")
+    def test_several_urls_build_a_failover_provider(self, mock_web3_cls):
+        mock_web3_cls.HTTPProvider.side_effect = lambda url, **_: FakeProvider(url)
+        mock_web3_cls.return_value = MagicMock()
+        mock_web3_cls.return_value.eth.chain_id = 1
+
+        Web3Context.from_url(["http://a", "http://b"])
+
+        (provider,) = mock_web3_cls.call_args.args
+        assert isinstance(provider, FailoverProvider)
+        assert provider.endpoint_uri == "http://a,http://b"
+
+    def test_empty_url_list_rejected(self):
+        with pytest.raises(ValueError):
+            Web3Context.from_url([])
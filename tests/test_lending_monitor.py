@@ -0,0 +1,215 @@
+"""Unit tests for LendingHealthMonitor — a fake multicall answers from a
+dict of chain state."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from web3 import Web3
+from web3.exceptions import Web3RPCError
+
+from ipor_fusion import LendingHealthMonitor
+from ipor_fusion.core.context import Web3Context
+from ipor_fusion.market_ids import IporFusionMarkets
+from ipor_fusion.readers.aave_v3 import AaveV3Reader, AaveV3UserAccountData
+from ipor_fusion.readers.lending_health import (
+    AAVE_V3_POOL,
+    MORPHO_BLUE_ADDRESS,
+    ORACLE_PRICE_SCALE,
+)
+from ipor_fusion.readers.morpho import (
+    MorphoMarket,
+    MorphoMarketParams,
+    MorphoOracle,
+    MorphoPosition,
+    MorphoReader,
+)
+from ipor_fusion.types import MorphoBlueMarketId
+
+VAULT = Web3.to_checksum_address("0x" + "11" * 20)
+OTHER_VAULT = Web3.to_checksum_address("0x" + "22" * 20)
+TOKEN = Web3.to_checksum_address("0x" + "aa" * 20)
+ORACLE = Web3.to_checksum_address("0x" + "dd" * 20)
+MARKET_ID = MorphoBlueMarketId("a" * 64)
+MORPHO, AAVE = IporFusionMarkets.MORPHO, IporFusionMarkets.AAVE_V3
+SUBSTRATES = {MORPHO: [bytes.fromhex(MARKET_ID)]}
+
+
+class _Chain:
+    """Answers `call_all` by calldata, like a node at `block`."""
+
+    def __init__(self):
+        ctx = MagicMock()
+        self.morpho = MorphoReader(ctx, MORPHO_BLUE_ADDRESS)
+        self.aave = AaveV3Reader(ctx, AAVE_V3_POOL[1])
+        self.block = 100
+        self.price = ORACLE_PRICE_SCALE
+        self.positions = {
+            VAULT: MorphoPosition(0, 500, 1_000),
+            OTHER_VAULT: MorphoPosition(0, 100, 1_000),
+        }
+        self.aave_data = AaveV3UserAccountData(
+            10_000 * 10**8, 5_000 * 10**8, 0, 8_000, 7_500, 16 * 10**17
+        )
+        self.batches: list[int] = []
+        self.read_at: list[object] = []
+
+    def _answers(self):
+        answers = {
+            self.morpho.market_params(MARKET_ID).data: MorphoMarketParams(
+                TOKEN, TOKEN, ORACLE, TOKEN, 86 * 10**16
+            ),
+            self.morpho.market(MARKET_ID).data: MorphoMarket(
+                2_000, 2_000, 1_000, 1_000, 0, 0
+            ),
+            MorphoOracle(MagicMock(), ORACLE).price().data: self.price,
+            self.aave.get_user_account_data(OTHER_VAULT).data: self.aave_data,
+            bytes.fromhex("42cbb15c"): self.block,  # getBlockNumber()
+        }
+        for vault, position in self.positions.items():
+            answers[self.morpho.position(MARKET_ID, vault).data] = position
+        return answers
+
+    def __call__(self, ctx, calls):
+        self.batches.append(len(calls))
+        self.read_at.append(ctx.default_block)
+        answers = self._answers()
+        return [answers[call.data] for call in calls]
+
+
+@pytest.fixture
+def chain():
+    chain = _Chain()
+    with patch("ipor_fusion.readers.lending_monitor.call_all", chain):
+        yield chain
+
+
+def _monitor(ctx=None, **kwargs):
+    monitor = LendingHealthMonitor(ctx or MagicMock(), 1, **kwargs)
+    monitor.track(VAULT, [MORPHO], SUBSTRATES)
+    monitor.track(OTHER_VAULT, [MORPHO, AAVE], SUBSTRATES)
+    return monitor
+
+
+class TestLendingHealthMonitor:
+    def test_one_batch_for_all_vaults(self, chain):
+        monitor = _monitor()
+
+        assert monitor.refresh() == []
+
+        # params once, then block + 2 positions + market + price + Aave
+        assert chain.batches == [1, 6]
+        assert monitor.vaults == [VAULT, OTHER_VAULT]
+        (morpho,) = monitor.health(VAULT).markets
+        assert morpho.health_factor == pytest.approx(1.72)
+        assert [m.protocol for m in monitor.health(OTHER_VAULT).markets] == [
+            "morpho",
+            "aave_v3",
+        ]
+        assert monitor.history(VAULT)[0].block_number == 100
+
+    def test_refresh_at_block_leaves_context_unpinned(self, chain):
+        ctx = Web3Context(web3=MagicMock(), chain_id=1)
+        monitor = _monitor(ctx)
+
+        monitor.refresh(105)
+        monitor.refresh()
+
+        assert chain.read_at == [105, 105, "latest"]
+        assert ctx.default_block == "latest"
+
+    def test_unchanged_inputs_are_not_recomputed(self, chain):
+        monitor = _monitor()
+        monitor.refresh()
+        first = monitor.health(VAULT).markets[0]
+        chain.block = 101
+
+        with patch(
+            "ipor_fusion.readers.lending_monitor._morpho_market_health"
+        ) as compute:
+            monitor.refresh()
+
+        compute.assert_not_called()
+        assert chain.batches == [1, 6, 6]
+        sample = monitor.history(VAULT)[-1]
+        assert sample.block_number == 101
+        assert not sample.changed
+        assert sample.health.markets[0] is first
+
+    def test_alerts_when_warning_flips(self, chain):
+        monitor = _monitor()
+        received = []
+        monitor.on_alert(received.append)
+        monitor.refresh()
+
+        # 1000 * 0.6 * 0.86 / 500 = 1.032: critical for the first vault only
+        chain.price = 6 * ORACLE_PRICE_SCALE // 10
+        (alert,) = monitor.refresh()
+        chain.price = ORACLE_PRICE_SCALE
+        (recovery,) = monitor.refresh()
+
+        assert received == [alert, recovery]
+        assert alert.vault_address == VAULT
+        assert alert.previous is not None and not alert.previous.is_warning
+        assert alert.is_warning and alert.is_critical
+        assert not recovery.is_warning
+        assert monitor.history(VAULT)[-2].changed
+
+    def test_failed_read_keeps_last_health(self, chain):
+        monitor = _monitor()
+        monitor.refresh()
+        chain.positions[VAULT] = ValueError("reverted")
+
+        assert monitor.refresh() == []
+
+        assert monitor.health(VAULT).markets[0].health_factor == pytest.approx(1.72)
+
+    def test_history_is_bounded(self, chain):
+        monitor = _monitor(history_size=2)
+
+        for block in (100, 101, 102):
+            chain.block = block
+            monitor.refresh()
+
+        assert [s.block_number for s in monitor.history(VAULT)] == [101, 102]
+
+    def test_failing_callback_does_not_stop_others(self, chain):
+        monitor = _monitor()
+        received = []
+        monitor.on_alert(MagicMock(side_effect=RuntimeError("boom")))
+        monitor.on_alert(received.append)
+        monitor.refresh()
+        chain.price = ORACLE_PRICE_SCALE // 2
+
+        monitor.refresh()
+
+        assert len(received) == 1
+
+    def test_run_outlives_failed_refresh(self, chain):
+        monitor = _monitor()
+        with patch.object(
+            monitor, "refresh", side_effect=[Web3RPCError("down"), []]
+        ) as refresh:
+            monitor.run([100, 101])
+
+        assert refresh.call_count == 2
+
+    @pytest.mark.parametrize(
+        "error",
+        [ConnectionResetError("reset"), requests.ReadTimeout("timed out")],
+    )
+    def test_run_outlives_transport_errors(self, chain, error):
+        monitor = _monitor()
+        with patch.object(monitor, "refresh", side_effect=[error, []]) as refresh:
+            monitor.run([100, 101])
+
+        assert refresh.call_count == 2
+
+    def test_untrack(self, chain):
+        monitor = _monitor()
+        monitor.untrack(OTHER_VAULT)
+
+        monitor.refresh()
+
+        assert chain.batches == [1, 4]
+        assert monitor.history(OTHER_VAULT) == []
@@ -0,0 +1,188 @@
+"""Unit tests for the lending stress test — positions built by hand, one
+mocked fetch."""
+
+import math
+from unittest.mock import MagicMock, patch
+
+import pytest
+from web3 import Web3
+
+from ipor_fusion import StressPosition, fetch_stress_positions, stress_test
+from ipor_fusion.market_ids import IporFusionMarkets
+from ipor_fusion.readers.aave_v3 import AaveV3UserAccountData
+from ipor_fusion.readers.lending_health import ORACLE_PRICE_SCALE
+from ipor_fusion.readers.morpho import (
+    MorphoMarket,
+    MorphoMarketParams,
+    MorphoPosition,
+    MorphoPositionSnapshot,
+)
+from ipor_fusion.types import MorphoBlueMarketId
+
+VAULT = Web3.to_checksum_address("0x" + "11" * 20)
+TOKEN = Web3.to_checksum_address("0x" + "aa" * 20)
+MORPHO_ID = MorphoBlueMarketId("a" * 64)
+IDLE_ID = MorphoBlueMarketId("b" * 64)
+
+
+def _position(collateral_value, debt, threshold=0.8):
+    return StressPosition(
+        vault_address=VAULT,
+        protocol="morpho",
+        market_id=14,
+        market_name="MORPHO",
+        collateral_value=collateral_value,
+        debt=debt,
+        liquidation_threshold=threshold,
+    )
+
+
+class TestStressPosition:
+    def test_liquidation_point(self):
+        # hf = 1000 * 0.8 / 400 = 2: liquidation after a 50% collateral drop
+        position = _position(1000.0, 400.0)
+
+        assert position.health_factor == 2.0
+        assert position.liquidation_shock == -0.5
+
+    def test_without_collateral_or_debt(self):
+        assert _position(0.0, 1.0).liquidation_shock == math.inf
+        assert _position(1.0, 0.0).health_factor == math.inf
+
+
+class TestStressTest:
+    @pytest.fixture(autouse=True)
+    def _numpy(self):
+        pytest.importorskip("numpy")
+
+    def test_default_grid_is_a_thousand_scenarios(self):
+        result = stress_test([_position(1000.0, 400.0), _position(1000.0, 700.0)])
+
+        assert result.health_factors.shape == (1000, 2)
+        assert result.health_factors[0].tolist() == pytest.approx([2.0, 8 / 7])
+
+    def test_health_scales_with_price_ratio(self):
+        result = stress_test(
+            [_position(1000.0, 400.0)], collateral_shocks=[-0.5], loan_shocks=[0.25]
+        )
+
+        # 2 * 0.5 / 1.25
+        assert result.health_factors[0, 0] == pytest.approx(0.8)
+        assert result.ltv_usage_percent[0, 0] == pytest.approx(125.0)
+        assert result.liquidation_distance[0, 0] == pytest.approx(-0.25)
+        assert result.liquidated[0, 0]
+
+    def test_worst_scenarios_rank_by_weakest_position(self):
+        safe, risky = _position(1000.0, 100.0), _position(1000.0, 700.0)
+        result = stress_test(
+            [safe, risky], collateral_shocks=[0.0, -0.1, -0.3], loan_shocks=[0.0]
+        )
+
+        rows = result.worst_scenarios(limit=2)
+
+        assert [row.collateral_shock for row in rows] == [-0.3, -0.1]
+        assert rows[0].worst_position is risky
+        # 1000 * 0.7 * 0.8 / 700
+        assert rows[0].min_health_factor == pytest.approx(0.8)
+        assert rows[0].liquidated_positions == 1
+        assert rows[1].liquidated_positions == 0
+
+    def test_no_positions(self):
+        result = stress_test([])
+
+        assert result.health_factors.shape == (1000, 0)
+        assert result.worst_scenarios() == []
+
+    def test_rejects_total_loss_shock(self):
+        with pytest.raises(ValueError, match="-100%"):
+            stress_test([_position(1.0, 1.0)], collateral_shocks=[-1.0])
+
+
+class TestFetchStressPositions:
+    @staticmethod
+    def _snapshot(
+        market_id,
+        borrow_shares,
+        oracle_price=2 * ORACLE_PRICE_SCALE,
+        collateral=1_000,
+        lltv=8 * 10**17,
+    ):
+        return MorphoPositionSnapshot(
+            market_id=market_id,
+            position=MorphoPosition(0, borrow_shares, collateral),
+            market=MorphoMarket(2_000, 2_000, 1_000, 1_000, 0, 0),
+            params=MorphoMarketParams(TOKEN, TOKEN, TOKEN, TOKEN, lltv),
+            oracle_price=oracle_price,
+        )
+
+    @patch("ipor_fusion.readers.lending_stress.AaveV3Reader")
+    @patch("ipor_fusion.readers.lending_stress.MorphoReader")
+    def test_one_read_per_protocol(self, mock_morpho, mock_aave):
+        mock_morpho.return_value.positions_for.return_value = [
+            self._snapshot(MORPHO_ID, 500),
+            self._snapshot(IDLE_ID, 0),
+        ]
+        mock_aave.return_value.get_user_account_data.return_value.call.return_value = (
+            AaveV3UserAccountData(
+                total_collateral_base=10_000 * 10**8,
+                total_debt_base=5_000 * 10**8,
+                available_borrows_base=0,
+                current_liquidation_threshold=8_000,
+                ltv=7_500,
+                health_factor=16 * 10**17,
+            )
+        )
+        morpho, aave = IporFusionMarkets.MORPHO, IporFusionMarkets.AAVE_V3
+
+        positions = fetch_stress_positions(
+            MagicMock(),
+            VAULT,
+            1,
+            [morpho, aave],
+            {morpho: [bytes.fromhex("aa" * 32), bytes.fromhex("bb" * 32)]},
+        )
+
+        mock_morpho.return_value.positions_for.assert_called_once()
+        assert [p.protocol for p in positions] == ["morpho", "aave_v3"]
+        morpho_position, aave_position = positions
+        # 1000 collateral at price 2, 500 borrowed, LLTV 0.8
+        assert morpho_position.collateral_value == 2_000.0
+        assert morpho_position.debt == 500.0
+        assert morpho_position.health_factor == pytest.approx(3.2)
+        # 500 / (1000 * 0.8), rounded up at 1e36 scale
+        assert morpho_position.liquidation_price == 625 * ORACLE_PRICE_SCALE // 1000
+        assert morpho_position.substrate_id == MORPHO_ID
+        assert aave_position.health_factor == pytest.approx(1.6)
+
+    @patch("ipor_fusion.readers.lending_stress.MorphoReader")
+    def test_liquidation_price_rounds_like_morpho(self, mock_morpho):
+        mock_morpho.return_value.positions_for.return_value = [
+            self._snapshot(MORPHO_ID, 1, collateral=3, lltv=86 * 10**16)
+        ]
+        morpho = IporFusionMarkets.MORPHO
+
+        (position,) = fetch_stress_positions(
+            MagicMock(), VAULT, 1, [morpho], {morpho: [bytes.fromhex("aa" * 32)]}
+        )
+
+        # Morpho floors collateral * price / 1e36, then * lltv / 1e18: a debt
+        # of 1 needs a collateral value of 2, i.e. a price of 2/3 (not the
+        # 1 / (3 * 0.86) a single rounding gives).
+        price = position.liquidation_price
+        assert price == -(-2 * ORACLE_PRICE_SCALE // 3)
+        assert (3 * price // ORACLE_PRICE_SCALE) * 86 * 10**16 // 10**18 == 1
+        below = price - 1
+        assert (3 * below // ORACLE_PRICE_SCALE) * 86 * 10**16 // 10**18 == 0
+
+    @patch("ipor_fusion.readers.lending_stress.MorphoReader")
+    def test_skips_position_without_oracle_price(self, mock_morpho):
+        mock_morpho.return_value.positions_for.return_value = [
+            self._snapshot(MORPHO_ID, 500, oracle_price=None)
+        ]
+        morpho = IporFusionMarkets.MORPHO
+
+        positions = fetch_stress_positions(
+            MagicMock(), VAULT, 1, [morpho], {morpho: [bytes.fromhex("aa" * 32)]}
+        )
+
+        assert positions == []
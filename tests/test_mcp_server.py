@@ -16,6 +16,7 @@ from ipor_fusion import (
     Roles,
     UnsupportedChainError,
 )
+from ipor_fusion.cli.config_store import FusionConfig
 from ipor_fusion.cli.morpho_api import (
     MorphoApiError,
     MorphoApiMarket,
@@ -27,6 +28,8 @@ from ipor_fusion.cli.morpho_api import (
     VaultV2Cap,
     VaultV2Info,
 )
+from ipor_fusion.core.websocket import SyncWebSocketProvider
+from ipor_fusion.mcp import server
 from ipor_fusion.mcp.models import (
     FeesSection,
     OracleNodeModel,
@@ -160,19 +163,15 @@ class TestConfigSetProvider:
         saved_cfg = mock_save.call_args[0][0]
         assert saved_cfg.providers["1"] == "https://rpc.example.com"
 
-    @patch("ipor_fusion.mcp.server.Web3")
+    @patch("ipor_fusion.mcp.server.detect_chain_id", return_value=42161)
     @patch("ipor_fusion.mcp.server.save_config")
     @patch("ipor_fusion.mcp.server.load_config", return_value=_empty_config())
-    def test_auto_detect_chain_id(self, mock_load, mock_save, mock_web3):
-        mock_instance = MagicMock()
-        mock_instance.eth.chain_id = 42161
-        mock_web3.return_value = mock_instance
-        mock_web3.HTTPProvider = MagicMock()
-
+    def test_auto_detect_chain_id(self, mock_load, mock_save, mock_detect):
         result = config_set_provider(url="https://rpc.example.com")
         assert "42161" in result.message
         saved_cfg = mock_save.call_args[0][0]
         assert saved_cfg.providers["42161"] == "https://rpc.example.com"
+        mock_detect.assert_called_once_with("https://rpc.example.com")
 
 
 class TestConfigSetEtherscanKey:
@@ -225,6 +224,40 @@ class TestVaultAdd:
         assert saved_cfg.vaults[0].label == "Updated"
 
 
+class TestBuildCtx:
+    @pytest.fixture(autouse=True)
+    def _fresh_contexts(self):
+        with patch.dict(server._contexts, clear=True):
+            yield
+
+    @patch("ipor_fusion.mcp.server.persistent_facts")
+    @patch("ipor_fusion.mcp.server.Web3Context.from_url")
+    def test_one_context_per_chain_shared_by_calls(self, from_url, _facts):
+        cfg = _config_with_provider()
+
+        head, head_block = server._build_ctx(cfg, 1)
+        pinned, pinned_block = server._build_ctx(cfg, 1, block_number=500)
+
+        from_url.assert_called_once()
+        assert head is from_url.return_value
+        assert head_block is None
+        assert pinned is head.pinned.return_value
+        head.pinned.assert_called_once_with(500)
+        assert pinned_block == 500
+
+    @patch("ipor_fusion.mcp.server.persistent_facts")
+    @patch("ipor_fusion.mcp.server.Web3Context.from_url")
+    def test_reconfigured_provider_closes_old_websocket(self, from_url, _facts):
+        old_ws = MagicMock(spec=SyncWebSocketProvider)
+        old, new = MagicMock(), MagicMock()
+        old.web3.provider = old_ws
+        from_url.side_effect = [old, new]
+
+        assert server._chain_ctx(FusionConfig(providers={"1": "wss://a"}), 1) is old
+        assert server._chain_ctx(FusionConfig(providers={"1": "wss://b"}), 1) is new
+        old_ws.close.assert_called_once()
+
+
 class TestVaultRemove:
     @patch("ipor_fusion.mcp.server.save_config")
     @patch(
@@ -418,9 +451,12 @@ class TestVaultOracleMapping:
 
         result = vault_oracle_mapping(vault_address=VAULT_ADDR)
 
-        # latest resolved to a number, passed to the SDK, and pinned on the ctx
+        # latest resolved to a number, passed to the SDK, and pinned on a ctx
+        # of its own (the server's context stays at the head)
         assert mock_build.call_args.args[2] == 777
-        assert ctx.default_block == 777
+        ctx.pinned.assert_called_once_with(777)
+        assert mock_build.call_args.args[0] is ctx.pinned.return_value
+        assert ctx.default_block == "latest"
         assert result.block_number == 777
         assert result.vault_name == "Reservoir"
         assert result.asset_source == "getConfiguredAssets"
@@ -444,7 +480,7 @@ class TestVaultOracleMapping:
         vault_oracle_mapping(vault_address=VAULT_ADDR, block_number=500)
 
         assert mock_build.call_args.args[2] == 500
-        assert ctx.default_block == 500
+        ctx.pinned.assert_called_once_with(500)
 
     @patch("ipor_fusion.mcp.server._build_ctx")
     @patch(
@@ -0,0 +1,179 @@
+"""Unit tests for the local AdaptiveCurveIRM port and MorphoRateModel."""
+
+import math
+from unittest.mock import MagicMock
+
+import pytest
+from _multicall import aggregate3_result
+from eth_abi import encode
+from web3 import Web3
+
+from ipor_fusion import MorphoMarket, MorphoMarketParams, MorphoRateModel, MorphoReader
+from ipor_fusion.readers import morpho_irm as irm
+from ipor_fusion.types import MorphoBlueMarketId
+
+WAD = irm.WAD
+YEAR = irm.SECONDS_PER_YEAR
+MORPHO = Web3.to_checksum_address("0x" + "bb" * 20)
+USER_TOKEN = Web3.to_checksum_address("0x" + "aa" * 20)
+IRM = Web3.to_checksum_address("0x" + "ee" * 20)
+MARKET_ID = MorphoBlueMarketId("a" * 64)
+OTHER_ID = MorphoBlueMarketId("b" * 64)
+RATE_AT_TARGET = irm.INITIAL_RATE_AT_TARGET
+
+
+class TestFixedPoint:
+    @pytest.mark.parametrize(
+        ("x", "y", "expected"), [(7, 2, 3), (-7, 2, -3), (7, -2, -3), (-7, -2, 3)]
+    )
+    def test_division_truncates_toward_zero(self, x, y, expected):
+        assert irm._div_to_zero(x, y) == expected
+
+    def test_w_exp_exact_at_powers_of_two(self):
+        assert irm.w_exp(0) == WAD
+        assert irm.w_exp(irm.LN_2_INT) == 2 * WAD
+        assert irm.w_exp(-irm.LN_2_INT) == WAD // 2
+
+    @pytest.mark.parametrize("x", [-30.0, -3.0, -0.4, 0.3, 1.0, 7.5, 40.0])
+    def test_w_exp_tracks_exp(self, x):
+        assert irm.w_exp(int(x * WAD)) / WAD == pytest.approx(math.exp(x), rel=5e-3)
+
+    def test_w_exp_bounds(self):
+        assert irm.w_exp(irm.LN_WEI_INT - 1) == 0
+        assert irm.w_exp(irm.WEXP_UPPER_BOUND) == irm.WEXP_UPPER_VALUE
+
+    def test_taylor_compounding_tracks_exp(self):
+        rate = WAD // 10 // YEAR
+        compounded = irm.w_taylor_compounded(rate, YEAR) / WAD
+        assert compounded == pytest.approx(math.expm1(0.1), rel=1e-4)
+
+
+class TestCurve:
+    def test_curve_spans_quarter_to_four_times_rate_at_target(self):
+        rates = irm.rate_curve(
+            RATE_AT_TARGET, [0, irm.TARGET_UTILIZATION, 95 * WAD // 100, WAD]
+        )
+
+        assert rates[0] == RATE_AT_TARGET // 4
+        assert rates[1] == RATE_AT_TARGET
+        assert RATE_AT_TARGET < rates[2] < rates[3]
+        assert rates[3] == 4 * RATE_AT_TARGET
+
+    def test_no_adaptation_at_target(self):
+        rate, end = irm.borrow_rate(irm.TARGET_UTILIZATION, RATE_AT_TARGET, YEAR)
+
+        assert rate == end == RATE_AT_TARGET
+
+    def test_uninitialized_market_starts_at_initial_rate(self):
+        rate, end = irm.borrow_rate(irm.TARGET_UTILIZATION, 0, YEAR)
+
+        assert rate == end == irm.INITIAL_RATE_AT_TARGET
+
+    def test_rate_at_target_adapts_within_bounds(self):
+        _, up = irm.borrow_rate(WAD, RATE_AT_TARGET, 5 * 86_400)
+        _, capped = irm.borrow_rate(WAD, RATE_AT_TARGET, YEAR)
+        _, floored = irm.borrow_rate(0, RATE_AT_TARGET, YEAR)
+
+        # Full utilization: err = 1, so rate at target grows by e^(50 * t / year)
+        expected = RATE_AT_TARGET * math.exp(50 * 5 / 365)
+        assert up == pytest.approx(expected, rel=5e-3)
+        assert capped == irm.MAX_RATE_AT_TARGET
+        assert floored == irm.MIN_RATE_AT_TARGET
+
+    def test_average_rate_lies_between_start_and_end(self):
+        rate, end = irm.borrow_rate(WAD, RATE_AT_TARGET, 5 * 86_400)
+
+        assert 4 * RATE_AT_TARGET < rate < 4 * end
+
+
+def _model(borrow=900, supply=1_000, last_update=1_000, fee=0, timestamp=1_000):
+    return MorphoRateModel(
+        market_id=MARKET_ID,
+        market=MorphoMarket(
+            supply * WAD, supply * WAD, borrow * WAD, borrow * WAD, last_update, fee
+        ),
+        params=MorphoMarketParams(USER_TOKEN, USER_TOKEN, USER_TOKEN, IRM, 0),
+        rate_at_target=RATE_AT_TARGET,
+        timestamp=timestamp,
+    )
+
+
+class TestMorphoRateModel:
+    def test_rates_at_target(self):
+        rates = _model(fee=WAD // 10).rates()
+
+        assert rates.rate_per_second_wad == RATE_AT_TARGET
+        assert rates.utilization == 0.9
+        assert rates.borrow_apy == pytest.approx(math.expm1(0.04), rel=1e-3)
+        assert rates.supply_apy == pytest.approx(rates.borrow_apy * 0.9 * 0.9)
+
+    def test_accrual_grows_both_totals_and_mints_fee_shares(self):
+        model = _model(fee=WAD // 10)
+
+        accrued = model.accrued(timestamp=1_000 + YEAR)
+
+        interest = accrued.market.total_borrow_assets - model.market.total_borrow_assets
+        assert interest == pytest.approx(900 * WAD * math.expm1(0.04), rel=1e-3)
+        assert accrued.market.total_supply_assets == 1_000 * WAD + interest
+        assert accrued.market.total_supply_shares > model.market.total_supply_shares
+        assert accrued.market.last_update == 1_000 + YEAR
+        assert accrued.timestamp == 1_000 + YEAR
+
+    def test_rates_after_borrow_moves_up_the_curve(self):
+        model = _model()
+
+        after = model.rates_after(borrow_assets=100 * WAD)
+
+        assert after.utilization == 1.0
+        assert after.rate_per_second_wad == 4 * RATE_AT_TARGET
+        assert model.rates_after(supply_assets=800 * WAD).utilization == 0.5
+
+    def test_rates_after_rejects_overdrawn_market(self):
+        with pytest.raises(ValueError, match="borrowed against"):
+            _model().rates_after(borrow_assets=101 * WAD)
+
+    def test_rate_curve_uses_adapted_rate_at_target(self):
+        model = _model(borrow=1_000)
+
+        (now,) = model.rate_curve([irm.TARGET_UTILIZATION])
+        (later,) = model.rate_curve([irm.TARGET_UTILIZATION], 1_000 + 86_400)
+
+        assert now == RATE_AT_TARGET
+        assert later > now
+
+
+class TestRateModels:
+    MARKET = encode(["uint128"] * 6, [1_000, 1_000, 900, 900, 1_000, 0])
+    PARAMS = encode(
+        ["address", "address", "address", "address", "uint256"],
+        [USER_TOKEN, USER_TOKEN, USER_TOKEN, IRM, 0],
+    )
+
+    def test_two_rounds_skip_markets_without_rate_at_target(self):
+        ctx = MagicMock()
+        ctx.call.side_effect = [
+            aggregate3_result(
+                (True, encode(["uint256"], [2_000])),
+                (True, self.MARKET),
+                (True, self.PARAMS),
+                (True, self.MARKET),
+                (True, self.PARAMS),
+            ),
+            aggregate3_result(
+                (True, encode(["int256"], [RATE_AT_TARGET])), (False, b"")
+            ),
+        ]
+
+        (model,) = MorphoReader(ctx, MORPHO).rate_models([MARKET_ID, OTHER_ID])
+
+        assert ctx.call.call_count == 2
+        assert model.market_id == MARKET_ID
+        assert model.rate_at_target == RATE_AT_TARGET
+        assert model.timestamp == 2_000
+        assert model.market.total_borrow_assets == 900
+
+    def test_no_markets_reads_nothing(self):
+        ctx = MagicMock()
+
+        assert MorphoReader(ctx, MORPHO).rate_models([]) == []
+        ctx.call.assert_not_called()
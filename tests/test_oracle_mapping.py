@@ -12,8 +12,12 @@ from typing import Any
 from unittest.mock import MagicMock, patch
 
 from eth_abi import encode
+from eth_utils import function_signature_to_4byte_selector
 from web3 import Web3
+from web3.exceptions import ContractLogicError, Web3RPCError
 
+from ipor_fusion.core.erc20 import ERC20
+from ipor_fusion.core.oracle import PriceOracleMiddleware
 from ipor_fusion.readers import oracle_mapping as om
 from ipor_fusion.types import NodeStatus, Price
 
@@ -182,6 +186,10 @@ class FakeReader:
         self.events_to_block = to_block
         return self.events
 
+    # batching (reads are already in memory)
+    def prefetch(self, assets, max_depth: int) -> None:
+        self.prefetched = (list(assets), max_depth)
+
 
 def _chainlink_asset(r: FakeReader, asset: str, source: str, *, symbol: str) -> None:
     r.symbols[asset] = symbol
@@ -1266,6 +1274,136 @@ class TestOracleMappingReader:
         assert reader.vault_convert_to_assets(vault, 10**18) == 1_040_000
 
 
+class _Chain:
+    """Answers reads by (target, calldata), one at a time through ``ctx.call``
+    or batched through a patched ``call_all``; anything unknown reverts."""
+
+    def __init__(self):
+        self.ctx = MagicMock()
+        self.ctx.call.side_effect = self._call
+        self.answers: dict[tuple[str, bytes], bytes] = {}
+        self.batches: list[int] = []
+
+    def set(self, call, *values: Any) -> None:
+        self.answers[(call.to.lower(), bytes(call.data))] = encode(
+            call.output_types, list(values)
+        )
+
+    def _call(self, to, data):
+        try:
+            return self.answers[(to.lower(), bytes(data))]
+        except KeyError:
+            raise ContractLogicError("execution reverted") from None
+
+    def call_all(self, ctx, calls):
+        self.batches.append(len(calls))
+        out: list[Any] = []
+        for call in calls:
+            try:
+                out.append(call.decode(self._call(call.to, call.data)))
+            except ContractLogicError as exc:
+                out.append(exc)
+        return out
+
+
+def _chain_with_erc4626() -> tuple[_Chain, str, str]:
+    """USDC on a Chainlink feed; wsrUSD on an ERC4626 feed over USDC."""
+    chain = _Chain()
+    ctx = chain.ctx
+    usdc, wsr = addr(1), addr(2)
+    feed_c, feed_w, vault = addr(0x11), addr(0x12), addr(0x21)
+    oracle = PriceOracleMiddleware(ctx, ORACLE)
+    for asset, symbol, decimals, source in (
+        (usdc, "USDC", 6, feed_c),
+        (wsr, "wsrUSD", 18, feed_w),
+    ):
+        chain.set(ERC20(ctx, asset).symbol(), symbol)
+        chain.set(ERC20(ctx, asset).decimals(), decimals)
+        chain.set(oracle.get_source_of_asset_price(asset), source)
+        chain.set(oracle.get_asset_price(asset), 10**8, 8)
+    feed = om._Aggregator(ctx, feed_c)
+    chain.set(feed.latest_round_data(), 1, 99_980_000, 0, 1_700_000_000, 1)
+    chain.set(feed.decimals(), 8)
+    chain.set(feed.description(), "USDC / USD")
+    chain.set(feed.version(), 4)
+    chain.set(om._Erc4626Feed(ctx, feed_w).vault(), vault)
+    chain.set(om._Erc4626Vault(ctx, vault).asset(), usdc)
+    chain.set(om._Erc4626Vault(ctx, vault).decimals(), 18)
+    chain.set(om._Erc4626Vault(ctx, vault).convert_to_assets(10**18), 1_040_000)
+    return chain, usdc, wsr
+
+
+class TestPrefetch:
+    def test_levels_are_batched_and_resolution_reads_nothing(self):
+        chain, usdc, wsr = _chain_with_erc4626()
+        reader = om.OracleMappingReader(chain.ctx, ORACLE)
+        with patch.object(om, "call_all", chain.call_all):
+            reader.prefetch([usdc, wsr], 6)
+        expected = [
+            om.resolve_asset(om.OracleMappingReader(chain.ctx, ORACLE), a, 6)
+            for a in (usdc, wsr)
+        ]
+        chain.ctx.call.reset_mock()
+
+        nodes = [om.resolve_asset(reader, a, 6) for a in (usdc, wsr)]
+
+        # assets + variant probes, feed probes, vault reads, then the rate
+        # (USDC, reached again through the vault, is already known)
+        assert chain.batches == [10, 26, 2, 1]
+        chain.ctx.call.assert_not_called()
+        assert nodes == expected
+        assert nodes[1].source_type == om.TYPE_ERC4626
+        assert nodes[1].status == "resolved"
+
+    def test_failed_multicall_falls_back_to_single_reads(self):
+        chain, usdc, wsr = _chain_with_erc4626()
+        reader = om.OracleMappingReader(chain.ctx, ORACLE)
+        with patch.object(om, "call_all", side_effect=Web3RPCError("down")):
+            reader.prefetch([usdc, wsr], 6)
+
+        node = om.resolve_asset(reader, wsr, 6)
+
+        assert node.status == "resolved"
+        assert node.dependencies[0].source_type == om.TYPE_CHAINLINK
+
+    def test_only_prices_and_aggregator_getters_are_live(self):
+        reader, _ = _mock_reader()
+        feed, vault = addr(0x11), addr(0x21)
+        calls = reader._feed_calls(feed) + [
+            om._Erc4626Vault(MagicMock(), vault).asset(),
+            om._Erc4626Vault(MagicMock(), vault).decimals(),
+        ]
+
+        live = {c.data for c in calls if not c.immutable}
+        probes = {c.data for c in reader._feed_calls(feed) if c.cache_revert}
+
+        assert live == {
+            function_signature_to_4byte_selector(signature)
+            for signature in (
+                "latestRoundData()",
+                "decimals()",
+                "description()",
+                "version()",
+                "aggregator()",
+                "phaseId()",
+            )
+        }
+        # Only the feed-type probes remember that a feed lacks a getter
+        assert probes == {c.data for c in reader._feed_calls(feed) if c.immutable}
+        assert not any(c.cache_revert for c in calls[-2:])
+
+    def test_reads_are_memoized_reverts_included(self):
+        chain, usdc, _ = _chain_with_erc4626()
+        reader = om.OracleMappingReader(chain.ctx, ORACLE)
+        om.resolve_asset(reader, usdc, 6)
+        calls = chain.ctx.call.call_count
+
+        om.resolve_asset(reader, usdc, 6)
+        om.resolve_asset(reader.delegate(ORACLE), usdc, 6)
+
+        assert chain.ctx.call.call_count == calls
+
+
 # ---------------------------------------------------------------------------
 # Asset enumeration (manager call vs event-replay fallback) + block pinning
 # ---------------------------------------------------------------------------
@@ -1418,6 +1556,7 @@ class TestBuildOracleMapping:
         ):
             out = om.build_oracle_mapping(object(), vault, 123)
 
+        assert r.prefetched == ([usdc, wsr, nosrc], 6)
         assert out.vault == vault
         assert out.vault_name == "Reservoir"
         assert out.price_oracle == oracle
@@ -0,0 +1,184 @@
+"""Unit tests for the query planner and Multicall3 batching — no network."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from _multicall import MulticallChain, revert_data
+from eth_abi import encode
+from eth_utils import function_signature_to_4byte_selector
+from web3 import Web3
+from web3.exceptions import ContractLogicError
+
+from ipor_fusion.core.contract import Call
+from ipor_fusion.core.multicall import call_all
+from ipor_fusion.core.planner import QueryPlan
+
+VAULT = Web3.to_checksum_address("0x1111111111111111111111111111111111111111")
+ORACLE = Web3.to_checksum_address("0x2222222222222222222222222222222222222222")
+ASSET = Web3.to_checksum_address("0x3333333333333333333333333333333333333333")
+
+
+def _selector(signature: str) -> bytes:
+    return function_signature_to_4byte_selector(signature)
+
+
+class FakeChain(MulticallChain):
+    """Answers reads from a table; a missing or ``None`` entry reverts."""
+
+    def __init__(self, table: dict[tuple[str, bytes], bytes | None]):
+        super().__init__()
+        self.table = table
+        self.multicall_deployed = True
+
+    def aggregate3(self, data: bytes) -> bytes:
+        return super().aggregate3(data) if self.multicall_deployed else b""
+
+    def result(self, to: str, data: bytes) -> tuple[bool, bytes]:
+        answer = self.table.get((to, data))
+        return answer is not None, answer or revert_data("nope")
+
+
+def _call(to, signature: str, output: str, ctx) -> Call:
+    return Call(to=to, data=_selector(signature), output_types=[output], ctx=ctx)
+
+
+@pytest.fixture
+def chain() -> FakeChain:
+    return FakeChain(
+        {
+            (VAULT, _selector("asset()")): encode(["address"], [ASSET]),
+            (VAULT, _selector("oracle()")): encode(["address"], [ORACLE]),
+            (VAULT, _selector("decimals()")): encode(["uint8"], [18]),
+            (ASSET, _selector("decimals()")): encode(["uint8"], [6]),
+            (ORACLE, _selector("price()")): encode(["uint256"], [42]),
+        }
+    )
+
+
+class TestQueryPlan:
+    def test_dependent_reads_run_one_aggregate_per_round(self, chain):
+        plan = QueryPlan(chain)
+        asset = plan.read(_call(VAULT, "asset()", "address", chain))
+        oracle = plan.read(_call(VAULT, "oracle()", "address", chain))
+        decimals = plan.read(_call(VAULT, "decimals()", "uint8", chain))
+        asset_decimals = plan.then(
+            lambda a: _call(a, "decimals()", "uint8", chain), asset
+        )
+        price = plan.then(lambda o: _call(o, "price()", "uint256", chain), oracle)
+        summary = plan.derive(lambda d, p: (d, p), asset_decimals, price)
+
+        plan.execute()
+
+        assert plan.rounds == 2
+        assert chain.aggregates == 2
+        assert len(chain.requests) == 2
+        assert decimals.result() == 18
+        assert summary.result() == (6, 42)
+
+    def test_optional_revert_settles_to_none(self, chain):
+        plan = QueryPlan(chain)
+        missing = plan.read(_call(VAULT, "missing()", "uint256", chain), optional=True)
+        present = plan.read(_call(VAULT, "decimals()", "uint8", chain))
+
+        plan.execute()
+
+        assert missing.result() is None
+        assert present.result() == 18
+
+    def test_required_failure_stops_later_rounds(self, chain):
+        plan = QueryPlan(chain)
+        missing = plan.read(_call(VAULT, "missing()", "address", chain))
+        plan.read(_call(VAULT, "decimals()", "uint8", chain))
+        never = plan.then(lambda a: _call(a, "decimals()", "uint8", chain), missing)
+
+        with pytest.raises(ContractLogicError, match="nope"):
+            plan.execute()
+
+        assert len(chain.requests) == 1
+        with pytest.raises(RuntimeError, match="not executed"):
+            never.result()
+
+    def test_each_keeps_mapping_shape_and_drops_only_failed_entries(self, chain):
+        plan = QueryPlan(chain)
+        targets = plan.derive(lambda: [VAULT, ASSET, ORACLE])
+        decimals = plan.each(
+            lambda addrs: {a: _call(a, "decimals()", "uint8", chain) for a in addrs},
+            targets,
+            optional=True,
+        )
+
+        plan.execute()
+
+        assert plan.rounds == 1
+        assert decimals.result() == {VAULT: 18, ASSET: 6, ORACLE: None}
+
+    def test_failed_aggregate_falls_back_to_direct_reads(self, chain):
+        chain.multicall_deployed = False
+        plan = QueryPlan(chain)
+        asset = plan.read(_call(VAULT, "asset()", "address", chain))
+        oracle = plan.read(_call(VAULT, "oracle()", "address", chain))
+        plan.each(
+            lambda a, o: [
+                _call(a, "decimals()", "uint8", chain),
+                _call(o, "price()", "uint256", chain),
+            ],
+            asset,
+            oracle,
+        )
+
+        plan.execute()
+
+        assert asset.result() == ASSET
+        # One failed aggregate in round 1; round 2 no longer tries it.
+        assert chain.aggregates == 1
+        assert len(chain.requests) == 5
+
+    def test_non_call_reads_and_tasks_run_individually(self, chain):
+        mocked = MagicMock()
+        mocked.call.return_value = "USDC"
+        plan = QueryPlan(chain)
+        symbol = plan.read(mocked)
+        block = plan.task(lambda: 123)
+        stamp = plan.task(lambda b: b * 10, block)
+
+        plan.execute()
+
+        assert symbol.result() == "USDC"
+        assert stamp.result() == 1230
+        assert chain.requests == []
+
+    def test_builder_returning_none_skips_the_read(self, chain):
+        plan = QueryPlan(chain)
+        nothing = plan.derive(lambda: None)
+        skipped = plan.then(
+            lambda addr: _call(addr, "decimals()", "uint8", chain) if addr else None,
+            nothing,
+        )
+
+        plan.execute()
+
+        assert skipped.result() is None
+        assert chain.requests == []
+
+    def test_plan_executes_once(self, chain):
+        plan = QueryPlan(chain)
+        plan.execute()
+        with pytest.raises(RuntimeError):
+            plan.execute()
+        with pytest.raises(RuntimeError):
+            plan.derive(lambda: 1)
+
+
+class TestCallAll:
+    def test_reports_reverts_per_call(self, chain):
+        outcomes = call_all(
+            chain,
+            [
+                _call(VAULT, "decimals()", "uint8", chain),
+                _call(VAULT, "missing()", "uint8", chain),
+            ],
+        )
+
+        assert outcomes[0] == 18
+        assert isinstance(outcomes[1], ContractLogicError)
+        assert 'Error("nope")' in str(outcomes[1])
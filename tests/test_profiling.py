@@ -0,0 +1,130 @@
+"""Unit tests for the Chrome trace-event profiler — no network required."""
+
+import json
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from web3 import Web3
+
+from ipor_fusion.core.contract import Call
+from ipor_fusion.core.profiling import (
+    Profiler,
+    ProfilingMiddleware,
+    TracedThreadPoolExecutor,
+    active_profiler,
+    span,
+    traced,
+)
+
+TO = Web3.to_checksum_address("0x1111111111111111111111111111111111111111")
+
+
+def _spans(profiler: Profiler, category: str | None = None) -> list[dict]:
+    return [
+        e
+        for e in profiler.to_dict()["traceEvents"]
+        if e["ph"] == "X" and (category is None or e["cat"] == category)
+    ]
+
+
+class TestProfiler:
+    def test_span_records_complete_event(self):
+        with Profiler() as profiler, span("phase 1", vault="0xabc"):
+            pass
+
+        (event,) = _spans(profiler)
+        assert event["name"] == "phase 1"
+        assert event["cat"] == "phase"
+        assert event["dur"] >= 0
+        assert event["args"] == {"vault": "0xabc"}
+        assert event["tid"] == threading.get_ident()
+
+    def test_module_span_is_noop_without_active_profiler(self):
+        profiler = Profiler()
+        with span("ignored"):
+            pass
+        assert active_profiler() is None
+        assert profiler.events == []
+
+    def test_second_active_profiler_rejected(self):
+        with Profiler(), pytest.raises(RuntimeError):
+            Profiler().activate()
+        assert active_profiler() is None
+
+    def test_thread_tracks_are_named(self):
+        with Profiler() as profiler:
+            worker = threading.Thread(target=_record_on_thread, name="fetch-worker")
+            worker.start()
+            worker.join()
+
+        metadata = [e for e in profiler.to_dict()["traceEvents"] if e["ph"] == "M"]
+        assert {"name": "fetch-worker"} in [m["args"] for m in metadata]
+
+    def test_write_emits_trace_event_json(self, tmp_path):
+        with Profiler() as profiler, span("x"):
+            pass
+        out = tmp_path / "trace.json"
+
+        profiler.write(out)
+
+        data = json.loads(out.read_text(encoding="utf-8"))
+        assert data["displayTimeUnit"] == "ms"
+        assert [e["name"] for e in data["traceEvents"] if e["ph"] == "X"] == ["x"]
+
+
+def _record_on_thread() -> None:
+    with span("work"):
+        pass
+
+
+class TestTasks:
+    def test_traced_records_only_while_active(self):
+        fn = traced(lambda: 42, name="answer")
+        assert fn() == 42
+
+        with Profiler() as profiler:
+            assert fn() == 42
+
+        assert [e["name"] for e in _spans(profiler, "task")] == ["answer"]
+
+    def test_executor_records_tasks_on_worker_threads(self):
+        with Profiler() as profiler, TracedThreadPoolExecutor() as pool:
+            pool.submit(_record_on_thread).result()
+            pool.submit(_safe_call, lambda: None).result()
+
+        tasks = _spans(profiler, "task")
+        assert [e["name"] for e in tasks][0].endswith("_record_on_thread")
+        assert len(tasks) == 2
+        assert all(e["tid"] != threading.get_ident() for e in tasks)
+
+    def test_task_name_unwraps_safe_call_around_call_read(self):
+        from ipor_fusion.core.profiling import _task_name
+
+        call = Call(to=TO, data=bytes.fromhex("313ce567"), output_types=["uint8"])
+
+        assert _task_name(_safe_call, (call.call,)) == f"call {TO} 0x313ce567"
+
+
+def _safe_call(func):
+    return func()
+
+
+class TestMiddleware:
+    def test_rpc_span_summarizes_eth_call(self):
+        make_request = MagicMock(return_value={"result": "0x"})
+        middleware = ProfilingMiddleware(MagicMock()).wrap_make_request(make_request)
+
+        with Profiler() as profiler:
+            middleware("eth_call", [{"to": TO, "data": "0x313ce56700"}, "latest"])
+
+        (event,) = _spans(profiler, "rpc")
+        assert event["name"] == "eth_call"
+        assert event["args"] == {"to": TO, "selector": "0x313ce567", "block": "latest"}
+
+    def test_rpc_passthrough_when_inactive(self):
+        make_request = MagicMock(return_value={"result": "0x1"})
+        middleware = ProfilingMiddleware(MagicMock()).wrap_make_request(make_request)
+
+        assert middleware("eth_blockNumber", []) == {"result": "0x1"}
+        make_request.assert_called_once_with("eth_blockNumber", [])
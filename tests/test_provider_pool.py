@@ -0,0 +1,118 @@
+"""Unit tests for weighted RPC load balancing — no network required."""
+
+import threading
+from collections import Counter
+
+import pytest
+import requests
+from web3 import Web3
+from web3.providers import BaseProvider
+
+from ipor_fusion.core.context import Web3Context
+from ipor_fusion.core.provider_pool import ProviderPool
+from ipor_fusion.core.ratecontrol import AdaptiveRateMiddleware
+from ipor_fusion.types import ChainId
+
+TIMEOUT_S = 5
+
+
+class FakeProvider(BaseProvider):
+    def __init__(self, uri, error=None):
+        super().__init__()
+        self.endpoint_uri = uri
+        self.error = error
+        self.gate: threading.Event | None = None
+        self.calls = 0
+
+    def make_request(self, method, params):
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(TIMEOUT_S)
+        if self.error is not None:
+            raise self.error
+        return {"result": self.endpoint_uri}
+
+    def is_connected(self, show_traceback=False):
+        return True
+
+
+def _pool(*fakes, **kwargs) -> ProviderPool:
+    pool = ProviderPool(fakes, **kwargs)
+    pool._next_probe = float("inf")
+    return pool
+
+
+def _checkouts(pool: ProviderPool, n: int) -> Counter:
+    return Counter(pool._checkout([]).uri for _ in range(n))
+
+
+class TestProviderPool:
+    def test_cold_pool_splits_by_weight(self):
+        pool = _pool(FakeProvider("a"), FakeProvider("b"), weights=[3, 1])
+        assert _checkouts(pool, 8) == {"a": 6, "b": 2}
+
+    def test_faster_endpoint_takes_more_traffic(self):
+        pool = _pool(FakeProvider("fast"), FakeProvider("slow"))
+        pool.endpoints[0].record_latency(0.1)
+        pool.endpoints[1].record_latency(0.3)
+        assert _checkouts(pool, 8) == {"fast": 6, "slow": 2}
+
+    def test_per_endpoint_cap_is_never_exceeded(self):
+        a, b = FakeProvider("a"), FakeProvider("b")
+        gate = threading.Event()
+        a.gate = b.gate = gate
+        pool = _pool(a, b, max_in_flight=[2, 1])
+        threads = [
+            threading.Thread(target=pool.make_request, args=("eth_call", []))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            while a.calls + b.calls < 3:
+                threading.Event().wait(0.005)
+            assert [e.in_flight for e in pool.endpoints] == [2, 1]
+            assert a.calls + b.calls == 3
+        finally:
+            gate.set()
+        for thread in threads:
+            thread.join(TIMEOUT_S)
+        assert a.calls + b.calls == 4
+        assert [e.in_flight for e in pool.endpoints] == [0, 0]
+
+    def test_failed_endpoint_is_ejected_and_read_moves_on(self):
+        broken = FakeProvider("broken", error=requests.ConnectionError("down"))
+        pool = _pool(broken, FakeProvider("ok"), weights=[10, 1])
+
+        assert pool.make_request("eth_call", []) == {"result": "ok"}
+        assert pool.make_request("eth_call", []) == {"result": "ok"}
+        assert broken.calls == 1
+
+    def test_writes_are_not_retried_elsewhere(self):
+        broken = FakeProvider("broken", error=requests.ConnectionError("down"))
+        other = FakeProvider("other")
+        pool = _pool(broken, other, weights=[10, 1])
+
+        with pytest.raises(requests.ConnectionError):
+            pool.make_request("eth_sendRawTransaction", ["0x00"])
+        assert other.calls == 0
+
+    def test_invalid_configuration_rejected(self):
+        with pytest.raises(ValueError):
+            ProviderPool([FakeProvider("a")], weights=[1, 2])
+        with pytest.raises(ValueError):
+            ProviderPool([FakeProvider("a")], max_in_flight=0)
+
+
+class TestPoolCapacity:
+    def test_scheduler_and_limiter_sized_to_the_pool(self):
+        pool = _pool(
+            FakeProvider("pool-a"), FakeProvider("pool-b"), max_in_flight=[12, 12]
+        )
+        web3 = Web3(pool)
+        ctx = Web3Context(web3, ChainId(1))
+
+        assert pool.max_in_flight == 24
+        assert ctx.scheduler.max_workers == 24
+        middleware = AdaptiveRateMiddleware(web3)
+        assert middleware._limiter().limit == 24
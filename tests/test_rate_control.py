@@ -0,0 +1,179 @@
+"""Unit tests for adaptive RPC rate control — no network required."""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from ipor_fusion.core.ratecontrol import (
+    FAILED,
+    OK,
+    THROTTLED,
+    AdaptiveRateMiddleware,
+    AimdLimiter,
+)
+
+
+def _http_error(status: int, retry_after: str | None = None) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _saturate(limiter: AimdLimiter) -> None:
+    while limiter.in_flight < int(limiter.limit):
+        limiter.acquire()
+
+
+class TestAimdLimiter:
+    def test_fast_responses_grow_the_limit_additively(self):
+        limiter = AimdLimiter(initial=4, maximum=6)
+        for _ in range(40):
+            _saturate(limiter)
+            limiter.release("eth_call", 0.1, OK)
+        assert limiter.limit == 6
+
+    def test_unsaturated_window_does_not_grow(self):
+        limiter = AimdLimiter(initial=4)
+        for _ in range(10):
+            limiter.acquire()
+            limiter.release("eth_call", 0.1, OK)
+        assert limiter.limit == 4
+
+    def test_slow_responses_hold_the_limit(self):
+        limiter = AimdLimiter(initial=4)
+        _saturate(limiter)
+        limiter.release("eth_call", 0.1, OK)
+        grown = limiter.limit
+        for _ in range(5):
+            _saturate(limiter)
+            limiter.release("eth_call", 1.0, OK)
+        assert limiter.limit == grown
+
+    def test_throttle_halves_once_per_cooldown(self):
+        clock = FakeClock()
+        limiter = AimdLimiter(initial=16, clock=clock)
+        for _ in range(3):
+            limiter.acquire()
+            limiter.release("eth_call", 0.1, THROTTLED)
+        assert limiter.limit == 8
+
+        clock.now += AimdLimiter.DECREASE_COOLDOWN_S
+        limiter.acquire()
+        limiter.release("eth_call", 0.1, THROTTLED)
+        assert limiter.limit == 4
+
+    def test_limit_never_drops_below_minimum(self):
+        clock = FakeClock()
+        limiter = AimdLimiter(initial=2, minimum=1, clock=clock)
+        for _ in range(4):
+            clock.now += 10
+            limiter.acquire()
+            limiter.release("eth_call", 0.1, THROTTLED)
+        assert limiter.limit == 1
+
+    def test_acquire_blocks_at_the_limit(self):
+        limiter = AimdLimiter(initial=1)
+        limiter.acquire()
+        entered = threading.Event()
+
+        def second():
+            limiter.acquire()
+            entered.set()
+
+        thread = threading.Thread(target=second)
+        thread.start()
+        assert not entered.wait(0.05)
+        limiter.release("eth_call", 0.1, FAILED)
+        assert entered.wait(5)
+        thread.join(5)
+
+    def test_invalid_bounds_rejected(self):
+        with pytest.raises(ValueError):
+            AimdLimiter(initial=0.5)
+
+    def test_shared_per_key(self):
+        assert AimdLimiter.shared("http://a") is AimdLimiter.shared("http://a")
+        assert AimdLimiter.shared("http://a") is not AimdLimiter.shared("http://b")
+
+
+class TestAdaptiveRateMiddleware:
+    @pytest.fixture
+    def delays(self) -> list[float]:
+        return []
+
+    def _wrap(self, responses, delays, limiter=None):
+        """Middleware around a provider that plays back ``responses``."""
+        calls: list[str] = []
+        middleware = AdaptiveRateMiddleware(MagicMock())
+        middleware.limiter = limiter or AimdLimiter()
+        middleware.sleep = delays.append
+        queue = list(responses)
+
+        def make_request(method, params):
+            calls.append(method)
+            outcome = queue.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        return middleware.wrap_make_request(make_request), calls
+
+    def test_retries_read_after_http_429_honouring_retry_after(self, delays):
+        limiter = AimdLimiter(initial=8)
+        request, calls = self._wrap(
+            [_http_error(429, retry_after="3"), {"result": "0x1"}], delays, limiter
+        )
+
+        assert request("eth_call", []) == {"result": "0x1"}
+        assert calls == ["eth_call", "eth_call"]
+        assert delays == [3.0]
+        assert limiter.limit == 4
+        assert limiter.in_flight == 0
+
+    def test_retries_json_rpc_rate_limit_error(self, delays):
+        throttled = {"error": {"code": -32005, "message": "Rate limit exceeded"}}
+        request, calls = self._wrap([throttled, {"result": "0x2"}], delays)
+
+        assert request("eth_getLogs", []) == {"result": "0x2"}
+        assert len(calls) == 2
+        assert 0 <= delays[0] <= AdaptiveRateMiddleware.BACKOFF_BASE_S
+
+    def test_gives_up_after_max_attempts(self, delays):
+        request, calls = self._wrap(
+            [_http_error(503)] * AdaptiveRateMiddleware.MAX_ATTEMPTS, delays
+        )
+
+        with pytest.raises(requests.HTTPError):
+            request("eth_blockNumber", [])
+        assert len(calls) == AdaptiveRateMiddleware.MAX_ATTEMPTS
+        assert len(delays) == AdaptiveRateMiddleware.MAX_ATTEMPTS - 1
+
+    def test_writes_are_never_retried(self, delays):
+        request, calls = self._wrap([_http_error(429)], delays)
+
+        with pytest.raises(requests.HTTPError):
+            request("eth_sendRawTransaction", ["0x00"])
+        assert calls == ["eth_sendRawTransaction"]
+        assert delays == []
+
+    def test_reverts_and_client_errors_pass_through(self, delays):
+        revert = {"error": {"code": 3, "message": "execution reverted"}}
+        request, calls = self._wrap([revert, _http_error(400)], delays)
+
+        assert request("eth_call", []) == revert
+        with pytest.raises(requests.HTTPError):
+            request("eth_call", [])
+        assert len(calls) == 2
+        assert delays == []
@@ -2,9 +2,13 @@
 
 from unittest.mock import MagicMock
 
+import pytest
+from _multicall import aggregate3_result
 from eth_abi import encode
 from web3 import Web3
+from web3.exceptions import ContractLogicError
 
+from ipor_fusion.readers import uniswap_v3_math
 from ipor_fusion.readers.aave_v3 import (
     AaveV3PositionBreakdown,
     AaveV3Reader,
@@ -18,9 +22,11 @@ from ipor_fusion.readers.morpho import (
     MorphoMarketRates,
     MorphoPosition,
     MorphoPositionBreakdown,
+    MorphoPositionSnapshot,
     MorphoReader,
 )
-from ipor_fusion.readers.ramses_v2 import RamsesV2Position, RamsesV2Reader
+from ipor_fusion.readers.position_manager import TickFeeGrowth
+from ipor_fusion.readers.ramses_v2 import RamsesV2Pool, RamsesV2Position, RamsesV2Reader
 from ipor_fusion.readers.uniswap_v3 import UniswapV3Position, UniswapV3Reader
 from ipor_fusion.types import Amount
 
@@ -320,6 +326,207 @@ class TestMorphoReaderPositionBreakdown:
         assert result.collateral == 0
 
 
+class TestMorphoReaderPositionsFor:
+    OTHER_ID = "b" * 64
+
+    @staticmethod
+    def _position(borrow_shares):
+        return encode(["uint256", "uint128", "uint128"], [1000, borrow_shares, 42])
+
+    MARKET = encode(
+        ["uint128", "uint128", "uint128", "uint128", "uint128", "uint128"],
+        [2_000_000, 2_000_000, 1_500_000, 1_500_000, 1700000000, 0],
+    )
+    PARAMS = encode(
+        ["address", "address", "address", "address", "uint256"],
+        [TOKEN_A, TOKEN_B, ORACLE, IRM, 860000000000000000],
+    )
+
+    def test_two_rounds_for_all_markets(self):
+        reader, ctx = _make_reader(MorphoReader)
+        ctx.call.side_effect = [
+            aggregate3_result(
+                (True, self._position(500)),
+                (True, self.MARKET),
+                (True, self.PARAMS),
+                (True, self._position(700)),
+                (True, self.MARKET),
+                (True, self.PARAMS),
+            ),
+            # Both markets share an oracle: one price() read
+            aggregate3_result((True, encode(["uint256"], [3 * 10**36]))),
+        ]
+
+        snapshots = reader.positions_for(USER_ADDR, [MARKET_ID, self.OTHER_ID])
+
+        assert ctx.call.call_count == 2
+        assert [s.market_id for s in snapshots] == [MARKET_ID, self.OTHER_ID]
+        assert isinstance(snapshots[0], MorphoPositionSnapshot)
+        assert snapshots[0].oracle_price == 3 * 10**36
+        assert snapshots[1].breakdown.borrow_assets == 700
+        assert snapshots[1].breakdown == MorphoPositionBreakdown(
+            market_id=self.OTHER_ID,
+            loan_token=TOKEN_A,
+            collateral_token=TOKEN_B,
+            collateral=Amount(42),
+            borrow_assets=Amount(700),
+            supply_assets=Amount(1000),
+        )
+
+    def test_supply_only_skips_price_round(self):
+        reader, ctx = _make_reader(MorphoReader)
+        supply_only = encode(["uint256", "uint128", "uint128"], [1000, 0, 0])
+        ctx.call.return_value = aggregate3_result(
+            (True, supply_only), (True, self.MARKET), (True, self.PARAMS)
+        )
+
+        (snapshot,) = reader.positions_for(USER_ADDR, [MARKET_ID])
+
+        assert ctx.call.call_count == 1
+        assert snapshot.oracle_price is None
+
+    def test_reverted_market_is_left_out(self):
+        reader, ctx = _make_reader(MorphoReader)
+        ctx.call.side_effect = [
+            aggregate3_result(
+                (True, self._position(500)),
+                (False, b""),
+                (True, self.PARAMS),
+                (True, self._position(500)),
+                (True, self.MARKET),
+                (True, self.PARAMS),
+            ),
+            aggregate3_result((False, b"")),
+        ]
+
+        (snapshot,) = reader.positions_for(USER_ADDR, [MARKET_ID, self.OTHER_ID])
+
+        assert snapshot.market_id == self.OTHER_ID
+        assert snapshot.oracle_price is None
+
+    def test_no_markets_reads_nothing(self):
+        reader, ctx = _make_reader(MorphoReader)
+
+        assert reader.positions_for(USER_ADDR, []) == []
+        ctx.call.assert_not_called()
+
+
+class TestAaveV3ReaderPositionsFor:
+    A_TOKEN = Web3.to_checksum_address("0x" + "10" * 20)
+    VARIABLE_DEBT = Web3.to_checksum_address("0x" + "30" * 20)
+    STABLE_DEBT = Web3.to_checksum_address("0x" + "20" * 20)
+    PROVIDER = Web3.to_checksum_address("0x" + "50" * 20)
+    AAVE_ORACLE = Web3.to_checksum_address("0x" + "60" * 20)
+    ZERO = Web3.to_checksum_address("0x" + "00" * 20)
+    # collateral $10,000, debt $5,000
+    ACCOUNT = encode(["uint256"] * 6, [10_000 * 10**8, 5_000 * 10**8, 0, 8000, 7500, 0])
+
+    @classmethod
+    def _reserve(cls, reserve_id, ltv, threshold, decimals, stable_debt_token):
+        configuration = ltv | threshold << 16 | decimals << 48
+        return encode(
+            ["uint256", *["uint128"] * 5, "uint40", "uint16", *["address"] * 4]
+            + ["uint128"] * 3,
+            [configuration, 0, 0, 0, 0, 0, 0, reserve_id]
+            + [cls.A_TOKEN, stable_debt_token, cls.VARIABLE_DEBT, cls.ZERO, 0, 0, 0],
+        )
+
+    @staticmethod
+    def _uint(value):
+        return True, encode(["uint256"], [value])
+
+    def _round_one(self, *reserves):
+        # Bit 1: reserve 0 used as collateral; bit 2: borrowing reserve 1
+        return aggregate3_result(
+            (True, self.ACCOUNT),
+            self._uint(0b110),
+            (True, encode(["address"], [self.PROVIDER])),
+            *reserves,
+        )
+
+    def test_three_rounds_for_all_reserves(self):
+        reader, ctx = _make_reader(AaveV3Reader)
+        ctx.call.side_effect = [
+            self._round_one(
+                (True, self._reserve(0, 7500, 8000, 6, self.ZERO)),
+                (True, self._reserve(1, 8000, 8250, 18, self.STABLE_DEBT)),
+            ),
+            aggregate3_result(
+                self._uint(10_000 * 10**6),  # TOKEN_A aToken
+                self._uint(0),  # TOKEN_A variable debt
+                self._uint(0),  # TOKEN_B aToken
+                self._uint(2 * 10**18),  # TOKEN_B variable debt
+                self._uint(0),  # TOKEN_B stable debt
+                (True, encode(["address"], [self.AAVE_ORACLE])),
+            ),
+            encode(["uint256[]"], [[10**8, 2_500 * 10**8]]),
+        ]
+
+        positions = reader.positions_for(USER_ADDR, [TOKEN_A, TOKEN_B])
+
+        assert ctx.call.call_count == 3
+        assert positions.account.total_debt_base == 5_000 * 10**8
+        supplied, borrowed = positions.reserves
+        assert supplied.collateral_enabled
+        assert supplied.reserve.decimals == 6
+        assert supplied.supply_usd == 10_000.0
+        # $10,000 at an 80% threshold over $5,000 of debt
+        assert supplied.health_contribution == 1.6
+        assert not borrowed.collateral_enabled
+        assert borrowed.debt_usd == 5_000.0
+        assert borrowed.health_contribution == 0.0
+        assert borrowed.breakdown == AaveV3PositionBreakdown(
+            asset=TOKEN_B,
+            a_token=self.A_TOKEN,
+            variable_debt_token=self.VARIABLE_DEBT,
+            stable_debt_token=self.STABLE_DEBT,
+            supply=Amount(0),
+            variable_debt=Amount(2 * 10**18),
+            stable_debt=Amount(0),
+        )
+
+    def test_without_prices_skips_oracle(self):
+        reader, ctx = _make_reader(AaveV3Reader)
+        ctx.call.side_effect = [
+            aggregate3_result(
+                (True, self.ACCOUNT),
+                self._uint(0b10),
+                (True, self._reserve(0, 7500, 8000, 6, self.ZERO)),
+            ),
+            aggregate3_result(self._uint(10_000 * 10**6), self._uint(0)),
+        ]
+
+        (position,) = reader.positions_for(
+            USER_ADDR, [TOKEN_A], with_prices=False
+        ).reserves
+
+        assert ctx.call.call_count == 2
+        assert position.supply == 10_000 * 10**6
+        assert position.price is None
+        assert position.supply_usd is None
+        assert position.health_contribution is None
+
+    def test_reverted_reserve_is_left_out(self):
+        reader, ctx = _make_reader(AaveV3Reader)
+        ctx.call.side_effect = [
+            self._round_one(
+                (False, b""), (True, self._reserve(1, 0, 0, 18, self.ZERO))
+            ),
+            aggregate3_result(
+                self._uint(0),
+                self._uint(0),
+                (True, encode(["address"], [self.AAVE_ORACLE])),
+            ),
+        ]
+
+        positions = reader.positions_for(USER_ADDR, [TOKEN_A, TOKEN_B])
+
+        # Nothing held: no price round
+        assert ctx.call.call_count == 2
+        assert [p.asset for p in positions.reserves] == [TOKEN_B]
+        assert positions.reserves[0].is_empty
+
+
 class TestMorphoReaderRates:
     def test_rates_computes_apy_and_utilization(self):
         reader, ctx = _make_reader(MorphoReader)
@@ -464,6 +671,193 @@ class TestUniswapV3Reader:
         assert result.tokens_owed1 == 60
 
 
+class TestPositionValues:
+    FACTORY = Web3.to_checksum_address("0x" + "f0" * 20)
+    POOL = Web3.to_checksum_address("0x" + "b0" * 20)
+    LIQUIDITY = 10**18
+
+    @staticmethod
+    def _position(liquidity, owed0, owed1):
+        return encode(
+            ["uint96", *["address"] * 3, "uint24", "int24", "int24", "uint128"]
+            + ["uint256", "uint256", "uint128", "uint128"],
+            [0, USER_ADDR, TOKEN_A, TOKEN_B, 3000, -600, 600, liquidity]
+            + [0, 0, owed0, owed1],
+        )
+
+    @staticmethod
+    def _tick():
+        # liquidityGross, liquidityNet, feeGrowthOutside0/1, and the rest
+        return encode(
+            ["uint128", "int128", "uint256", "uint256", "int56", "uint160"],
+            [1, 1, 0, 0, 0, 0],
+        )
+
+    @staticmethod
+    def _ramses_tick():
+        # Ramses V2: boosted liquidity (gross, net) before the fee growth
+        return encode(
+            ["uint128", "int128", "uint128", "int128", "uint256", "uint256"]
+            + ["int56", "uint160"],
+            [1, 1, 7, 7, 0, 0, 0, 0],
+        )
+
+    def test_three_rounds_value_every_position(self):
+        reader, ctx = _make_reader(UniswapV3Reader)
+        ctx.pinned.return_value = ctx
+        ctx.call.side_effect = [
+            aggregate3_result(
+                (True, self._position(self.LIQUIDITY, 5, 6)),
+                (True, self._position(0, 3, 4)),
+                (False, b""),  # burned
+                (True, encode(["address"], [self.FACTORY])),
+                (True, encode(["uint256"], [1234])),  # getBlockNumber()
+            ),
+            aggregate3_result((True, encode(["address"], [self.POOL]))),
+            aggregate3_result(
+                # slot0 at price 1, with its trailing fields
+                (True, encode(["uint160", "int24", "uint16"], [2**96, 0, 1])),
+                (True, encode(["uint256"], [2 * 2**128])),
+                (True, encode(["uint256"], [0])),
+                (True, self._tick()),
+                (True, self._tick()),
+            ),
+        ]
+
+        active, closed = reader.position_values([1, 2, 3])
+
+        assert ctx.call.call_count == 3
+        # The pools are read at the block the positions were read at
+        ctx.pinned.assert_called_once_with(1234)
+        assert isinstance(active.position, UniswapV3Position)
+        assert active.pool.address == self.POOL
+        assert active.in_range
+        assert (
+            active.amount0,
+            active.amount1,
+        ) == uniswap_v3_math.amounts_for_liquidity(2**96, -600, 600, self.LIQUIDITY)
+        # Owed 5, plus fee growth of 2 per unit of liquidity
+        assert (active.fees0, active.fees1) == (5 + 2 * self.LIQUIDITY, 6)
+        assert closed.token_id == 2
+        assert (closed.amount0, closed.amount1) == (0, 0)
+        assert (closed.fees0, closed.fees1) == (3, 4)
+
+    def test_ramses_ticks_use_the_ramses_layout(self):
+        reader, ctx = _make_reader(RamsesV2Reader)
+        ctx.pinned.return_value = ctx
+        ctx.call.side_effect = [
+            aggregate3_result(
+                (True, self._position(self.LIQUIDITY, 0, 0)),
+                (True, encode(["address"], [self.FACTORY])),
+                (True, encode(["uint256"], [1234])),
+            ),
+            aggregate3_result((True, encode(["address"], [self.POOL]))),
+            aggregate3_result(
+                (True, encode(["uint160", "int24", "uint16"], [2**96, 0, 1])),
+                (True, encode(["uint256"], [2**128])),
+                (True, encode(["uint256"], [0])),
+                (True, self._ramses_tick()),
+                (True, self._ramses_tick()),
+            ),
+        ]
+
+        (value,) = reader.position_values([1])
+
+        # The boosted liquidity is not mistaken for fee growth outside
+        assert (value.fees0, value.fees1) == (self.LIQUIDITY, 0)
+
+    def test_pre_read_positions_are_valued_at_their_block(self):
+        reader, ctx = _make_reader(UniswapV3Reader)
+        ctx.pinned.return_value = ctx
+        ctx.call.side_effect = [
+            aggregate3_result(
+                (True, encode(["uint256"], [1])),  # balanceOf()
+            ),
+            aggregate3_result((True, encode(["uint256"], [7]))),
+            aggregate3_result((True, self._position(self.LIQUIDITY, 0, 0))),
+            # The factory alone: the positions are not read again
+            aggregate3_result((True, encode(["address"], [self.FACTORY]))),
+            aggregate3_result((True, encode(["address"], [self.POOL]))),
+            aggregate3_result(
+                (True, encode(["uint160", "int24", "uint16"], [2**96, 0, 1])),
+                (True, encode(["uint256"], [2**128])),
+                (True, encode(["uint256"], [0])),
+                (True, self._tick()),
+                (True, self._tick()),
+            ),
+        ]
+
+        positions = reader.positions_of(USER_ADDR, block=1234)
+        (value,) = reader.position_values(positions, block=1234)
+
+        assert value.token_id == 7
+        assert value.fees0 == self.LIQUIDITY
+        assert {c.args for c in ctx.pinned.call_args_list} == {(1234,)}
+
+    def test_pre_read_positions_need_a_block(self):
+        reader, _ = _make_reader(UniswapV3Reader)
+
+        with pytest.raises(ValueError, match="block"):
+            reader.position_values({7: MagicMock()})
+
+    def test_no_tokens_reads_nothing(self):
+        reader, ctx = _make_reader(UniswapV3Reader)
+
+        assert reader.position_values([]) == []
+        ctx.call.assert_not_called()
+
+    def test_positions_of_enumerates_owner_tokens(self):
+        reader, ctx = _make_reader(RamsesV2Reader)
+        ctx.pinned.return_value = ctx
+        ctx.call.side_effect = [
+            aggregate3_result(
+                (True, encode(["uint256"], [1234])),  # getBlockNumber()
+                (True, encode(["uint256"], [2])),
+            ),
+            aggregate3_result(
+                (True, encode(["uint256"], [7])),
+                (True, encode(["uint256"], [9])),
+            ),
+            aggregate3_result(
+                (True, self._position(self.LIQUIDITY, 0, 0)),
+                (True, self._position(0, 1, 2)),
+            ),
+        ]
+
+        positions = reader.positions_of(USER_ADDR)
+
+        assert ctx.call.call_count == 3
+        # The indices and positions are read at the balance's block
+        ctx.pinned.assert_called_once_with(1234)
+        assert list(positions) == [7, 9]
+        assert isinstance(positions[7], RamsesV2Position)
+        assert positions[7].liquidity == self.LIQUIDITY
+        assert positions[9].tokens_owed1 == 2
+
+    def test_failed_index_read_raises(self):
+        reader, ctx = _make_reader(UniswapV3Reader)
+        ctx.pinned.return_value = ctx
+        ctx.call.side_effect = [
+            aggregate3_result(
+                (True, encode(["uint256"], [1234])),
+                (True, encode(["uint256"], [2])),
+            ),
+            aggregate3_result((True, encode(["uint256"], [7])), (False, b"")),
+        ]
+
+        with pytest.raises(ContractLogicError):
+            reader.token_ids_of(USER_ADDR)
+
+    def test_positions_of_empty_owner_reads_balance_only(self):
+        reader, ctx = _make_reader(UniswapV3Reader)
+        ctx.call.return_value = aggregate3_result(
+            (True, encode(["uint256"], [1234])), (True, encode(["uint256"], [0]))
+        )
+
+        assert reader.positions_of(USER_ADDR) == {}
+        ctx.call.assert_called_once()
+
+
 # ── Ramses V2 ──────────────────────────────────────────────────────────
 
 
@@ -517,3 +911,13 @@ class TestRamsesV2Reader:
         assert result.fee_growth_inside1_last_x128 == 400
         assert result.tokens_owed0 == 10
         assert result.tokens_owed1 == 20
+
+    def test_ticks_skip_boosted_liquidity(self):
+        pool, ctx = _make_reader(RamsesV2Pool)
+        ctx.call.return_value = encode(
+            ["uint128", "int128", "uint128", "int128", "uint256", "uint256"]
+            + ["int56", "uint160", "uint32", "bool"],
+            [10, -10, 4, -4, 111, 222, 0, 0, 0, True],
+        )
+
+        assert pool.ticks(-100).call() == TickFeeGrowth(111, 222)
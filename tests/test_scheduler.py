@@ -0,0 +1,153 @@
+"""Unit tests for the shared RPC scheduler — no network required."""
+
+import threading
+import time
+from concurrent.futures import CancelledError
+from unittest.mock import MagicMock
+
+import pytest
+from web3 import Web3
+from web3.exceptions import ContractLogicError
+
+from ipor_fusion.core.context import Web3Context
+from ipor_fusion.core.scheduler import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NORMAL,
+    RpcScheduler,
+)
+from ipor_fusion.types import ChainId
+
+TIMEOUT_S = 5
+
+
+def _blocked(scheduler: RpcScheduler) -> threading.Event:
+    """Occupy every worker until the returned event is set."""
+    release = threading.Event()
+    started = threading.Barrier(scheduler.max_workers + 1)
+    group = scheduler.group(priority=PRIORITY_HIGH)
+    for _ in range(scheduler.max_workers):
+        group.submit(lambda: (started.wait(TIMEOUT_S), release.wait(TIMEOUT_S)))
+    started.wait(TIMEOUT_S)
+    return release
+
+
+class TestRpcScheduler:
+    def test_concurrency_is_bounded(self):
+        scheduler = RpcScheduler(max_workers=2)
+        lock = threading.Lock()
+        running = peak = 0
+
+        def task():
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+
+        with scheduler.group() as pool:
+            for _ in range(8):
+                pool.submit(task)
+
+        assert peak == 2
+
+    def test_higher_priority_runs_first(self):
+        scheduler = RpcScheduler(max_workers=1)
+        release = _blocked(scheduler)
+        order: list[str] = []
+        futures = [
+            scheduler.group(priority=p).submit(order.append, label)
+            for p, label in (
+                (PRIORITY_LOW, "low"),
+                (PRIORITY_HIGH, "high"),
+                (PRIORITY_NORMAL, "normal"),
+            )
+        ]
+        release.set()
+        for future in futures:
+            future.result(TIMEOUT_S)
+
+        assert order == ["high", "normal", "low"]
+
+    def test_fatal_error_fails_queued_tasks_without_running_them(self):
+        scheduler = RpcScheduler(max_workers=1)
+        release = _blocked(scheduler)
+        ran: list[int] = []
+        group = scheduler.group()
+
+        def boom():
+            raise ConnectionError("provider down")
+
+        failing = group.submit(boom)
+        queued = [group.submit(ran.append, i) for i in range(3)]
+        release.set()
+
+        with pytest.raises(ConnectionError):
+            failing.result(TIMEOUT_S)
+        for future in queued:
+            with pytest.raises(ConnectionError):
+                future.result(TIMEOUT_S)
+        assert ran == []
+        assert isinstance(group.error, ConnectionError)
+        with pytest.raises(ConnectionError):
+            group.submit(ran.append, 99).result(TIMEOUT_S)
+
+    def test_recoverable_errors_do_not_fail_the_group(self):
+        scheduler = RpcScheduler(max_workers=1)
+        group = scheduler.group()
+
+        def revert():
+            raise ContractLogicError("execution reverted")
+
+        reverted = group.submit(revert)
+        after = group.submit(lambda: 42)
+
+        with pytest.raises(ContractLogicError):
+            reverted.result(TIMEOUT_S)
+        assert after.result(TIMEOUT_S) == 42
+        assert group.error is None
+
+    def test_nested_groups_do_not_deadlock_a_single_worker(self):
+        scheduler = RpcScheduler(max_workers=1)
+
+        def outer():
+            with scheduler.group() as inner:
+                futures = [inner.submit(lambda i=i: i * 2) for i in range(4)]
+            return sum(f.result() for f in futures)
+
+        assert scheduler.group().submit(outer).result(TIMEOUT_S) == 12
+
+    def test_failing_with_block_cancels_queued_tasks(self):
+        scheduler = RpcScheduler(max_workers=1)
+        release = _blocked(scheduler)
+        with pytest.raises(KeyError), scheduler.group() as group:
+            queued = group.submit(lambda: 1)
+            raise KeyError("caller bailed")
+        release.set()
+
+        with pytest.raises(CancelledError):
+            queued.result(TIMEOUT_S)
+
+
+class TestContextScheduler:
+    def test_injected_scheduler_is_used(self):
+        scheduler = RpcScheduler(max_workers=3)
+        ctx = Web3Context(MagicMock(), ChainId(1), scheduler=scheduler)
+        assert ctx.scheduler is scheduler
+        assert RpcScheduler.for_context(ctx) is scheduler
+
+    def test_contexts_on_one_endpoint_share_a_scheduler(self):
+        url = "http://127.0.0.1:1/shared-scheduler-test"
+        first = Web3Context(Web3(Web3.HTTPProvider(url)), ChainId(1))
+        second = Web3Context(Web3(Web3.HTTPProvider(url)), ChainId(1))
+        other = Web3Context(
+            Web3(Web3.HTTPProvider(url + "-other")),
+            ChainId(1),
+        )
+        assert first.scheduler is second.scheduler
+        assert first.scheduler is not other.scheduler
+
+    def test_non_context_falls_back_to_default(self):
+        assert RpcScheduler.for_context(MagicMock()) is RpcScheduler.shared()
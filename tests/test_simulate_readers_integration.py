@@ -80,6 +80,12 @@ class TestMorphoReaderIntegration:
         assert position.borrow_shares >= 0
         assert position.collateral >= 0
 
+    def test_local_rate_matches_irm(self, web3_eth):
+        reader = MorphoReader(_ctx(web3_eth, self.BLOCK), ETHEREUM_MORPHO_BLUE)
+        (model,) = reader.rate_models([MORPHO_USDC_MARKET_ID])
+        rates = reader.rates_from(model.market, model.params)
+        assert model.borrow_rate() == rates.rate_per_second_wad
+
 
 class TestAaveV3ReaderIntegration:
     BLOCK = 22616438
@@ -91,6 +97,18 @@ class TestAaveV3ReaderIntegration:
         assert data.total_collateral_base >= 0
         assert data.ltv >= 0
 
+    def test_positions_for_matches_account_data(self, web3_eth):
+        reader = AaveV3Reader(_ctx(web3_eth, self.BLOCK), ETHEREUM_AAVE_V3_POOL)
+        positions = reader.positions_for(ETHEREUM_AAVE_VAULT, [ETHEREUM_USDC])
+        (usdc,) = positions.reserves
+        assert usdc.reserve.decimals == 6
+        assert usdc.price is None or usdc.price > 0
+        if positions.account.total_debt_base:
+            contributions = sum(
+                r.health_contribution or 0.0 for r in positions.reserves
+            )
+            assert contributions <= positions.account.health_factor / 1e18 + 1e-6
+
 
 # ── Arbitrum ───────────────────────────────────────────────────────────
 
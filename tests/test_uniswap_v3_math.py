@@ -0,0 +1,90 @@
+"""Unit tests for the local Uniswap V3 tick, price and fee math."""
+
+from decimal import Decimal, getcontext
+
+import pytest
+
+from ipor_fusion.readers import uniswap_v3_math as v3
+
+Q96 = v3.Q96
+
+
+class TestTickMath:
+    def test_bounds_and_origin(self):
+        assert v3.get_sqrt_ratio_at_tick(v3.MIN_TICK) == v3.MIN_SQRT_RATIO
+        assert v3.get_sqrt_ratio_at_tick(v3.MAX_TICK) == v3.MAX_SQRT_RATIO
+        assert v3.get_sqrt_ratio_at_tick(0) == Q96
+
+    @pytest.mark.parametrize("bit", range(20))
+    def test_every_tick_bit_tracks_sqrt_price(self, bit):
+        getcontext().prec = 80
+        for tick in (1 << bit, -(1 << bit)):
+            if abs(tick) > v3.MAX_TICK:
+                continue
+            exact = (Decimal("1.0001") ** tick).sqrt() * Q96
+            got = Decimal(v3.get_sqrt_ratio_at_tick(tick))
+            assert abs(got - exact) / exact < Decimal("1e-17")
+
+    def test_rejects_out_of_range_tick(self):
+        with pytest.raises(ValueError, match="outside"):
+            v3.get_sqrt_ratio_at_tick(v3.MAX_TICK + 1)
+
+    @pytest.mark.parametrize("tick", [v3.MIN_TICK + 1, -50_001, -1, 0, 1, 60, 887_271])
+    def test_tick_at_sqrt_ratio_inverts(self, tick):
+        sqrt_price = v3.get_sqrt_ratio_at_tick(tick)
+
+        assert v3.get_tick_at_sqrt_ratio(sqrt_price) == tick
+        assert v3.get_tick_at_sqrt_ratio(sqrt_price - 1) == tick - 1
+
+    def test_tick_at_max_sqrt_ratio_is_rejected(self):
+        with pytest.raises(ValueError, match="out of range"):
+            v3.get_tick_at_sqrt_ratio(v3.MAX_SQRT_RATIO)
+
+
+class TestAmounts:
+    LIQUIDITY = 10**18
+
+    def test_rounding_up_adds_at_most_one(self):
+        a, b = v3.get_sqrt_ratio_at_tick(-600), v3.get_sqrt_ratio_at_tick(600)
+
+        for delta in (v3.get_amount0_delta, v3.get_amount1_delta):
+            down = delta(a, b, self.LIQUIDITY, False)
+            assert delta(b, a, self.LIQUIDITY, True) - down in (0, 1)
+
+    def test_in_range_holds_both_tokens(self):
+        amount0, amount1 = v3.amounts_for_liquidity(Q96, -600, 600, self.LIQUIDITY)
+
+        # Symmetric range around price 1: L * (1 - 1.0001^-300) of each
+        expected = self.LIQUIDITY * (1 - 1.0001**-300)
+        assert amount0 == pytest.approx(expected, rel=1e-9)
+        assert amount1 == pytest.approx(expected, rel=1e-9)
+
+    def test_out_of_range_holds_one_token(self):
+        below = v3.amounts_for_liquidity(
+            v3.get_sqrt_ratio_at_tick(-1_000), -600, 600, self.LIQUIDITY
+        )
+        above = v3.amounts_for_liquidity(
+            v3.get_sqrt_ratio_at_tick(1_000), -600, 600, self.LIQUIDITY
+        )
+
+        assert below[0] > 0 and below[1] == 0
+        assert above[0] == 0 and above[1] > 0
+
+
+class TestFees:
+    def test_fee_growth_inside_for_each_side_of_range(self):
+        # global 100, outside lower 10, outside upper 20
+        assert v3.fee_growth_inside(0, -60, 60, 100, 10, 20) == 70
+        assert v3.fee_growth_inside(-120, -60, 60, 100, 10, 20) == 10 - 20 + 2**256
+        assert v3.fee_growth_inside(120, -60, 60, 100, 10, 20) == 20 - 10
+
+    def test_uncollected_fees_wrap_like_solidity(self):
+        # Growth inside wrapped past 2**256 since the last update
+        fees = v3.uncollected_fees(
+            liquidity=2 * 10**18,
+            fee_growth_inside_x128=5 * v3.Q128,
+            fee_growth_inside_last_x128=2**256 - 5 * v3.Q128,
+            tokens_owed=7,
+        )
+
+        assert fees == 7 + 10 * 2 * 10**18
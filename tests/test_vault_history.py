@@ -0,0 +1,168 @@
+"""Unit tests for the vault history sampler — mock Web3Context, no network."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from web3 import Web3
+from web3.exceptions import ContractLogicError
+
+from ipor_fusion import (
+    BalanceFuse,
+    block_at_timestamp,
+    block_grid,
+    fetch_vault_history,
+    timestamp_grid,
+)
+from ipor_fusion.core.context import Web3Context
+from ipor_fusion.core.scheduler import RpcScheduler
+
+VAULT = Web3.to_checksum_address("0x" + "11" * 20)
+FUSE = Web3.to_checksum_address("0x" + "f1" * 20)
+
+
+def _chain(head: int, block_time: int = 12, genesis: int = 1_000) -> MagicMock:
+    """A chain whose block n was mined at genesis + n * block_time."""
+    ctx = MagicMock()
+    ctx.web3.eth.block_number = head
+    ctx.get_block.side_effect = lambda n: {"timestamp": genesis + n * block_time}
+    return ctx
+
+
+class TestGrids:
+    def test_block_grid_includes_last_block(self):
+        assert block_grid(100, 110, 4) == [100, 104, 108, 110]
+        assert block_grid(100, 108, 4) == [100, 104, 108]
+        assert block_grid(5, 5, 10) == [5]
+
+    def test_block_grid_rejects_reversed_range(self):
+        with pytest.raises(ValueError, match="before"):
+            block_grid(10, 5, 1)
+
+    def test_block_at_timestamp_finds_last_block_at_or_before(self):
+        ctx = _chain(head=1_000)
+
+        assert block_at_timestamp(ctx, 1_000 + 12 * 500) == 500
+        assert block_at_timestamp(ctx, 1_000 + 12 * 500 + 11) == 500
+        assert block_at_timestamp(ctx, 10**12) == 1_000
+        assert ctx.get_block.call_count < 40
+
+    def test_block_at_timestamp_before_first_block(self):
+        with pytest.raises(ValueError, match="later than"):
+            block_at_timestamp(_chain(head=100), 999)
+
+    def test_timestamp_grid_shares_header_reads(self):
+        ctx = _chain(head=10_000)
+
+        blocks = timestamp_grid(ctx, 1_000 + 12 * 100, 1_000 + 12 * 400, 12 * 100)
+
+        assert blocks == [100, 200, 300, 400]
+        # Four independent searches would read ~4 * log2(10_000) headers.
+        assert ctx.get_block.call_count < 40
+
+    def test_timestamp_grid_lists_each_block_once(self):
+        ctx = _chain(head=100, block_time=60)
+
+        assert timestamp_grid(ctx, 1_000, 1_120, 30) == [0, 1, 2]
+
+
+class TestFetchVaultHistory:
+    @staticmethod
+    def _ctx() -> Web3Context:
+        return Web3Context(web3=MagicMock(), chain_id=1)
+
+    @patch("ipor_fusion.readers.vault_history.call_all")
+    @patch(
+        "ipor_fusion.core.plasma_vault.PlasmaVault.get_balance_fuses",
+        return_value=[BalanceFuse(market_id=3, fuse=FUSE)],
+    )
+    @patch("ipor_fusion.core.contract.Call.call", return_value=6)
+    def test_one_multicall_per_block_in_block_order(
+        self, _decimals, _fuses, mock_call_all
+    ):
+        def batch(ctx, calls):
+            block = ctx.default_block
+            assert len(calls) == 6
+            assert calls[3].data[4:] == (10**6).to_bytes(32, "big")
+            return [block * 10, block, block + 1, 1_000_000 + block, 0, 7 * block]
+
+        mock_call_all.side_effect = batch
+
+        rows = list(fetch_vault_history(self._ctx(), VAULT, [10, 20, 30, 40, 50]))
+
+        assert [row.block_number for row in rows] == [10, 20, 30, 40, 50]
+        assert rows[1].timestamp == 200
+        assert rows[1].total_assets == 20
+        assert rows[1].total_supply == 21
+        assert rows[1].share_price == 1_000_020
+        assert rows[1].market_assets == {3: 140}
+        assert mock_call_all.call_count == 5
+
+    @patch("ipor_fusion.readers.vault_history.call_all")
+    @patch("ipor_fusion.core.contract.Call.call", return_value=18)
+    def test_reverted_reads_are_none(self, _decimals, mock_call_all):
+        reverted = ContractLogicError("execution reverted")
+        mock_call_all.return_value = [1_700_000_000, reverted, reverted, reverted, 0]
+
+        (row,) = fetch_vault_history(self._ctx(), VAULT, [5], market_ids=[])
+
+        assert row.timestamp == 1_700_000_000
+        assert row.total_assets is None
+        assert row.share_price is None
+        assert row.unrealized_management_fee == 0
+        assert row.market_assets == {}
+
+    @patch("ipor_fusion.readers.vault_history.call_all")
+    @patch("ipor_fusion.core.contract.Call.call", return_value=18)
+    def test_blocks_are_read_on_the_context_scheduler(self, _decimals, mock_call_all):
+        threads: set[str] = set()
+
+        def batch(ctx, calls):
+            threads.add(threading.current_thread().name)
+            return [0] * len(calls)
+
+        mock_call_all.side_effect = batch
+        scheduler = RpcScheduler(max_workers=2, name="history-test")
+        ctx = Web3Context(web3=MagicMock(), chain_id=1, scheduler=scheduler)
+
+        rows = list(fetch_vault_history(ctx, VAULT, [1, 2, 3], market_ids=[]))
+
+        assert len(rows) == 3
+        assert threads
+        assert all(name.startswith("ipor-history-test-") for name in threads)
+
+    @patch("ipor_fusion.readers.vault_history.call_all")
+    @patch("ipor_fusion.core.contract.Call.call", return_value=18)
+    def test_at_most_max_concurrent_blocks_in_flight(self, _decimals, mock_call_all):
+        lock = threading.Lock()
+        active = peak = 0
+
+        def batch(ctx, calls):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return [0] * len(calls)
+
+        mock_call_all.side_effect = batch
+        scheduler = RpcScheduler(max_workers=4, name="history-window")
+        ctx = Web3Context(web3=MagicMock(), chain_id=1, scheduler=scheduler)
+
+        rows = list(
+            fetch_vault_history(
+                ctx, VAULT, list(range(1, 9)), market_ids=[], max_concurrent=2
+            )
+        )
+
+        assert len(rows) == 8
+        assert peak <= 2
+
+    def test_no_blocks_reads_nothing(self):
+        ctx = MagicMock()
+
+        assert list(fetch_vault_history(ctx, VAULT, [])) == []
+        ctx.pinned.assert_not_called()
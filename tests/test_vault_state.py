@@ -0,0 +1,302 @@
+"""Unit tests for VaultStateCache — an in-memory chain of logs, no network."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from eth_abi import encode
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.exceptions import Web3RPCError
+
+from ipor_fusion import (
+    AccessManager,
+    PlasmaVault,
+    PriceOracleMiddleware,
+    VaultStateCache,
+    WithdrawManager,
+)
+from ipor_fusion.core import vault_state as vs
+from ipor_fusion.core.context import Web3Context
+
+VAULT = Web3.to_checksum_address("0x" + "11" * 20)
+ACCESS = Web3.to_checksum_address("0x" + "22" * 20)
+ORACLE = Web3.to_checksum_address("0x" + "33" * 20)
+WITHDRAW = Web3.to_checksum_address("0x" + "44" * 20)
+ALICE = Web3.to_checksum_address("0x" + "aa" * 20)
+BOB = Web3.to_checksum_address("0x" + "bb" * 20)
+FUSE_A = Web3.to_checksum_address("0x" + "f1" * 20)
+FUSE_B = Web3.to_checksum_address("0x" + "f2" * 20)
+ASSET = Web3.to_checksum_address("0x" + "a5" * 20)
+
+GET_ACCESS_MANAGER = Web3.keccak(text="getAccessManagerAddress()")[:4]
+GET_PRICE_ORACLE = Web3.keccak(text="getPriceOracleMiddleware()")[:4]
+
+
+class FakeChain:
+    """Serves `get_block`, `get_logs` and the two manager getters."""
+
+    def __init__(self):
+        self.head = 100
+        self.logs: list[dict] = []
+        self.get_logs_calls = 0
+
+    def emit(self, address, topic, data=b"", indexed=(), block=None) -> dict:
+        log = {
+            "address": address,
+            "topics": [HexBytes(topic), *(HexBytes(t) for t in indexed)],
+            "data": HexBytes(data),
+            "blockNumber": self.head if block is None else block,
+            "logIndex": len(self.logs),
+            "removed": False,
+        }
+        self.logs.append(log)
+        return log
+
+    def context(self) -> Web3Context:
+        ctx = Web3Context(web3=MagicMock(), chain_id=1)
+        ctx.get_block = lambda block="latest": {  # type: ignore[method-assign]
+            "number": self.head,
+            "timestamp": 1_000 + self.head,
+        }
+        ctx.get_logs = self.get_logs  # type: ignore[method-assign]
+        ctx.call = self.call  # type: ignore[method-assign]
+        return ctx
+
+    def get_logs(self, contract_address, topics, from_block=0, to_block="latest"):
+        self.get_logs_calls += 1
+        addresses = (
+            {contract_address}
+            if isinstance(contract_address, str)
+            else set(contract_address)
+        )
+        wanted = set(topics[0])
+        return [
+            log
+            for log in reversed(self.logs)  # providers need not sort
+            if log["address"] in addresses
+            and log["topics"][0].to_0x_hex() in wanted
+            and from_block <= log["blockNumber"] <= to_block
+        ]
+
+    def call(self, to, data, block=None):
+        if bytes(data)[:4] == GET_ACCESS_MANAGER:
+            return encode(["address"], [ACCESS])
+        return encode(["address"], [ORACLE])
+
+
+def _balance_fuse(chain, topic, market_id, fuse, block=None):
+    return chain.emit(
+        VAULT, topic, encode(["uint256", "address"], [market_id, fuse]), block=block
+    )
+
+
+def _grant(chain, role_id, account, delay=0, since=0, new_member=True):
+    return chain.emit(
+        ACCESS,
+        vs.ROLE_GRANTED,
+        encode(["uint32", "uint48", "bool"], [delay, since, new_member]),
+        indexed=(encode(["uint64"], [role_id]), encode(["address"], [account])),
+    )
+
+
+def _revoke(chain, role_id, account):
+    return chain.emit(
+        ACCESS,
+        vs.ROLE_REVOKED,
+        indexed=(encode(["uint64"], [role_id]), encode(["address"], [account])),
+    )
+
+
+def _withdraw_request(chain, account, amount, end):
+    return chain.emit(
+        WITHDRAW,
+        vs.WITHDRAW_REQUEST_UPDATED,
+        encode(["address", "uint256", "uint32"], [account, amount, end]),
+    )
+
+
+@pytest.fixture
+def chain():
+    chain = FakeChain()
+    chain.emit(VAULT, vs.WITHDRAW_MANAGER_CHANGED, encode(["address"], [WITHDRAW]))
+    return chain
+
+
+@pytest.fixture
+def shared(chain):
+    ctx = chain.context()
+    cache = VaultStateCache.shared(1, VAULT)
+    yield ctx, cache
+    VaultStateCache.clear_shared()
+
+
+class TestReplay:
+    def test_load_decodes_every_component(self, chain):
+        _balance_fuse(chain, vs.BALANCE_FUSE_ADDED, 1, FUSE_A)
+        _balance_fuse(chain, vs.BALANCE_FUSE_ADDED, 2, FUSE_B)
+        _balance_fuse(chain, vs.BALANCE_FUSE_REMOVED, 2, FUSE_B)
+        _grant(chain, 1, ALICE, delay=60)
+        _grant(chain, 100, BOB)
+        _revoke(chain, 100, BOB)
+        chain.emit(
+            ORACLE, vs.PRICE_SOURCE_UPDATED, encode(["address"] * 2, [ASSET, ALICE])
+        )
+        _withdraw_request(chain, ALICE, 5, end=2_000)
+        _withdraw_request(chain, BOB, 7, end=2_000)
+        _withdraw_request(chain, BOB, 0, end=2_000)
+        cache = VaultStateCache(1, VAULT)
+
+        cache.sync(chain.context())
+
+        assert [(f.market_id, f.fuse) for f in cache.balance_fuses()] == [(1, FUSE_A)]
+        assert cache.withdraw_manager() == WITHDRAW
+        assert [
+            (r.role_id, r.account, r.execution_delay) for r in cache.role_accounts()
+        ] == [(1, ALICE, 60)]
+        assert [(s.asset, s.source) for s in cache.price_sources()] == [(ASSET, ALICE)]
+        assert cache.withdraw_request_accounts(1_500) == [ALICE]
+        assert cache.withdraw_request_accounts(2_000) == []
+        assert cache.block_number == 100
+
+    def test_grant_takes_effect_at_since(self, chain):
+        _grant(chain, 1, ALICE, since=1_200)
+        cache = VaultStateCache(1, VAULT)
+
+        cache.sync(chain.context())
+        assert cache.role_accounts(1) == []
+
+        chain.head = 200
+        cache.sync(chain.context())
+        assert [r.account for r in cache.role_accounts(1)] == [ALICE]
+
+    def test_regrant_schedules_new_delay(self, chain):
+        _grant(chain, 1, ALICE, delay=60)
+        _grant(chain, 1, ALICE, delay=10, since=1_150, new_member=False)
+        cache = VaultStateCache(1, VAULT)
+
+        cache.sync(chain.context())
+        assert cache.role_accounts(1)[0].execution_delay == 60
+
+        chain.head = 150
+        cache.sync(chain.context())
+        assert cache.role_accounts(1)[0].execution_delay == 10
+
+
+class TestDeltas:
+    def test_sync_reads_only_new_blocks(self, chain):
+        _balance_fuse(chain, vs.BALANCE_FUSE_ADDED, 1, FUSE_A)
+        cache = VaultStateCache(1, VAULT)
+        ctx = chain.context()
+        cache.sync(ctx)
+        calls = chain.get_logs_calls
+
+        chain.head = 101
+        _balance_fuse(chain, vs.BALANCE_FUSE_REMOVED, 1, FUSE_A)
+        _grant(chain, 4, BOB)
+        cache.sync(ctx)
+
+        assert chain.get_logs_calls == calls + 1
+        assert cache.balance_fuses() == []
+        assert [r.account for r in cache.role_accounts(4)] == [BOB]
+
+    def test_apply_ignores_logs_already_synced(self, chain):
+        cache = VaultStateCache(1, VAULT)
+        ctx = chain.context()
+        cache.sync(ctx)
+
+        chain.head = 101
+        log = _withdraw_request(chain, ALICE, 5, end=5_000)
+        cache.apply(log)
+        cache.sync(ctx)
+        chain.head = 102
+        cache.apply(_withdraw_request(chain, ALICE, 0, end=5_000))
+        cache.apply(log)  # redelivered: already in
+
+        assert cache.withdraw_request_accounts(1_000) == []
+
+    def test_manager_change_reloads(self, chain):
+        cache = VaultStateCache(1, VAULT)
+        ctx = chain.context()
+        cache.sync(ctx)
+        _withdraw_request(chain, ALICE, 5, end=5_000)
+        other = Web3.to_checksum_address("0x" + "55" * 20)
+
+        chain.head = 101
+        chain.emit(VAULT, vs.WITHDRAW_MANAGER_CHANGED, encode(["address"], [other]))
+        cache.sync(ctx)
+
+        assert cache.withdraw_manager() == other
+        assert cache.withdraw_request_accounts(1_000) == []
+
+    def test_removed_log_marks_stale(self, chain, shared):
+        ctx, cache = shared
+        cache.sync(ctx)
+        log = dict(_grant(chain, 1, ALICE), removed=True)
+
+        cache.apply(log)
+
+        assert VaultStateCache.tracking(ctx, VAULT) is None
+        cache.sync(ctx)
+        assert VaultStateCache.tracking(ctx, VAULT) is cache
+
+
+class TestWrappersConsultSharedCache:
+    def test_compound_methods_skip_event_replay(self, chain, shared):
+        ctx, cache = shared
+        _balance_fuse(chain, vs.BALANCE_FUSE_ADDED, 1, FUSE_A)
+        _grant(chain, 1, ALICE)
+        cache.sync(ctx)
+        calls = chain.get_logs_calls
+
+        assert [f.fuse for f in PlasmaVault(ctx, VAULT).get_balance_fuses()] == [FUSE_A]
+        assert PlasmaVault(ctx, VAULT).withdraw_manager_address() == WITHDRAW
+        assert [
+            r.account for r in AccessManager(ctx, ACCESS).get_all_role_accounts()
+        ] == [ALICE]
+        assert PriceOracleMiddleware(ctx, ORACLE).get_assets_price_sources() == []
+        assert WithdrawManager(ctx, WITHDRAW).get_pending_requests() == []
+        assert chain.get_logs_calls == calls
+
+    def test_pinned_block_bypasses_cache(self, chain, shared):
+        ctx, cache = shared
+        cache.sync(ctx)
+
+        ctx.default_block = 50
+
+        assert VaultStateCache.tracking(ctx, VAULT) is None
+
+    def test_failed_sync_bypasses_cache_until_next_success(self, chain, shared):
+        ctx, cache = shared
+        cache.sync(ctx)
+        get_logs = ctx.get_logs
+        ctx.get_logs = MagicMock(side_effect=Web3RPCError("range too large"))  # type: ignore[method-assign]
+        chain.head = 101
+
+        with pytest.raises(Web3RPCError):
+            cache.sync(ctx)
+        assert VaultStateCache.tracking(ctx, ACCESS) is None
+
+        ctx.get_logs = get_logs  # type: ignore[method-assign]
+        cache.sync(ctx)
+        assert VaultStateCache.tracking(ctx, ACCESS) is cache
+
+    def test_cache_goes_unused_once_the_last_sync_is_too_old(self, chain, shared):
+        ctx, cache = shared
+        now = [0.0]
+        cache._clock = lambda: now[0]
+        cache.sync(ctx)
+
+        now[0] = VaultStateCache.MAX_AGE_S
+        assert VaultStateCache.tracking(ctx, VAULT) is cache
+
+        now[0] += 1
+        assert VaultStateCache.tracking(ctx, VAULT) is None
+
+        cache.sync(ctx)
+        assert VaultStateCache.tracking(ctx, VAULT) is cache
+
+    def test_unregistered_cache_is_not_consulted(self, chain):
+        ctx = chain.context()
+        VaultStateCache(1, VAULT).sync(ctx)
+
+        assert VaultStateCache.tracking(ctx, VAULT) is None
@@ -1,13 +1,18 @@
 # pyright: reportAttributeAccessIssue=false
 """Unit tests for Web3Context — mock Web3 calls, no network required."""
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 import pytest
 from hexbytes import HexBytes
 from web3 import Web3
+from web3.exceptions import ContractLogicError
 
 from ipor_fusion.core.context import Web3Context
+from ipor_fusion.core.ratecontrol import AdaptiveRateMiddleware
 from ipor_fusion.errors import TransactionError
 from ipor_fusion.types import ChainId
 
@@ -84,6 +89,7 @@ class TestFromUrl:
         mock_web3_cls.HTTPProvider.assert_called_once_with(
             "http://localhost:8545",
             request_kwargs={"timeout": Web3Context.DEFAULT_RPC_TIMEOUT_S},
+            exception_retry_configuration=None,
         )
         mock_web3_cls.assert_called_once_with(mock_provider)
         assert ctx.chain_id == ChainId(42161)
@@ -108,7 +114,21 @@ class TestFromUrl:
         Web3Context.from_url("http://localhost:8545", request_timeout_s=10.0)
 
         mock_web3_cls.HTTPProvider.assert_called_once_with(
-            "http://localhost:8545", request_kwargs={"timeout": 10.0}
+            "http://localhost:8545",
+            request_kwargs={"timeout": 10.0},
+            exception_retry_configuration=None,
+        )
+
+    @patch("ipor_fusion.core.context.Web3")
+    def test_from_url_installs_rate_control(self, mock_web3_cls):
+        mock_web3_instance = MagicMock()
+        mock_web3_instance.eth.chain_id = 1
+        mock_web3_cls.return_value = mock_web3_instance
+
+        Web3Context.from_url("http://localhost:8545")
+
+        mock_web3_instance.middleware_onion.add.assert_any_call(
+            AdaptiveRateMiddleware, name="ipor_fusion_rate_control"
         )
 
 
@@ -214,3 +234,99 @@ class TestSendFailedReceipt:
 
         with pytest.raises(TransactionError):
             ctx.send(TO_ADDR, b"\x01")
+
+
+# ── call single-flight ──────────────────────────────────────────────────
+
+
+class TestCallSingleFlight:
+    @staticmethod
+    def _gated_ctx(error=None):
+        """Context whose ``eth.call`` blocks until the returned gate opens."""
+        ctx = _make_ctx()
+        gate = threading.Event()
+        started = threading.Event()
+
+        def eth_call(tx, block_identifier):
+            started.set()
+            gate.wait(5)
+            if error is not None:
+                raise error
+            return HexBytes(tx["data"])
+
+        ctx.web3.eth.call.side_effect = eth_call
+        return ctx, gate, started
+
+    @staticmethod
+    def _race(ctx, gate, started, followers):
+        with ThreadPoolExecutor(max_workers=followers + 1) as pool:
+            futures = [pool.submit(ctx.call, TO_ADDR, b"\x01")]
+            started.wait(5)
+            futures += [
+                pool.submit(ctx.call, TO_ADDR, b"\x01") for _ in range(followers)
+            ]
+            time.sleep(0.05)  # let the followers join the flight
+            gate.set()
+            return [f.exception(5) or f.result() for f in futures]
+
+    def test_concurrent_identical_calls_share_one_request(self):
+        ctx, gate, started = self._gated_ctx()
+
+        results = self._race(ctx, gate, started, followers=3)
+
+        assert results == [HexBytes(b"\x01")] * 4
+        assert ctx.web3.eth.call.call_count == 1
+
+    def test_errors_reach_every_waiter(self):
+        ctx, gate, started = self._gated_ctx(ContractLogicError("execution reverted"))
+
+        results = self._race(ctx, gate, started, followers=1)
+
+        assert all(isinstance(r, ContractLogicError) for r in results)
+        assert ctx.web3.eth.call.call_count == 1
+
+    def test_different_blocks_are_separate_requests(self):
+        ctx = _make_ctx()
+        ctx.web3.eth.call.return_value = HexBytes(b"\x02")
+
+        ctx.call(TO_ADDR, b"\x01", block=1)
+        ctx.call(TO_ADDR, b"\x01", block=2)
+        ctx.call(TO_ADDR, b"\x01", block=2)
+
+        assert ctx.web3.eth.call.call_count == 3
+
+
+class TestSharedReads:
+    def test_pinned_block_reads_are_reused(self):
+        ctx = _make_ctx()
+        ctx.default_block = 100
+        ctx.web3.eth.call.return_value = HexBytes(b"\x02")
+
+        with ctx.shared_reads():
+            ctx.call(TO_ADDR, b"\x01")
+            ctx.call(TO_ADDR, b"\x01")
+            ctx.call(TO_ADDR, b"\x01", block=99)
+
+        assert ctx.web3.eth.call.call_count == 2
+
+    def test_latest_reads_are_not_reused(self):
+        ctx = _make_ctx()
+        ctx.web3.eth.call.return_value = HexBytes(b"\x02")
+
+        with ctx.shared_reads():
+            ctx.call(TO_ADDR, b"\x01")
+            ctx.call(TO_ADDR, b"\x01")
+
+        assert ctx.web3.eth.call.call_count == 2
+
+    def test_cache_is_dropped_on_exit(self):
+        ctx = _make_ctx()
+        ctx.default_block = 100
+        ctx.web3.eth.call.return_value = HexBytes(b"\x02")
+
+        with ctx.shared_reads():
+            ctx.call(TO_ADDR, b"\x01")
+        ctx.call(TO_ADDR, b"\x01")
+
+        assert ctx.web3.eth.call.call_count == 2
+        assert ctx.cached_read(TO_ADDR, b"\x01") is None
@@ -0,0 +1,268 @@
+"""Unit tests for the WebSocket provider and subscriptions — no network."""
+
+import json
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+from hexbytes import HexBytes
+from web3 import Web3
+from websockets.exceptions import ConnectionClosedError
+
+from ipor_fusion.core.context import Web3Context
+from ipor_fusion.core.provider_pool import ProviderPool
+from ipor_fusion.core.websocket import SyncWebSocketProvider, detect_chain_id
+from ipor_fusion.errors import SubscriptionError
+
+VAULT = Web3.to_checksum_address("0x" + "11" * 20)
+TOPIC = "0x" + "ab" * 32
+
+HEAD = {
+    "number": "0x65",
+    "timestamp": "0x6553f100",
+    "hash": "0x" + "01" * 32,
+    "parentHash": "0x" + "02" * 32,
+    "miner": "0x" + "cd" * 20,
+    "baseFeePerGas": "0x3b9aca00",
+}
+LOG = {
+    "address": VAULT.lower(),
+    "blockHash": "0x" + "03" * 32,
+    "blockNumber": "0x65",
+    "data": "0x",
+    "logIndex": "0x2",
+    "topics": [TOPIC],
+    "transactionHash": "0x" + "04" * 32,
+    "transactionIndex": "0x0",
+    "removed": False,
+}
+
+
+class FakeNode:
+    """Stands in for a websockets connection: answers JSON-RPC requests and
+    pushes subscription notifications, in order, through one inbox."""
+
+    def __init__(self):
+        self.inbox: queue.Queue = queue.Queue()
+        self.sent: list[dict] = []
+        self.subscriptions = 0
+
+    def send(self, raw: str) -> None:
+        request = json.loads(raw)
+        self.sent.append(request)
+        method, params = request["method"], request["params"]
+        if method == "eth_subscribe":
+            self.subscriptions += 1
+            result = f"0xsub{self.subscriptions}"
+        elif method == "eth_chainId":
+            result = "0x1"
+        elif method == "eth_blockNumber":
+            result = "0x64"
+        else:  # echo, so concurrent callers can tell their answers apart
+            result = params
+        self._push({"jsonrpc": "2.0", "id": request["id"], "result": result})
+
+    def notify(self, subscription: str, result: dict) -> None:
+        self._push(
+            {
+                "jsonrpc": "2.0",
+                "method": "eth_subscription",
+                "params": {"subscription": subscription, "result": result},
+            }
+        )
+
+    def drop(self) -> None:
+        self.inbox.put(ConnectionResetError("peer went away"))
+
+    def close(self) -> None:
+        self.inbox.put(None)
+
+    def _push(self, message: dict) -> None:
+        self.inbox.put(json.dumps(message))
+
+    def __iter__(self):
+        while True:
+            item = self.inbox.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+
+@pytest.fixture
+def node():
+    return FakeNode()
+
+
+@pytest.fixture
+def provider(node):
+    provider = SyncWebSocketProvider(
+        "wss://node.example", request_timeout_s=5, connect=lambda _uri: node
+    )
+    yield provider
+    provider.close()
+
+
+def _settle(provider: SyncWebSocketProvider) -> None:
+    """Messages are handled in order, so once a response arrives every
+    notification pushed before it has been routed."""
+    provider.make_request("eth_blockNumber", [])
+
+
+class TestRequests:
+    def test_concurrent_requests_share_one_connection(self, provider, node):
+        with ThreadPoolExecutor(8) as pool:
+            responses = list(
+                pool.map(lambda i: provider.make_request("eth_echo", [i]), range(32))
+            )
+
+        assert [r["result"] for r in responses] == [[i] for i in range(32)]
+        assert len({r["id"] for r in responses}) == 32
+
+    def test_dropped_connection_fails_pending_and_reconnects(self, node):
+        node.send = lambda raw: node.drop()
+        second = FakeNode()
+        connect = MagicMock(side_effect=[node, second])
+        provider = SyncWebSocketProvider("wss://node.example", connect=connect)
+
+        with pytest.raises(ConnectionError, match="lost"):
+            provider.make_request("eth_blockNumber", [])
+
+        assert provider.make_request("eth_blockNumber", [])["result"] == "0x64"
+        assert connect.call_count == 2
+        provider.close()
+
+    def test_closed_connection_on_send_is_a_connection_error(self, node):
+        def closed(raw):
+            raise ConnectionClosedError(None, None)
+
+        node.send = closed
+        second = FakeNode()
+        connect = MagicMock(side_effect=[node, second])
+        provider = SyncWebSocketProvider("wss://node.example", connect=connect)
+
+        with pytest.raises(ConnectionError, match="lost"):
+            provider.make_request("eth_blockNumber", [])
+
+        assert provider.make_request("eth_blockNumber", [])["result"] == "0x64"
+        provider.close()
+
+    def test_request_timeout(self, node):
+        node.send = lambda raw: None  # never answers
+        provider = SyncWebSocketProvider(
+            "wss://node.example", request_timeout_s=0.05, connect=lambda _uri: node
+        )
+
+        with pytest.raises(TimeoutError):
+            provider.make_request("eth_blockNumber", [])
+
+
+class TestSubscriptions:
+    def test_new_heads_are_formatted(self, provider, node):
+        ctx = Web3Context.from_provider(provider)
+        heads = ctx.subscribe_new_heads()
+        node.notify(heads.id, HEAD)
+
+        head = next(iter(heads))
+
+        assert node.sent[-1]["params"] == ["newHeads"]
+        assert head["number"] == 101
+        assert head["baseFeePerGas"] == 10**9
+        assert head["hash"] == HexBytes(HEAD["hash"])
+        assert head["miner"] == Web3.to_checksum_address(HEAD["miner"])
+
+    def test_logs_match_get_logs_shape(self, provider, node):
+        ctx = Web3Context.from_provider(provider)
+        logs = ctx.subscribe_logs(VAULT, topics=[[TOPIC]])
+        node.notify(logs.id, LOG)
+
+        log = next(iter(logs))
+
+        assert node.sent[-1]["params"] == [
+            "logs",
+            {"address": VAULT, "topics": [[TOPIC]]},
+        ]
+        assert log["address"] == VAULT
+        assert log["blockNumber"] == 101
+        assert log["logIndex"] == 2
+        assert log["topics"] == [HexBytes(TOPIC)]
+        assert log["removed"] is False
+
+    def test_drain_returns_queued_events(self, provider, node):
+        heads = provider.subscribe(["newHeads"], lambda raw: int(raw["number"], 16))
+        for number in ("0x65", "0x66", "0x67"):
+            node.notify(heads.id, {"number": number})
+        _settle(provider)
+
+        assert next(iter(heads)) == 101
+        assert heads.drain() == [102, 103]
+        assert heads.drain() == []
+
+    def test_close_unsubscribes_and_ends_iteration(self, provider, node):
+        heads = provider.subscribe(["newHeads"], dict)
+
+        heads.close()
+
+        assert list(heads) == []
+        assert node.sent[-1]["method"] == "eth_unsubscribe"
+        assert node.sent[-1]["params"] == [heads.id]
+
+    def test_dropped_connection_ends_subscription_with_error(self, provider, node):
+        heads = provider.subscribe(["newHeads"], dict)
+
+        node.drop()
+
+        with pytest.raises(SubscriptionError, match="lost"):
+            next(iter(heads))
+
+    def test_provider_pool_subscribes_through_its_websocket(self, provider, node):
+        http = MagicMock(spec=Web3.HTTPProvider)
+        ctx = Web3Context(web3=Web3(ProviderPool([http, provider])), chain_id=1)
+
+        heads = ctx.subscribe_new_heads()
+
+        assert ctx.supports_subscriptions
+        assert node.sent[-1]["params"] == ["newHeads"]
+        heads.close()
+
+    def test_http_context_cannot_subscribe(self):
+        ctx = Web3Context(web3=MagicMock(), chain_id=1)
+
+        assert ctx.supports_subscriptions is False
+        with pytest.raises(SubscriptionError, match="ws://"):
+            ctx.subscribe_new_heads()
+
+
+class TestDetectChainId:
+    def test_websocket_connection_is_closed_after_the_probe(self, node):
+        with (
+            patch("ipor_fusion.core.websocket._default_connect", return_value=node),
+            patch.object(node, "close", wraps=node.close) as close,
+        ):
+            assert detect_chain_id("wss://node.example") == 1
+
+        assert node.sent[-1]["method"] == "eth_chainId"
+        close.assert_called_once_with()
+
+    @patch("ipor_fusion.core.websocket.Web3")
+    def test_http_url_is_probed_over_http(self, mock_web3):
+        mock_web3.return_value.eth.chain_id = 8453
+
+        assert detect_chain_id("https://node.example") == 8453
+        mock_web3.HTTPProvider.assert_called_once_with("https://node.example")
+
+
+class TestFromUrl:
+    def test_websocket_url_builds_persistent_provider(self, node):
+        with patch(
+            "ipor_fusion.core.websocket._default_connect", return_value=node
+        ) as connect:
+            ctx = Web3Context.from_url("wss://node.example")
+
+        assert isinstance(ctx.web3.provider, SyncWebSocketProvider)
+        assert ctx.chain_id == 1
+        assert ctx.supports_subscriptions
+        connect.assert_called_once_with("wss://node.example")
+        ctx.web3.provider.close()
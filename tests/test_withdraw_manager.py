@@ -247,3 +247,20 @@ def test_pending_requests_passes_from_block(wm, ctx):
     wm.get_pending_requests_info(from_block=BlockNumber(1234))
     call_kwargs = ctx.get_logs.call_args
     assert call_kwargs[1]["from_block"] == BlockNumber(1234)
+
+
+def test_pending_requests_verifies_source_accounts_without_replay(wm, ctx):
+    current_ts = 5000
+    ctx.get_block.return_value = {"timestamp": current_ts}
+    ctx.call.return_value = encode(
+        ["uint256", "uint256", "bool", "uint256"],
+        [200, current_ts + 500, True, 3600],
+    )
+    source = MagicMock()
+    source.withdraw_request_accounts.return_value = [FAKE_ACCOUNT]
+
+    requests = wm.get_pending_requests(source=source)
+
+    ctx.get_logs.assert_not_called()
+    source.withdraw_request_accounts.assert_called_once_with(current_ts)
+    assert [r.account for r in requests] == [FAKE_ACCOUNT]